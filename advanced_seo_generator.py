@@ -8,9 +8,11 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-import re
 
 # Importa o sistema base
+from chapter_generator import chapter_lines
+from f5_lexicon import LEXICON
+from phrase_ranker import RankedPhrase
 from video_seo_optimizer import VideoSEOOptimizer, TranscriptionAnalyzer, SEOContentGenerator
 
 logging.basicConfig(level=logging.INFO)
@@ -22,104 +24,15 @@ class AdvancedSEOGenerator:
     def __init__(self):
         self.base_optimizer = VideoSEOOptimizer()
         self.analyzer = TranscriptionAnalyzer()
-        self.specific_themes = self._load_specific_themes()
-    
-    def _load_specific_themes(self) -> Dict[str, Dict]:
-        """Carrega temas específicos com templates otimizados"""
-        return {
-            'autorresponsabilidade': {
-                'keywords': [
-                    'autorresponsabilidade', 'autoconhecimento', 'responsabilidade', 'consciência',
-                    'desenvolvimento pessoal', 'reflexão', 'crescimento', 'valores', 'decisões',
-                    'comportamento', 'mudança', 'transformação', 'atitude', 'escolhas'
-                ],
-                'title_templates': [
-                    "Autorresponsabilidade: O Segredo do Sucesso Profissional | F5 Estratégia",
-                    "Como Desenvolver Autorresponsabilidade e Transformar sua Carreira | F5",
-                    "Autorresponsabilidade na Prática: Estratégias Comprovadas | F5 Estratégia",
-                    "O Poder da Autorresponsabilidade para Empresários | F5 Estratégia",
-                    "Desenvolva Autorresponsabilidade em 30 Dias | Método F5 Estratégia"
-                ],
-                'description_intro': "Descubra como a autorresponsabilidade pode transformar sua vida profissional e pessoal. Neste vídeo, exploramos estratégias práticas para desenvolver consciência, tomar melhores decisões e assumir controle total dos seus resultados.",
-                'landing_page': 'https://f5estrategia.com/desenvolvimento-pessoal',
-                'cta': "Transforme sua mentalidade e alcance resultados extraordinários"
-            },
-            'lideranca': {
-                'keywords': [
-                    'liderança', 'gestão', 'equipe', 'management', 'líder', 'time',
-                    'performance', 'motivação', 'engajamento', 'cultura organizacional',
-                    'comunicação', 'feedback', 'desenvolvimento de talentos'
-                ],
-                'title_templates': [
-                    "Liderança de Alta Performance: Estratégias Comprovadas | F5",
-                    "Como Liderar Equipes de Sucesso | Método F5 Estratégia",
-                    "Gestão de Equipes: Técnicas que Funcionam | F5 Estratégia",
-                    "Liderança Eficaz para Empresários | F5 Estratégia",
-                    "Desenvolva sua Liderança em 30 Dias | F5 Estratégia"
-                ],
-                'description_intro': "Aprenda as estratégias de liderança que transformam equipes comuns em times de alta performance. Técnicas práticas para motivar, engajar e desenvolver talentos em sua organização.",
-                'landing_page': 'https://f5estrategia.com/gestao-equipes',
-                'cta': "Torne-se um líder extraordinário"
-            },
-            'comunicacao': {
-                'keywords': [
-                    'comunicação', 'apresentação', 'oratória', 'persuasão', 'influência',
-                    'networking', 'relacionamento', 'diálogo', 'escuta', 'clareza',
-                    'storytelling', 'negociação', 'conflitos'
-                ],
-                'title_templates': [
-                    "Comunicação Estratégica: Como Influenciar e Persuadir | F5",
-                    "Domine a Arte da Comunicação Empresarial | F5 Estratégia",
-                    "Comunicação de Alta Performance | Método F5 Estratégia",
-                    "Como se Comunicar com Impacto | F5 Estratégia",
-                    "Desenvolva sua Comunicação em 30 Dias | F5 Estratégia"
-                ],
-                'description_intro': "Descubra como dominar a comunicação estratégica para influenciar, persuadir e gerar resultados extraordinários em seus negócios e relacionamentos profissionais.",
-                'landing_page': 'https://f5estrategia.com/comunicacao-estrategica',
-                'cta': "Comunique-se com impacto e autoridade"
-            },
-            'vendas': {
-                'keywords': [
-                    'vendas', 'negociação', 'fechamento', 'prospecção', 'cliente',
-                    'conversão', 'funil', 'leads', 'relacionamento comercial',
-                    'objeções', 'argumentação', 'proposta', 'valor'
-                ],
-                'title_templates': [
-                    "Técnicas de Vendas que Funcionam | F5 Estratégia",
-                    "Como Vender Mais e Melhor | Método F5 Estratégia",
-                    "Vendas de Alta Performance | F5 Estratégia",
-                    "Domine a Arte da Negociação | F5 Estratégia",
-                    "Aumente suas Vendas em 30 Dias | F5 Estratégia"
-                ],
-                'description_intro': "Aprenda as técnicas de vendas e negociação que os profissionais de sucesso usam para fechar mais negócios e aumentar sua receita de forma consistente.",
-                'landing_page': 'https://f5estrategia.com/vendas-estrategicas',
-                'cta': "Multiplique seus resultados em vendas"
-            }
-        }
+        # Temas, templates e índices de palavras-chave montados uma vez por processo (ver f5_lexicon)
+        self.lexicon = LEXICON
+        self.specific_themes = LEXICON.specific_themes
     
     def detect_specific_theme(self, transcription: str) -> Optional[str]:
         """Detecta tema específico com maior precisão"""
-        clean_text = self.analyzer.clean_text(transcription).lower()
-        
-        theme_scores = {}
-        
-        for theme_name, theme_data in self.specific_themes.items():
-            score = 0
-            keywords = theme_data['keywords']
-            
-            for keyword in keywords:
-                # Busca exata e variações
-                if keyword.lower() in clean_text:
-                    # Conta ocorrências
-                    occurrences = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', clean_text))
-                    score += occurrences * 2
-                
-                # Busca parcial para palavras compostas
-                for word in keyword.split():
-                    if len(word) > 3 and word in clean_text:
-                        score += 1
-            
-            theme_scores[theme_name] = score
+        # Tokens do texto limpo (memoizados) -> tabela de n-gramas das palavras-chave (ver f5_lexicon)
+        tokens = self.analyzer.analyze(transcription).tokens
+        theme_scores = self.lexicon.score_specific_themes(tokens)
         
         # Retorna tema com maior score se significativo
         if theme_scores:
@@ -135,15 +48,22 @@ class AdvancedSEOGenerator:
             # Lê transcrição
             with open(transcription_file, 'r', encoding='utf-8') as f:
                 transcription = f.read()
-            
+        except Exception as e:
+            logger.error(f"Erro ao gerar conteúdo otimizado: {e}")
+            return {'error': str(e)}
+        return self.generate_optimized_content_from_text(transcription, transcription_file)
+    
+    def generate_optimized_content_from_text(self, transcription: str, source_file: str = '') -> Dict[str, any]:
+        """Gera conteúdo SEO otimizado a partir da transcrição já em memória"""
+        try:
             # Detecta tema específico
             specific_theme = self.detect_specific_theme(transcription)
             
             if specific_theme:
-                return self._generate_theme_specific_content(transcription, specific_theme, transcription_file)
+                return self._generate_theme_specific_content(transcription, specific_theme, source_file)
             else:
                 # Fallback para análise geral
-                return self.base_optimizer.optimize_video_from_transcription(transcription_file)
+                return self.base_optimizer.optimize_transcription(transcription, source_file)
                 
         except Exception as e:
             logger.error(f"Erro ao gerar conteúdo otimizado: {e}")
@@ -153,7 +73,7 @@ class AdvancedSEOGenerator:
         """Gera conteúdo específico para tema detectado"""
         theme_data = self.specific_themes[theme]
         keywords = self.analyzer.extract_keywords(transcription, top_n=15)
-        key_phrases = self.analyzer.extract_key_phrases(transcription, max_phrases=5)
+        key_phrases = self.analyzer.extract_ranked_phrases(transcription, max_phrases=5)
         
         # Título otimizado para o tema
         title = self._select_best_title(theme_data['title_templates'], keywords)
@@ -180,7 +100,7 @@ class AdvancedSEOGenerator:
             'seo_content': {
                 'title': {
                     'primary': title,
-                    'alternatives': theme_data['title_templates'][:5],
+                    'alternatives': list(theme_data['title_templates'][:5]),
                     'character_count': len(title),
                     'theme_optimized': True
                 },
@@ -188,7 +108,8 @@ class AdvancedSEOGenerator:
                     'content': description,
                     'character_count': len(description),
                     'within_limit': len(description) <= 5000,
-                    'theme_optimized': True
+                    'theme_optimized': True,
+                    'chapters': [chapter.to_dict() for chapter in self.analyzer.extract_chapters(transcription)]
                 },
                 'tags': {
                     'content': tags,
@@ -200,8 +121,9 @@ class AdvancedSEOGenerator:
             },
             'keywords': {
                 'primary': keywords,
-                'theme_specific': theme_data['keywords'][:10],
-                'key_phrases': key_phrases
+                'theme_specific': list(theme_data['keywords'][:10]),
+                'key_phrases': [phrase.text for phrase in key_phrases],
+                'key_moments': [phrase.to_dict() for phrase in key_phrases]
             },
             'recommendations': self._generate_theme_recommendations(theme, len(transcription))
         }
@@ -225,7 +147,7 @@ class AdvancedSEOGenerator:
         return templates[0]
     
     def _generate_theme_description(self, transcription: str, theme_data: Dict, 
-                                   title: str, keywords: List, key_phrases: List) -> str:
+                                   title: str, keywords: List, key_phrases: List[RankedPhrase]) -> str:
         """Gera descrição específica para o tema"""
         
         intro = theme_data['description_intro']
@@ -233,7 +155,7 @@ class AdvancedSEOGenerator:
         cta = theme_data['cta']
         
         # Pontos principais (máximo 3)
-        main_points = [phrase.strip() for phrase in key_phrases[:3] if len(phrase.strip()) > 30]
+        main_points = [phrase.with_timestamp() for phrase in key_phrases[:3] if len(phrase.text) > 30]
         
         # Top keywords para SEO
         top_keywords = [kw[0] for kw in keywords[:6]]
@@ -255,6 +177,11 @@ class AdvancedSEOGenerator:
             for point in theme_points[:3-len(main_points)]:
                 description += f"\n✅ {point}"
         
+        # Capítulos do vídeo (transcrições com timecode)
+        chapters = self.analyzer.extract_chapters(transcription)
+        if chapters:
+            description += f"\n\n⏱️ CAPÍTULOS:\n{chapter_lines(chapters)}"
+        
         description += f"""
 
 🔍 PALAVRAS-CHAVE PRINCIPAIS:
@@ -333,34 +260,13 @@ Transformando negócios através de estratégias comprovadas."""
         base_tags = ['f5-estrategia', 'metodologia-chavi', 'empreendedorismo']
         
         # Tags específicas do tema
-        theme_tags = {
-            'autorresponsabilidade': [
-                'autorresponsabilidade', 'autoconhecimento', 'desenvolvimento-pessoal',
-                'crescimento-profissional', 'mindset', 'transformacao-pessoal',
-                'consciencia', 'responsabilidade', 'mudanca-comportamental'
-            ],
-            'lideranca': [
-                'lideranca', 'gestao-equipes', 'alta-performance', 'motivacao',
-                'engajamento', 'cultura-organizacional', 'desenvolvimento-talentos',
-                'feedback', 'management', 'lider'
-            ],
-            'comunicacao': [
-                'comunicacao-estrategica', 'oratoria', 'apresentacao', 'persuasao',
-                'influencia', 'networking', 'storytelling', 'negociacao',
-                'relacionamento-profissional', 'comunicacao-empresarial'
-            ],
-            'vendas': [
-                'vendas', 'negociacao', 'fechamento', 'conversao', 'funil-vendas',
-                'prospecção', 'relacionamento-comercial', 'objecoes',
-                'tecnicas-vendas', 'vendas-estrategicas'
-            ]
-        }
+        theme_tags = list(self.specific_themes[theme]['tags']) if theme in self.specific_themes else []
         
         # Tags do conteúdo (palavras-chave extraídas)
-        content_tags = [kw[0].replace(' ', '-') for kw, freq in keywords[:5]]
+        content_tags = [kw.replace(' ', '-') for kw, freq in keywords[:5]]
         
         # Combina todas
-        all_tags = base_tags + theme_tags.get(theme, []) + content_tags
+        all_tags = base_tags + theme_tags + content_tags
         
         # Remove duplicatas e limita
         unique_tags = []
@@ -379,7 +285,7 @@ Transformando negócios através de estratégias comprovadas."""
         return {
             'title': title,
             'description': f'{theme.title()} - Conteúdo F5 Estratégia',
-            'keywords': '-'.join([kw[0] for kw in keywords[:8]]),
+            'keywords': '-'.join([kw[0].replace(' ', '-') for kw in keywords[:8]]),
             'category': theme,
             'author': 'F5 Estratégia',
             'creation_date': datetime.now().strftime('%Y-%m-%d'),
@@ -422,6 +328,16 @@ Transformando negócios através de estratégias comprovadas."""
         
         return base_recommendations + theme_recommendations.get(theme, [])
 
+# Gerador compartilhado pelas chamadas do processo
+_generator: Optional[AdvancedSEOGenerator] = None
+
+def get_generator() -> AdvancedSEOGenerator:
+    """Gerador do processo (criado na primeira chamada e reaproveitado)"""
+    global _generator
+    if _generator is None:
+        _generator = AdvancedSEOGenerator()
+    return _generator
+
 def generate_complete_seo_package(transcription_file: str) -> Dict[str, any]:
     """
     Função principal para gerar pacote completo de SEO
@@ -432,8 +348,7 @@ def generate_complete_seo_package(transcription_file: str) -> Dict[str, any]:
     Returns:
         Dict com conteúdo SEO otimizado
     """
-    generator = AdvancedSEOGenerator()
-    return generator.generate_optimized_content(transcription_file)
+    return get_generator().generate_optimized_content(transcription_file)
 
 if __name__ == "__main__":
     # Teste com a transcrição de autorresponsabilidade
@@ -0,0 +1,302 @@
+"""
+Batch Processor - Processamento paralelo das pastas de transcrições
+Desenvolvido para F5 Estratégia - Descoberta preguiçosa, pool de processos e relatório JSONL incremental
+
+As transcrições são descobertas com os.scandir à medida que o pool tem vagas (sem listar a árvore
+inteira antes), cada vídeo grava seus arquivos assim que termina e cada resultado vira uma linha do
+relatório JSONL, gravada e sincronizada no disco na hora. Uma falha no arquivo 300 não perde os
+299 anteriores, e --resume retoma a partir do relatório existente pulando o que já deu certo.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterator, Set, Tuple
+
+from config import AppConfig
+from content_index import GENERATED_FILES
+from f5_lexicon import get_lexicon
+from corpus_stats import load_corpus_stats
+from keyword_engine import get_background_corpus
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tarefas disponíveis: nome -> descrição
+TASKS = {
+    'upload': 'Arquivos de upload do YouTube (generate_youtube_files)',
+    'f5': 'Arquivos no formato F5 com pesquisa no YouTube (f5_seo_system)',
+    'prompt': 'Prompts estruturados para IA (seo_prompt_generator)'
+}
+
+# Tarefas em andamento por processo do pool
+PENDING_PER_WORKER = 2
+
+# Campos de texto longos omitidos do relatório (o conteúdo completo fica nos arquivos do vídeo)
+MAX_REPORT_VALUE_LENGTH = 300
+
+# Instâncias criadas uma vez em cada processo do pool
+_worker_runners: Dict[str, Any] = {}
+
+
+def iter_transcription_files(root: str) -> Iterator[str]:
+    """
+    Transcrições (.txt) nas subpastas de root, descobertas sob demanda
+
+    Arquivos na raiz (prompts e modelos), arquivos gerados (titulo.txt, descricao.txt, ...)
+    e pastas ocultas são ignorados.
+    """
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Pasta ignorada ({directory}): {e}")
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append((entry.path, depth + 1))
+            elif (depth > 0 and entry.name.endswith('.txt') and entry.name not in GENERATED_FILES
+                  and entry.is_file()):
+                yield entry.path
+        # Ordem alfabética na saída (a pilha inverte)
+        stack.extend(reversed(subdirectories))
+
+
+def _runner(task: str, output_dir: str):
+    """Cria (uma vez por processo) o executor da tarefa"""
+    runner = _worker_runners.get(task)
+    if runner is not None:
+        return runner
+
+    if task == 'upload':
+        from generate_youtube_files import generate_youtube_upload_files
+        runner = generate_youtube_upload_files
+    elif task == 'f5':
+        from f5_seo_system import F5SEOSystem
+        runner = F5SEOSystem().save_f5_youtube_files
+    elif task == 'prompt':
+        from seo_prompt_generator import SEOPromptGenerator
+        generator = SEOPromptGenerator()
+
+        def runner(path: str, force: bool = False) -> Dict[str, Any]:
+            name = os.path.splitext(os.path.basename(path))[0]
+            return generator.generate_structured_prompt(path, os.path.join(output_dir, f"{name}.json"))
+    else:
+        raise ValueError(f"Tarefa desconhecida: {task} (opções: {', '.join(TASKS)})")
+
+    _worker_runners[task] = runner
+    return runner
+
+
+def _summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Resumo enxuto do resultado para o relatório"""
+    if 'content_summary' in result:
+        return result['content_summary']
+    return {
+        key: value for key, value in result.items()
+        if isinstance(value, (str, int, float, bool)) and len(str(value)) <= MAX_REPORT_VALUE_LENGTH
+    }
+
+
+def process_transcription(task: str, path: str, output_dir: str = '', collect: bool = False,
+                          force: bool = False) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Processa uma transcrição (executado no pool de processos)
+
+    Args:
+        force: Regenera mesmo se o manifesto indicar saídas atualizadas (ver build_manifest)
+
+    Returns:
+        Tuple (linha do relatório, resultado completo se collect)
+    """
+    started = time.perf_counter()
+    try:
+        result = _runner(task, output_dir)(path, force=force)
+    except Exception as e:
+        result = {'error': str(e)}
+
+    record = {
+        'file': path,
+        'task': task,
+        'status': 'error' if 'error' in result else 'ok',
+        'elapsed': round(time.perf_counter() - started, 3),
+        'finished_at': datetime.now().isoformat(timespec='seconds')
+    }
+    if 'error' in result:
+        record['error'] = result['error']
+    else:
+        record['up_to_date'] = bool(result.get('up_to_date'))
+        record['summary'] = _summarize(result)
+    return record, result if collect else None
+
+
+def completed_files(report_path: str) -> Set[str]:
+    """Arquivos já processados com sucesso em um relatório JSONL (linhas truncadas são ignoradas)"""
+    done = set()
+    if not os.path.exists(report_path):
+        return done
+    with open(report_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') == 'ok':
+                done.add(os.path.abspath(record['file']))
+    return done
+
+
+class BatchProcessor:
+    """Processa pastas de transcrições em paralelo gravando cada resultado assim que termina"""
+
+    def __init__(self, task: str = 'upload', workers: Optional[int] = None,
+                 report_path: Optional[str] = None, resume: bool = False, show_progress: bool = True,
+                 force: bool = False):
+        """
+        Args:
+            task: 'upload', 'f5' ou 'prompt' (ver TASKS)
+            workers: Processos do pool (padrão: AppConfig.CATALOG_WORKERS ou CPUs; 1 = sem pool)
+            report_path: Relatório JSONL (padrão: reports/batch_<tarefa>_<data>.jsonl)
+            resume: Pula os arquivos que já constam com sucesso no relatório
+            show_progress: Exibe uma linha por arquivo concluído
+            force: Regenera todos os arquivos, ignorando o manifesto de entradas
+        """
+        if task not in TASKS:
+            raise ValueError(f"Tarefa desconhecida: {task} (opções: {', '.join(TASKS)})")
+        self.task = task
+        self.workers = workers or AppConfig.CATALOG_WORKERS or os.cpu_count() or 1
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.report_path = report_path or os.path.join(AppConfig.REPORTS_DIR, f"batch_{task}_{timestamp}.jsonl")
+        self.output_dir = os.path.splitext(self.report_path)[0]
+        self.resume = resume
+        self.show_progress = show_progress
+        self.force = force
+
+    def _write(self, report, record: Dict[str, Any]):
+        report.write(json.dumps(record, ensure_ascii=False) + '\n')
+        report.flush()
+        os.fsync(report.fileno())
+
+    def _progress(self, record: Dict[str, Any], counts: Dict[str, int], started: float):
+        if not self.show_progress:
+            return
+        done = counts['ok'] + counts['error']
+        rate = done / (time.perf_counter() - started)
+        if record['status'] == 'error':
+            mark = f"✗ {record.get('error', '')[:80]}"
+        else:
+            mark = '=' if record.get('up_to_date') else '✓'
+        print(f"   [{done}] {mark} {record['file']} ({record['elapsed']:.1f}s, {rate:.2f} arquivos/s)")
+
+    def run(self, root: Optional[str] = None, collect: bool = False) -> Dict[str, Any]:
+        """
+        Processa todas as transcrições de root
+
+        Args:
+            root: Pasta das transcrições (padrão: AppConfig.TRANSCRIPTIONS_DIR)
+            collect: Também retorna os resultados completos por arquivo (relativo a root)
+
+        Returns:
+            Dict com processed, successful, failed, skipped (já no relatório), up_to_date (sem mudanças),
+            elapsed, output_file e results (se collect)
+        """
+        root = root or AppConfig.TRANSCRIPTIONS_DIR
+        done = completed_files(self.report_path) if self.resume else set()
+        # Vídeos novos da biblioteca entram no IDF antes do lote (uma vez, no processo principal)
+        get_background_corpus.cache_clear()
+        load_corpus_stats(sync=True)
+        os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+        if self.task == 'prompt':
+            os.makedirs(self.output_dir, exist_ok=True)
+
+        counts = {'ok': 0, 'error': 0, 'skipped': 0, 'up_to_date': 0}
+        results: Dict[str, Dict[str, Any]] = {}
+        started = time.perf_counter()
+
+        def handle(record: Dict[str, Any], result: Optional[Dict[str, Any]]):
+            self._write(report, record)
+            counts[record['status']] += 1
+            counts['up_to_date'] += int(record.get('up_to_date', False))
+            if collect:
+                results[os.path.relpath(record['file'], root)] = result
+            self._progress(record, counts, started)
+
+        def pending_files() -> Iterator[str]:
+            for path in iter_transcription_files(root):
+                if os.path.abspath(path) in done:
+                    counts['skipped'] += 1
+                    continue
+                yield path
+
+        with open(self.report_path, 'a', encoding='utf-8') as report:
+            if self.workers == 1:
+                for path in pending_files():
+                    handle(*process_transcription(self.task, path, self.output_dir, collect, self.force))
+            else:
+                # Léxico e estatísticas do corpus montados antes do fork: os processos do pool os herdam
+                get_lexicon()
+                get_background_corpus()
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    files = pending_files()
+                    in_flight = set()
+                    try:
+                        while True:
+                            # Descobre novos arquivos só quando há vaga no pool
+                            for path in files:
+                                in_flight.add(pool.submit(process_transcription, self.task, path,
+                                                          self.output_dir, collect, self.force))
+                                if len(in_flight) >= self.workers * PENDING_PER_WORKER:
+                                    break
+                            if not in_flight:
+                                break
+                            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                handle(*future.result())
+                    except KeyboardInterrupt:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+
+        summary = {
+            'processed': counts['ok'] + counts['error'],
+            'successful': counts['ok'],
+            'failed': counts['error'],
+            'skipped': counts['skipped'],
+            'up_to_date': counts['up_to_date'],
+            'elapsed': round(time.perf_counter() - started, 2),
+            'output_file': self.report_path
+        }
+        if collect:
+            summary['results'] = results
+        return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Processamento em lote das transcrições - F5 Estratégia")
+    parser.add_argument('root', nargs='?', default=AppConfig.TRANSCRIPTIONS_DIR, help='Pasta das transcrições')
+    parser.add_argument('--task', choices=list(TASKS), default='upload',
+                        help='; '.join(f"{name}: {description}" for name, description in TASKS.items()))
+    parser.add_argument('--workers', type=int, help='Processos (padrão: CPUs)')
+    parser.add_argument('--report', help='Relatório JSONL (padrão: reports/batch_<tarefa>_<data>.jsonl)')
+    parser.add_argument('--resume', action='store_true', help='Pula arquivos já concluídos no relatório')
+    parser.add_argument('--force', action='store_true', help='Regenera mesmo arquivos sem mudanças')
+    args = parser.parse_args()
+
+    if args.resume and not args.report:
+        parser.error('--resume requer --report')
+
+    print(f"🚀 Processando transcrições em: {args.root} ({TASKS[args.task]})")
+    summary = BatchProcessor(args.task, args.workers, args.report, args.resume, force=args.force).run(args.root)
+    print(f"\n📊 {summary['successful']} ok ({summary['up_to_date']} sem mudanças), {summary['failed']} com erro, "
+          f"{summary['skipped']} já concluídos em {summary['elapsed']:.1f}s")
+    print(f"📄 Relatório: {summary['output_file']}")
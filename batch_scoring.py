@@ -0,0 +1,302 @@
+"""
+Batch Scoring - Pontuação vetorizada de catálogo completo
+Desenvolvido para F5 Estratégia - CHAVI, persona e SEO para milhares de vídeos sem chamadas de IA
+"""
+
+import argparse
+import csv
+import logging
+import os
+import time
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Matrizes esparsas (opcional - fallback para NumPy denso)
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from config import F5Config
+from content_optimizer import CHAVIAnalyzer, PersonaTargeting, SEOAnalyzer
+from persona_classifier import get_persona_classifier
+from text_analysis import AnalyzedText, FIELDS, MAX_NGRAM, keyword_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class KeywordWeights:
+    """Vocabulário de palavras-chave e matrizes de pesos (termos x grupos) usadas na pontuação"""
+
+    def __init__(self):
+        chavi_criteria = CHAVIAnalyzer().evaluation_criteria
+
+        self.pillars = list(chavi_criteria.keys())
+        self.personas = list(PersonaTargeting.PERSONA_INDICATORS.keys())
+        self.core_keywords = list(F5Config.CORE_KEYWORDS)
+
+        groups = {
+            **{f'chavi_{p}': c['keywords'] for p, c in chavi_criteria.items()},
+            **{f'persona_{p}': kws for p, kws in PersonaTargeting.PERSONA_INDICATORS.items()},
+            'core': self.core_keywords,
+            'emotional': SEOAnalyzer.EMOTIONAL_WORDS,
+            'cta': SEOAnalyzer.CTA_WORDS
+        }
+
+        # Vocabulário único (uma coluna por palavra-chave)
+        self.vocabulary: Dict[str, int] = {}
+        for keywords in groups.values():
+            for keyword in keywords:
+                self.vocabulary.setdefault(keyword, len(self.vocabulary))
+
+        self.group_columns = list(groups.keys())
+        membership = np.zeros((len(self.vocabulary), len(groups)), dtype=np.float64)
+        for j, keywords in enumerate(groups.values()):
+            for keyword in keywords:
+                membership[self.vocabulary[keyword], j] = 1.0
+
+        self.membership = membership
+        self.group_sizes = membership.sum(axis=0)
+        self.chavi_weights = np.array([chavi_criteria[p]['weight'] for p in self.pillars])
+
+    def group_index(self, name: str) -> int:
+        """Índice da coluna do grupo na matriz de pesos"""
+        return self.group_columns.index(name)
+
+    def group_slice(self, prefix: str) -> List[int]:
+        """Índices das colunas de grupos com o prefixo informado"""
+        return [i for i, name in enumerate(self.group_columns) if name.startswith(prefix)]
+
+
+def build_document_term_matrices(analyzed_texts: List[AnalyzedText],
+                                 vocabulary: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Monta uma matriz documento-termo (contagens) por campo
+
+    Args:
+        analyzed_texts: Contextos já tokenizados, um por vídeo
+        vocabulary: Mapa palavra-chave -> coluna
+
+    Returns:
+        Dict campo -> matriz (n_videos x n_termos), esparsa quando SciPy disponível
+    """
+    n_docs, n_terms = len(analyzed_texts), len(vocabulary)
+
+    # Chave normalizada -> colunas (formas diferentes como 'venda'/'vendas' dividem a mesma chave)
+    key_columns: Dict[Tuple[str, ...], List[int]] = {}
+    long_keywords = []
+    for keyword, j in vocabulary.items():
+        key = keyword_key(keyword)
+        if len(key) > MAX_NGRAM:
+            long_keywords.append((keyword, j))
+        elif key:
+            key_columns.setdefault(key, []).append(j)
+
+    matrices = {}
+    for field_name in FIELDS:
+        # Uma consulta por n-grama distinto do campo, em vez de uma contagem por palavra-chave
+        rows, cols, values = [], [], []
+        for i, analyzed in enumerate(analyzed_texts):
+            for ngram, count in analyzed.field_ngrams[field_name].items():
+                columns = key_columns.get(ngram)
+                if columns:
+                    rows.extend([i] * len(columns))
+                    cols.extend(columns)
+                    values.extend([count] * len(columns))
+            for keyword, j in long_keywords:
+                count = analyzed.count(keyword, field_name)
+                if count:
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(count)
+
+        if SCIPY_AVAILABLE:
+            matrices[field_name] = sparse.csr_matrix(
+                (values, (rows, cols)), shape=(n_docs, n_terms), dtype=np.float64
+            )
+        else:
+            dense = np.zeros((n_docs, n_terms), dtype=np.float64)
+            dense[rows, cols] = values
+            matrices[field_name] = dense
+
+    return matrices
+
+
+def _presence(matrix) -> Any:
+    """Converte contagens em presença (0/1) preservando o formato da matriz"""
+    if SCIPY_AVAILABLE and sparse.issparse(matrix):
+        presence = matrix.copy()
+        presence.data = np.ones_like(presence.data)
+        return presence
+    return (matrix > 0).astype(np.float64)
+
+
+def _dense(product) -> np.ndarray:
+    """Garante ndarray denso para o resultado de um produto de matrizes"""
+    return product.toarray() if hasattr(product, 'toarray') else np.asarray(product)
+
+
+def score_batch(videos: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Calcula CHAVI, persona, sub-scores de SEO e densidade de palavras-chave para um catálogo
+
+    Reproduz as regras de CHAVIAnalyzer, PersonaTargeting e SEOAnalyzer como produtos
+    entre matrizes documento-termo e matrizes de pesos, sem nenhuma chamada de rede.
+
+    Args:
+        videos: Lista de dicts com video_id, title, description e tags
+
+    Returns:
+        DataFrame com uma linha por vídeo
+    """
+    weights = KeywordWeights()
+    analyzed_texts = [AnalyzedText.from_video(video) for video in videos]
+    n_docs = len(analyzed_texts)
+
+    matrices = build_document_term_matrices(analyzed_texts, weights.vocabulary)
+    counts_all = matrices['title'] + matrices['description'] + matrices['tags']
+
+    present_all = _dense(_presence(counts_all) @ weights.membership)
+    present_title = _dense(_presence(matrices['title']) @ weights.membership)
+    present_desc = _dense(_presence(matrices['description']) @ weights.membership)
+    present_tags = _dense(_presence(matrices['tags']) @ weights.membership)
+
+    data: Dict[str, Any] = {
+        'video_id': [video.get('video_id', '') for video in videos],
+        'title': [analyzed.title for analyzed in analyzed_texts]
+    }
+
+    # CHAVI: 2 pontos se no título, 1 se apenas no restante do conteúdo
+    chavi_idx = weights.group_slice('chavi_')
+    chavi_raw = present_all[:, chavi_idx] + present_title[:, chavi_idx]
+    chavi_scores = np.minimum(10, chavi_raw / (weights.group_sizes[chavi_idx] * 2) * 10).round(2)
+    for k, pilar in enumerate(weights.pillars):
+        data[f'chavi_{pilar}'] = chavi_scores[:, k]
+        data[f'chavi_{pilar}_keywords'] = present_all[:, chavi_idx[k]].astype(int)
+    data['chavi_weighted'] = (chavi_scores @ weights.chavi_weights).round(2)
+
+    # Persona: 1 ponto por indicador + 0.5 se no título, normalizado por indicadores
+    persona_idx = weights.group_slice('persona_')
+    persona_scores = (present_all[:, persona_idx] + 0.5 * present_title[:, persona_idx]) / weights.group_sizes[persona_idx]
+    totals = persona_scores.sum(axis=1, keepdims=True)
+    persona_probs = np.divide(
+        persona_scores, totals,
+        out=np.full_like(persona_scores, 1.0 / len(persona_idx)),
+        where=totals > 0
+    )
+    for k, persona in enumerate(weights.personas):
+        data[f'persona_{persona}'] = persona_probs[:, k].round(4)
+    best = persona_scores.argmax(axis=1)
+    confidence = persona_scores[np.arange(n_docs), best]
+
+    # Com modelo treinado, probabilidades calibradas substituem todo o bloco de regras
+    # (personas fora do modelo ficam com 0, sem manter o score de regra ao lado)
+    classifier = get_persona_classifier()
+    if classifier is not None and n_docs:
+        model_probs = classifier.predict_proba_tokens([a.tokens for a in analyzed_texts])
+        persona_probs = np.zeros((n_docs, len(weights.personas)))
+        persona_probs[:, [weights.personas.index(label) for label in classifier.labels]] = model_probs
+        for k, persona in enumerate(weights.personas):
+            data[f'persona_{persona}'] = persona_probs[:, k].round(4)
+        best = persona_probs.argmax(axis=1)
+        confidence = persona_probs[np.arange(n_docs), best]
+
+    data['persona_target'] = [weights.personas[i] for i in best]
+    data['persona_confidence'] = confidence
+
+    # SEO - título
+    core = weights.group_index('core')
+    title_len = np.array([len(a.title) for a in analyzed_texts])
+    title_score = np.where((title_len >= 60) & (title_len <= 70), 2,
+                           np.where(((title_len >= 50) & (title_len < 60)) | ((title_len > 70) & (title_len <= 80)), 1, 0))
+    title_score = title_score + 2 * (present_title[:, core] > 0) + (present_title[:, weights.group_index('emotional')] > 0)
+
+    # SEO - descrição
+    desc_len = np.array([len(a.description) for a in analyzed_texts])
+    desc_keywords = present_desc[:, core]
+    has_timestamps = np.array([bool(SEOAnalyzer.TIMESTAMP_PATTERN.search(a.description)) for a in analyzed_texts])
+    desc_score = (2 * (desc_len >= 125)
+                  + np.where(desc_keywords >= 3, 3, np.where(desc_keywords >= 1, 1, 0))
+                  + (present_desc[:, weights.group_index('cta')] > 0)
+                  + has_timestamps)
+
+    # SEO - tags
+    n_tags = np.array([len(a.tags) for a in analyzed_texts])
+    tags_keywords = present_tags[:, core]
+    tags_score = (np.where((n_tags >= 10) & (n_tags <= 15), 2, np.where((n_tags >= 5) & (n_tags < 10), 1, 0))
+                  + np.where(tags_keywords >= 3, 3, np.where(tags_keywords >= 1, 1, 0))
+                  + (tags_keywords > 0))
+
+    data['seo_title'] = np.minimum(10, title_score)
+    data['seo_description'] = np.minimum(10, desc_score)
+    data['seo_tags'] = np.minimum(10, tags_score)
+    data['seo_score'] = (data['seo_title'] * 0.4 + data['seo_description'] * 0.4 + data['seo_tags'] * 0.2).round(2)
+
+    # Densidade de palavras-chave principais (% de palavras)
+    word_counts = np.array([a.word_count for a in analyzed_texts], dtype=np.float64)
+    core_columns = [weights.vocabulary[kw] for kw in weights.core_keywords]
+    core_counts = _dense(counts_all[:, core_columns])
+    density = np.divide(core_counts * 100, word_counts[:, None],
+                        out=np.zeros_like(core_counts), where=word_counts[:, None] > 0).round(2)
+    for k, keyword in enumerate(weights.core_keywords):
+        data[f'density_{keyword}'] = density[:, k]
+
+    return pd.DataFrame(data)
+
+
+def select_for_ai(scores: pd.DataFrame, limit: int = 20, max_seo_score: float = None) -> pd.DataFrame:
+    """
+    Seleciona os vídeos com pior pontuação para enviar à otimização com IA
+
+    Args:
+        scores: Resultado de score_batch
+        limit: Número máximo de vídeos
+        max_seo_score: Considera apenas vídeos com score SEO até este valor
+
+    Returns:
+        DataFrame ordenado do pior para o melhor
+    """
+    candidates = scores if max_seo_score is None else scores[scores['seo_score'] <= max_seo_score]
+    return candidates.sort_values(['seo_score', 'chavi_weighted']).head(limit)
+
+
+def load_videos_csv(arquivo_csv: str) -> List[Dict[str, Any]]:
+    """Carrega vídeos no formato do banco de vídeos F5 (titulo, descricao, tags)"""
+    with open(arquivo_csv, 'r', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+
+    return [
+        {
+            'video_id': row.get('video_id') or f'f5_video_{i:03d}',
+            'title': row.get('titulo', ''),
+            'description': row.get('descricao', ''),
+            'tags': row['tags'].split(',') if row.get('tags') else []
+        }
+        for i, row in enumerate(rows, 1)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pontuação em lote do catálogo - F5 Estratégia")
+    parser.add_argument('--csv', default='banco_videos_f5.csv', help='CSV com titulo, descricao e tags')
+    parser.add_argument('--output', default='reports/catalog_scores.csv', help='Arquivo CSV de saída')
+    parser.add_argument('--worst', type=int, default=20, help='Quantidade de vídeos a enviar para IA')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    videos = load_videos_csv(args.csv)
+    scores = score_batch(videos)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    scores.to_csv(args.output, index=False)
+
+    print(f"✅ {len(videos)} vídeos pontuados em {elapsed:.2f}s")
+    print(f"💾 Scores salvos em: {args.output}")
+    print(f"\n🎯 {args.worst} vídeos com pior score para otimização com IA:")
+    for _, row in select_for_ai(scores, args.worst).iterrows():
+        print(f"   • [{row['seo_score']}/10] {row['title'][:60]}")
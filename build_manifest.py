@@ -0,0 +1,298 @@
+"""
+Build Manifest - Regeneração incremental dos arquivos SEO por hash de conteúdo
+Desenvolvido para F5 Estratégia - Só refaz titulo.txt, descricao.txt, tags.txt e metadados.txt quando algo mudou
+
+Cada saída depende de quatro entradas, como num Makefile:
+    - a transcrição (sha256 do arquivo);
+    - o gerador (sha256 do código-fonte dos módulos da tarefa + GENERATOR_VERSION + léxico F5);
+    - os dados da marca (F5Config);
+    - a época das estatísticas do corpus (IDF das palavras-chave), que só muda com
+      `corpus_stats.py --rebuild`: vídeos novos na biblioteca não regeneram tudo a cada execução.
+O manifesto (SQLite em data/, seguro para os processos do batch_processor) guarda esses hashes e o sha256
+de cada arquivo gerado; se nenhuma entrada mudou e as saídas continuam as mesmas (nenhuma outra tarefa ou
+transcrição da pasta as sobrescreveu), o resultado anterior é reaproveitado.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Callable
+
+from config import AppConfig, F5Config
+from corpus_stats import corpus_epoch
+from f5_lexicon import get_lexicon
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Incrementar para forçar a regeneração de tudo sem mudar o código dos geradores
+GENERATOR_VERSION = 1
+
+# Módulos cujo código-fonte define cada tarefa
+TASK_DEPENDENCIES = {
+    'upload': ('generate_youtube_files', 'advanced_seo_generator', 'video_seo_optimizer', 'transcript_parser',
+               'f5_lexicon', 'keyword_engine', 'corpus_stats', 'phrase_ranker', 'chapter_generator'),
+    'f5': ('f5_seo_system', 'advanced_seo_generator', 'video_seo_optimizer', 'transcript_parser', 'f5_lexicon',
+           'keyword_engine', 'corpus_stats', 'phrase_ranker', 'chapter_generator')
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    task TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    generator_hash TEXT NOT NULL,
+    brand_hash TEXT NOT NULL,
+    corpus_epoch INTEGER NOT NULL DEFAULT 0,
+    outputs TEXT NOT NULL,
+    result TEXT NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (task, source)
+);
+"""
+
+
+def file_hash(path: str) -> str:
+    """sha256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _cached_file_hash(path: str, mtime_ns: int, size: int) -> str:
+    return file_hash(path)
+
+
+def corpus_hash(path: Optional[str] = None) -> str:
+    """
+    Hash do conteúdo das estatísticas do corpus ('' sem arquivo); recalculado só quando o arquivo muda
+
+    Muda a cada vídeo novo da biblioteca: serve a caches de análise baratos de refazer, não ao
+    manifesto (que usa corpus_epoch).
+    """
+    path = path or AppConfig.CORPUS_STATS_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ''
+    return _cached_file_hash(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def outputs_hashes(paths: List[str]) -> Dict[str, str]:
+    """sha256 de cada saída gerada ('' se o arquivo não existe)"""
+    return {path: file_hash(path) if os.path.exists(path) else '' for path in paths}
+
+
+@lru_cache(maxsize=None)
+def generator_hash(task: str) -> str:
+    """Hash do código-fonte dos módulos da tarefa (calculado uma vez por processo)"""
+    if task not in TASK_DEPENDENCIES:
+        raise ValueError(f"Tarefa sem manifesto: {task} (opções: {', '.join(TASK_DEPENDENCIES)})")
+    digest = hashlib.sha256(f"{task}:{GENERATOR_VERSION}".encode('utf-8'))
+    for module in TASK_DEPENDENCIES[task]:
+        spec = importlib.util.find_spec(module)
+        if spec and spec.origin and os.path.exists(spec.origin):
+            digest.update(file_hash(spec.origin).encode('ascii'))
+    # Tabelas do léxico, que podem vir do arquivo de override em vez do código
+    digest.update(get_lexicon().digest.encode('ascii'))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def brand_hash() -> str:
+    """Hash dos dados da marca usados pelos templates (F5Config)"""
+    brand = {
+        name: value for name, value in inspect.getmembers(F5Config)
+        if name.isupper() and not callable(value)
+    }
+    payload = json.dumps(brand, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """Manifesto de entradas e saídas de cada transcrição processada"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Arquivo SQLite (padrão: AppConfig.BUILD_MANIFEST_PATH)
+        """
+        self.path = path or AppConfig.BUILD_MANIFEST_PATH
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(builds)')}
+        if 'corpus_epoch' not in columns:
+            # Manifestos anteriores: registros valem para a época inicial do corpus
+            self._conn.execute("ALTER TABLE builds ADD COLUMN corpus_epoch INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    @staticmethod
+    def inputs(task: str, source: str) -> Dict[str, str]:
+        """Hashes atuais das entradas de uma saída"""
+        return {
+            'source_hash': file_hash(source),
+            'generator_hash': generator_hash(task),
+            'brand_hash': brand_hash(),
+            'corpus_epoch': corpus_epoch()
+        }
+
+    def stale_reason(self, task: str, source: str, inputs: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Motivo para regenerar (None = saídas atualizadas)
+
+        Returns:
+            'novo', 'transcrição alterada', 'gerador alterado', 'marca alterada', 'corpus alterado',
+            'saída ausente' ou 'saída sobrescrita'
+        """
+        inputs = inputs or self.inputs(task, source)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT source_hash, generator_hash, brand_hash, corpus_epoch, outputs FROM builds '
+                'WHERE task = ? AND source = ?',
+                (task, os.path.abspath(source))
+            ).fetchone()
+        if row is None:
+            return 'novo'
+        built_source, built_generator, built_brand, built_corpus, outputs = row
+        if built_source != inputs['source_hash']:
+            return 'transcrição alterada'
+        if built_generator != inputs['generator_hash']:
+            return 'gerador alterado'
+        if built_brand != inputs['brand_hash']:
+            return 'marca alterada'
+        if built_corpus != inputs['corpus_epoch']:
+            return 'corpus alterado'
+
+        outputs = json.loads(outputs)
+        if not isinstance(outputs, dict):
+            # Registro antigo, sem o hash das saídas
+            return 'saída sobrescrita'
+        if not all(os.path.exists(path) for path in outputs):
+            return 'saída ausente'
+        # A mesma pasta recebe os arquivos das duas tarefas e de todas as transcrições dela
+        if any(file_hash(path) != digest for path, digest in outputs.items()):
+            return 'saída sobrescrita'
+        return None
+
+    def result(self, task: str, source: str) -> Optional[Dict[str, Any]]:
+        """Resultado registrado na última geração"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM builds WHERE task = ? AND source = ?', (task, os.path.abspath(source))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, task: str, source: str, inputs: Dict[str, str], outputs: List[str], result: Dict[str, Any]):
+        """Registra uma geração concluída (com o sha256 de cada saída, para detectar sobrescritas)"""
+        hashes = outputs_hashes(outputs)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO builds (task, source, source_hash, generator_hash, brand_hash, corpus_epoch, '
+                'outputs, result, built_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (task, os.path.abspath(source), inputs['source_hash'], inputs['generator_hash'],
+                 inputs['brand_hash'], inputs['corpus_epoch'], json.dumps(hashes, ensure_ascii=False),
+                 json.dumps(result, ensure_ascii=False, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def forget(self, task: Optional[str] = None):
+        """Remove os registros (de uma tarefa ou todos), forçando a próxima geração"""
+        with self._lock:
+            if task:
+                self._conn.execute('DELETE FROM builds WHERE task = ?', (task,))
+            else:
+                self._conn.execute('DELETE FROM builds')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Manifesto compartilhado por processo (cada processo do pool abre sua conexão)
+_manifest: Optional[BuildManifest] = None
+_manifest_pid: Optional[int] = None
+
+
+def get_manifest() -> BuildManifest:
+    """Manifesto do processo atual (conexões SQLite não são reaproveitadas após fork)"""
+    global _manifest, _manifest_pid
+    if _manifest is None or _manifest_pid != os.getpid():
+        _manifest, _manifest_pid = BuildManifest(), os.getpid()
+    return _manifest
+
+
+def build_if_stale(task: str, source: str, build: Callable[[], Dict[str, Any]],
+                   force: bool = False, manifest: Optional[BuildManifest] = None) -> Dict[str, Any]:
+    """
+    Executa build() apenas se alguma entrada da transcrição mudou
+
+    Args:
+        task: Tarefa ('upload' ou 'f5')
+        source: Arquivo de transcrição
+        build: Gera os arquivos; retorna dict com 'files_created' (ou 'error')
+        force: Regenera mesmo com as entradas inalteradas
+        manifest: Manifesto (padrão: compartilhado do processo)
+
+    Returns:
+        Resultado de build() ou o resultado anterior com 'up_to_date': True
+    """
+    if not AppConfig.BUILD_MANIFEST_ENABLED:
+        return build()
+
+    manifest = manifest or get_manifest()
+    try:
+        inputs = manifest.inputs(task, source)
+    except OSError as e:
+        return {'error': str(e)}
+
+    if not force:
+        reason = manifest.stale_reason(task, source, inputs)
+        previous = manifest.result(task, source) if reason is None else None
+        if previous is not None:
+            return {**previous, 'up_to_date': True}
+        logger.info(f"Regenerando {os.path.basename(source)} ({task}): {reason}")
+
+    result = build()
+    if 'error' not in result:
+        outputs = list(result.get('files_created', {}).values())
+        manifest.record(task, source, inputs, outputs, result)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    from batch_processor import iter_transcription_files
+
+    parser = argparse.ArgumentParser(description="Estado da regeneração incremental - F5 Estratégia")
+    parser.add_argument('root', nargs='?', default=AppConfig.TRANSCRIPTIONS_DIR, help='Pasta das transcrições')
+    parser.add_argument('--task', choices=list(TASK_DEPENDENCIES), default='upload')
+    parser.add_argument('--forget', action='store_true', help='Limpa o manifesto da tarefa (tudo será regenerado)')
+    args = parser.parse_args()
+
+    manifest = BuildManifest()
+    if args.forget:
+        manifest.forget(args.task)
+        print(f"🧹 Manifesto da tarefa '{args.task}' limpo")
+    else:
+        stale = 0
+        for path in iter_transcription_files(args.root):
+            reason = manifest.stale_reason(args.task, path)
+            if reason:
+                stale += 1
+                print(f"   ↻ {path} ({reason})")
+        print(f"📊 {stale} transcrições a regenerar")
+    manifest.close()
@@ -0,0 +1,365 @@
+"""
+Catalog Optimizer - Otimização paralela do catálogo de vídeos
+Desenvolvido para F5 Estratégia - Pontuação por regras em processos + chamadas de IA assíncronas limitadas por provedor
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator, Tuple, Union
+
+# Barra de progresso (opcional - fallback para print)
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+from config import AIConfig, AppConfig
+from content_optimizer import ContentAnalysis, ContentOptimizer, RuleBasedAnalyzer, OptimizationSuggestion
+from near_duplicates import NearDuplicateIndex, shingles, jaccard, video_text
+from text_analysis import normalize_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# IDs reais do YouTube: 11 caracteres base64url (ex.: 'dQw4w9WgXcQ')
+YOUTUBE_VIDEO_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# Analisador por regras criado uma vez em cada processo do pool
+_worker_analyzer: Optional[RuleBasedAnalyzer] = None
+
+
+def _init_worker():
+    """Inicializa o analisador por regras no processo filho"""
+    global _worker_analyzer
+    _worker_analyzer = RuleBasedAnalyzer()
+
+
+def score_videos(videos: List[Dict[str, Any]]) -> List[Union[ContentAnalysis, Dict[str, Any]]]:
+    """
+    Pontua um bloco de vídeos por regras (executado no pool de processos)
+
+    Returns:
+        Análise de cada vídeo, na ordem do bloco; {'error': ...} para vídeos malformados,
+        sem derrubar os demais vídeos do bloco
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _init_worker()
+    analyses = []
+    for video in videos:
+        try:
+            analyses.append(_worker_analyzer.analyze(video))
+        except Exception as e:
+            analyses.append({'error': str(e)})
+    return analyses
+
+
+class ProgressDisplay:
+    """Exibe progresso e vazão (vídeos/s) do processamento em lote"""
+    
+    # Intervalo mínimo entre linhas de progresso sem tqdm (segundos)
+    PRINT_INTERVAL = 1.0
+
+    def __init__(self, total: int, description: str = "Otimizando"):
+        self.total = total
+        self.done = 0
+        self.errors = 0
+        self.start = time.perf_counter()
+        self.last_print = 0.0
+        self.bar = tqdm(total=total, desc=description, unit='vídeo') if TQDM_AVAILABLE else None
+
+    @property
+    def throughput(self) -> float:
+        """Vídeos concluídos por segundo"""
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, error: bool = False):
+        """Registra um vídeo concluído"""
+        self.done += 1
+        self.errors += int(error)
+
+        if self.bar is not None:
+            self.bar.set_postfix(erros=self.errors, vps=f"{self.throughput:.2f}")
+            self.bar.update(1)
+        elif self.done == self.total or time.perf_counter() - self.last_print >= self.PRINT_INTERVAL:
+            self.last_print = time.perf_counter()
+            remaining = (self.total - self.done) / self.throughput if self.throughput else 0
+            print(f"   ⏱️ {self.done}/{self.total} | {self.throughput:.2f} vídeos/s | "
+                  f"erros: {self.errors} | restante: ~{remaining:.0f}s")
+
+    def close(self):
+        """Finaliza a exibição"""
+        if self.bar is not None:
+            self.bar.close()
+        elapsed = time.perf_counter() - self.start
+        print(f"📊 {self.done} vídeos em {elapsed:.1f}s ({self.throughput:.2f} vídeos/s, {self.errors} erros)")
+
+
+def reusable_payload(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Otimização de IA guardada no índice de quase duplicados (None se não houve IA)"""
+    if 'error' in result or not result.get('ai_used'):
+        return None
+    return {
+        'title': result['original']['title'],
+        'optimized_title': result['optimized']['title'],
+        'suggestions': [suggestion.to_dict() for suggestion in result['analysis'].optimization_suggestions],
+        'ai_used': result['ai_used']
+    }
+
+
+class CatalogOptimizer:
+    """Motor paralelo: regras em ProcessPoolExecutor, IA assíncrona pelo LLMGateway"""
+
+    def __init__(self, content_optimizer: Optional[ContentOptimizer] = None, use_ai: bool = True,
+                 workers: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 chunksize: int = 16, batch_size: Optional[int] = None, show_progress: bool = True,
+                 job_budget: Optional[float] = None, dedup: Optional[bool] = None):
+        """
+        Args:
+            content_optimizer: Otimizador com IA configurada (criado sob demanda se use_ai)
+            use_ai: Se False, apenas pontuação por regras
+            workers: Processos para pontuação (padrão: AppConfig.CATALOG_WORKERS ou CPUs)
+            max_concurrency: Limite global de requisições (lotes) na etapa de IA (padrão: apenas os limites
+                             por provedor do gateway, AIConfig.PROVIDER_LIMITS)
+            chunksize: Vídeos por tarefa enviada ao pool de processos
+            batch_size: Vídeos por requisição de IA (padrão: AIConfig.PROMPT_BATCH_SIZE; 1 = individual)
+            show_progress: Exibe progresso e vazão
+            job_budget: Orçamento de IA da execução em USD (padrão: AIConfig.JOB_BUDGET_USD; 0 = sem limite)
+            dedup: Reaproveita a otimização de vídeos quase idênticos (padrão: AppConfig.NEAR_DUPLICATE_ENABLED)
+        """
+        self.use_ai = use_ai
+        self.content_optimizer = content_optimizer or (ContentOptimizer() if use_ai else None)
+        self.workers = workers or AppConfig.CATALOG_WORKERS or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency
+        self.chunksize = max(1, chunksize)
+        self.batch_size = max(1, batch_size or AIConfig.PROMPT_BATCH_SIZE)
+        self.show_progress = show_progress
+        self.job_budget = job_budget
+        dedup = AppConfig.NEAR_DUPLICATE_ENABLED if dedup is None else dedup
+        self.dedup_index = NearDuplicateIndex.load() if dedup and use_ai else None
+        self.reused = 0
+
+    async def stream(self, videos: List[Dict[str, Any]]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Processa o catálogo e entrega os resultados na ordem de entrada
+
+        Args:
+            videos: Lista de dicts com video_id, title, description e tags
+
+        Yields:
+            Tuple (índice, resultado) - resultado contém 'error' em caso de falha
+        """
+        loop = asyncio.get_running_loop()
+        ledger = self.content_optimizer.ai_optimizer.ledger if self.use_ai else None
+        if ledger is not None:
+            # O orçamento por execução conta a partir daqui; acima dele o catálogo segue só com regras
+            logger.info(f"Execução de IA {ledger.start_job('catalog', self.job_budget)}")
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        progress = ProgressDisplay(len(videos)) if self.show_progress else None
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            chunks = [
+                loop.run_in_executor(pool, score_videos, videos[i:i + self.chunksize])
+                for i in range(0, len(videos), self.chunksize)
+            ]
+
+            async def scored_at(index: int) -> Union[ContentAnalysis, Dict[str, Any]]:
+                analyses = await chunks[index // self.chunksize]
+                return analyses[index % self.chunksize]
+
+            async def analysis_at(index: int) -> ContentAnalysis:
+                analysis = await scored_at(index)
+                if isinstance(analysis, dict):
+                    raise ValueError(analysis['error'])
+                return analysis
+
+            # Quase duplicados (do índice salvo ou de um vídeo anterior da mesma execução) não vão à IA
+            signatures, reuse, leaders = self._plan_reuse(videos)
+
+            async def optimize_batch(start: int) -> List[Dict[str, Any]]:
+                scored = [await scored_at(i) for i in leaders[start:start + self.batch_size]]
+                # Vídeos que falharam na pontuação ficam fora do lote e levam o próprio erro
+                indices = [i for i, analysis in zip(leaders[start:], scored) if not isinstance(analysis, dict)]
+                analyses = [analysis for analysis in scored if not isinstance(analysis, dict)]
+
+                if not self.use_ai:
+                    results = [ContentOptimizer.build_result(analysis) for analysis in analyses]
+                elif not analyses:
+                    results = []
+                else:
+                    # Vazão limitada pela concorrência e tokens/minuto de cada provedor
+                    if semaphore is None:
+                        results = await self.content_optimizer.optimize_batch_async(analyses)
+                    else:
+                        async with semaphore:
+                            results = await self.content_optimizer.optimize_batch_async(analyses)
+
+                if self.dedup_index is not None:
+                    for index, result in zip(indices, results):
+                        payload = reusable_payload(result)
+                        if payload:
+                            self.dedup_index.add(self._video_key(videos[index]), signatures[index], payload)
+
+                results = iter(results)
+                return [analysis if isinstance(analysis, dict) else next(results) for analysis in scored]
+
+            batches = [
+                asyncio.create_task(optimize_batch(start))
+                for start in range(0, len(leaders), self.batch_size)
+            ]
+            leader_position = {index: position for position, index in enumerate(leaders)}
+
+            async def process(index: int) -> Dict[str, Any]:
+                if index in leader_position:
+                    position = leader_position[index]
+                    results = await batches[position // self.batch_size]
+                    return results[position % self.batch_size]
+
+                source, similarity = reuse[index]
+                if isinstance(source, int):
+                    # Quase duplicado de um vídeo anterior desta execução: aguarda a otimização dele
+                    payload = reusable_payload(await process(source))
+                    if payload is None:
+                        return ContentOptimizer.build_result(await analysis_at(index))
+                    source = payload
+                self.reused += 1
+                return self.reuse_result(await analysis_at(index), source, similarity)
+
+            tasks = [asyncio.create_task(process(i)) for i in range(len(videos))]
+
+            try:
+                # Aguarda na ordem de entrada; as demais tarefas seguem em paralelo
+                for index, task in enumerate(tasks):
+                    try:
+                        result = await task
+                    except Exception as e:
+                        logger.error(f"Erro ao otimizar vídeo {index + 1}: {e}")
+                        result = {'error': str(e)}
+
+                    if progress:
+                        progress.update(error='error' in result)
+                    yield index, result
+            finally:
+                for task in tasks + batches:
+                    task.cancel()
+                if progress:
+                    progress.close()
+                if self.dedup_index is not None:
+                    self.dedup_index.save()
+                self._report_cache()
+
+    @staticmethod
+    def _video_key(video: Dict[str, Any]) -> str:
+        """
+        Chave do vídeo no índice de quase duplicados
+
+        Sem ID real do YouTube (ex.: 'f5_video_012', gerado pela posição no CSV), a chave é uma
+        impressão digital de título + descrição, estável entre exportações reordenadas.
+        """
+        video_id = str(video.get('video_id') or '')
+        if YOUTUBE_VIDEO_ID.match(video_id):
+            return video_id
+        content = normalize_text(video.get('title', '')) + '\n' + normalize_text(video.get('description', ''))
+        return 'fp_' + hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+    def _plan_reuse(self, videos: List[Dict[str, Any]]) -> Tuple[List[Any], Dict[int, Tuple[Any, float]], List[int]]:
+        """
+        Separa os vídeos que precisam de IA dos que reaproveitam uma otimização
+
+        Returns:
+            Tuple (assinaturas, reuso, líderes): reuso mapeia índice -> (payload salvo ou índice
+            do vídeo líder desta execução, similaridade); líderes são os índices enviados à IA
+        """
+        if self.dedup_index is None:
+            return [None] * len(videos), {}, list(range(len(videos)))
+
+        signatures, reuse, leaders = [], {}, []
+        run_index = NearDuplicateIndex(self.dedup_index.threshold)
+        for index, video in enumerate(videos):
+            signature = self.dedup_index.signature(video_text(video))
+            signatures.append(signature)
+
+            stored = self.dedup_index.best_match(signature)
+            in_run = run_index.best_match(signature, with_payload=False)
+            if stored and (not in_run or stored[1] >= in_run[1]):
+                reuse[index] = (stored[2], stored[1])
+            elif in_run:
+                reuse[index] = (int(in_run[0]), in_run[1])
+            else:
+                leaders.append(index)
+                run_index.add(str(index), signature)
+
+        if reuse:
+            logger.info(f"{len(reuse)}/{len(videos)} vídeos quase duplicados reaproveitam otimizações")
+        return signatures, reuse, leaders
+
+    def reuse_result(self, analysis: ContentAnalysis, payload: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+        """
+        Adapta a otimização de um quase duplicado ao vídeo atual
+
+        As sugestões valem para os dois vídeos; o título otimizado só é reaproveitado quando
+        os títulos originais também são quase iguais (cortes diferentes pedem títulos diferentes).
+        """
+        analysis.optimization_suggestions = [
+            OptimizationSuggestion.from_dict(item) for item in payload['suggestions']
+        ]
+        same_title = jaccard(shingles(analysis.title), shingles(payload['title'])) >= self.dedup_index.threshold
+        result = ContentOptimizer.build_result(
+            analysis, payload['optimized_title'] if same_title else None, payload['ai_used']
+        )
+        result['reused_similarity'] = round(similarity, 3)
+        return result
+
+    def _report_cache(self):
+        """Exibe a taxa de acerto do cache, as chamadas por provedor e o custo da execução"""
+        if not self.use_ai or not self.show_progress:
+            return
+        if self.reused:
+            print(f"🔁 Quase duplicados: {self.reused} vídeos reaproveitaram otimizações (sem chamada de IA)")
+        ai_optimizer = self.content_optimizer.ai_optimizer
+        stats = ai_optimizer.cache_stats()
+        if stats and stats['hits'] + stats['misses']:
+            print(f"🎯 Cache de IA: {stats['hits']} acertos / {stats['misses']} chamadas "
+                  f"({stats['hit_rate']:.0%} de acerto)")
+        gateway_stats = ai_optimizer.gateway.stats()
+        for provider, calls in gateway_stats['calls'].items():
+            failures = gateway_stats['failures'][provider]
+            if calls or failures:
+                print(f"🤖 {provider}: {calls} chamadas, {failures} falhas")
+        if 'cost' in gateway_stats:
+            print(f"💰 Custo de IA: US$ {gateway_stats['cost']['job']:.4f} nesta execução, "
+                  f"US$ {gateway_stats['cost']['day']:.4f} hoje")
+
+    def run(self, videos: List[Dict[str, Any]],
+            on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Executa o processamento completo de forma síncrona
+
+        Args:
+            videos: Lista de vídeos
+            on_result: Callback chamado para cada resultado, na ordem de entrada
+
+        Returns:
+            Lista de resultados na ordem de entrada
+        """
+        async def collect():
+            results = []
+            async for index, result in self.stream(videos):
+                if on_result:
+                    on_result(index, result)
+                results.append(result)
+            return results
+
+        return asyncio.run(collect())
+
+
+def optimize_catalog(videos: List[Dict[str, Any]], use_ai: bool = True, **kwargs) -> List[Dict[str, Any]]:
+    """Função de conveniência para otimizar um catálogo em paralelo"""
+    return CatalogOptimizer(use_ai=use_ai, **kwargs).run(videos)
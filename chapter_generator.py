@@ -0,0 +1,285 @@
+"""
+Chapter Generator - Capítulos do YouTube a partir dos segmentos com timecode
+Desenvolvido para F5 Estratégia - Linhas "0:00 Título" para a descrição, inclusive em lives de várias horas
+
+Segmentação por coesão léxica (TextTiling): o texto falado vira uma sequência de tokens
+normalizados (sem stopwords), agrupados em pseudo-frases de tamanho fixo. Em cada fronteira entre
+pseudo-frases compara-se, por cosseno, o bloco de vocabulário anterior com o seguinte; vales
+profundos na curva de coesão indicam mudança de assunto. As somas dos blocos são um produto
+esparso por uma matriz de faixa (custo linear no número de tokens), e os picos em volta de cada
+vale vêm de máximos acumulados, sem subir a curva a partir de cada ponto.
+
+Uma fronteira vira capítulo se o vale passa do corte do TextTiling (média - desvio/2 das
+profundidades) e tem profundidade de ao menos a coesão mediana do vídeo (descarta a oscilação de
+um assunto só). Espaçamento mínimo e tamanho das pseudo-frases crescem com a duração: em lives
+longas os capítulos ficam proporcionalmente maiores e as comparações, menos ruidosas, com o
+mesmo número de pseudo-frases por bloco (custo ainda linear).
+
+As fronteiras mais profundas viram capítulos, respeitando o espaçamento; o título de cada um
+vem das palavras-chave do trecho (keyword_engine), com IDF calculado entre os próprios capítulos
+para destacar o que distingue cada trecho do resto do vídeo. Regras do YouTube: o primeiro
+capítulo começa em 0:00 e são necessários ao menos 3 capítulos de 10 segundos ou mais.
+"""
+
+import bisect
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+# Somas de blocos esparsas (opcional - fallback denso com NumPy)
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from corpus_stats import text_tokens
+from f5_lexicon import LEXICON
+from keyword_engine import BackgroundCorpus, KeywordEngine
+from phrase_ranker import STOPWORD_KEYS
+from text_analysis import tokenize
+from transcript_parser import TranscriptSegment, format_timestamp, segments_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tokens (sem stopwords) por pseudo-frase (mínimo; cresce para que o bloco cubra metade do
+# espaçamento entre capítulos) e pseudo-frases por bloco de comparação
+PSEUDO_SENTENCE_SIZE = 20
+BLOCK_SIZE = 6
+
+# Profundidade mínima de um vale, em múltiplos da coesão mediana do vídeo
+MIN_RELATIVE_DEPTH = 1.0
+
+# Regras do YouTube (mínimo de capítulos e duração) e limites editoriais; o espaçamento
+# também nunca fica abaixo de duração / MAX_CHAPTERS
+MIN_CHAPTERS = 3
+YOUTUBE_MIN_CHAPTER_SECONDS = 10
+MIN_CHAPTER_SECONDS = 60
+MAX_CHAPTERS = 20
+
+# Palavras-chave combinadas no título de cada capítulo
+TITLE_KEYWORDS = 2
+
+
+@dataclass
+class Chapter:
+    """Capítulo do vídeo: início/fim em segundos, título e palavras-chave do trecho"""
+    start: float
+    end: float
+    title: str
+    keywords: List[str] = field(default_factory=list)
+
+    @property
+    def timestamp(self) -> str:
+        return format_timestamp(self.start)
+
+    @property
+    def line(self) -> str:
+        """Linha da descrição no formato reconhecido pelo YouTube ('4:17 Funil de Vendas')"""
+        return f"{self.timestamp} {self.title}"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'start': self.start, 'end': self.end, 'timestamp': self.timestamp,
+                'title': self.title, 'keywords': self.keywords}
+
+
+def _token_stream(segments: List[TranscriptSegment]):
+    """Ids dos termos e segmento de origem de cada token de conteúdo, na ordem da fala"""
+    vocabulary: Dict[str, int] = {}
+    terms, owners = [], []
+    for index, segment in enumerate(segments):
+        for token in tokenize(segment.text):
+            if token in STOPWORD_KEYS or len(token) < 3:
+                continue
+            terms.append(vocabulary.setdefault(token, len(vocabulary)))
+            owners.append(index)
+    return np.array(terms, dtype=np.int64), np.array(owners, dtype=np.int64), len(vocabulary)
+
+
+def cohesion_curve(terms: np.ndarray, vocabulary_size: int, window: int = PSEUDO_SENTENCE_SIZE,
+                   block: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    Similaridade de cosseno entre os blocos antes e depois de cada fronteira de pseudo-frase
+
+    Returns:
+        Vetor com uma posição por fronteira (a fronteira i fica antes da pseudo-frase i + 1)
+    """
+    sentences = -(-len(terms) // window)
+    rows = np.arange(len(terms)) // window
+    gaps = np.arange(1, sentences)
+    if not len(gaps):
+        return np.zeros(0)
+
+    if SCIPY_AVAILABLE:
+        counts = sparse.csr_matrix((np.ones(len(terms)), (rows, terms)), shape=(sentences, vocabulary_size))
+        # Matrizes de faixa: linha g soma as pseudo-frases [g - block, g) ou [g, g + block)
+        offsets = np.arange(block)
+        left_columns = gaps[:, None] - 1 - offsets
+        right_columns = gaps[:, None] + offsets
+        band_rows = np.repeat(np.arange(len(gaps)), block).reshape(len(gaps), block)
+        left_valid = left_columns >= 0
+        right_valid = right_columns < sentences
+        shape = (len(gaps), sentences)
+        left = sparse.csr_matrix((np.ones(left_valid.sum()), (band_rows[left_valid], left_columns[left_valid])),
+                                 shape=shape) @ counts
+        right = sparse.csr_matrix((np.ones(right_valid.sum()), (band_rows[right_valid], right_columns[right_valid])),
+                                  shape=shape) @ counts
+        dot = np.asarray(left.multiply(right).sum(axis=1)).ravel()
+        left_norm = np.sqrt(np.asarray(left.multiply(left).sum(axis=1)).ravel())
+        right_norm = np.sqrt(np.asarray(right.multiply(right).sum(axis=1)).ravel())
+    else:
+        counts = np.zeros((sentences + 1, vocabulary_size))
+        np.add.at(counts, (rows + 1, terms), 1.0)
+        prefix = np.cumsum(counts, axis=0)
+        left = prefix[gaps] - prefix[np.maximum(gaps - block, 0)]
+        right = prefix[np.minimum(gaps + block, sentences)] - prefix[gaps]
+        dot = np.einsum('ij,ij->i', left, right)
+        left_norm = np.linalg.norm(left, axis=1)
+        right_norm = np.linalg.norm(right, axis=1)
+
+    norms = left_norm * right_norm
+    return np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+
+
+def depth_scores(cohesion: np.ndarray) -> np.ndarray:
+    """
+    Profundidade de cada fronteira: (pico à esquerda - coesão) + (pico à direita - coesão)
+
+    Calculada em toda fronteira, como no TextTiling; os picos são os máximos locais mais
+    próximos de cada lado, obtidos por acumulação (equivale a subir a curva a partir do ponto).
+    Numa encosta a profundidade é menor que no fundo do vale, que vence a disputa pelo espaçamento.
+    """
+    size = len(cohesion)
+    if size < 3:
+        return np.zeros(size)
+
+    # Suavização leve (média móvel de 3) para não cortar em oscilações isoladas
+    padded = np.pad(cohesion, 1, mode='edge')
+    smooth = (padded[:-2] + padded[1:-1] + padded[2:]) / 3
+
+    previous = np.concatenate(([-np.inf], smooth[:-1]))
+    following = np.concatenate((smooth[1:], [-np.inf]))
+    positions = np.arange(size)
+    peaks = (smooth >= previous) & (smooth >= following)
+    left_peak = np.maximum.accumulate(np.where(peaks, positions, 0))
+    right_peak = np.minimum.accumulate(np.where(peaks, positions, size - 1)[::-1])[::-1]
+
+    return (smooth[left_peak] - smooth) + (smooth[right_peak] - smooth)
+
+
+def _select_boundaries(depth: np.ndarray, min_depth: float, times: np.ndarray, duration: float,
+                       min_seconds: float, max_chapters: int) -> List[float]:
+    """Inícios de capítulo (segundos) das fronteiras mais profundas, respeitando a duração mínima"""
+    if not depth.any():
+        return []
+    # Corte do TextTiling (média - desvio/2 das profundidades) e profundidade mínima do vídeo
+    cutoff = max(depth.mean() - depth.std() / 2, min_depth)
+    candidates = np.flatnonzero(depth > cutoff)
+
+    chosen = [0.0, duration]
+    for index in candidates[np.argsort(-depth[candidates], kind='stable')]:
+        if len(chosen) - 1 >= max_chapters:
+            break
+        start = float(times[index])
+        position = bisect.bisect(chosen, start)
+        if start - chosen[position - 1] >= min_seconds and chosen[position] - start >= min_seconds:
+            chosen.insert(position, start)
+    return chosen[1:-1]
+
+
+def _title(keywords: List[str], previous: str) -> str:
+    """Título curto com as principais palavras-chave do trecho, sem repetir o capítulo anterior"""
+    picked: List[str] = []
+    used = set()
+    for keyword in keywords:
+        words = set(keyword.split())
+        if keyword == previous or words & used:
+            continue
+        picked.append(keyword)
+        used |= words
+        if len(picked) == TITLE_KEYWORDS:
+            break
+    text = ' e '.join(picked)
+    return ' '.join(word if word in LEXICON.connectors else word.capitalize() for word in text.split())
+
+
+def detect_chapters(segments: List[TranscriptSegment], min_seconds: float = MIN_CHAPTER_SECONDS,
+                    max_chapters: int = MAX_CHAPTERS) -> List[Chapter]:
+    """
+    Capítulos do vídeo a partir dos segmentos da transcrição
+
+    Args:
+        segments: Segmentos com timecode (transcript_parser)
+        min_seconds: Duração mínima de cada capítulo (nunca abaixo do mínimo do YouTube nem de
+            duração / max_chapters)
+        max_chapters: Limite de capítulos
+
+    Returns:
+        Chapter em ordem, o primeiro em 0:00; lista vazia se o texto não tem timecode ou
+        não rende o mínimo de capítulos exigido pelo YouTube
+    """
+    timed = [segment for segment in segments if segment.start is not None]
+    if not timed:
+        return []
+    duration = max(segment.end if segment.end is not None else segment.start for segment in timed)
+    min_seconds = max(min_seconds, YOUTUBE_MIN_CHAPTER_SECONDS, duration / max_chapters)
+
+    terms, owners, vocabulary_size = _token_stream(timed)
+    if not len(terms) or duration <= 0:
+        return []
+    # Pseudo-frases maiores em vídeos longos: cada bloco cobre ao menos metade do espaçamento
+    tokens_per_second = len(terms) / duration
+    window = max(PSEUDO_SENTENCE_SIZE, round(min_seconds / 2 * tokens_per_second / BLOCK_SIZE))
+    cohesion = cohesion_curve(terms, vocabulary_size, window=window)
+    depth = depth_scores(cohesion)
+    if not len(depth):
+        return []
+
+    # Cada fronteira começa no segmento do primeiro token da pseudo-frase seguinte
+    starts = np.array([segment.start for segment in timed])
+    gap_owners = owners[np.arange(1, len(depth) + 1) * window]
+    boundaries = _select_boundaries(depth, MIN_RELATIVE_DEPTH * float(np.median(cohesion)), starts[gap_owners],
+                                    duration, min_seconds, max_chapters)
+    if len(boundaries) + 1 < MIN_CHAPTERS:
+        return []
+
+    edges = [0.0] + boundaries + [duration]
+    first_segments = np.searchsorted(starts, edges[:-1], side='left')
+    last_segments = list(first_segments[1:]) + [len(timed)]
+    texts = [segments_text(timed[first:last]) for first, last in zip(first_segments, last_segments)]
+
+    # IDF entre os capítulos: o assunto do vídeo inteiro pesa menos que o de cada trecho
+    engine = KeywordEngine(background=BackgroundCorpus.from_documents(texts))
+    chapters: List[Chapter] = []
+    previous = ''
+    for number, (text, start, end) in enumerate(zip(texts, edges[:-1], edges[1:]), 1):
+        keywords = [keyword for keyword, _ in engine.extract(text_tokens(text), top_n=5)]
+        title = _title(keywords, previous) or f"Parte {number}"
+        chapters.append(Chapter(start, end, title, keywords))
+        previous = keywords[0] if keywords else ''
+    return chapters
+
+
+def chapter_lines(chapters: List[Chapter]) -> str:
+    """Bloco de capítulos para a descrição (uma linha por capítulo)"""
+    return '\n'.join(chapter.line for chapter in chapters)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from transcript_parser import parse_file
+
+    parser = argparse.ArgumentParser(description="Capítulos de uma transcrição com timecode - F5 Estratégia")
+    parser.add_argument('file', help='Arquivo de transcrição (.txt)')
+    parser.add_argument('--min-seconds', type=float, default=MIN_CHAPTER_SECONDS, help='Duração mínima do capítulo')
+    parser.add_argument('--max-chapters', type=int, default=MAX_CHAPTERS, help='Limite de capítulos')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    chapters = detect_chapters(list(parse_file(args.file)), args.min_seconds, args.max_chapters)
+    print(chapter_lines(chapters) or "Sem capítulos (transcrição sem timecode ou curta demais)")
+    print(f"\n⏱️ {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -116,6 +116,91 @@ class AIConfig:
     # Configurações de geração
     MAX_TOKENS = 4000
     TEMPERATURE = 0.7
+    # Sugestões estruturadas e lotes do catálogo: 0 = determinístico, reaproveitado pelo cache de respostas
+    STRUCTURED_TEMPERATURE = float(os.getenv('AI_STRUCTURED_TEMPERATURE', '0'))
+    
+    # Chamadas simultâneas de IA no processamento em lote
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('AI_MAX_CONCURRENT_REQUESTS', '4'))
+    
+    # Cadeia de fallback e limites por provedor (ver llm_gateway.py)
+    PROVIDER_ORDER = [p.strip() for p in os.getenv('AI_PROVIDER_ORDER', 'gemini,claude,openai').split(',') if p.strip()]
+    PROVIDER_LIMITS = {
+        'gemini': {
+            'max_concurrent': int(os.getenv('GEMINI_MAX_CONCURRENT', str(MAX_CONCURRENT_REQUESTS))),
+            'tokens_per_minute': int(os.getenv('GEMINI_TOKENS_PER_MINUTE', '1000000'))
+        },
+        'claude': {
+            'max_concurrent': int(os.getenv('CLAUDE_MAX_CONCURRENT', str(MAX_CONCURRENT_REQUESTS))),
+            'tokens_per_minute': int(os.getenv('CLAUDE_TOKENS_PER_MINUTE', '80000'))
+        },
+        'openai': {
+            'max_concurrent': int(os.getenv('OPENAI_MAX_CONCURRENT', str(MAX_CONCURRENT_REQUESTS))),
+            'tokens_per_minute': int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '150000'))
+        }
+    }
+    REQUEST_TIMEOUT = float(os.getenv('AI_REQUEST_TIMEOUT', '120'))
+    
+    # Validade do contexto F5 registrado no cache de contexto do provedor (Gemini CachedContent)
+    CONTEXT_CACHE_TTL_SECONDS = int(os.getenv('AI_CONTEXT_CACHE_TTL_SECONDS', '3600'))
+    
+    # Empacotamento de vários vídeos por requisição no processamento em lote (1 = desativado)
+    PROMPT_BATCH_SIZE = int(os.getenv('AI_PROMPT_BATCH_SIZE', '8'))
+    BATCH_TOKENS_PER_VIDEO = int(os.getenv('AI_BATCH_TOKENS_PER_VIDEO', '600'))
+    
+    # Tentativas de reparo quando a resposta JSON não segue o schema
+    JSON_REPAIR_ATTEMPTS = int(os.getenv('AI_JSON_REPAIR_ATTEMPTS', '1'))
+    
+    # Tokens de saída por tarefa (MAX_TOKENS fica para chamadas sem tarefa; 'batch' é por vídeo do lote)
+    TASK_MAX_OUTPUT_TOKENS = {
+        'suggestions': int(os.getenv('AI_SUGGESTIONS_MAX_TOKENS', '1200')),
+        'title': int(os.getenv('AI_TITLE_MAX_TOKENS', '60')),
+        'batch': BATCH_TOKENS_PER_VIDEO,
+        'stream': int(os.getenv('AI_STREAM_MAX_TOKENS', '1200'))
+    }
+    
+    # Modelos Gemini 2.5 raciocinam antes de responder e esses tokens contam em max_output_tokens:
+    # orçamento de raciocínio por modelo (prefixo do nome), somado ao limite de saída da tarefa.
+    # O 2.5 Pro não desliga o raciocínio (mínimo 128); o Flash aceita 0.
+    GEMINI_THINKING_BUDGETS = {
+        'gemini-2.5-pro': int(os.getenv('GEMINI_PRO_THINKING_BUDGET', '1024')),
+        'gemini-2.5-flash': int(os.getenv('GEMINI_FLASH_THINKING_BUDGET', '0'))
+    }
+    
+    # Preço por 1M de tokens em USD: (entrada, saída)
+    MODEL_PRICING = {
+        'gemini-2.5-pro': (1.25, 10.0),
+        'gemini-2.5-flash': (0.30, 2.50),
+        'claude-3-5-sonnet-20241022': (3.0, 15.0),
+        'claude-3-5-haiku-20241022': (0.80, 4.0),
+        'gpt-4-turbo-preview': (10.0, 30.0),
+        'gpt-4o-mini': (0.15, 0.60)
+    }
+    # Modelos sem preço cadastrado são contabilizados pelo preço mais alto (estimativa conservadora)
+    DEFAULT_PRICING = (10.0, 30.0)
+    # Fração do preço de entrada cobrada pelos tokens lidos do cache de contexto
+    CACHED_INPUT_PRICE_RATIO = {'gemini': 0.25, 'claude': 0.1, 'openai': 0.5}
+    
+    # Contabilização de uso e orçamento (ver llm_usage.py); 0 = sem limite
+    USAGE_TRACKING_ENABLED = os.getenv('AI_USAGE_TRACKING', 'True').lower() == 'true'
+    USAGE_PATH = os.getenv('AI_USAGE_PATH', os.path.join(os.getcwd(), 'data', 'llm_usage.sqlite3'))
+    DAILY_BUDGET_USD = float(os.getenv('AI_DAILY_BUDGET_USD', '0'))
+    JOB_BUDGET_USD = float(os.getenv('AI_JOB_BUDGET_USD', '0'))
+    # A partir desta fração do orçamento, as chamadas passam para os modelos econômicos
+    BUDGET_DOWNGRADE_RATIO = float(os.getenv('AI_BUDGET_DOWNGRADE_RATIO', '0.8'))
+    ECONOMY_MODELS = {
+        'gemini': os.getenv('GEMINI_ECONOMY_MODEL', 'gemini-2.5-flash'),
+        'claude': os.getenv('CLAUDE_ECONOMY_MODEL', 'claude-3-5-haiku-20241022'),
+        'openai': os.getenv('OPENAI_ECONOMY_MODEL', 'gpt-4o-mini')
+    }
+    
+    # Cache persistente de respostas (ver llm_cache.py)
+    CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'True').lower() == 'true'
+    CACHE_PATH = os.getenv('AI_CACHE_PATH', os.path.join(os.getcwd(), 'data', 'llm_cache.sqlite3'))
+    CACHE_TTL_SECONDS = int(os.getenv('AI_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))  # 30 dias
+    CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '50000'))
+    CACHE_MAX_MB = int(os.getenv('AI_CACHE_MAX_MB', '200'))
+    # Reaproveitar respostas geradas com temperatura > 0 (False = nova variação a cada chamada)
+    CACHE_REUSE_SAMPLED = os.getenv('AI_CACHE_REUSE_SAMPLED', 'False').lower() == 'true'
     
     # Prompts padrão para Gemini
     CONTENT_OPTIMIZATION_PROMPT = """
@@ -151,6 +236,9 @@ class AppConfig:
     DATA_COLLECTION_INTERVAL = int(os.getenv('DATA_COLLECTION_INTERVAL', '3600'))  # 1 hora
     MAX_VIDEOS_PER_REQUEST = int(os.getenv('MAX_VIDEOS_PER_REQUEST', '50'))
     
+    # Processos para pontuação por regras em lote (0 = número de CPUs)
+    CATALOG_WORKERS = int(os.getenv('CATALOG_WORKERS', '0'))
+    
     # Rate limiting para respeitar quotas do YouTube
     API_RATE_LIMIT = int(os.getenv('API_RATE_LIMIT', '100'))  # requests por minuto
     
@@ -160,6 +248,42 @@ class AppConfig:
     LOGS_DIR = os.path.join(os.getcwd(), 'logs')
     CREDENTIALS_DIR = os.path.join(os.getcwd(), 'credentials')
     
+    # Modelo de classificação de personas (treinado offline com persona_classifier.py)
+    PERSONA_MODEL_PATH = os.getenv('PERSONA_MODEL_PATH', os.path.join(DATA_DIR, 'persona_model.npy'))
+    
+    # Base de conhecimento da marca (JSONs usados no contexto fixo dos prompts - ver f5_context.py)
+    KNOWLEDGE_DIR = os.getenv('F5_KNOWLEDGE_DIR', os.path.join(os.getcwd(), 'Conhecimento f5'))
+    # Substitui tabelas do léxico (palavras-chave, temas, stopwords, templates) sem mudar código (ver f5_lexicon.py)
+    LEXICON_PATH = os.getenv('F5_LEXICON_PATH', os.path.join(KNOWLEDGE_DIR, 'lexico_seo.json'))
+    
+    # Reaproveitamento de otimizações entre vídeos quase idênticos (ver near_duplicates.py)
+    NEAR_DUPLICATE_ENABLED = os.getenv('NEAR_DUPLICATE_ENABLED', 'True').lower() == 'true'
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+    NEAR_DUPLICATE_INDEX_PATH = os.getenv('NEAR_DUPLICATE_INDEX_PATH', os.path.join(DATA_DIR, 'near_duplicates.npy'))
+    
+    # Biblioteca de conteúdos indexada para busca (ver content_index.py)
+    TRANSCRIPTIONS_DIR = os.getenv('F5_TRANSCRIPTIONS_DIR', os.path.join(os.getcwd(), 'Transcricoes de Videos'))
+    CATALOG_CSV = os.getenv('F5_CATALOG_CSV', os.path.join(os.getcwd(), 'banco_videos_f5.csv'))
+    SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH', os.path.join(DATA_DIR, 'content_index.npy'))
+    SEARCH_VECTOR_DIMS = int(os.getenv('SEARCH_VECTOR_DIMS', '1024'))
+    # A partir deste tamanho a busca usa IVF (aproximada) em vez de força bruta
+    SEARCH_ANN_MIN_DOCS = int(os.getenv('SEARCH_ANN_MIN_DOCS', '5000'))
+    SEARCH_ANN_NPROBE = int(os.getenv('SEARCH_ANN_NPROBE', '8'))
+    # Índice invertido BM25 para busca exata por palavra-chave (ver keyword_index.py)
+    KEYWORD_INDEX_PATH = os.getenv('KEYWORD_INDEX_PATH', os.path.join(DATA_DIR, 'keyword_index.pkl'))
+    # Frequência de documentos por termo em toda a biblioteca, para IDF (ver corpus_stats.py)
+    CORPUS_STATS_PATH = os.getenv('CORPUS_STATS_PATH', os.path.join(DATA_DIR, 'corpus_stats.npy'))
+    CORPUS_STATS_BUCKETS = int(os.getenv('CORPUS_STATS_BUCKETS', str(1 << 20)))
+
+    # Cache em disco dos estágios do pipeline F5 (análise e pesquisa de palavras-chave)
+    F5_PIPELINE_CACHE_ENABLED = os.getenv('F5_PIPELINE_CACHE_ENABLED', 'True').lower() == 'true'
+    F5_PIPELINE_CACHE_DIR = os.getenv('F5_PIPELINE_CACHE_DIR', os.path.join(DATA_DIR, 'f5_pipeline'))
+    F5_PIPELINE_CACHE_TTL_SECONDS = int(os.getenv('F5_PIPELINE_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))  # 7 dias
+
+    # Manifesto da regeneração incremental dos arquivos SEO (ver build_manifest.py)
+    BUILD_MANIFEST_ENABLED = os.getenv('BUILD_MANIFEST_ENABLED', 'True').lower() == 'true'
+    BUILD_MANIFEST_PATH = os.getenv('BUILD_MANIFEST_PATH', os.path.join(DATA_DIR, 'build_manifest.sqlite3'))
+    
     @classmethod
     def ensure_directories(cls):
         """Cria os diretórios necessários se não existirem"""
@@ -0,0 +1,508 @@
+"""
+Content Index - Índice vetorial local para busca semântica na biblioteca de conteúdos
+Desenvolvido para F5 Estratégia - Vídeos do canal, transcrições e pacotes SEO gerados
+
+Cada documento vira um vetor TF-IDF de dimensão fixa por feature hashing com sinal
+(unigramas e bigramas normalizados), sem vocabulário a manter. A busca é exata (produto
+matricial NumPy) em catálogos pequenos e aproximada por IVF (k-means + listas invertidas)
+a partir de AppConfig.SEARCH_ANN_MIN_DOCS. Vetores ficam em .npy (memory-mapped na leitura)
+e documentos/DF em .json; novos documentos entram sem reconstruir o índice.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+from config import AppConfig
+from text_analysis import TOKENIZER_VERSION, tokenize
+from transcript_parser import parse_file, segments_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Semente do hash de sinal (independente do hash de posição)
+SIGN_SEED = 0x5BD1E995
+
+# Arquivos gerados pelo sistema em cada pasta de vídeo (pacote SEO, não transcrição)
+GENERATED_FILES = ('titulo.txt', 'descricao.txt', 'tags.txt', 'metadados.txt')
+
+# Tipos de documento da biblioteca
+KIND_LABELS = {'video': 'Vídeo do canal', 'transcript': 'Transcrição', 'seo_package': 'Pacote SEO'}
+
+
+def hashed_features(text: str, dims: int) -> Dict[int, float]:
+    """
+    Frequências com sinal por posição hasheada (unigramas + bigramas)
+
+    O sinal aleatório faz as colisões se cancelarem em média em vez de se acumularem.
+    """
+    tokens = tokenize(text)
+    terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    features: Dict[int, float] = {}
+    for term in terms:
+        encoded = term.encode('utf-8')
+        position = zlib.crc32(encoded) % dims
+        sign = 1.0 if zlib.crc32(encoded, SIGN_SEED) & 1 else -1.0
+        features[position] = features.get(position, 0.0) + sign
+    return features
+
+
+def tf_vector(text: str, dims: int) -> np.ndarray:
+    """Vetor de frequência sublinear (1 + log tf, preservando o sinal do hash)"""
+    vector = np.zeros(dims, dtype=np.float32)
+    for position, value in hashed_features(text, dims).items():
+        if value:
+            vector[position] = np.sign(value) * (1.0 + np.log(abs(value)))
+    return vector
+
+
+def fingerprint(text: str) -> str:
+    """Identifica o conteúdo indexado (documento alterado = novo vetor)"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Centróides unitários por k-means sobre similaridade de cosseno (vetores já normalizados)"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for k in range(n_lists):
+            members = vectors[assignments == k]
+            if len(members):
+                centroids[k] = members.sum(axis=0)
+            else:
+                # Lista vazia: reinicia em um ponto aleatório
+                centroids[k] = vectors[rng.integers(len(vectors))]
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids /= np.where(norms > 0, norms, 1.0)
+    return centroids.astype(np.float32)
+
+
+class ContentIndex:
+    """Índice TF-IDF hasheado com busca exata ou IVF e atualização incremental"""
+
+    def __init__(self, dims: Optional[int] = None):
+        """
+        Args:
+            dims: Dimensão dos vetores (padrão: AppConfig.SEARCH_VECTOR_DIMS)
+        """
+        self.dims = dims or AppConfig.SEARCH_VECTOR_DIMS
+        self.docs: List[Dict[str, Any]] = []
+        self.active: List[bool] = []
+        self.df = np.zeros(self.dims, dtype=np.int64)
+        self._positions: Dict[str, int] = {}
+
+        # Vetores TF: bloco persistido (memory-mapped) + linhas adicionadas nesta sessão
+        self._stored = np.zeros((0, self.dims), dtype=np.float32)
+        self._pending: List[np.ndarray] = []
+        self._weighted: Optional[np.ndarray] = None
+
+        # IVF: centróides e lista de cada linha (-1 = ainda não atribuída)
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments: Optional[np.ndarray] = None
+        self._ivf_size = 0
+        # Linhas anteriores ao k-means; as posteriores são sempre comparadas (recém-adicionadas)
+        self._ivf_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def doc_ids(self) -> List[str]:
+        return list(self._positions)
+
+    def fingerprint_of(self, doc_id: str) -> Optional[str]:
+        """Fingerprint do conteúdo indexado (None se ausente)"""
+        position = self._positions.get(doc_id)
+        return self.docs[position].get('fingerprint') if position is not None else None
+
+    # ------------------------------------------------------------------ #
+    # Atualização
+    # ------------------------------------------------------------------ #
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Indexa ou atualiza um documento
+
+        Args:
+            doc_id: Identificador estável (caminho do arquivo, video_id...)
+            text: Texto completo indexado
+            metadata: Campos exibidos e filtráveis (title, kind, persona, performance_score...)
+
+        Returns:
+            False se o documento já estava indexado com o mesmo conteúdo
+        """
+        content_hash = fingerprint(text)
+        if doc_id in self._positions:
+            if self.fingerprint_of(doc_id) == content_hash:
+                return False
+            self.remove(doc_id)
+
+        vector = tf_vector(text, self.dims)
+        self.df += vector != 0
+        self.docs.append({**(metadata or {}), 'id': doc_id, 'fingerprint': content_hash})
+        self.active.append(True)
+        self._positions[doc_id] = len(self.docs) - 1
+        self._pending.append(vector)
+        self._weighted = None
+        if self.assignments is not None:
+            self.assignments = np.append(self.assignments, -1).astype(np.int32)
+        return True
+
+    def remove(self, doc_id: str):
+        """Remove um documento (a linha é descartada na próxima gravação)"""
+        position = self._positions.pop(doc_id, None)
+        if position is None:
+            return
+        self.active[position] = False
+        self.df -= self._row(position) != 0
+        self._weighted = None
+
+    def _row(self, position: int) -> np.ndarray:
+        stored = len(self._stored)
+        return self._stored[position] if position < stored else self._pending[position - stored]
+
+    def _matrix(self) -> np.ndarray:
+        if self._pending:
+            self._stored = np.vstack([np.asarray(self._stored), np.stack(self._pending)])
+            self._pending = []
+        return self._stored
+
+    # ------------------------------------------------------------------ #
+    # Pesos e busca
+    # ------------------------------------------------------------------ #
+    def idf(self) -> np.ndarray:
+        """IDF suavizado por posição hasheada"""
+        n_docs = len(self._positions)
+        return (np.log((1 + n_docs) / (1 + self.df)) + 1).astype(np.float32)
+
+    def weighted_matrix(self) -> np.ndarray:
+        """Vetores TF-IDF normalizados (linhas removidas zeradas), recalculados só após mudanças"""
+        if self._weighted is None:
+            weighted = self._matrix() * self.idf()
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            weighted /= np.where(norms > 0, norms, 1.0)
+            weighted[~np.asarray(self.active, dtype=bool)] = 0.0
+            self._weighted = weighted
+            self._assign_pending()
+        return self._weighted
+
+    def query_vector(self, text: str) -> np.ndarray:
+        vector = tf_vector(text, self.dims) * self.idf()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10):
+        """Agrupa os documentos em ~sqrt(N) listas para a busca aproximada"""
+        weighted = self.weighted_matrix()
+        live = np.flatnonzero(self.active)
+        if len(live) < 2:
+            return
+        n_lists = n_lists or max(2, int(np.sqrt(len(live))))
+        # Treino em amostra: o custo do k-means não cresce com o catálogo inteiro
+        rng = np.random.default_rng(0)
+        sample = live if len(live) <= 20000 else rng.choice(live, size=20000, replace=False)
+        self.centroids = spherical_kmeans(weighted[sample], min(n_lists, len(sample)), iterations)
+        self.assignments = np.argmax(weighted @ self.centroids.T, axis=1).astype(np.int32)
+        self._ivf_size = len(live)
+        self._ivf_rows = len(self.docs)
+        logger.info(f"Índice IVF: {len(self.centroids)} listas para {len(live)} documentos")
+
+    def _assign_pending(self):
+        """Atribui à lista mais próxima os documentos adicionados após o k-means"""
+        if self.centroids is None:
+            return
+        pending = np.flatnonzero(self.assignments < 0)
+        if len(pending):
+            self.assignments[pending] = np.argmax(self._weighted[pending] @ self.centroids.T, axis=1)
+
+    def maybe_rebuild_ivf(self):
+        """Cria o IVF ao atingir SEARCH_ANN_MIN_DOCS e o refaz quando o catálogo dobra"""
+        n_docs = len(self._positions)
+        if n_docs >= AppConfig.SEARCH_ANN_MIN_DOCS and (self.centroids is None or n_docs > 2 * self._ivf_size):
+            self.build_ivf()
+
+    def search(self, query: str, k: int = 10, filters: Optional[Dict[str, Any]] = None,
+               nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Documentos mais similares à consulta
+
+        Args:
+            query: Texto livre
+            k: Número de resultados
+            filters: kind, persona, category (igualdade), min_score (performance_score mínimo)
+                     e since (data ISO mínima)
+            nprobe: Listas IVF visitadas (padrão: AppConfig.SEARCH_ANN_NPROBE)
+
+        Returns:
+            Metadados dos documentos com 'relevance_score' (cosseno), do mais relevante ao menos
+        """
+        if not self._positions:
+            return []
+        weighted = self.weighted_matrix()
+        query_vector = self.query_vector(query)
+        if not query_vector.any():
+            return []
+
+        if self.centroids is not None:
+            nprobe = min(nprobe or AppConfig.SEARCH_ANN_NPROBE, len(self.centroids))
+            lists = np.argsort(self.centroids @ query_vector)[-nprobe:]
+            probed = np.isin(self.assignments, lists)
+            probed[self._ivf_rows:] = True
+            candidates = np.flatnonzero(probed)
+        else:
+            candidates = np.arange(len(weighted))
+
+        if filters:
+            candidates = np.array([i for i in candidates if self._matches(self.docs[i], filters)], dtype=np.int64)
+        if len(candidates) == 0:
+            return []
+
+        scores = weighted[candidates] @ query_vector
+        # Seleção parcial O(N) dos k melhores; só eles são ordenados
+        top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            if scores[i] <= 0:
+                break
+            doc = dict(self.docs[candidates[i]])
+            doc['relevance_score'] = round(float(scores[i]), 4)
+            results.append(doc)
+        return results
+
+    @staticmethod
+    def _matches(doc: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        for key in ('kind', 'persona', 'category'):
+            if key in filters and doc.get(key) != filters[key]:
+                return False
+        if 'min_score' in filters and (doc.get('performance_score') or 0) < filters['min_score']:
+            return False
+        if 'since' in filters and (doc.get('date') or '') < str(filters['since']):
+            return False
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _paths(path: str) -> Tuple[str, str, str]:
+        base = os.path.splitext(path)[0]
+        return path, base + '.json', base + '_ivf.npz'
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Grava vetores (.npy), documentos/DF (.json) e IVF (.npz), descartando linhas removidas"""
+        path = path or AppConfig.SEARCH_INDEX_PATH
+        vectors_path, metadata_path, ivf_path = self._paths(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self.maybe_rebuild_ivf()
+        self.weighted_matrix()
+        live = np.flatnonzero(self.active)
+        vectors = np.ascontiguousarray(self._matrix()[live], dtype=np.float32)
+        docs = [self.docs[i] for i in live]
+        assignments = self.assignments[live] if self.assignments is not None else None
+
+        # O arquivo atual pode estar memory-mapped: grava em temporário e substitui
+        temp_path = vectors_path + '.tmp.npy'
+        np.save(temp_path, vectors)
+        self._stored = vectors
+        os.replace(temp_path, vectors_path)
+
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'tokenizer': TOKENIZER_VERSION, 'dims': self.dims, 'docs': docs,
+                       'df': self.df.tolist(), 'ivf_size': self._ivf_size,
+                       'ivf_rows': int(np.sum(live < self._ivf_rows))}, f, ensure_ascii=False)
+        if self.centroids is not None:
+            np.savez(ivf_path, centroids=self.centroids, assignments=assignments)
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+
+        self._ivf_rows = int(np.sum(live < self._ivf_rows))
+        self.docs, self.active, self.assignments = docs, [True] * len(docs), assignments
+        self._positions = {doc['id']: i for i, doc in enumerate(docs)}
+        self._weighted = None
+        logger.info(f"Índice de conteúdo salvo em: {path} ({len(docs)} documentos)")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, mmap: bool = True) -> 'ContentIndex':
+        """Carrega o índice (vetores memory-mapped); sem arquivo ou versão incompatível, índice vazio"""
+        path = path or AppConfig.SEARCH_INDEX_PATH
+        vectors_path, metadata_path, ivf_path = cls._paths(path)
+        if not os.path.exists(vectors_path):
+            return cls()
+
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('version') != INDEX_VERSION:
+                raise ValueError(f"versão incompatível: {metadata.get('version')}")
+            if metadata.get('tokenizer') != TOKENIZER_VERSION:
+                raise ValueError(f"tokenização incompatível: {metadata.get('tokenizer')}")
+            vectors = np.load(vectors_path, mmap_mode='r' if mmap else None)
+        except Exception as e:
+            logger.warning(f"Índice de conteúdo ignorado ({e})")
+            return cls()
+
+        index = cls(metadata['dims'])
+        index.docs = metadata['docs']
+        index.active = [True] * len(index.docs)
+        index.df = np.array(metadata['df'], dtype=np.int64)
+        index._positions = {doc['id']: i for i, doc in enumerate(index.docs)}
+        index._stored = vectors
+        index._ivf_size = metadata.get('ivf_size', 0)
+        index._ivf_rows = metadata.get('ivf_rows', 0)
+        if os.path.exists(ivf_path):
+            ivf = np.load(ivf_path)
+            index.centroids, index.assignments = ivf['centroids'], ivf['assignments'].astype(np.int32)
+        return index
+
+
+# ---------------------------------------------------------------------- #
+# Biblioteca de conteúdos da F5
+# ---------------------------------------------------------------------- #
+def _modified_date(path: str) -> str:
+    return datetime.fromtimestamp(os.path.getmtime(path)).date().isoformat()
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ''
+
+
+def _read_transcript(path: str) -> str:
+    """Texto falado de uma transcrição, sem timecodes nem locutores"""
+    try:
+        return segments_text(parse_file(path))
+    except OSError:
+        return ''
+
+
+def iter_library_documents(transcriptions_dir: Optional[str] = None, catalog_csv: Optional[str] = None,
+                           include_generated: bool = True) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Documentos da biblioteca: transcrições, pacotes SEO gerados e vídeos do catálogo
+
+    Args:
+        include_generated: Inclui os pacotes SEO gerados (False para as estatísticas do corpus,
+                           que não podem depender da saída da execução anterior)
+
+    Yields:
+        Tuple (doc_id, texto, metadados) - metadados com kind, title, category, keywords e date
+    """
+    transcriptions_dir = transcriptions_dir or AppConfig.TRANSCRIPTIONS_DIR
+    if os.path.isdir(transcriptions_dir):
+        for root, _, files in os.walk(transcriptions_dir):
+            if os.path.samefile(root, transcriptions_dir):
+                # Raiz contém prompts e modelos, não vídeos
+                continue
+            folder = os.path.basename(root)
+            package = {name: _read(os.path.join(root, name)) for name in GENERATED_FILES if name in files}
+
+            for name in sorted(files):
+                if not name.endswith('.txt') or name in GENERATED_FILES:
+                    continue
+                path = os.path.join(root, name)
+                text = _read_transcript(path)
+                if text.strip():
+                    yield path, text, {'kind': 'transcript', 'title': package.get('titulo.txt', '').strip()
+                                       or os.path.splitext(name)[0], 'category': folder, 'path': path,
+                                       'date': _modified_date(path)}
+
+            if include_generated and (package.get('titulo.txt') or package.get('descricao.txt')):
+                text = '\n'.join(package.values())
+                tags = [tag.strip() for tag in package.get('tags.txt', '').split(',') if tag.strip()]
+                yield os.path.join(root, 'titulo.txt'), text, {
+                    'kind': 'seo_package', 'title': package.get('titulo.txt', '').strip() or folder,
+                    'category': folder, 'keywords': tags[:8], 'path': root,
+                    'date': _modified_date(os.path.join(root, 'titulo.txt' if 'titulo.txt' in package
+                                                        else 'descricao.txt'))
+                }
+
+    catalog_csv = catalog_csv or AppConfig.CATALOG_CSV
+    if os.path.exists(catalog_csv):
+        from batch_scoring import load_videos_csv
+        for video in load_videos_csv(catalog_csv):
+            text = ' '.join([video['title'], video['description'], ' '.join(video['tags'])])
+            yield f"video:{video['video_id']}", text, {
+                'kind': 'video', 'title': video['title'], 'keywords': video['tags'][:8],
+                'date': _modified_date(catalog_csv)
+            }
+
+
+def sync_library(index, transcriptions_dir: Optional[str] = None, catalog_csv: Optional[str] = None) -> int:
+    """
+    Atualiza o índice com a biblioteca: novos e alterados entram, removidos saem
+
+    Aceita qualquer índice com doc_ids, fingerprint_of, add e remove
+    (ContentIndex ou keyword_index.KeywordIndex).
+
+    Persona e score por regras são calculados apenas para documentos novos ou alterados.
+
+    Returns:
+        Número de documentos (re)indexados
+    """
+    from content_optimizer import RuleBasedAnalyzer
+    analyzer = None
+    seen, changed = set(), 0
+
+    for doc_id, text, metadata in iter_library_documents(transcriptions_dir, catalog_csv):
+        seen.add(doc_id)
+        if index.fingerprint_of(doc_id) == fingerprint(text):
+            continue
+
+        analyzer = analyzer or RuleBasedAnalyzer()
+        analysis = analyzer.analyze({'title': metadata['title'], 'description': text,
+                                     'tags': metadata.get('keywords', [])})
+        metadata.update({'persona': analysis.persona_target, 'performance_score': analysis.seo_score})
+        changed += index.add(doc_id, text, metadata)
+
+    for doc_id in [doc_id for doc_id in index.doc_ids() if doc_id not in seen]:
+        index.remove(doc_id)
+        changed += 1
+    return changed
+
+
+def load_library_index(path: Optional[str] = None) -> ContentIndex:
+    """Carrega o índice salvo, sincroniza com a biblioteca e grava se algo mudou"""
+    index = ContentIndex.load(path)
+    changed = sync_library(index)
+    if changed:
+        logger.info(f"Índice de conteúdo: {changed} documentos atualizados")
+        index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Busca na biblioteca de conteúdos - F5 Estratégia")
+    parser.add_argument('query', nargs='?', help='Consulta (sem consulta, apenas atualiza o índice)')
+    parser.add_argument('-k', type=int, default=10, help='Número de resultados')
+    parser.add_argument('--kind', choices=list(KIND_LABELS), help='Restringe o tipo de documento')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_library_index()
+    print(f"📚 {len(index)} documentos indexados ({time.perf_counter() - start:.2f}s)")
+
+    if args.query:
+        start = time.perf_counter()
+        results = index.search(args.query, args.k, {'kind': args.kind} if args.kind else None)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for result in results:
+            print(f"  {result['relevance_score']:.3f}  [{KIND_LABELS[result['kind']]}] {result['title'][:80]}")
+        print(f"🔎 {len(results)} resultados em {elapsed_ms:.1f} ms")
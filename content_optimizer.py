@@ -4,39 +4,139 @@ Desenvolvido para F5 Estratégia - Baseado na Metodologia CHAVI
 Usando Gemini (Google AI) como IA principal
 """
 
+import asyncio
 import logging
 import json
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from datetime import datetime
-from dataclasses import dataclass
-
-# Importações para IA - Gemini como principal
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-
-# Fallback para Claude/Anthropic
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-
-# Fallback para OpenAI
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from dataclasses import dataclass, asdict
 
 from config import F5Config, AIConfig, YouTubeConfig
+from text_analysis import AnalyzedText, normalize_text
+from persona_classifier import get_persona_classifier
+from llm_cache import LLMCache
+from llm_gateway import LLMGateway, PROVIDER_LABELS, estimate_tokens
+from llm_usage import UsageLedger, BudgetExceeded, BUDGET_SKIP
+from f5_context import get_f5_prefix
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Valores aceitos nas sugestões estruturadas
+SUGGESTION_PRIORITIES = ('alta', 'media', 'baixa')
+SUGGESTION_FIELDS = ('title', 'description', 'tags', 'thumbnail', 'content')
+
+# Schema JSON de uma sugestão (subconjunto aceito por Gemini, Claude e OpenAI)
+SUGGESTION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'pillar': {'type': 'string', 'enum': list(F5Config.CHAVI_PILLARS)},
+        'priority': {'type': 'string', 'enum': list(SUGGESTION_PRIORITIES)},
+        'field': {'type': 'string', 'enum': list(SUGGESTION_FIELDS)},
+        'proposed_text': {'type': 'string'}
+    },
+    'required': ['pillar', 'priority', 'field', 'proposed_text']
+}
+
+SUGGESTIONS_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'suggestions': {'type': 'array', 'items': SUGGESTION_SCHEMA}
+    },
+    'required': ['suggestions']
+}
+
+BATCH_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'videos': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'video_id': {'type': 'string'},
+                    'suggestions': {'type': 'array', 'items': SUGGESTION_SCHEMA},
+                    'optimized_title': {'type': 'string'}
+                },
+                'required': ['video_id', 'suggestions', 'optimized_title']
+            }
+        }
+    },
+    'required': ['videos']
+}
+
+@dataclass
+class OptimizationSuggestion:
+    """Sugestão de otimização estruturada"""
+    pillar: str          # Pilar CHAVI (C, H, A, V, I)
+    priority: str        # alta, media, baixa
+    field: str           # title, description, tags, thumbnail, content
+    proposed_text: str   # Texto proposto / ação recomendada
+    
+    def __str__(self) -> str:
+        pillar = F5Config.CHAVI_PILLARS.get(self.pillar, self.pillar)
+        return f"[{self.priority.upper()}] {pillar} ({self.field}): {self.proposed_text}"
+    
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> 'OptimizationSuggestion':
+        """
+        Valida um item contra SUGGESTION_SCHEMA
+        
+        Raises:
+            ValueError: Item fora do schema
+        """
+        if not isinstance(data, dict):
+            raise ValueError("sugestão deve ser um objeto")
+        
+        values = {}
+        for name in SUGGESTION_SCHEMA['required']:
+            value = data.get(name)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"campo '{name}' ausente ou vazio")
+            values[name] = value.strip()
+        
+        # Tolerância a variações de caixa/acentuação ('Média', 'c')
+        values['pillar'] = values['pillar'].upper()
+        values['priority'] = normalize_text(values['priority'])
+        values['field'] = values['field'].lower()
+        for name, allowed in (('pillar', tuple(F5Config.CHAVI_PILLARS)), ('priority', SUGGESTION_PRIORITIES),
+                              ('field', SUGGESTION_FIELDS)):
+            if values[name] not in allowed:
+                raise ValueError(f"valor inválido para '{name}': {values[name]}")
+        
+        return cls(**values)
+
+def parse_suggestion_list(items: Any) -> Tuple[List[OptimizationSuggestion], List[str]]:
+    """
+    Valida uma lista de sugestões
+    
+    Returns:
+        Tuple (sugestões válidas, erros encontrados)
+    """
+    if not isinstance(items, list):
+        return [], ["'suggestions' deve ser uma lista"]
+    
+    suggestions, errors = [], []
+    for i, item in enumerate(items):
+        try:
+            suggestions.append(OptimizationSuggestion.from_dict(item))
+        except ValueError as e:
+            errors.append(f"suggestions[{i}]: {e}")
+    if not suggestions and not errors:
+        errors.append("nenhuma sugestão retornada")
+    return suggestions, errors
+
+def load_json_payload(response_text: str) -> Any:
+    """Extrai o objeto JSON da resposta (tolera cercas de código e texto em volta)"""
+    start, end = response_text.find('{'), response_text.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("resposta sem objeto JSON")
+    return json.loads(response_text[start:end + 1])
+
 @dataclass
 class ContentAnalysis:
     """Estrutura para análise de conteúdo"""
@@ -47,7 +147,7 @@ class ContentAnalysis:
     persona_target: str
     chavi_score: Dict[str, float]
     seo_score: float
-    optimization_suggestions: List[str]
+    optimization_suggestions: List[OptimizationSuggestion]
     keyword_density: Dict[str, float]
     sentiment_analysis: str
     estimated_performance: str
@@ -100,7 +200,10 @@ class CHAVIAnalyzer:
         Returns:
             Dict com pontuação por pilar CHAVI
         """
-        content_text = f"{title} {description} {' '.join(tags)}".lower()
+        return self.analyze_chavi(AnalyzedText.from_fields(title, description, tags))
+    
+    def analyze_chavi(self, analyzed: AnalyzedText) -> Dict[str, float]:
+        """Analisa os pilares CHAVI a partir do contexto de texto já tokenizado"""
         scores = {}
         
         for pilar, criteria in self.evaluation_criteria.items():
@@ -108,10 +211,10 @@ class CHAVIAnalyzer:
             keyword_matches = 0
             
             for keyword in criteria['keywords']:
-                if keyword in content_text:
+                if analyzed.contains(keyword):
                     keyword_matches += 1
                     # Pontuação extra se estiver no título
-                    if keyword in title.lower():
+                    if analyzed.contains(keyword, 'title'):
                         score += 2
                     else:
                         score += 1
@@ -132,8 +235,26 @@ class CHAVIAnalyzer:
 class PersonaTargeting:
     """Sistema de direcionamento por persona"""
     
+    # Palavras-chave indicativas por persona
+    PERSONA_INDICATORS = {
+        'estrategico': [
+            'roi', 'kpi', 'métricas', 'escalabilidade', 'enterprise', 'corporativo',
+            'dashboard', 'business intelligence', 'previsibilidade', 'sustentável'
+        ],
+        'crescimento': [
+            'pme', 'pequena empresa', 'crescer', 'escalar', 'estruturar',
+            'funil', 'processo', 'organizacional', 'otimizar'
+        ],
+        'smart': [
+            'rápido', 'simples', 'prático', 'urgente', 'sobrevivência',
+            'início', 'começar', 'básico', 'essencial'
+        ]
+    }
+    
     def __init__(self):
         self.personas = F5Config.PERSONAS
+        # Modelo probabilístico carregado uma vez por processo (None = regras por palavras-chave)
+        self.classifier = get_persona_classifier()
     
     def identify_target_persona(self, title: str, description: str, tags: List[str]) -> Tuple[str, float]:
         """
@@ -147,33 +268,24 @@ class PersonaTargeting:
         Returns:
             Tuple com (persona_identificada, confiança)
         """
-        content_text = f"{title} {description} {' '.join(tags)}".lower()
+        return self.identify_persona(AnalyzedText.from_fields(title, description, tags))
+    
+    def identify_persona(self, analyzed: AnalyzedText) -> Tuple[str, float]:
+        """Identifica a persona alvo a partir do contexto de texto já tokenizado"""
+        if self.classifier is not None:
+            probs = self.classifier.predict_proba_tokens([analyzed.tokens])[0]
+            best = int(probs.argmax())
+            return self.classifier.labels[best], float(probs[best])
         
         persona_scores = {}
         
-        # Palavras-chave indicativas por persona
-        persona_indicators = {
-            'estrategico': [
-                'roi', 'kpi', 'métricas', 'escalabilidade', 'enterprise', 'corporativo',
-                'dashboard', 'business intelligence', 'previsibilidade', 'sustentável'
-            ],
-            'crescimento': [
-                'pme', 'pequena empresa', 'crescer', 'escalar', 'estruturar',
-                'funil', 'processo', 'organizacional', 'otimizar'
-            ],
-            'smart': [
-                'rápido', 'simples', 'prático', 'urgente', 'sobrevivência',
-                'início', 'começar', 'básico', 'essencial'
-            ]
-        }
-        
-        for persona, indicators in persona_indicators.items():
+        for persona, indicators in self.PERSONA_INDICATORS.items():
             score = 0
             for indicator in indicators:
-                if indicator in content_text:
+                if analyzed.contains(indicator):
                     score += 1
                     # Peso extra se estiver no título
-                    if indicator in title.lower():
+                    if analyzed.contains(indicator, 'title'):
                         score += 0.5
             
             # Normalizar por número de indicadores
@@ -189,6 +301,15 @@ class PersonaTargeting:
 class SEOAnalyzer:
     """Analisador de SEO específico para YouTube"""
     
+    # Elementos emocionais/clique no título
+    EMOTIONAL_WORDS = ['como', 'segredo', 'dicas', 'estratégia', 'resultado', 'aumento', 'melhores']
+    
+    # Call-to-action na descrição
+    CTA_WORDS = ['inscreva', 'curtir', 'comentar', 'compartilhar', 'link', 'acesse']
+    
+    # Timestamps na descrição
+    TIMESTAMP_PATTERN = re.compile(r'\d{1,2}:\d{2}')
+    
     def __init__(self):
         self.core_keywords = F5Config.CORE_KEYWORDS
     
@@ -204,11 +325,15 @@ class SEOAnalyzer:
         Returns:
             Dict com análise de SEO
         """
+        return self.analyze_seo(AnalyzedText.from_fields(title, description, tags))
+    
+    def analyze_seo(self, analyzed: AnalyzedText) -> Dict[str, Any]:
+        """Analisa aspectos de SEO a partir do contexto de texto já tokenizado"""
         analysis = {
-            'title_analysis': self._analyze_title(title),
-            'description_analysis': self._analyze_description(description),
-            'tags_analysis': self._analyze_tags(tags),
-            'keyword_density': self._calculate_keyword_density(title, description, tags),
+            'title_analysis': self._analyze_title(analyzed),
+            'description_analysis': self._analyze_description(analyzed),
+            'tags_analysis': self._analyze_tags(analyzed),
+            'keyword_density': self._calculate_keyword_density(analyzed),
             'overall_score': 0
         }
         
@@ -221,8 +346,9 @@ class SEOAnalyzer:
         
         return analysis
     
-    def _analyze_title(self, title: str) -> Dict[str, Any]:
+    def _analyze_title(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Analisa qualidade SEO do título"""
+        title = analyzed.title
         score = 0
         issues = []
         suggestions = []
@@ -238,10 +364,9 @@ class SEOAnalyzer:
             suggestions.append("Mantenha o título entre 60-70 caracteres")
         
         # Verificar palavras-chave principais
-        title_lower = title.lower()
         keyword_found = False
         for keyword in self.core_keywords:
-            if keyword in title_lower:
+            if analyzed.contains(keyword, 'title'):
                 score += 2
                 keyword_found = True
                 break
@@ -251,8 +376,7 @@ class SEOAnalyzer:
             suggestions.append(f"Inclua uma das palavras-chave: {', '.join(self.core_keywords[:3])}")
         
         # Verificar elementos emocionais/clique
-        emotional_words = ['como', 'segredo', 'dicas', 'estratégia', 'resultado', 'aumento', 'melhores']
-        if any(word in title_lower for word in emotional_words):
+        if any(analyzed.contains(word, 'title') for word in self.EMOTIONAL_WORDS):
             score += 1
         else:
             suggestions.append("Considere adicionar palavras que geram interesse como 'como', 'dicas', 'estratégia'")
@@ -264,8 +388,9 @@ class SEOAnalyzer:
             'length': len(title)
         }
     
-    def _analyze_description(self, description: str) -> Dict[str, Any]:
+    def _analyze_description(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Analisa qualidade SEO da descrição"""
+        description = analyzed.description
         score = 0
         issues = []
         suggestions = []
@@ -278,8 +403,7 @@ class SEOAnalyzer:
             suggestions.append("Descrição deve ter pelo menos 125 caracteres")
         
         # Verificar palavras-chave
-        desc_lower = description.lower()
-        keywords_found = sum(1 for keyword in self.core_keywords if keyword in desc_lower)
+        keywords_found = sum(1 for keyword in self.core_keywords if analyzed.contains(keyword, 'description'))
         
         if keywords_found >= 3:
             score += 3
@@ -290,14 +414,13 @@ class SEOAnalyzer:
             suggestions.append("Inclua mais palavras-chave relevantes na descrição")
         
         # Verificar call-to-action
-        cta_words = ['inscreva', 'curtir', 'comentar', 'compartilhar', 'link', 'acesse']
-        if any(word in desc_lower for word in cta_words):
+        if any(analyzed.contains(word, 'description') for word in self.CTA_WORDS):
             score += 1
         else:
             suggestions.append("Adicione call-to-action (inscreva-se, curtir, comentar)")
         
         # Verificar timestamps
-        if re.search(r'\d{1,2}:\d{2}', description):
+        if self.TIMESTAMP_PATTERN.search(description):
             score += 1
         else:
             suggestions.append("Considere adicionar timestamps para vídeos longos")
@@ -310,8 +433,9 @@ class SEOAnalyzer:
             'keywords_found': keywords_found
         }
     
-    def _analyze_tags(self, tags: List[str]) -> Dict[str, Any]:
+    def _analyze_tags(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Analisa qualidade das tags"""
+        tags = analyzed.tags
         score = 0
         issues = []
         suggestions = []
@@ -329,8 +453,7 @@ class SEOAnalyzer:
                 issues.append("Muitas tags podem diluir relevância")
         
         # Verificar palavras-chave nas tags
-        tags_text = ' '.join(tags).lower()
-        core_keywords_in_tags = sum(1 for keyword in self.core_keywords if keyword in tags_text)
+        core_keywords_in_tags = sum(1 for keyword in self.core_keywords if analyzed.contains(keyword, 'tags'))
         
         if core_keywords_in_tags >= 3:
             score += 3
@@ -340,13 +463,7 @@ class SEOAnalyzer:
             issues.append("Poucas palavras-chave principais nas tags")
         
         # Verificar variações de palavras-chave
-        variations_found = False
-        for tag in tags:
-            if any(keyword in tag.lower() for keyword in self.core_keywords):
-                variations_found = True
-                break
-        
-        if variations_found:
+        if core_keywords_in_tags > 0:
             score += 1
         
         return {
@@ -357,242 +474,423 @@ class SEOAnalyzer:
             'core_keywords_found': core_keywords_in_tags
         }
     
-    def _calculate_keyword_density(self, title: str, description: str, tags: List[str]) -> Dict[str, float]:
+    def _calculate_keyword_density(self, analyzed: AnalyzedText) -> Dict[str, float]:
         """Calcula densidade de palavras-chave"""
-        all_text = f"{title} {description} {' '.join(tags)}".lower()
-        word_count = len(all_text.split())
+        word_count = analyzed.word_count
         
         density = {}
         for keyword in self.core_keywords:
-            count = all_text.count(keyword.lower())
+            count = analyzed.count(keyword)
             density[keyword] = round((count / word_count) * 100, 2) if word_count > 0 else 0
         
         return density
 
 class GeminiContentOptimizer:
-    """Otimizador de conteúdo usando Gemini (Google AI)"""
+    """Otimizador de conteúdo usando Gemini (Google AI), com fallback para Claude e OpenAI"""
     
-    def __init__(self):
+    SUGGESTIONS_SYSTEM = "Você é um especialista em YouTube SEO e Growth Marketing da F5 Estratégia."
+    TITLE_SYSTEM = "Você é um especialista em títulos para YouTube da F5 Estratégia."
+    
+    # Instrução de formato das sugestões estruturadas (ver SUGGESTION_SCHEMA)
+    SUGGESTION_FORMAT = """Para cada sugestão informe:
+        - pillar: pilar CHAVI trabalhado (C, H, A, V ou I)
+        - priority: alta, media ou baixa
+        - field: onde aplicar (title, description, tags, thumbnail ou content)
+        - proposed_text: texto proposto ou ação concreta
+        Responda apenas com JSON: {"suggestions": [{"pillar": "...", "priority": "...", "field": "...", "proposed_text": "..."}]}"""
+    
+    def __init__(self, use_cache: Optional[bool] = None, reuse_sampled: Optional[bool] = None):
+        """
+        Args:
+            use_cache: Usa o cache persistente de respostas (padrão: AIConfig.CACHE_ENABLED)
+            reuse_sampled: Reaproveita respostas com temperatura > 0 (padrão: AIConfig.CACHE_REUSE_SAMPLED)
+        """
         self.ai_config = AIConfig()
         
-        # Inicializar Gemini se disponível
-        if GEMINI_AVAILABLE and self.ai_config.GEMINI_API_KEY:
-            genai.configure(api_key=self.ai_config.GEMINI_API_KEY)
-            self.gemini_model = genai.GenerativeModel(self.ai_config.GEMINI_MODEL)
-            self.use_gemini = True
-            logger.info("Gemini (Google AI) inicializado como IA principal")
-        
-        # Fallback para Claude se Gemini não estiver disponível
-        elif ANTHROPIC_AVAILABLE and self.ai_config.ANTHROPIC_API_KEY:
-            self.claude_client = anthropic.Anthropic(
-                api_key=self.ai_config.ANTHROPIC_API_KEY
-            )
-            self.use_gemini = False
-            self.use_claude = True
-            logger.info("Claude (Anthropic) configurado como fallback")
+        # Cache persistente de respostas
+        use_cache = self.ai_config.CACHE_ENABLED if use_cache is None else use_cache
+        reuse_sampled = self.ai_config.CACHE_REUSE_SAMPLED if reuse_sampled is None else reuse_sampled
+        self.cache = None
+        if use_cache:
+            try:
+                self.cache = LLMCache()
+            except Exception as e:
+                logger.warning(f"Cache de IA indisponível: {e}")
         
-        # Fallback para OpenAI se nem Gemini nem Claude estiverem disponíveis
-        elif OPENAI_AVAILABLE and self.ai_config.OPENAI_API_KEY:
-            openai.api_key = self.ai_config.OPENAI_API_KEY
-            self.use_gemini = False
-            self.use_claude = False
-            logger.info("OpenAI configurado como fallback")
+        # Registro de tokens/custo e orçamento diário e por execução
+        self.ledger = None
+        if self.ai_config.USAGE_TRACKING_ENABLED:
+            try:
+                self.ledger = UsageLedger()
+            except Exception as e:
+                logger.warning(f"Registro de uso de IA indisponível: {e}")
         
-        else:
+        # Cadeia de provedores (Gemini → Claude → OpenAI); erro se nenhum estiver configurado
+        try:
+            self.gateway = LLMGateway(cache=self.cache, reuse_sampled=reuse_sampled, ledger=self.ledger)
+        except ValueError:
             logger.error("Nenhuma API de IA configurada")
-            raise ValueError("Configure pelo menos uma API de IA (Gemini, Claude ou OpenAI)")
+            raise
+        
+        self.provider, self.model = self.gateway.primary.name, self.gateway.primary.model
+        
+        # Contexto fixo da marca: enviado como prefixo cacheado, os prompts levam só a parte do vídeo
+        self.f5_prefix = get_f5_prefix()
+        self.use_gemini = self.provider == 'gemini'
+        self.use_claude = self.provider == 'claude'
+        fallbacks = [p.name for p in self.gateway.providers[1:]]
+        logger.info(f"{PROVIDER_LABELS[self.provider]} inicializado como IA principal"
+                    + (f" (fallback: {', '.join(fallbacks)})" if fallbacks else ""))
+    
+    def task_max_tokens(self, task: str, items: int = 1) -> int:
+        """Limite de tokens de saída da tarefa (AIConfig.TASK_MAX_OUTPUT_TOKENS), por item para lotes"""
+        return self.ai_config.TASK_MAX_OUTPUT_TOKENS.get(task, self.ai_config.MAX_TOKENS) * max(1, items)
     
-    def generate_optimization_suggestions(self, content_analysis: ContentAnalysis) -> List[str]:
+    def ai_available(self) -> bool:
+        """False quando o orçamento de IA está esgotado (processamento segue só com regras)"""
+        return self.gateway.budget_mode() != BUDGET_SKIP
+    
+    async def _generate_async(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                              response_schema: Optional[Dict[str, Any]] = None, with_context: bool = True,
+                              feature: str = 'general') -> str:
+        """Gera texto pelo gateway (cache, limites por provedor, fallback, prefixo F5 cacheado e orçamento)"""
+        response = await self.gateway.generate(
+            prompt, system, max_tokens, temperature, response_schema,
+            prefix=self.f5_prefix if with_context else None, feature=feature
+        )
+        return response.text
+    
+    async def _repair_json_async(self, invalid_text: str, errors: List[str], schema: Dict[str, Any],
+                                 max_tokens: int, feature: str = 'general') -> str:
+        """Nova tentativa barata: só a resposta inválida e os erros, sem o contexto original"""
+        prompt = f"""
+        A resposta abaixo deveria seguir o schema JSON informado, mas é inválida.
+        Corrija-a mantendo o conteúdo e retorne apenas o JSON corrigido.
+        
+        ERROS: {'; '.join(errors[:10])}
+        
+        SCHEMA: {json.dumps(schema, ensure_ascii=False)}
+        
+        RESPOSTA INVÁLIDA:
+        {invalid_text[:6000]}
         """
-        Gera sugestões de otimização usando IA
+        # A correção tem o tamanho da resposta original (limitada ao teto da tarefa)
+        repair_tokens = min(max_tokens, int(estimate_tokens(invalid_text) * 1.25) + 50)
+        return await self._generate_async(prompt, system="", max_tokens=repair_tokens, temperature=0,
+                                          response_schema=schema, with_context=False, feature=f"{feature}_repair")
+    
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Estatísticas do cache de respostas (None se desativado)"""
+        return self.cache.stats() if self.cache else None
+    
+    def build_suggestions_prompt(self, content_analysis: ContentAnalysis, structured: bool = True) -> str:
+        """
+        Prompt de sugestões de otimização para uma análise por regras
+        
+        Args:
+            content_analysis: Análise por regras
+            structured: Pede JSON no formato SUGGESTIONS_RESPONSE_SCHEMA (False = lista legível, p/ streaming)
+        """
+        persona_info = F5Config.PERSONAS[content_analysis.persona_target]
+        
+        return f"""
+        Como especialista em YouTube SEO e metodologia CHAVI da F5 Estratégia, analise este conteúdo:
+        
+        TÍTULO: {content_analysis.title}
+        DESCRIÇÃO: {content_analysis.description[:500]}...
+        PERSONA ALVO: {persona_info['name']} ({persona_info['revenue']})
+        FOCO DA PERSONA: {', '.join(persona_info['focus'])}
+        
+        SCORES CHAVI:
+        {json.dumps(content_analysis.chavi_score, indent=2)}
+        
+        SCORE SEO: {content_analysis.seo_score}/10
+        
+        Forneça 5-7 sugestões ESPECÍFICAS e ACIONÁVEIS para otimizar este conteúdo, considerando:
+        1. Metodologia CHAVI (melhorar pilares com menor pontuação)
+        2. SEO para YouTube
+        3. Adequação à persona alvo
+        4. Tom de voz da F5 (Sábio + Herói: confiável, analítico, determinado)
+        
+        {self.SUGGESTION_FORMAT if structured else 'Formato: Lista numerada com sugestões diretas e específicas.'}
+        """
+    
+    @staticmethod
+    def validate_suggestions_response(response_text: str) -> Tuple[List[OptimizationSuggestion], List[str]]:
+        """Valida a resposta contra SUGGESTIONS_RESPONSE_SCHEMA; retorna (sugestões válidas, erros)"""
+        try:
+            payload = load_json_payload(response_text)
+        except ValueError as e:
+            return [], [f"JSON inválido: {e}"]
+        if not isinstance(payload, dict):
+            return [], ["a resposta deve ser um objeto com a chave 'suggestions'"]
+        return parse_suggestion_list(payload.get('suggestions'))
+    
+    def build_title_prompt(self, current_title: str, persona: str, keywords: List[str]) -> str:
+        """Prompt de título otimizado"""
+        persona_info = F5Config.PERSONAS[persona]
+        
+        return f"""
+        Crie um título otimizado para YouTube baseado nestas informações:
+        
+        TÍTULO ATUAL: {current_title}
+        PERSONA ALVO: {persona_info['name']} - {persona_info['revenue']}
+        FOCO: {', '.join(persona_info['focus'])}
+        PALAVRAS-CHAVE: {', '.join(keywords[:3])}
+        
+        CRITÉRIOS:
+        - 60-70 caracteres
+        - Incluir palavra-chave principal
+        - Gerar curiosidade/urgência
+        - Adequado à persona
+        - Tom profissional mas acessível
+        
+        Retorne apenas o título otimizado, sem explicações.
+        """
+    
+    async def _generate_structured_async(self, prompt: str, system: str, schema: Dict[str, Any],
+                                         max_tokens: int, temperature: float,
+                                         validate: Callable[[str], Tuple[Any, List[str]]],
+                                         feature: str = 'general') -> Tuple[Any, List[str]]:
+        """
+        Gera JSON no modo estruturado do provedor, valida e faz reparo se necessário
+        
+        Args:
+            schema: Schema JSON esperado
+            validate: Função texto -> (resultado, erros)
+            feature: Tarefa registrada no uso de IA
+        
+        Returns:
+            Tuple (resultado validado, erros restantes)
+        """
+        response_text = await self._generate_async(prompt, system, max_tokens, temperature,
+                                                   response_schema=schema, feature=feature)
+        result, errors = validate(response_text)
+        
+        for _ in range(self.ai_config.JSON_REPAIR_ATTEMPTS):
+            if not errors:
+                break
+            logger.warning(f"Resposta fora do schema ({len(errors)} erros) - tentando reparo")
+            repaired_text = await self._repair_json_async(response_text, errors, schema, max_tokens, feature)
+            repaired, repaired_errors = validate(repaired_text)
+            if len(repaired_errors) < len(errors):
+                response_text, result, errors = repaired_text, repaired, repaired_errors
+        
+        return result, errors
+    
+    async def generate_optimization_suggestions_async(self, content_analysis: ContentAnalysis) -> List[OptimizationSuggestion]:
+        """
+        Gera sugestões de otimização estruturadas usando IA
         
         Args:
             content_analysis: Análise completa do conteúdo
         
         Returns:
-            Lista de sugestões específicas
+            Lista de OptimizationSuggestion (vazia em caso de erro)
         """
         try:
-            persona_info = F5Config.PERSONAS[content_analysis.persona_target]
-            
-            prompt = f"""
-            Como especialista em YouTube SEO e metodologia CHAVI da F5 Estratégia, analise este conteúdo:
-            
-            TÍTULO: {content_analysis.title}
-            DESCRIÇÃO: {content_analysis.description[:500]}...
-            PERSONA ALVO: {persona_info['name']} ({persona_info['revenue']})
-            FOCO DA PERSONA: {', '.join(persona_info['focus'])}
-            
-            SCORES CHAVI:
-            {json.dumps(content_analysis.chavi_score, indent=2)}
-            
-            SCORE SEO: {content_analysis.seo_score}/10
-            
-            CONTEXTO F5 ESTRATÉGIA:
-            - Agência de marketing digital especializada
-            - Metodologia CHAVI (Campanha, Humanização, Anúncios, Vendas, Inteligência)
-            - Arquétipos de marca: Sábio + Herói (confiável, analítico, determinado)
-            - Foco em resultados mensuráveis e dados
-            
-            Forneça 5-7 sugestões ESPECÍFICAS e ACIONÁVEIS para otimizar este conteúdo, considerando:
-            1. Metodologia CHAVI (melhorar pilares com menor pontuação)
-            2. SEO para YouTube
-            3. Adequação à persona alvo
-            4. Tom de voz da F5 (Sábio + Herói: confiável, analítico, determinado)
-            
-            Formato: Lista numerada com sugestões diretas e específicas.
-            """
-            
-            if self.use_gemini:
-                # Usar Gemini
-                response = self.gemini_model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=self.ai_config.MAX_TOKENS,
-                        temperature=self.ai_config.TEMPERATURE,
-                    )
-                )
-                suggestions_text = response.text
-            elif hasattr(self, 'use_claude') and self.use_claude:
-                # Fallback para Claude
-                response = self.claude_client.messages.create(
-                    model=self.ai_config.CLAUDE_MODEL,
-                    max_tokens=self.ai_config.MAX_TOKENS,
-                    temperature=self.ai_config.TEMPERATURE,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
-                suggestions_text = response.content[0].text
-            else:
-                # Fallback para OpenAI
-                response = openai.chat.completions.create(
-                    model=self.ai_config.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": "Você é um especialista em YouTube SEO e Growth Marketing da F5 Estratégia."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=self.ai_config.MAX_TOKENS,
-                    temperature=self.ai_config.TEMPERATURE
-                )
-                suggestions_text = response.choices[0].message.content
-            
-            # Extrair sugestões numeradas
-            suggestions = []
-            for line in suggestions_text.split('\n'):
-                if re.match(r'^\d+\.', line.strip()):
-                    suggestions.append(line.strip())
-            
+            suggestions, errors = await self._generate_structured_async(
+                self.build_suggestions_prompt(content_analysis),
+                system=self.SUGGESTIONS_SYSTEM,
+                schema=SUGGESTIONS_RESPONSE_SCHEMA,
+                max_tokens=self.task_max_tokens('suggestions'),
+                temperature=self.ai_config.STRUCTURED_TEMPERATURE,
+                validate=self.validate_suggestions_response,
+                feature='suggestions'
+            )
+            if errors:
+                logger.warning(f"{len(errors)} sugestões descartadas por não seguirem o schema")
             return suggestions
             
+        except BudgetExceeded:
+            return []
         except Exception as e:
             logger.error(f"Erro ao gerar sugestões com IA: {e}")
-            return [
-                "Erro ao gerar sugestões automáticas",
-                "Verifique sua configuração de API de IA",
-                "Consulte os logs para mais detalhes"
-            ]
+            return []
     
-    def generate_optimized_title(self, current_title: str, persona: str, keywords: List[str]) -> str:
+    async def generate_optimized_title_async(self, current_title: str, persona: str, keywords: List[str]) -> str:
         """Gera sugestão de título otimizado"""
         try:
-            persona_info = F5Config.PERSONAS[persona]
-            
-            prompt = f"""
-            Crie um título otimizado para YouTube baseado nestas informações:
-            
-            TÍTULO ATUAL: {current_title}
-            PERSONA ALVO: {persona_info['name']} - {persona_info['revenue']}
-            FOCO: {', '.join(persona_info['focus'])}
-            PALAVRAS-CHAVE: {', '.join(keywords[:3])}
-            
-            CONTEXTO F5 ESTRATÉGIA:
-            - Agência de marketing digital
-            - Tom de voz: Confiável, analítico, determinado (Sábio + Herói)
-            - Metodologia CHAVI
-            
-            CRITÉRIOS:
-            - 60-70 caracteres
-            - Incluir palavra-chave principal
-            - Gerar curiosidade/urgência
-            - Adequado à persona
-            - Tom profissional mas acessível
-            
-            Retorne apenas o título otimizado, sem explicações.
-            """
-            
-            if self.use_gemini:
-                response = self.gemini_model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=100,
-                        temperature=0.8,
-                    )
-                )
-                return response.text.strip().replace('"', '')
-            elif hasattr(self, 'use_claude') and self.use_claude:
-                response = self.claude_client.messages.create(
-                    model=self.ai_config.CLAUDE_MODEL,
-                    max_tokens=100,
-                    temperature=0.8,
-                    messages=[{
-                        "role": "user", 
-                        "content": prompt
-                    }]
-                )
-                return response.content[0].text.strip().replace('"', '')
-            else:
-                response = openai.chat.completions.create(
-                    model=self.ai_config.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": "Você é um especialista em títulos para YouTube da F5 Estratégia."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=100,
-                    temperature=0.8
-                )
-                return response.choices[0].message.content.strip().replace('"', '')
+            title = await self._generate_async(
+                self.build_title_prompt(current_title, persona, keywords),
+                system=self.TITLE_SYSTEM,
+                max_tokens=self.task_max_tokens('title'),
+                temperature=0.8,
+                feature='title'
+            )
+            return title.strip().replace('"', '')
             
+        except BudgetExceeded:
+            return current_title
         except Exception as e:
             logger.error(f"Erro ao gerar título otimizado: {e}")
             return current_title
+    
+    @staticmethod
+    def batch_refs(analyses: List[ContentAnalysis]) -> List[str]:
+        """Identificadores únicos por vídeo no lote (video_id, ou posição se ausente/repetido)"""
+        refs, seen = [], set()
+        for i, analysis in enumerate(analyses):
+            ref = analysis.video_id or f"item_{i + 1}"
+            if ref in seen:
+                ref = f"{ref}_{i + 1}"
+            seen.add(ref)
+            refs.append(ref)
+        return refs
+    
+    def build_batch_prompt(self, analyses: List[ContentAnalysis], refs: List[str]) -> str:
+        """
+        Prompt com vários vídeos: contexto F5/CHAVI uma única vez, seguido de um bloco por vídeo
+        
+        Args:
+            analyses: Análises por regras dos vídeos do lote
+            refs: Identificador de cada vídeo (ver batch_refs)
+        
+        Returns:
+            Prompt pedindo um objeto JSON por vídeo
+        """
+        blocks = []
+        for ref, analysis in zip(refs, analyses):
+            persona_info = F5Config.PERSONAS[analysis.persona_target]
+            blocks.append(f"""
+        VIDEO_ID: {ref}
+        TÍTULO: {analysis.title}
+        DESCRIÇÃO: {analysis.description[:500]}...
+        PERSONA ALVO: {persona_info['name']} ({persona_info['revenue']}) - foco: {', '.join(persona_info['focus'])}
+        SCORES CHAVI: {json.dumps(analysis.chavi_score)}
+        SCORE SEO: {analysis.seo_score}/10
+        """)
+        
+        return f"""
+        Como especialista em YouTube SEO e metodologia CHAVI da F5 Estratégia, otimize cada vídeo abaixo.
+        
+        PARA CADA VÍDEO:
+        - 5-7 sugestões ESPECÍFICAS e ACIONÁVEIS (pilares CHAVI com menor pontuação, SEO para YouTube,
+          adequação à persona alvo, tom de voz Sábio + Herói)
+        - Um título otimizado: 60-70 caracteres, com a palavra-chave principal
+          ({', '.join(F5Config.CORE_KEYWORDS[:3])}), gerando curiosidade/urgência, tom profissional mas acessível
+        
+        {self.SUGGESTION_FORMAT}
+        
+        FORMATO DE RESPOSTA: JSON com um item por vídeo:
+        {{"videos": [{{"video_id": "...", "suggestions": [...], "optimized_title": "..."}}]}}
+        
+        VÍDEOS ({len(analyses)}):
+        {''.join(blocks)}
+        """
+    
+    @staticmethod
+    def parse_batch_response(response_text: str, refs: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Valida a resposta JSON de um lote contra BATCH_RESPONSE_SCHEMA
+        
+        Args:
+            response_text: Texto retornado pela IA
+            refs: Identificadores esperados
+        
+        Returns:
+            Tuple (video_id -> {'suggestions', 'optimized_title'} só com itens válidos,
+                   erros de estrutura geral - itens malformados não geram erro, são refeitos individualmente)
+        """
+        try:
+            payload = load_json_payload(response_text)
+        except ValueError as e:
+            return {}, [f"JSON inválido: {e}"]
+        
+        items = payload.get('videos') if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            return {}, ["a resposta deve ser um objeto com a lista 'videos'"]
+        
+        expected = set(refs)
+        valid = {}
+        for item in items:
+            if not isinstance(item, dict) or item.get('video_id') not in expected:
+                continue
+            title = item.get('optimized_title')
+            suggestions, errors = parse_suggestion_list(item.get('suggestions'))
+            if errors or not isinstance(title, str) or not title.strip():
+                continue
+            
+            valid[item['video_id']] = {
+                'suggestions': suggestions,
+                'optimized_title': title.strip().replace('"', '')
+            }
+        return valid, []
+    
+    async def generate_batch_async(self, analyses: List[ContentAnalysis]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Gera sugestões e título para vários vídeos em uma única requisição
+        
+        Args:
+            analyses: Análises por regras dos vídeos do lote
+        
+        Returns:
+            Lista na ordem de entrada; None para itens ausentes ou malformados na resposta
+        """
+        refs = self.batch_refs(analyses)
+        try:
+            parsed, _ = await self._generate_structured_async(
+                self.build_batch_prompt(analyses, refs),
+                system=self.SUGGESTIONS_SYSTEM,
+                schema=BATCH_RESPONSE_SCHEMA,
+                max_tokens=self.task_max_tokens('batch', len(analyses)),
+                temperature=self.ai_config.STRUCTURED_TEMPERATURE,
+                validate=lambda text: self.parse_batch_response(text, refs),
+                feature='batch'
+            )
+        except BudgetExceeded:
+            parsed = {}
+        except Exception as e:
+            logger.error(f"Erro ao gerar lote com IA: {e}")
+            parsed = {}
+        
+        return [parsed.get(ref) for ref in refs]
+    
+    def generate_optimization_suggestions(self, content_analysis: ContentAnalysis) -> List[OptimizationSuggestion]:
+        """Versão bloqueante de generate_optimization_suggestions_async"""
+        return asyncio.run(self.generate_optimization_suggestions_async(content_analysis))
+    
+    def generate_optimized_title(self, current_title: str, persona: str, keywords: List[str]) -> str:
+        """Versão bloqueante de generate_optimized_title_async"""
+        return asyncio.run(self.generate_optimized_title_async(current_title, persona, keywords))
 
-class ContentOptimizer:
-    """Classe principal do otimizador de conteúdo"""
+class RuleBasedAnalyzer:
+    """Análise por regras (CHAVI, persona e SEO) sem chamadas de IA"""
     
     def __init__(self):
         self.chavi_analyzer = CHAVIAnalyzer()
         self.persona_targeting = PersonaTargeting()
         self.seo_analyzer = SEOAnalyzer()
-        self.ai_optimizer = GeminiContentOptimizer()
     
-    def analyze_content(self, video_data: Dict[str, Any]) -> ContentAnalysis:
+    def analyze(self, video_data: Dict[str, Any]) -> ContentAnalysis:
         """
-        Análise completa de conteúdo
+        Análise de conteúdo baseada apenas em regras
         
         Args:
             video_data: Dados do vídeo (título, descrição, tags, etc.)
         
         Returns:
-            ContentAnalysis com análise completa
+            ContentAnalysis sem sugestões de IA
         """
         title = video_data.get('title', '')
         description = video_data.get('description', '')
         tags = video_data.get('tags', [])
         video_id = video_data.get('video_id', '')
         
+        # Contexto de texto construído uma única vez e compartilhado pelos analisadores
+        analyzed = AnalyzedText.from_fields(title, description, tags)
+        
         # Análise CHAVI
-        chavi_scores = self.chavi_analyzer.analyze_content_chavi(title, description, tags)
+        chavi_scores = self.chavi_analyzer.analyze_chavi(analyzed)
         
         # Identificação de persona
-        target_persona, persona_confidence = self.persona_targeting.identify_target_persona(title, description, tags)
+        target_persona, persona_confidence = self.persona_targeting.identify_persona(analyzed)
         
         # Análise SEO
-        seo_analysis = self.seo_analyzer.analyze_seo_score(title, description, tags)
+        seo_analysis = self.seo_analyzer.analyze_seo(analyzed)
         
         # Criar objeto de análise
-        content_analysis = ContentAnalysis(
+        return ContentAnalysis(
             video_id=video_id,
             title=title,
             description=description,
@@ -605,6 +903,28 @@ class ContentOptimizer:
             sentiment_analysis="Neutro",  # Placeholder - pode ser expandido
             estimated_performance="Médio"  # Placeholder - pode ser expandido
         )
+
+class ContentOptimizer:
+    """Classe principal do otimizador de conteúdo"""
+    
+    def __init__(self):
+        self.rule_analyzer = RuleBasedAnalyzer()
+        self.chavi_analyzer = self.rule_analyzer.chavi_analyzer
+        self.persona_targeting = self.rule_analyzer.persona_targeting
+        self.seo_analyzer = self.rule_analyzer.seo_analyzer
+        self.ai_optimizer = GeminiContentOptimizer()
+    
+    def analyze_content(self, video_data: Dict[str, Any]) -> ContentAnalysis:
+        """
+        Análise completa de conteúdo
+        
+        Args:
+            video_data: Dados do vídeo (título, descrição, tags, etc.)
+        
+        Returns:
+            ContentAnalysis com análise completa
+        """
+        content_analysis = self.rule_analyzer.analyze(video_data)
         
         # Gerar sugestões com IA
         ai_suggestions = self.ai_optimizer.generate_optimization_suggestions(content_analysis)
@@ -622,15 +942,78 @@ class ContentOptimizer:
         Returns:
             Dict com versão otimizada
         """
-        analysis = self.analyze_content(video_data)
+        return self.optimize_analysis(self.rule_analyzer.analyze(video_data))
+    
+    def optimize_analysis(self, analysis: ContentAnalysis) -> Dict[str, Any]:
+        """Versão bloqueante de optimize_analysis_async"""
+        return asyncio.run(self.optimize_analysis_async(analysis))
+    
+    async def optimize_analysis_async(self, analysis: ContentAnalysis) -> Dict[str, Any]:
+        """
+        Executa as etapas de IA (sugestões e título) sobre uma análise por regras já calculada
         
-        # Gerar título otimizado
-        optimized_title = self.ai_optimizer.generate_optimized_title(
-            analysis.title,
-            analysis.persona_target,
-            F5Config.CORE_KEYWORDS
+        Args:
+            analysis: Resultado de RuleBasedAnalyzer.analyze
+        
+        Returns:
+            Dict com versão otimizada (sem IA quando o orçamento está esgotado)
+        """
+        if not self.ai_optimizer.ai_available():
+            return self.build_result(analysis)
+        
+        # Sugestões e título são independentes: disparados em paralelo
+        suggestions, optimized_title = await asyncio.gather(
+            self.ai_optimizer.generate_optimization_suggestions_async(analysis),
+            self.ai_optimizer.generate_optimized_title_async(
+                analysis.title,
+                analysis.persona_target,
+                F5Config.CORE_KEYWORDS
+            )
         )
+        analysis.optimization_suggestions = suggestions
         
+        ai_used = PROVIDER_LABELS[self.ai_optimizer.provider]
+        return self.build_result(analysis, optimized_title, ai_used)
+    
+    async def optimize_batch_async(self, analyses: List[ContentAnalysis]) -> List[Dict[str, Any]]:
+        """
+        Otimiza vários vídeos com uma única requisição de IA (contexto compartilhado)
+        
+        Itens ausentes ou malformados na resposta são refeitos individualmente.
+        
+        Args:
+            analyses: Resultados de RuleBasedAnalyzer.analyze
+        
+        Returns:
+            Lista de resultados na ordem de entrada
+        """
+        if not self.ai_optimizer.ai_available():
+            return [self.build_result(analysis) for analysis in analyses]
+        if len(analyses) == 1:
+            return [await self.optimize_analysis_async(analyses[0])]
+        
+        batch = await self.ai_optimizer.generate_batch_async(analyses)
+        ai_used = PROVIDER_LABELS[self.ai_optimizer.provider]
+        
+        retries = [i for i, item in enumerate(batch) if item is None]
+        if retries:
+            logger.warning(f"{len(retries)}/{len(analyses)} itens do lote inválidos - refazendo individualmente")
+        retried = await asyncio.gather(*(self.optimize_analysis_async(analyses[i]) for i in retries))
+        retried = dict(zip(retries, retried))
+        
+        results = []
+        for i, (analysis, item) in enumerate(zip(analyses, batch)):
+            if item is None:
+                results.append(retried[i])
+                continue
+            analysis.optimization_suggestions = item['suggestions']
+            results.append(self.build_result(analysis, item['optimized_title'], ai_used))
+        return results
+    
+    @staticmethod
+    def build_result(analysis: ContentAnalysis, optimized_title: Optional[str] = None,
+                     ai_used: Optional[str] = None) -> Dict[str, Any]:
+        """Monta o dicionário de resultado de otimização (sem IA, o título original é mantido)"""
         return {
             'original': {
                 'title': analysis.title,
@@ -638,14 +1021,14 @@ class ContentOptimizer:
                 'tags': analysis.tags
             },
             'optimized': {
-                'title': optimized_title,
+                'title': optimized_title or analysis.title,
                 'description': analysis.description,  # Pode ser expandido
                 'tags': analysis.tags  # Pode ser expandido
             },
             'analysis': analysis,
             'persona_target': analysis.persona_target,
             'improvement_potential': 10 - analysis.seo_score,
-            'ai_used': 'Gemini (Google AI)' if self.ai_optimizer.use_gemini else ('Claude (Anthropic)' if hasattr(self.ai_optimizer, 'use_claude') and self.ai_optimizer.use_claude else 'OpenAI')
+            'ai_used': ai_used
         }
 
 def create_content_optimizer():
@@ -0,0 +1,264 @@
+"""
+Corpus Stats - Frequência de documentos dos termos em toda a biblioteca do canal
+Desenvolvido para F5 Estratégia - IDF em O(1) para os geradores de palavras-chave e tags
+
+Cada n-grama (1 a 3 palavras, mesma forma dos candidatos do keyword_engine) é mapeado por
+crc32 para uma posição de um vetor de contagens de tamanho fixo (vocabulário hasheado, sem
+dicionário de termos). O vetor fica em .npy, memory-mapped na leitura e compartilhado entre
+processos; o .json ao lado guarda a versão e o fingerprint de cada documento contado.
+
+Documentos novos são somados ao vetor (batch_processor ou --sync) sem reprocessar o restante; como as contagens de um
+documento não são guardadas separadamente, documentos alterados ou removidos disparam a
+reconstrução a partir da biblioteca. Colisões de hash só podem aumentar o df (IDF conservador).
+
+A época (epoch, no .json) só muda com --rebuild: é ela, e não o conteúdo do vetor, que o
+build_manifest trata como entrada dos arquivos gerados. Vídeos novos entram no IDF sem obrigar a
+regenerar a biblioteca inteira; --rebuild é o pedido explícito para isso.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import AppConfig
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 1
+
+# Maior n-grama contado (igual ao keyword_engine)
+MAX_NGRAM = 3
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def text_tokens(text: str) -> List[str]:
+    """Tokens em minúsculas (mesma forma de TranscriptionAnalyzer.clean_text().split())"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def iter_ngrams(tokens: List[str], max_n: int = MAX_NGRAM) -> Iterable[str]:
+    """Todos os n-gramas de 1 a max_n palavras, como texto ('funil de vendas')"""
+    total = len(tokens)
+    for position in range(total):
+        for size in range(1, min(max_n, total - position) + 1):
+            yield ' '.join(tokens[position:position + size])
+
+
+def term_bucket(term: str, buckets: int) -> int:
+    """Posição do termo no vetor de contagens (estável entre processos, ao contrário de hash())"""
+    return zlib.crc32(term.encode('utf-8')) % buckets
+
+
+class CorpusStats:
+    """Contagem de documentos por termo hasheado, persistida e atualizada incrementalmente"""
+
+    def __init__(self, buckets: Optional[int] = None):
+        """
+        Args:
+            buckets: Tamanho do vetor de contagens (padrão: AppConfig.CORPUS_STATS_BUCKETS)
+        """
+        self.buckets = buckets or AppConfig.CORPUS_STATS_BUCKETS
+        self.df = np.zeros(self.buckets, dtype=np.uint32)
+        self.documents: Dict[str, str] = {}
+        # Incrementada só na reconstrução explícita (ver rebuild_corpus_stats)
+        self.epoch = 0
+        self._log_total = 0.0
+
+    @property
+    def document_count(self) -> int:
+        return len(self.documents)
+
+    def doc_ids(self) -> List[str]:
+        return list(self.documents)
+
+    def fingerprint_of(self, doc_id: str) -> Optional[str]:
+        return self.documents.get(doc_id)
+
+    def add(self, doc_id: str, text: str) -> bool:
+        """
+        Soma os termos distintos de um documento novo
+
+        Returns:
+            False se o documento já foi contado (alterações exigem rebuild, ver sync_corpus_stats)
+        """
+        from content_index import fingerprint
+        if doc_id in self.documents:
+            return False
+
+        positions = np.unique(np.fromiter(
+            (term_bucket(term, self.buckets) for term in set(iter_ngrams(text_tokens(text)))),
+            dtype=np.int64
+        ))
+        if not self.df.flags.writeable:
+            # Vetor memory-mapped somente leitura: passa a trabalhar numa cópia em memória
+            self.df = np.array(self.df)
+        self.df[positions] += 1
+        self.documents[doc_id] = fingerprint(text)
+        self._log_total = 0.0
+        return True
+
+    def document_frequency(self, term: str) -> int:
+        """Documentos que contêm o termo (limite superior, por colisões)"""
+        return int(self.df[term_bucket(term, self.buckets)])
+
+    def idf(self, term: str) -> float:
+        """IDF suavizado: log((1 + N) / (1 + df)) + 1 (termo ausente = mais distintivo)"""
+        if not self._log_total:
+            self._log_total = math.log(1 + self.document_count)
+        return self._log_total - math.log(1 + int(self.df[term_bucket(term, self.buckets)])) + 1
+
+    def idf_many(self, terms: List[str]) -> np.ndarray:
+        """IDF de vários termos de uma vez"""
+        positions = np.fromiter((term_bucket(term, self.buckets) for term in terms), dtype=np.int64,
+                                count=len(terms))
+        return np.log((1 + self.document_count) / (1 + self.df[positions].astype(np.float64))) + 1
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _metadata_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '.json'
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Grava o vetor (.npy) e os documentos contados (.json)"""
+        path = path or AppConfig.CORPUS_STATS_PATH
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        # O arquivo atual pode estar memory-mapped: grava em temporário e substitui
+        temp_path = path + '.tmp.npy'
+        np.save(temp_path, self.df)
+        os.replace(temp_path, path)
+
+        metadata_path = self._metadata_path(path)
+        with open(metadata_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'version': STATS_VERSION, 'buckets': self.buckets, 'epoch': self.epoch,
+                       'documents': self.documents}, f, ensure_ascii=False)
+        os.replace(metadata_path + '.tmp', metadata_path)
+        logger.info(f"Estatísticas do corpus salvas em: {path} ({self.document_count} documentos)")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, mmap: bool = True) -> 'CorpusStats':
+        """Carrega o vetor (memory-mapped); sem arquivo ou versão incompatível, estatísticas vazias"""
+        path = path or AppConfig.CORPUS_STATS_PATH
+        if not os.path.exists(path):
+            return cls()
+
+        try:
+            with open(cls._metadata_path(path), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('version') != STATS_VERSION:
+                raise ValueError(f"versão incompatível: {metadata.get('version')}")
+            df = np.load(path, mmap_mode='r' if mmap else None)
+            if df.shape != (metadata['buckets'],):
+                raise ValueError(f"tamanho inesperado: {df.shape}")
+        except Exception as e:
+            logger.warning(f"Estatísticas do corpus ignoradas ({e})")
+            return cls()
+
+        stats = cls(metadata['buckets'])
+        stats.df = df
+        stats.documents = metadata['documents']
+        stats.epoch = metadata.get('epoch', 0)
+        return stats
+
+
+def corpus_epoch(path: Optional[str] = None) -> int:
+    """Época das estatísticas salvas (0 sem arquivo), lida só do .json"""
+    path = path or AppConfig.CORPUS_STATS_PATH
+    try:
+        with open(CorpusStats._metadata_path(path), 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('epoch', 0))
+    except (OSError, ValueError):
+        return 0
+
+
+def sync_corpus_stats(stats: CorpusStats, transcriptions_dir: Optional[str] = None,
+                      catalog_csv: Optional[str] = None) -> CorpusStats:
+    """
+    Atualiza as estatísticas com a biblioteca do canal (ver content_index.iter_library_documents)
+
+    Só transcrições e vídeos do catálogo são contados: os pacotes SEO gerados mudariam o IDF a cada
+    geração e as palavras-chave nunca se estabilizariam. Documentos novos são somados; se algum foi
+    alterado ou removido, as contagens são refeitas.
+
+    Returns:
+        As mesmas estatísticas (atualizadas) ou novas, se foi preciso reconstruir
+    """
+    from content_index import iter_library_documents, fingerprint
+
+    documents = list(iter_library_documents(transcriptions_dir, catalog_csv, include_generated=False))
+    current = {doc_id: fingerprint(text) for doc_id, text, _ in documents}
+    stale = [doc_id for doc_id, known in stats.documents.items() if current.get(doc_id) != known]
+
+    if stale:
+        logger.info(f"Estatísticas do corpus: {len(stale)} documentos alterados ou removidos, reconstruindo")
+        epoch = stats.epoch
+        stats = CorpusStats(stats.buckets)
+        stats.epoch = epoch
+
+    added = sum(stats.add(doc_id, text) for doc_id, text, _ in documents)
+    if added and not stale:
+        logger.info(f"Estatísticas do corpus: {added} documentos novos")
+    return stats
+
+
+def load_corpus_stats(path: Optional[str] = None, sync: bool = False) -> CorpusStats:
+    """
+    Estatísticas salvas (memory-mapped), sem reler a biblioteca
+
+    Sem sync a leitura nunca grava em disco: sem arquivo, as estatísticas ficam vazias (idf = 1
+    para todo termo). A sincronização fica com os pontos de entrada explícitos (batch_processor,
+    CLI --sync/--rebuild).
+
+    Args:
+        path: Arquivo .npy (padrão: AppConfig.CORPUS_STATS_PATH)
+        sync: Sincroniza com a biblioteca e grava se algo mudou
+    """
+    stats = CorpusStats.load(path)
+    if sync:
+        known = dict(stats.documents)
+        stats = sync_corpus_stats(stats)
+        if stats.documents != known:
+            stats.save(path)
+    return stats
+
+
+def rebuild_corpus_stats(path: Optional[str] = None) -> CorpusStats:
+    """Refaz as contagens do zero e inicia uma nova época (os arquivos gerados ficam desatualizados)"""
+    stats = sync_corpus_stats(CorpusStats())
+    stats.epoch = corpus_epoch(path) + 1
+    stats.save(path)
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Estatísticas de documentos da biblioteca - F5 Estratégia")
+    parser.add_argument('terms', nargs='*', help='Termos para consultar df/IDF')
+    parser.add_argument('--sync', action='store_true', help='Soma documentos novos da biblioteca')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Refaz as contagens do zero (nova época: as saídas serão regeneradas)')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        stats = rebuild_corpus_stats()
+    else:
+        stats = load_corpus_stats(sync=args.sync)
+
+    used = int(np.count_nonzero(stats.df))
+    print(f"📚 {stats.document_count} documentos, {used} de {stats.buckets} posições ocupadas "
+          f"({stats.df.nbytes / 1024 / 1024:.1f} MB)")
+    for term in args.terms:
+        term = ' '.join(text_tokens(term))
+        print(f"   {term}: df={stats.document_frequency(term)}, idf={stats.idf(term):.3f}")
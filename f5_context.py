@@ -0,0 +1,105 @@
+"""
+F5 Context - Bloco fixo de contexto da marca para prompts de IA
+Desenvolvido para F5 Estratégia - Montado uma vez a partir do config e da pasta "Conhecimento f5"
+
+O bloco é enviado como prefixo estável: o gateway o registra no cache de contexto do
+provedor (Gemini CachedContent, cache_control do Claude, prefixo automático do OpenAI)
+e cada chamada envia apenas a parte específica do vídeo.
+"""
+
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Any
+
+from config import F5Config, AppConfig
+from llm_gateway import PromptPrefix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seções da base de conhecimento incluídas no prefixo, por arquivo
+KNOWLEDGE_SECTIONS = {
+    'institucional.json': [
+        'historia_evolucao', 'missao', 'visao', 'valores', 'posicionamento', 'servicos', 'diferenciais',
+        'metodologia_chavi_intro', 'chavi_campanha', 'chavi_humanizacao', 'chavi_anuncios',
+        'chavi_vendas', 'chavi_inteligencia'
+    ],
+    'branding.json': [
+        'golden_circle_por_que', 'golden_circle_como', 'golden_circle_o_que',
+        'arquetipo_primario_sabio', 'arquetipo_secundario_heroi', 'combinacao_arquetipos',
+        'proposta_unica_valor', 'elementos_chave_puv', 'comunicacao_empresario_estrategico',
+        'comunicacao_empresario_crescimento', 'comunicacao_empresario_smart', 'tom_voz_marca',
+        'posicionamento_mercado'
+    ]
+}
+
+
+def load_knowledge_sections(knowledge_dir: str) -> List[Dict[str, Any]]:
+    """
+    Lê as seções selecionadas dos documentos JSON da base de conhecimento
+
+    Returns:
+        Lista de seções (title, content) na ordem de KNOWLEDGE_SECTIONS
+    """
+    sections = []
+    for file_name, section_ids in KNOWLEDGE_SECTIONS.items():
+        path = os.path.join(knowledge_dir, file_name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Base de conhecimento indisponível ({file_name}): {e}")
+            continue
+
+        by_id = {
+            section['section_id']: section
+            for document in data.get('documents', [])
+            for section in document.get('sections', [])
+        }
+        sections.extend(by_id[section_id] for section_id in section_ids if section_id in by_id)
+    return sections
+
+
+def build_f5_context_text(knowledge_dir: str = None) -> str:
+    """Monta o texto do contexto fixo (determinístico: mesma entrada, mesmo texto)"""
+    archetypes = F5Config.BRAND_ARCHETYPES
+    lines = [
+        "CONTEXTO F5 ESTRATÉGIA (referência fixa para todas as respostas)",
+        "",
+        "- Agência de marketing digital especializada em tráfego pago e vendas",
+        "- Metodologia CHAVI (" + ', '.join(F5Config.CHAVI_PILLARS.values()) + ")",
+        f"- Arquétipos de marca: {archetypes['primary']} + {archetypes['secondary']} "
+        f"({', '.join(archetypes['tone'])})",
+        "- Foco em resultados mensuráveis e dados",
+        "",
+        "PERSONAS:"
+    ]
+    for key, persona in F5Config.PERSONAS.items():
+        lines.append(f"- {key}: {persona['name']} ({persona['age_range']} anos, {persona['revenue']}) - "
+                     f"foco: {', '.join(persona['focus'])}")
+
+    lines += ["", "PALAVRAS-CHAVE PRINCIPAIS: " + ', '.join(F5Config.CORE_KEYWORDS)]
+
+    sections = load_knowledge_sections(knowledge_dir or AppConfig.KNOWLEDGE_DIR)
+    if sections:
+        lines += ["", "BASE DE CONHECIMENTO DA MARCA:"]
+        for section in sections:
+            lines += ["", f"## {section['title']}", section['content'].strip()]
+
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=None)
+def get_f5_prefix(knowledge_dir: str = None) -> PromptPrefix:
+    """Prefixo F5 montado e medido uma única vez por processo"""
+    prefix = PromptPrefix.from_text(build_f5_context_text(knowledge_dir))
+    logger.info(f"Contexto F5 montado: ~{prefix.tokens} tokens (id {prefix.digest[:12]})")
+    return prefix
+
+
+if __name__ == "__main__":
+    prefix = get_f5_prefix()
+    print(prefix.text)
+    print(f"\n📏 {len(prefix.text)} caracteres, ~{prefix.tokens} tokens, id {prefix.digest[:12]}")
@@ -0,0 +1,399 @@
+"""
+F5 Lexicon - Tabelas de palavras-chave, temas, stopwords e templates da F5 Estratégia
+Desenvolvido para F5 Estratégia - Registro imutável carregado uma vez por processo, com índices pré-calculados
+
+As tabelas ficam neste módulo e podem ser substituídas (tabela inteira, por chave) pelo arquivo
+opcional AppConfig.LEXICON_PATH ("Conhecimento f5/lexico_seo.json"), sem mudar código.
+
+O registro é montado na importação: os geradores apenas o consultam, e os processos do pool do
+batch_processor (fork) herdam tabelas e índices de n-gramas já prontos por copy-on-write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+from config import AppConfig
+from text_analysis import normalize_text, stem
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Palavras irrelevantes para SEO
+STOPWORDS = [
+    'a', 'o', 'e', 'é', 'de', 'do', 'da', 'em', 'um', 'uma', 'com', 'como', 'para',
+    'por', 'no', 'na', 'se', 'eu', 'ele', 'ela', 'nós', 'vocês', 'eles', 'elas',
+    'que', 'qual', 'quando', 'onde', 'porque', 'então', 'mas', 'ou', 'nem', 'já',
+    'ainda', 'só', 'também', 'muito', 'mais', 'menos', 'bem', 'mal', 'todo', 'toda',
+    'tudo', 'nada', 'algo', 'alguém', 'ninguém', 'sim', 'não', 'talvez', 'quem',
+    'isso', 'aquilo', 'este', 'esta', 'esse', 'essa', 'aquele', 'aquela', 'meu',
+    'minha', 'seu', 'sua', 'nosso', 'nossa', 'deles', 'delas', 'ter', 'ser', 'estar',
+    'fazer', 'vai', 'vou', 'foi', 'era', 'está', 'estou', 'tem', 'tinha', 'faz',
+    'fazia', 'pode', 'podia', 'quer', 'queria', 'sabe', 'sabia', 'vem', 'vinha',
+    'ali', 'aqui', 'lá', 'aí', 'cá', 'assim', 'agora', 'hoje', 'ontem', 'amanhã',
+    'antes', 'depois', 'sempre', 'nunca', 'às', 'vezes', 'pelo', 'pela', 'pelos',
+    'pelas', 'contra', 'sobre', 'sob', 'entre', 'até', 'desde', 'durante', 'através',
+    # Marcas da fala, frequentes em transcrições
+    'você', 'gente', 'coisa', 'coisas', 'vamos', 'quero', 'tiver', 'tipo', 'né', 'pra', 'pro',
+    'acho', 'olha', 'entendeu', 'tenho', 'temos', 'estão', 'muita', 'muitas', 'muitos', 'mesmo',
+    'mesma', 'outra', 'outro', 'outros', 'cada', 'dele', 'dela', 'esses', 'essas', 'estes', 'estas'
+]
+
+# Conectivos aceitos no meio de palavras-chave de 3 palavras ("funil de vendas")
+CONNECTORS = ['de', 'do', 'da', 'dos', 'das', 'em', 'no', 'na', 'nos', 'nas', 'e', 'para', 'com']
+
+# Palavras-chave relacionadas à F5 Estratégia por categoria (temas gerais)
+F5_KEYWORDS = {
+    'negocio': [
+        'empreendedorismo', 'empresário', 'negócio', 'empresa', 'gestão', 'liderança',
+        'estratégia', 'planejamento', 'crescimento', 'escalabilidade', 'inovação',
+        'produtividade', 'performance', 'resultados', 'metas', 'objetivos'
+    ],
+    'marketing': [
+        'marketing', 'digital', 'vendas', 'tráfego', 'leads', 'conversão', 'funil',
+        'campanhas', 'anúncios', 'publicidade', 'branding', 'marca', 'posicionamento',
+        'segmentação', 'audiência', 'cliente', 'público', 'mercado'
+    ],
+    'desenvolvimento': [
+        'autoconhecimento', 'autorresponsabilidade', 'desenvolvimento', 'pessoal',
+        'profissional', 'competências', 'habilidades', 'mindset', 'mentalidade',
+        'consciência', 'reflexão', 'aprendizado', 'evolução', 'transformação'
+    ],
+    'comunicacao': [
+        'comunicação', 'oratória', 'apresentação', 'discurso', 'storytelling',
+        'persuasão', 'influência', 'networking', 'relacionamento', 'conexão',
+        'diálogo', 'escuta', 'feedback', 'clareza', 'objetividade'
+    ],
+    'gestao': [
+        'equipe', 'time', 'colaborador', 'funcionário', 'talento', 'recrutamento',
+        'seleção', 'treinamento', 'capacitação', 'motivação', 'engajamento',
+        'cultura', 'organizacional', 'processo', 'sistemática', 'metodologia'
+    ]
+}
+
+# URLs das landing pages da F5 por categoria
+LANDING_PAGES = {
+    'negocio': 'https://f5estrategia.com/gestao-empresarial',
+    'marketing': 'https://f5estrategia.com/marketing-digital',
+    'desenvolvimento': 'https://f5estrategia.com/desenvolvimento-pessoal',
+    'comunicacao': 'https://f5estrategia.com/comunicacao-estrategica',
+    'gestao': 'https://f5estrategia.com/gestao-equipes',
+    'consultoria': 'https://f5estrategia.com/consultoria',
+    'treinamento': 'https://f5estrategia.com/treinamentos',
+    'contato': 'https://f5estrategia.com/contato'
+}
+
+# Templates de título por tema geral ({keyword}, {area}, {tempo})
+TITLE_TEMPLATES = {
+    'desenvolvimento': [
+        "Como Desenvolver {keyword} e Transformar sua {area} | F5 Estratégia",
+        "{keyword}: A Chave para o Sucesso {area} | Dicas Práticas F5",
+        "Desenvolva {keyword} em {tempo} e Mude sua {area} Para Sempre",
+        "{keyword} na Prática: Estratégias que Funcionam | F5 Estratégia"
+    ],
+    'negocio': [
+        "Como {keyword} Pode Revolucionar seu Negócio | F5 Estratégia",
+        "{keyword} para Empresários: Estratégias Comprovadas | F5",
+        "Aumente seus Resultados com {keyword} | Método F5 Estratégia",
+        "{keyword}: O Segredo dos Empresários de Sucesso | F5"
+    ],
+    'marketing': [
+        "{keyword} no Marketing Digital: Estratégias que Vendem | F5",
+        "Como Usar {keyword} para Gerar Mais Leads | F5 Estratégia",
+        "{keyword}: A Estratégia Secreta para Vender Mais | F5",
+        "Aumente suas Vendas com {keyword} | Método F5 Comprovado"
+    ],
+    'comunicacao': [
+        "Comunicação {keyword}: Como Influenciar e Persuadir | F5",
+        "{keyword} na Comunicação Empresarial | F5 Estratégia",
+        "Domine a Arte da {keyword} e Mude seus Resultados | F5",
+        "{keyword}: Comunicação que Gera Resultados | F5 Estratégia"
+    ],
+    'gestao': [
+        "Gestão {keyword}: Como Liderar Equipes de Alta Performance | F5",
+        "{keyword} para Gestores: Estratégias Eficazes | F5 Estratégia",
+        "Como Aplicar {keyword} na sua Gestão | Método F5",
+        "{keyword}: O Diferencial dos Líderes de Sucesso | F5"
+    ]
+}
+
+# Tags por tema geral
+THEME_TAGS = {
+    'desenvolvimento': ['autoconhecimento', 'crescimento-pessoal', 'soft-skills', 'mindset'],
+    'negocio': ['crescimento-empresarial', 'inovacao-negocios', 'escalabilidade', 'resultados'],
+    'marketing': ['trafego-pago', 'leads', 'conversao', 'vendas-digitais'],
+    'comunicacao': ['oratoria', 'apresentacao', 'persuasao', 'networking'],
+    'gestao': ['gestao-equipes', 'alta-performance', 'cultura-organizacional', 'processos']
+}
+
+# Temas específicos com templates otimizados (advanced_seo_generator)
+SPECIFIC_THEMES = {
+    'autorresponsabilidade': {
+        'keywords': [
+            'autorresponsabilidade', 'autoconhecimento', 'responsabilidade', 'consciência',
+            'desenvolvimento pessoal', 'reflexão', 'crescimento', 'valores', 'decisões',
+            'comportamento', 'mudança', 'transformação', 'atitude', 'escolhas'
+        ],
+        'title_templates': [
+            "Autorresponsabilidade: O Segredo do Sucesso Profissional | F5 Estratégia",
+            "Como Desenvolver Autorresponsabilidade e Transformar sua Carreira | F5",
+            "Autorresponsabilidade na Prática: Estratégias Comprovadas | F5 Estratégia",
+            "O Poder da Autorresponsabilidade para Empresários | F5 Estratégia",
+            "Desenvolva Autorresponsabilidade em 30 Dias | Método F5 Estratégia"
+        ],
+        'description_intro': "Descubra como a autorresponsabilidade pode transformar sua vida profissional e pessoal. Neste vídeo, exploramos estratégias práticas para desenvolver consciência, tomar melhores decisões e assumir controle total dos seus resultados.",
+        'landing_page': 'https://f5estrategia.com/desenvolvimento-pessoal',
+        'cta': "Transforme sua mentalidade e alcance resultados extraordinários",
+        'tags': [
+            'autorresponsabilidade', 'autoconhecimento', 'desenvolvimento-pessoal',
+            'crescimento-profissional', 'mindset', 'transformacao-pessoal',
+            'consciencia', 'responsabilidade', 'mudanca-comportamental'
+        ]
+    },
+    'lideranca': {
+        'keywords': [
+            'liderança', 'gestão', 'equipe', 'management', 'líder', 'time',
+            'performance', 'motivação', 'engajamento', 'cultura organizacional',
+            'comunicação', 'feedback', 'desenvolvimento de talentos'
+        ],
+        'title_templates': [
+            "Liderança de Alta Performance: Estratégias Comprovadas | F5",
+            "Como Liderar Equipes de Sucesso | Método F5 Estratégia",
+            "Gestão de Equipes: Técnicas que Funcionam | F5 Estratégia",
+            "Liderança Eficaz para Empresários | F5 Estratégia",
+            "Desenvolva sua Liderança em 30 Dias | F5 Estratégia"
+        ],
+        'description_intro': "Aprenda as estratégias de liderança que transformam equipes comuns em times de alta performance. Técnicas práticas para motivar, engajar e desenvolver talentos em sua organização.",
+        'landing_page': 'https://f5estrategia.com/gestao-equipes',
+        'cta': "Torne-se um líder extraordinário",
+        'tags': [
+            'lideranca', 'gestao-equipes', 'alta-performance', 'motivacao',
+            'engajamento', 'cultura-organizacional', 'desenvolvimento-talentos',
+            'feedback', 'management', 'lider'
+        ]
+    },
+    'comunicacao': {
+        'keywords': [
+            'comunicação', 'apresentação', 'oratória', 'persuasão', 'influência',
+            'networking', 'relacionamento', 'diálogo', 'escuta', 'clareza',
+            'storytelling', 'negociação', 'conflitos'
+        ],
+        'title_templates': [
+            "Comunicação Estratégica: Como Influenciar e Persuadir | F5",
+            "Domine a Arte da Comunicação Empresarial | F5 Estratégia",
+            "Comunicação de Alta Performance | Método F5 Estratégia",
+            "Como se Comunicar com Impacto | F5 Estratégia",
+            "Desenvolva sua Comunicação em 30 Dias | F5 Estratégia"
+        ],
+        'description_intro': "Descubra como dominar a comunicação estratégica para influenciar, persuadir e gerar resultados extraordinários em seus negócios e relacionamentos profissionais.",
+        'landing_page': 'https://f5estrategia.com/comunicacao-estrategica',
+        'cta': "Comunique-se com impacto e autoridade",
+        'tags': [
+            'comunicacao-estrategica', 'oratoria', 'apresentacao', 'persuasao',
+            'influencia', 'networking', 'storytelling', 'negociacao',
+            'relacionamento-profissional', 'comunicacao-empresarial'
+        ]
+    },
+    'vendas': {
+        'keywords': [
+            'vendas', 'negociação', 'fechamento', 'prospecção', 'cliente',
+            'conversão', 'funil', 'leads', 'relacionamento comercial',
+            'objeções', 'argumentação', 'proposta', 'valor'
+        ],
+        'title_templates': [
+            "Técnicas de Vendas que Funcionam | F5 Estratégia",
+            "Como Vender Mais e Melhor | Método F5 Estratégia",
+            "Vendas de Alta Performance | F5 Estratégia",
+            "Domine a Arte da Negociação | F5 Estratégia",
+            "Aumente suas Vendas em 30 Dias | F5 Estratégia"
+        ],
+        'description_intro': "Aprenda as técnicas de vendas e negociação que os profissionais de sucesso usam para fechar mais negócios e aumentar sua receita de forma consistente.",
+        'landing_page': 'https://f5estrategia.com/vendas-estrategicas',
+        'cta': "Multiplique seus resultados em vendas",
+        'tags': [
+            'vendas', 'negociacao', 'fechamento', 'conversao', 'funil-vendas',
+            'prospecção', 'relacionamento-comercial', 'objecoes',
+            'tecnicas-vendas', 'vendas-estrategicas'
+        ]
+    }
+}
+
+# Tabelas que o arquivo AppConfig.LEXICON_PATH pode substituir
+DEFAULT_TABLES = {
+    'stopwords': STOPWORDS,
+    'connectors': CONNECTORS,
+    'f5_keywords': F5_KEYWORDS,
+    'landing_pages': LANDING_PAGES,
+    'title_templates': TITLE_TEMPLATES,
+    'theme_tags': THEME_TAGS,
+    'specific_themes': SPECIFIC_THEMES
+}
+
+# Partes de palavras-chave compostas com até este tamanho não contam na detecção de tema
+MIN_KEYWORD_PART_LENGTH = 4
+
+
+def _freeze(value: Any) -> Any:
+    """Cópia imutável (dict -> MappingProxyType, list -> tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class Lexicon:
+    """Tabelas imutáveis de palavras-chave, temas e templates, com índices de n-gramas pré-calculados"""
+
+    def __init__(self, tables: Mapping[str, Any], source: str = 'código'):
+        """
+        Args:
+            tables: Tabelas no formato de DEFAULT_TABLES
+            source: Origem das tabelas (para log e digest)
+        """
+        self.source = source
+        self.stopwords = frozenset(tables['stopwords'])
+        self.connectors = frozenset(tables['connectors'])
+        self.f5_keywords = _freeze(tables['f5_keywords'])
+        self.landing_pages = _freeze(tables['landing_pages'])
+        self.title_templates = _freeze(tables['title_templates'])
+        self.theme_tags = _freeze(tables['theme_tags'])
+        self.specific_themes = _freeze({
+            name: {**data, 'keywords': [keyword.lower() for keyword in data['keywords']]}
+            for name, data in tables['specific_themes'].items()
+        })
+
+        # Consulta O(1) do bônus F5 na extração de palavras-chave (ver keyword_engine):
+        # radicais normalizados das palavras F5 e as expressões F5 completas
+        self.f5_stems = frozenset(
+            stem(normalize_text(keyword)) for keywords in self.f5_keywords.values() for keyword in keywords
+        )
+        self.f5_phrases = frozenset(
+            keyword.lower() for keywords in self.f5_keywords.values() for keyword in keywords
+        ) | frozenset(keyword for data in self.specific_themes.values() for keyword in data['keywords'])
+
+        payload = json.dumps(tables, sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+        # Palavras-chave dos temas específicos como n-gramas de tokens com IDs; cada tema
+        # guarda os IDs das suas palavras-chave e das partes de palavras compostas
+        self.theme_keywords: Tuple[str, ...] = tuple(sorted({
+            keyword for data in self.specific_themes.values() for keyword in data['keywords']
+        }))
+        self._ngram_ids: Dict[Tuple[str, ...], int] = {
+            tuple(keyword.split()): keyword_id for keyword_id, keyword in enumerate(self.theme_keywords)
+        }
+        self._ngram_heads = frozenset(ngram[0] for ngram in self._ngram_ids)
+        self.max_ngram = max((len(ngram) for ngram in self._ngram_ids), default=0)
+
+        self.keyword_parts: Tuple[str, ...] = tuple(sorted({
+            part for keyword in self.theme_keywords for part in keyword.split()
+            if len(part) >= MIN_KEYWORD_PART_LENGTH
+        }))
+        part_ids = {part: part_id for part_id, part in enumerate(self.keyword_parts)}
+
+        # Com repetição, como nas listas originais (palavra repetida conta duas vezes)
+        self.theme_keyword_ids: Mapping[str, Tuple[int, ...]] = MappingProxyType({
+            name: tuple(self._ngram_ids[tuple(keyword.split())] for keyword in data['keywords'])
+            for name, data in self.specific_themes.items()
+        })
+        self.theme_part_ids: Mapping[str, Tuple[int, ...]] = MappingProxyType({
+            name: tuple(
+                part_ids[part] for keyword in data['keywords'] for part in keyword.split()
+                if len(part) >= MIN_KEYWORD_PART_LENGTH
+            )
+            for name, data in self.specific_themes.items()
+        })
+
+    def keyword_counts(self, tokens: List[str]) -> List[int]:
+        """
+        Ocorrências de cada palavra-chave dos temas específicos (índice = ID), numa só passada
+
+        Só as posições que começam com a primeira palavra de alguma palavra-chave são
+        estendidas até max_ngram tokens; o custo é linear no tamanho do texto.
+
+        Args:
+            tokens: Tokens do texto limpo (TranscriptAnalysis.tokens)
+        """
+        counts = [0] * len(self.theme_keywords)
+        heads, ngram_ids, total = self._ngram_heads, self._ngram_ids, len(tokens)
+        for position, token in enumerate(tokens):
+            if token not in heads:
+                continue
+            for size in range(1, min(self.max_ngram, total - position) + 1):
+                keyword_id = ngram_ids.get(tuple(tokens[position:position + size]))
+                if keyword_id is not None:
+                    counts[keyword_id] += 1
+        return counts
+
+    def score_specific_themes(self, tokens: List[str]) -> Dict[str, int]:
+        """
+        Score de cada tema específico: 2 por ocorrência (palavra inteira) de cada palavra-chave
+        + 1 por parte de palavra composta (4+ letras) presente em alguma palavra do texto
+
+        As partes são procuradas no vocabulário (palavras distintas), não no texto inteiro.
+        """
+        counts = self.keyword_counts(tokens)
+        vocabulary = '\n'.join(set(tokens))
+        present = [part in vocabulary for part in self.keyword_parts]
+        return {
+            name: 2 * sum(counts[keyword_id] for keyword_id in self.theme_keyword_ids[name])
+            + sum(present[part_id] for part_id in self.theme_part_ids[name])
+            for name in self.specific_themes
+        }
+
+
+def load_tables(path: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Tabelas padrão, substituídas pelas presentes no arquivo JSON de override (se existir)
+
+    Returns:
+        Tuple (tabelas, origem)
+    """
+    path = path or AppConfig.LEXICON_PATH
+    tables = dict(DEFAULT_TABLES)
+    if not path or not os.path.exists(path):
+        return tables, 'código'
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Léxico ignorado ({path}): {e}")
+        return tables, 'código'
+
+    for key, value in overrides.items():
+        if key not in DEFAULT_TABLES:
+            logger.warning(f"Tabela desconhecida no léxico ({path}): {key}")
+        elif not isinstance(value, type(DEFAULT_TABLES[key])):
+            logger.warning(f"Tabela '{key}' com formato inválido no léxico ({path})")
+        else:
+            tables[key] = value
+    return tables, path
+
+
+@lru_cache(maxsize=1)
+def get_lexicon() -> Lexicon:
+    """Léxico do processo (montado uma vez; herdado pelos processos filhos via fork)"""
+    tables, source = load_tables()
+    lexicon = Lexicon(tables, source)
+    logger.debug(f"Léxico F5 carregado de {source} (id {lexicon.digest[:12]})")
+    return lexicon
+
+
+# Montado na importação para que o fork do pool já encontre os índices prontos
+LEXICON = get_lexicon()
+
+
+if __name__ == "__main__":
+    lexicon = get_lexicon()
+    print(f"📚 Léxico F5 ({lexicon.source}, id {lexicon.digest[:12]})")
+    print(f"   {len(lexicon.stopwords)} stopwords")
+    print(f"   {sum(len(words) for words in lexicon.f5_keywords.values())} palavras-chave em "
+          f"{len(lexicon.f5_keywords)} temas gerais")
+    for name, data in lexicon.specific_themes.items():
+        print(f"   {name}: {len(data['keywords'])} palavras-chave, {len(data['title_templates'])} títulos")
@@ -5,22 +5,101 @@ Adaptado do modelo Colmeia Solar Academy com integração à API do YouTube
 
 import os
 import json
+import time
+import hashlib
 import requests
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Any, Optional, Callable, Iterable
 from collections import Counter
 import re
 
-from advanced_seo_generator import generate_complete_seo_package
-from config import YouTubeConfig
+from advanced_seo_generator import AdvancedSEOGenerator
+from config import YouTubeConfig, AppConfig
+from build_manifest import build_if_stale, corpus_hash, generator_hash
+from f5_lexicon import get_lexicon
+
+# Incrementar quando a lógica de um estágio cacheado mudar (invalida o cache em disco)
+PIPELINE_VERSION = 1
+
+@dataclass
+class F5PipelineState:
+    """Estado único passado entre os estágios: a transcrição é lida e analisada uma vez"""
+    transcription_file: str
+    transcription: str = ''
+    content_hash: str = ''
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    youtube_keywords: List[Tuple[str, int]] = field(default_factory=list)
+    theme: str = 'desenvolvimento'
+    keywords: List[str] = field(default_factory=list)
+    outputs: Dict[str, str] = field(default_factory=dict)
+    files: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    cached_stages: List[str] = field(default_factory=list)
+
+class StageCache:
+    """Saídas dos estágios em JSON no disco, endereçadas por (estágio, versão, entradas)"""
+    
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        self.directory = directory or AppConfig.F5_PIPELINE_CACHE_DIR
+        self.ttl_seconds = AppConfig.F5_PIPELINE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    
+    # Estágios calculados localmente: também dependem do código, do léxico e do corpus (IDF).
+    # A pesquisa no YouTube depende só das palavras-chave semente e não gasta cota de novo.
+    LOCAL_STAGES = ('analyze',)
+    
+    @classmethod
+    def make_key(cls, stage: str, inputs: Any) -> str:
+        """
+        Chave do estágio: entradas + PIPELINE_VERSION e, nos estágios locais, o código dos
+        geradores, o léxico F5 e as estatísticas do corpus
+        """
+        payload = {'stage': stage, 'version': PIPELINE_VERSION, 'inputs': inputs}
+        if stage in cls.LOCAL_STAGES:
+            payload.update(generator=generator_hash('f5'), lexicon=get_lexicon().digest, corpus=corpus_hash())
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.directory, stage, f"{key}.json")
+    
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        path = self._path(stage, key)
+        try:
+            if self.ttl_seconds and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, stage: str, key: str, value: Any):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, path)
 
 class F5SEOSystem:
     """Sistema completo de SEO adaptado para F5 Estratégia"""
     
-    def __init__(self):
+    # Estágios com saída reaproveitada do disco (render e write são baratos e dependem dos templates)
+    CACHED_STAGES = ('analyze', 'keyword_research')
+    
+    def __init__(self, use_cache: Optional[bool] = None):
+        """
+        Args:
+            use_cache: Usa o cache em disco dos estágios (padrão: AppConfig.F5_PIPELINE_CACHE_ENABLED)
+        """
         self.youtube_api_key = YouTubeConfig.API_KEY
         self.f5_tag_unique = "F5Estrategia2025"  # Tag única da F5 (equivalente ao ZDLju9ky)
         self.f5_context = self._load_f5_context()
+        self._static_prompt = None
+        self._seo_generator = None
+        self.last_research_complete = False
+        use_cache = AppConfig.F5_PIPELINE_CACHE_ENABLED if use_cache is None else use_cache
+        self.stage_cache = StageCache() if use_cache else None
         
     def _load_f5_context(self) -> Dict:
         """Carrega contexto específico da F5 Estratégia"""
@@ -56,6 +135,7 @@ class F5SEOSystem:
         """
         try:
             all_keywords = []
+            self.last_research_complete = bool(self.youtube_api_key)
             
             for keyword in base_keywords[:5]:  # Limita para não exceder quota
                 # Busca vídeos relacionados à palavra-chave
@@ -86,6 +166,8 @@ class F5SEOSystem:
                         for word in words:
                             if word not in ['esse', 'essa', 'para', 'como', 'mais', 'você', 'seu', 'sua']:
                                 all_keywords.append(word)
+                else:
+                    self.last_research_complete = False
             
             # Conta frequência e retorna as mais relevantes
             keyword_counts = Counter(all_keywords)
@@ -105,6 +187,7 @@ class F5SEOSystem:
             
         except Exception as e:
             print(f"Erro na pesquisa do YouTube: {e}")
+            self.last_research_complete = False
             # Fallback com palavras-chave básicas
             return [
                 ('autorresponsabilidade', 10), ('liderança', 9), ('gestão', 8),
@@ -114,16 +197,31 @@ class F5SEOSystem:
     
     def generate_f5_prompt_structured(self, transcription: str) -> str:
         """Gera prompt estruturado adaptado para F5 Estratégia"""
+        static_prefix, delta = self.generate_f5_prompt_parts(transcription)
+        return static_prefix + delta
+    
+    def generate_f5_prompt_parts(self, transcription: str) -> Tuple[str, str]:
+        """
+        Divide o prompt em prefixo fixo (regras, formatos, comandos) e parte variável (transcrição)
+        
+        O prefixo é idêntico para todos os vídeos e vem primeiro, permitindo reaproveitamento
+        pelo cache de contexto dos provedores; a transcrição vai sempre no final.
         
-        prompt = f"""
+        Returns:
+            Tuple (prefixo fixo, transcrição formatada)
+        """
+        if self._static_prompt is None:
+            self._static_prompt = self._build_static_prompt()
+        return self._static_prompt, f"\nTRANSCRIÇÃO:\n{transcription}\n"
+    
+    def _build_static_prompt(self) -> str:
+        """Parte fixa do prompt estruturado (montada uma vez por instância)"""
+        return f"""
 Aja como um especialista em SEO do YouTube, sua missão é a partir da transcrição do vídeo a ser postado no canal da F5 Estratégia, cuja finalidade principal é compartilhar conteúdo de valor para sua audiência interessada em empreendedorismo, liderança, vendas, marketing digital e crescimento de negócios, criar toda estrutura de texto otimizada e assim atingir o máximo de pessoas possíveis e ser um canal de tráfego orgânico para gerar vendas de nossos treinamentos e consultorias empresariais.
 
 O objetivo final é criar descrições de vídeos, tags otimizadas para SEO, baseadas em palavras-chave que compõem o conteúdo e que faça com que nossos vídeos estejam sempre nas primeiras posições de pesquisa nos temas relativos aos vídeos que produzirmos.
 
-Você formulará o formato e o conteúdo do texto solicitado que reflete as regras em `<regras></regras>`. E a saída final será conforme a lista de '##Comandos Iniciais' e no formato exemplificado em `<output1></output1>`, `<output2></output2>`, `<output3></output3>`, `<output4></output4>`.
-
-TRANSCRIÇÃO:
-{transcription}
+Você formulará o formato e o conteúdo do texto solicitado que reflete as regras em `<regras></regras>`. E a saída final será conforme a lista de '##Comandos Iniciais' e no formato exemplificado em `<output1></output1>`, `<output2></output2>`, `<output3></output3>`, `<output4></output4>`. A transcrição do vídeo está no final deste prompt.
 
 <regras>
 
@@ -224,88 +322,164 @@ Palavras-chave sugeridas:
 
 /5 = Analise se o número total de caracteres da lista de palavras-chave fornecidas para as tags do YouTube não excedeu 500 caracteres e caso falte de sugestões de palavras-chave para completar o número de caracteres o mais próximo possível desse limite e escreva no formato `<output5></output5>`.
 """
-        return prompt
     
-    def process_transcription_f5_style(self, transcription_file: str) -> Dict:
+    # ------------------------------------------------------------------ #
+    # Pipeline: load → analyze → keyword_research → render → write
+    # ------------------------------------------------------------------ #
+    def _run_stage(self, state: F5PipelineState, name: str, func: Callable[[F5PipelineState], Any],
+                   refresh: Iterable[str] = (), cache_inputs: Any = None) -> Any:
+        """
+        Executa um estágio medindo o tempo e, se cacheável, reaproveitando a saída do disco
+        
+        Args:
+            state: Estado do pipeline
+            name: Nome do estágio
+            func: Função do estágio (recebe o estado, retorna a saída serializável em JSON)
+            refresh: Estágios a recalcular ignorando o cache
+            cache_inputs: Entradas que definem a chave do cache do estágio
+        """
+        started = time.perf_counter()
+        cacheable = self.stage_cache is not None and name in self.CACHED_STAGES
+        key = StageCache.make_key(name, cache_inputs) if cacheable else None
+        
+        output = self.stage_cache.get(name, key) if cacheable and name not in refresh else None
+        if output is not None:
+            state.cached_stages.append(name)
+        else:
+            output = func(state)
+            if cacheable and self._is_cacheable_output(name, output):
+                self.stage_cache.set(name, key, output)
+        
+        state.timings[name] = round(time.perf_counter() - started, 4)
+        return output
+    
+    def _is_cacheable_output(self, name: str, output: Any) -> bool:
+        """Não guarda erros nem pesquisas do YouTube incompletas (fallback sem API)"""
+        if isinstance(output, dict) and 'error' in output:
+            return False
+        if name == 'keyword_research':
+            return self.last_research_complete
+        return True
+    
+    def _stage_load(self, state: F5PipelineState) -> str:
+        """Lê a transcrição uma única vez"""
+        with open(state.transcription_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def _stage_analyze(self, state: F5PipelineState) -> Dict[str, Any]:
+        """Análise SEO da transcrição em memória (tema, palavras-chave, frases)"""
+        if self._seo_generator is None:
+            self._seo_generator = AdvancedSEOGenerator()
+        return self._seo_generator.generate_optimized_content_from_text(
+            state.transcription, state.transcription_file
+        )
+    
+    def _stage_keyword_research(self, state: F5PipelineState) -> List[Tuple[str, int]]:
+        """Pesquisa no YouTube a partir das palavras-chave iniciais da análise"""
+        initial_keywords = [kw[0] for kw in state.analysis['keywords']['primary'][:10]]
+        print("🔍 Pesquisando palavras-chave no YouTube...")
+        return self.search_youtube_keywords(initial_keywords)
+    
+    def _stage_render(self, state: F5PipelineState) -> Dict[str, str]:
+        """Combina as palavras-chave e gera os 4 outputs no formato exato dos exemplos"""
+        # Adiciona palavras do YouTube
+        all_keywords = [kw for kw, score in state.youtube_keywords[:15]]
+        
+        # Adiciona palavras específicas do tema detectado
+        state.theme = state.analysis.get('video_info', {}).get('detected_theme', 'desenvolvimento')
+        
+        theme_keywords = {
+            'autorresponsabilidade': [
+                'desenvolvimento pessoal', 'autoconhecimento', 'responsabilidade',
+                'crescimento profissional', 'mindset', 'transformação pessoal'
+            ],
+            'lideranca': [
+                'gestão de equipes', 'alta performance', 'motivação',
+                'engajamento', 'cultura organizacional', 'feedback'
+            ],
+            'comunicacao': [
+                'comunicação estratégica', 'oratória', 'apresentação',
+                'persuasão', 'influência', 'networking'
+            ],
+            'vendas': [
+                'técnicas de vendas', 'negociação', 'fechamento',
+                'conversão', 'funil de vendas', 'prospecção'
+            ]
+        }
+        
+        if state.theme in theme_keywords:
+            all_keywords.extend(theme_keywords[state.theme])
+        
+        # Remove duplicatas
+        state.keywords = list(dict.fromkeys(all_keywords))
+        
+        return {
+            'tags_virgula': self._generate_output1(state.keywords),
+            'metadados_traco': self._generate_output2(state.keywords),
+            'descricao_completa': self._generate_output3(state.transcription, state.keywords, state.theme),
+            'titulos_thumbnails': self._generate_output4(state.transcription, state.keywords)
+        }
+    
+    def run_pipeline(self, transcription_file: str, write_files: bool = False,
+                     refresh: Iterable[str] = ()) -> F5PipelineState:
+        """
+        Executa o pipeline F5 passando um único estado entre os estágios
+        
+        Args:
+            transcription_file: Arquivo de transcrição
+            write_files: Executa o estágio write (titulo.txt, descricao.txt, ...)
+            refresh: Estágios a recalcular ignorando o cache em disco
+        
+        Returns:
+            F5PipelineState com análise, palavras-chave, outputs e tempo de cada estágio
+        
+        Raises:
+            RuntimeError: Se a análise da transcrição falhar
+        """
+        refresh = set(refresh)
+        state = F5PipelineState(transcription_file=transcription_file)
+        
+        state.transcription = self._run_stage(state, 'load', self._stage_load)
+        state.content_hash = hashlib.sha256(state.transcription.encode('utf-8')).hexdigest()
+        
+        state.analysis = self._run_stage(state, 'analyze', self._stage_analyze, refresh,
+                                         cache_inputs=state.content_hash)
+        if 'error' in state.analysis:
+            raise RuntimeError(state.analysis['error'])
+        
+        initial_keywords = [kw[0] for kw in state.analysis['keywords']['primary'][:10]]
+        research = self._run_stage(state, 'keyword_research', self._stage_keyword_research, refresh,
+                                   cache_inputs=initial_keywords)
+        state.youtube_keywords = [tuple(item) for item in research]
+        
+        state.outputs = self._run_stage(state, 'render', self._stage_render)
+        if write_files:
+            state.files = self._run_stage(state, 'write', self._stage_write)
+        return state
+    
+    def process_transcription_f5_style(self, transcription_file: str, refresh: Iterable[str] = ()) -> Dict:
         """
         Processa transcrição no estilo F5 Estratégia
         Integra pesquisa do YouTube + geração de conteúdo
         """
         try:
-            # Lê transcrição
-            with open(transcription_file, 'r', encoding='utf-8') as f:
-                transcription = f.read()
-            
-            # Primeiro, faz análise básica para extrair palavras-chave iniciais
-            basic_seo = generate_complete_seo_package(transcription_file)
-            
-            if 'error' in basic_seo:
-                return {'error': basic_seo['error']}
-            
-            # Extrai palavras-chave iniciais
-            initial_keywords = [kw[0] for kw in basic_seo['keywords']['primary'][:10]]
-            
-            # Pesquisa no YouTube para palavras-chave relacionadas
-            print("🔍 Pesquisando palavras-chave no YouTube...")
-            youtube_keywords = self.search_youtube_keywords(initial_keywords)
-            
-            # Combina palavras-chave
-            all_keywords = []
-            
-            # Adiciona palavras do YouTube
-            for kw, score in youtube_keywords[:15]:
-                all_keywords.append(kw)
-            
-            # Adiciona palavras específicas do tema detectado
-            theme = basic_seo.get('video_info', {}).get('detected_theme', 'desenvolvimento')
-            theme_keywords = {
-                'autorresponsabilidade': [
-                    'desenvolvimento pessoal', 'autoconhecimento', 'responsabilidade',
-                    'crescimento profissional', 'mindset', 'transformação pessoal'
-                ],
-                'lideranca': [
-                    'gestão de equipes', 'alta performance', 'motivação',
-                    'engajamento', 'cultura organizacional', 'feedback'
-                ],
-                'comunicacao': [
-                    'comunicação estratégica', 'oratória', 'apresentação',
-                    'persuasão', 'influência', 'networking'
-                ],
-                'vendas': [
-                    'técnicas de vendas', 'negociação', 'fechamento',
-                    'conversão', 'funil de vendas', 'prospecção'
-                ]
-            }
-            
-            if theme in theme_keywords:
-                all_keywords.extend(theme_keywords[theme])
-            
-            # Remove duplicatas
-            unique_keywords = list(dict.fromkeys(all_keywords))
-            
-            # Gera os 4 outputs no formato exato dos exemplos
-            output1 = self._generate_output1(unique_keywords)
-            output2 = self._generate_output2(unique_keywords)
-            output3 = self._generate_output3(transcription, unique_keywords, theme)
-            output4 = self._generate_output4(transcription, unique_keywords)
-            
-            return {
-                'success': True,
-                'transcription_file': transcription_file,
-                'theme_detected': theme,
-                'youtube_keywords_found': len(youtube_keywords),
-                'outputs': {
-                    'tags_virgula': output1,
-                    'metadados_traco': output2, 
-                    'descricao_completa': output3,
-                    'titulos_thumbnails': output4
-                },
-                'keywords_used': unique_keywords[:20]
-            }
-            
+            state = self.run_pipeline(transcription_file, refresh=refresh)
+            return self._pipeline_result(state)
         except Exception as e:
             return {'error': str(e)}
     
+    def _pipeline_result(self, state: F5PipelineState) -> Dict:
+        return {
+            'success': True,
+            'transcription_file': state.transcription_file,
+            'theme_detected': state.theme,
+            'youtube_keywords_found': len(state.youtube_keywords),
+            'outputs': state.outputs,
+            'keywords_used': state.keywords[:20],
+            'timings': state.timings,
+            'cached_stages': state.cached_stages
+        }
+    
     def _generate_output1(self, keywords: List[str]) -> str:
         """Gera output1: tags separadas por vírgula"""
         # Limita a 500 caracteres
@@ -465,93 +639,116 @@ Sugestão de thumbnail 5: Calendário/cronômetro + "{main_keyword.upper()}" + c
         
         return titles_thumbnails
     
-    def save_f5_youtube_files(self, transcription_file: str) -> Dict:
+    def _stage_write(self, state: F5PipelineState) -> Dict[str, str]:
+        """Grava os arquivos do YouTube ao lado da transcrição"""
+        # Diretório do vídeo
+        video_dir = os.path.dirname(state.transcription_file)
+        
+        # 1. ARQUIVO TITULO
+        titulo_content = state.outputs['titulos_thumbnails'].split('\n')[0].replace('Título 1: ', '')
+        titulo_file = os.path.join(video_dir, 'titulo.txt')
+        with open(titulo_file, 'w', encoding='utf-8') as f:
+            f.write(titulo_content)
+        
+        # 2. ARQUIVO DESCRIÇÃO  
+        descricao_file = os.path.join(video_dir, 'descricao.txt')
+        with open(descricao_file, 'w', encoding='utf-8') as f:
+            f.write(state.outputs['descricao_completa'])
+        
+        # 3. ARQUIVO TAGS (vírgulas)
+        tags_file = os.path.join(video_dir, 'tags.txt')
+        with open(tags_file, 'w', encoding='utf-8') as f:
+            f.write(state.outputs['tags_virgula'])
+        
+        # 4. ARQUIVO METADADOS (traços)  
+        metadados_file = os.path.join(video_dir, 'metadados.txt')
+        with open(metadados_file, 'w', encoding='utf-8') as f:
+            f.write(state.outputs['metadados_traco'])
+        
+        # 5. ARQUIVO RESUMO (bonus)
+        resumo_data = {
+            'video_info': {
+                'tema_detectado': state.theme,
+                'keywords_youtube_encontradas': len(state.youtube_keywords),
+                'titulo_caracteres': len(titulo_content),
+                'descricao_caracteres': len(state.outputs['descricao_completa']),
+                'tags_caracteres': len(state.outputs['tags_virgula']),
+                'metadados_caracteres': len(state.outputs['metadados_traco']),
+                'data_processamento': datetime.now().isoformat()
+            },
+            'arquivos_criados': [
+                'titulo.txt', 'descricao.txt', 'tags.txt', 'metadados.txt'
+            ],
+            'keywords_utilizadas': state.keywords[:20]
+        }
+        
+        resumo_file = os.path.join(video_dir, 'resumo_f5_seo.json')
+        with open(resumo_file, 'w', encoding='utf-8') as f:
+            json.dump(resumo_data, f, ensure_ascii=False, indent=2)
+        
+        return {
+            'titulo': titulo_file,
+            'descricao': descricao_file,
+            'tags': tags_file,
+            'metadados': metadados_file,
+            'resumo': resumo_file
+        }
+    
+    def save_f5_youtube_files(self, transcription_file: str, refresh: Iterable[str] = (),
+                              force: bool = False) -> Dict:
         """
         Salva arquivos no formato exato dos exemplos de energia solar
         Adaptado para F5 Estratégia
+        
+        Só regenera se a transcrição, o gerador ou os dados da marca mudaram (ver build_manifest);
+        force ou refresh regeneram sempre.
         """
+        return build_if_stale(
+            'f5', transcription_file, lambda: self._save_f5_youtube_files(transcription_file, refresh),
+            force=force or bool(refresh)
+        )
+    
+    def _save_f5_youtube_files(self, transcription_file: str, refresh: Iterable[str] = ()) -> Dict:
+        """Executa o pipeline completo com o estágio write"""
         try:
-            # Processa transcrição
-            result = self.process_transcription_f5_style(transcription_file)
-            
-            if 'error' in result:
-                return result
-            
-            # Diretório do vídeo
-            video_dir = os.path.dirname(transcription_file)
-            
-            # 1. ARQUIVO TITULO
-            titulo_content = result['outputs']['titulos_thumbnails'].split('\n')[0].replace('Título 1: ', '')
-            titulo_file = os.path.join(video_dir, 'titulo.txt')
-            with open(titulo_file, 'w', encoding='utf-8') as f:
-                f.write(titulo_content)
-            
-            # 2. ARQUIVO DESCRIÇÃO  
-            descricao_file = os.path.join(video_dir, 'descricao.txt')
-            with open(descricao_file, 'w', encoding='utf-8') as f:
-                f.write(result['outputs']['descricao_completa'])
-            
-            # 3. ARQUIVO TAGS (vírgulas)
-            tags_file = os.path.join(video_dir, 'tags.txt')
-            with open(tags_file, 'w', encoding='utf-8') as f:
-                f.write(result['outputs']['tags_virgula'])
-            
-            # 4. ARQUIVO METADADOS (traços)  
-            metadados_file = os.path.join(video_dir, 'metadados.txt')
-            with open(metadados_file, 'w', encoding='utf-8') as f:
-                f.write(result['outputs']['metadados_traco'])
-            
-            # 5. ARQUIVO RESUMO (bonus)
-            resumo_data = {
-                'video_info': {
-                    'tema_detectado': result['theme_detected'],
-                    'keywords_youtube_encontradas': result['youtube_keywords_found'],
-                    'titulo_caracteres': len(titulo_content),
-                    'descricao_caracteres': len(result['outputs']['descricao_completa']),
-                    'tags_caracteres': len(result['outputs']['tags_virgula']),
-                    'metadados_caracteres': len(result['outputs']['metadados_traco']),
-                    'data_processamento': datetime.now().isoformat()
-                },
-                'arquivos_criados': [
-                    'titulo.txt', 'descricao.txt', 'tags.txt', 'metadados.txt'
-                ],
-                'keywords_utilizadas': result['keywords_used']
-            }
-            
-            resumo_file = os.path.join(video_dir, 'resumo_f5_seo.json')
-            with open(resumo_file, 'w', encoding='utf-8') as f:
-                json.dump(resumo_data, f, ensure_ascii=False, indent=2)
+            state = self.run_pipeline(transcription_file, write_files=True, refresh=refresh)
             
             return {
                 'success': True,
-                'video_directory': video_dir,
-                'files_created': {
-                    'titulo': titulo_file,
-                    'descricao': descricao_file,
-                    'tags': tags_file,
-                    'metadados': metadados_file,
-                    'resumo': resumo_file
-                },
+                'video_directory': os.path.dirname(transcription_file),
+                'files_created': state.files,
                 'content_summary': {
-                    'titulo': titulo_content,
-                    'tema': result['theme_detected'],
-                    'keywords_count': len(result['keywords_used']),
-                    'youtube_research': result['youtube_keywords_found']
-                }
+                    'titulo': state.outputs['titulos_thumbnails'].split('\n')[0].replace('Título 1: ', ''),
+                    'tema': state.theme,
+                    'keywords_count': len(state.keywords[:20]),
+                    'youtube_research': len(state.youtube_keywords)
+                },
+                'timings': state.timings,
+                'cached_stages': state.cached_stages
             }
             
         except Exception as e:
             return {'error': str(e)}
 
-def process_f5_video(transcription_file: str) -> None:
-    """Função principal para processar vídeo F5"""
+def process_f5_video(transcription_file: str, refresh: Iterable[str] = (), force: bool = False) -> None:
+    """
+    Função principal para processar vídeo F5
+    
+    Args:
+        refresh: Estágios a recalcular ignorando o cache
+        force: Regenera os arquivos mesmo sem mudanças nas entradas
+    """
     
     system = F5SEOSystem()
     
     print("🚀 SISTEMA F5 SEO - PROCESSANDO VÍDEO...")
     print("🔍 Integrando com API do YouTube para pesquisa de palavras-chave...")
     
-    result = system.save_f5_youtube_files(transcription_file)
+    result = system.save_f5_youtube_files(transcription_file, refresh=refresh, force=force)
+    
+    if result.get('up_to_date'):
+        print("\n✅ ARQUIVOS JÁ ATUALIZADOS (nenhuma entrada mudou; use --force para regenerar)")
+        return
     
     if result.get('success'):
         print("\n✅ ARQUIVOS F5 CRIADOS COM SUCESSO!")
@@ -564,6 +761,11 @@ def process_f5_video(transcription_file: str) -> None:
         for tipo, caminho in result['files_created'].items():
             print(f"   ✓ {os.path.basename(caminho)}")
         
+        print(f"\n⏱️ ESTÁGIOS:")
+        for stage, seconds in result['timings'].items():
+            origem = ' (cache)' if stage in result['cached_stages'] else ''
+            print(f"   {stage:<17} {seconds * 1000:>8.1f} ms{origem}")
+        
         print(f"\n🔄 PRÓXIMOS PASSOS:")
         print(f"1. Use titulo.txt no campo título do YouTube")
         print(f"2. Use descricao.txt no campo descrição do YouTube")
@@ -574,10 +776,19 @@ def process_f5_video(transcription_file: str) -> None:
         print(f"❌ Erro: {result.get('error', 'Erro desconhecido')}")
 
 if __name__ == "__main__":
-    # Testa com o vídeo de autorresponsabilidade
-    transcription_path = "Transcricoes de Videos/Video 1/f5-youtube-video1-Autorresponsabilidade_01mp4.txt"
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sistema F5 SEO - arquivos do YouTube a partir da transcrição")
+    # Padrão: testa com o vídeo de autorresponsabilidade
+    parser.add_argument('transcription', nargs='?',
+                        default="Transcricoes de Videos/Video 1/f5-youtube-video1-Autorresponsabilidade_01mp4.txt")
+    parser.add_argument('--refresh', nargs='*', default=[], choices=F5SEOSystem.CACHED_STAGES,
+                        help='Estágios a recalcular ignorando o cache em disco')
+    parser.add_argument('--force', action='store_true', help='Regenera os arquivos mesmo sem mudanças')
+    args = parser.parse_args()
+    transcription_path = args.transcription
     
     if os.path.exists(transcription_path):
-        process_f5_video(transcription_path)
+        process_f5_video(transcription_path, refresh=args.refresh, force=args.force)
     else:
         print(f"❌ Arquivo não encontrado: {transcription_path}") 
\ No newline at end of file
@@ -7,18 +7,27 @@ import os
 import json
 from pathlib import Path
 from advanced_seo_generator import generate_complete_seo_package
+from build_manifest import build_if_stale
 
-def generate_youtube_upload_files(transcription_file: str) -> dict:
+def generate_youtube_upload_files(transcription_file: str, force: bool = False) -> dict:
     """
     Gera arquivos .txt separados para upload no YouTube
     
+    Só regenera se a transcrição, o gerador ou os dados da marca mudaram (ver build_manifest).
+    
     Args:
         transcription_file (str): Caminho para o arquivo de transcrição
+        force (bool): Regenera mesmo sem mudanças
     
     Returns:
-        dict: Resultado da operação com caminhos dos arquivos criados
+        dict: Resultado da operação com caminhos dos arquivos criados ('up_to_date' se reaproveitado)
     """
-    
+    return build_if_stale(
+        'upload', transcription_file, lambda: _build_youtube_upload_files(transcription_file), force=force
+    )
+
+def _build_youtube_upload_files(transcription_file: str) -> dict:
+    """Gera os arquivos de upload (sempre)"""
     try:
         # Gera a otimização SEO completa
         print("🔄 Analisando transcrição e gerando conteúdo SEO...")
@@ -126,33 +135,21 @@ def generate_youtube_upload_files(transcription_file: str) -> dict:
     except Exception as e:
         return {'error': str(e)}
 
-def process_video_directory(video_directory: str) -> dict:
+def process_video_directory(video_directory: str, workers: int = None) -> dict:
     """
-    Processa todos os vídeos em um diretório
+    Processa todos os vídeos em um diretório (em paralelo, ver batch_processor)
     
     Args:
         video_directory (str): Diretório contendo pastas de vídeos
+        workers (int): Processos usados (padrão: CPUs)
     
     Returns:
-        dict: Resultado do processamento
+        dict: Resultado por transcrição ("pasta/arquivo.txt"); o relatório JSONL fica em reports/
     """
-    results = {}
-    
-    # Busca pastas de vídeo
-    for item in os.listdir(video_directory):
-        item_path = os.path.join(video_directory, item)
-        if os.path.isdir(item_path):
-            # Busca arquivos .txt (transcrições) na pasta
-            txt_files = [f for f in os.listdir(item_path) if f.endswith('.txt')]
-            
-            for txt_file in txt_files:
-                transcription_path = os.path.join(item_path, txt_file)
-                print(f"\n📁 Processando: {item}/{txt_file}")
-                
-                result = generate_youtube_upload_files(transcription_path)
-                results[f"{item}/{txt_file}"] = result
+    from batch_processor import BatchProcessor
     
-    return results
+    summary = BatchProcessor('upload', workers=workers).run(video_directory, collect=True)
+    return summary['results']
 
 if __name__ == "__main__":
     # Processa o vídeo específico
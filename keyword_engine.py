@@ -0,0 +1,175 @@
+"""
+Keyword Engine - Extração de palavras-chave de 1 a 3 palavras (n-gramas e colocações)
+Desenvolvido para F5 Estratégia - TF-IDF contra a biblioteca do canal, PMI e bônus F5
+
+Uma passada pelos tokens gera os candidatos ("marketing", "marketing digital",
+"funil de vendas"): as palavras das pontas não podem ser stopwords nem números e precisam
+de min_length letras; no meio dos de 3 palavras só entram conectivos ("de", "para", ...).
+Cada candidato recebe
+
+    score = tf × idf × colocação × bônus F5
+
+- idf vem de um corpus de fundo plugável (por padrão, corpus_stats: df de toda a biblioteca do
+  canal, persistido; idf 1 enquanto não for gerado), de modo que termos que aparecem em todo
+  vídeo pesam menos que os distintivos;
+- colocação = 1 + NPMI (PMI normalizada entre as palavras das pontas) para n-gramas de
+  2 ou 3 palavras, que só entram se repetirem e forem mais frequentes juntas que por acaso;
+- bônus F5 por consulta em conjunto de radicais (ver f5_lexicon), sem comparar cada palavra
+  com cada palavra-chave.
+Todo o custo é linear no número de tokens (mais a ordenação dos candidatos).
+"""
+
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+from corpus_stats import MAX_NGRAM, CorpusStats, iter_ngrams, text_tokens
+from f5_lexicon import LEXICON, Lexicon
+from text_analysis import normalize_text, stem
+
+# N-gramas de 2+ palavras precisam aparecer ao menos esta quantidade de vezes
+MIN_COLLOCATION_COUNT = 2
+
+# Multiplicador de termos ligados aos temas da F5
+F5_BOOST = 2.0
+
+
+class BackgroundCorpus:
+    """Frequência de documentos dos n-gramas de poucos textos, em memória (ex.: testes, lotes avulsos)"""
+
+    def __init__(self):
+        self.document_count = 0
+        self.document_frequency: Counter = Counter()
+
+    def add(self, text: str):
+        """Conta os n-gramas distintos de um documento"""
+        self.document_frequency.update(set(iter_ngrams(text_tokens(text))))
+        self.document_count += 1
+
+    def idf(self, term: str) -> float:
+        """IDF suavizado: log((1 + N) / (1 + df)) + 1 (termo ausente = mais distintivo)"""
+        return math.log((1 + self.document_count) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    @classmethod
+    def from_documents(cls, texts: Iterable[str]) -> 'BackgroundCorpus':
+        corpus = cls()
+        for text in texts:
+            corpus.add(text)
+        return corpus
+
+
+@lru_cache(maxsize=1)
+def get_background_corpus() -> CorpusStats:
+    """
+    Estatísticas do canal (corpus_stats), carregadas uma vez por processo e memory-mapped
+
+    Somente leitura: sem arquivo de estatísticas todo termo tem idf 1 (ranking só por tf,
+    colocação e bônus F5) até que o batch_processor ou `corpus_stats.py --sync` o gerem.
+    """
+    return CorpusStats.load()
+
+
+class KeywordEngine:
+    """Ranqueia n-gramas de 1 a 3 palavras de um texto por TF-IDF, colocação e bônus F5"""
+
+    def __init__(self, background: Optional[Union[CorpusStats, BackgroundCorpus]] = None,
+                 lexicon: Optional[Lexicon] = None, max_n: int = MAX_NGRAM):
+        """
+        Args:
+            background: Qualquer objeto com idf(termo) -> float (padrão: corpus_stats do canal)
+            lexicon: Stopwords e radicais F5 (padrão: f5_lexicon.LEXICON)
+            max_n: Maior n-grama candidato
+        """
+        self._background = background
+        self.lexicon = lexicon or LEXICON
+        self.max_n = max_n
+
+    @property
+    def background(self) -> Union[CorpusStats, BackgroundCorpus]:
+        if self._background is None:
+            self._background = get_background_corpus()
+        return self._background
+
+    def _is_edge(self, token: str, min_length: int) -> bool:
+        """Palavra que pode abrir ou fechar um candidato"""
+        return len(token) >= min_length and token not in self.lexicon.stopwords and not token.isdigit()
+
+    def extract(self, tokens: List[str], min_length: int = 4,
+                top_n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Palavras-chave do texto ordenadas por score
+
+        Args:
+            tokens: Tokens do texto limpo (TranscriptAnalysis.tokens)
+            min_length: Tamanho mínimo das palavras das pontas
+            top_n: Limite de resultados (None = todos)
+
+        Returns:
+            Lista de (palavra-chave, score) em ordem decrescente de score
+        """
+        total = len(tokens)
+        if not total:
+            return []
+
+        # Frequência de cada palavra (para o PMI) e de cada candidato, numa passada
+        word_counts = Counter(tokens)
+        edges = {token for token in word_counts if self._is_edge(token, min_length)}
+        connectors = self.lexicon.connectors
+        counts: Counter = Counter()
+        for position, token in enumerate(tokens):
+            if token not in edges:
+                continue
+            counts[token] += 1
+            if position + 1 < total and tokens[position + 1] in edges:
+                counts[f"{token} {tokens[position + 1]}"] += 1
+            if (self.max_n >= 3 and position + 2 < total and tokens[position + 1] in connectors
+                    and tokens[position + 2] in edges):
+                counts[f"{token} {tokens[position + 1]} {tokens[position + 2]}"] += 1
+
+        # Radical normalizado de cada palavra distinta, para o bônus F5
+        f5_stems = self.lexicon.f5_stems
+        boosted = {token for token in edges if stem(normalize_text(token)) in f5_stems}
+
+        background = self.background
+        scored = []
+        for candidate, count in counts.items():
+            words = candidate.split(' ')
+            weight = 1.0
+            if len(words) > 1:
+                if count < MIN_COLLOCATION_COUNT:
+                    continue
+                npmi = self._npmi(count, word_counts[words[0]], word_counts[words[-1]], total)
+                if npmi <= 0:
+                    continue
+                weight += npmi
+            if candidate in self.lexicon.f5_phrases or any(word in boosted for word in words):
+                weight *= F5_BOOST
+            scored.append((candidate, round(count * background.idf(candidate) * weight, 3)))
+
+        # Ordenação estável: empates ficam na ordem de primeira ocorrência
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:top_n] if top_n else scored
+
+    @staticmethod
+    def _npmi(joint: int, first: int, last: int, total: int) -> float:
+        """PMI normalizado em [-1, 1] entre as palavras das pontas do n-grama"""
+        p_joint = joint / total
+        if p_joint >= 1:
+            return 1.0
+        pmi = math.log(p_joint / ((first / total) * (last / total)))
+        return pmi / -math.log(p_joint)
+
+
+if __name__ == "__main__":
+    import argparse
+    from transcript_parser import parse_file, segments_text
+
+    parser = argparse.ArgumentParser(description="Palavras-chave de uma transcrição - F5 Estratégia")
+    parser.add_argument('file', help='Arquivo de transcrição (.txt)')
+    parser.add_argument('-n', '--top', type=int, default=30, help='Quantidade de palavras-chave')
+    args = parser.parse_args()
+
+    tokens = text_tokens(segments_text(parse_file(args.file)))
+    for keyword, score in KeywordEngine().extract(tokens, top_n=args.top):
+        print(f"   {score:8.2f}  {keyword}")
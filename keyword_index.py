@@ -0,0 +1,293 @@
+"""
+Keyword Index - Índice invertido com ranqueamento BM25 para busca exata por palavra-chave
+Desenvolvido para F5 Estratégia - Complementa a busca semântica (content_index.py) no dashboard
+
+Cada termo normalizado (casefold, sem acentos, stemming leve) aponta para uma posting list
+ordenada de (documento, frequência). Filtros categóricos (persona, categoria, tipo) também são
+posting lists e se cruzam com as dos termos antes do cálculo do BM25; score mínimo e data
+são máscaras NumPy. Documentos entram incrementalmente e o índice é serializado em pickle.
+"""
+
+import logging
+import os
+import pickle
+from array import array
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from config import AppConfig, F5Config
+from text_analysis import TOKENIZER_VERSION, tokenize
+from content_index import fingerprint, sync_library
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Campos categóricos com posting list própria
+FACET_FIELDS = ('kind', 'persona', 'category')
+
+# Peso das ocorrências no título (contadas como repetições do termo)
+TITLE_WEIGHT = 2
+
+# Fração de documentos removidos que dispara a compactação ao salvar
+COMPACT_RATIO = 0.2
+
+
+class KeywordIndex:
+    """Índice invertido BM25 com filtros por posting list e atualização incremental"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Saturação da frequência do termo
+            b: Normalização pelo tamanho do documento
+        """
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Dict[str, Any]] = []
+        # termo -> (documentos, frequências); números de documento crescentes por construção
+        self.postings: Dict[str, tuple] = {}
+        self.facets: Dict[tuple, array] = {}
+        self.lengths = array('f')
+        self.scores = array('f')
+        self.dates = array('d')
+        self.active = array('b')
+        self.total_length = 0.0
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def doc_ids(self) -> List[str]:
+        return list(self._positions)
+
+    def fingerprint_of(self, doc_id: str) -> Optional[str]:
+        position = self._positions.get(doc_id)
+        return self.docs[position].get('fingerprint') if position is not None else None
+
+    # ------------------------------------------------------------------ #
+    # Atualização
+    # ------------------------------------------------------------------ #
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Indexa ou atualiza um documento
+
+        Args:
+            doc_id: Identificador estável
+            text: Texto completo
+            metadata: title (peso extra), kind, persona, category, performance_score, date (ISO)...
+
+        Returns:
+            False se o documento já estava indexado com o mesmo conteúdo
+        """
+        metadata = metadata or {}
+        content_hash = fingerprint(text)
+        if doc_id in self._positions:
+            if self.fingerprint_of(doc_id) == content_hash:
+                return False
+            self.remove(doc_id)
+
+        number = len(self.docs)
+        terms = Counter(tokenize(text))
+        for term in tokenize(metadata.get('title', '')):
+            terms[term] += TITLE_WEIGHT
+        for term, frequency in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array('i'), array('f'))
+            posting[0].append(number)
+            posting[1].append(frequency)
+
+        for field in FACET_FIELDS:
+            if metadata.get(field) is not None:
+                self.facets.setdefault((field, metadata[field]), array('i')).append(number)
+
+        length = float(sum(terms.values()))
+        self.docs.append({**metadata, 'id': doc_id, 'fingerprint': content_hash})
+        self.lengths.append(length)
+        self.scores.append(float(metadata.get('performance_score') or 0.0))
+        self.dates.append(np.datetime64(metadata['date'], 'D').astype(float) if metadata.get('date') else np.nan)
+        self.active.append(1)
+        self.total_length += length
+        self._positions[doc_id] = number
+        return True
+
+    def remove(self, doc_id: str):
+        """Remove um documento (as postings são limpas na próxima compactação)"""
+        number = self._positions.pop(doc_id, None)
+        if number is None:
+            return
+        self.active[number] = 0
+        self.total_length -= self.lengths[number]
+
+    def compact(self):
+        """Reconstrói as postings sem os documentos removidos"""
+        live = [(doc, number) for number, doc in enumerate(self.docs) if self.active[number]]
+        compacted = self.__class__(self.k1, self.b)
+        remap = {number: new for new, (_, number) in enumerate(live)}
+
+        for term, (numbers, frequencies) in self.postings.items():
+            kept = [(remap[n], f) for n, f in zip(numbers, frequencies) if n in remap]
+            if kept:
+                compacted.postings[term] = (array('i', [n for n, _ in kept]), array('f', [f for _, f in kept]))
+        for key, numbers in self.facets.items():
+            kept = array('i', [remap[n] for n in numbers if n in remap])
+            if kept:
+                compacted.facets[key] = kept
+
+        compacted.docs = [doc for doc, _ in live]
+        compacted.lengths = array('f', [self.lengths[n] for _, n in live])
+        compacted.scores = array('f', [self.scores[n] for _, n in live])
+        compacted.dates = array('d', [self.dates[n] for _, n in live])
+        compacted.active = array('b', [1] * len(live))
+        compacted.total_length = float(sum(compacted.lengths))
+        compacted._positions = {doc['id']: i for i, doc in enumerate(compacted.docs)}
+        self.__dict__.update(compacted.__dict__)
+
+    # ------------------------------------------------------------------ #
+    # Busca
+    # ------------------------------------------------------------------ #
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Máscara dos documentos válidos: ativos ∩ posting lists dos filtros ∩ faixas numéricas"""
+        mask = np.frombuffer(self.active, dtype=np.int8).astype(bool)
+        if not filters:
+            return mask
+
+        for field in FACET_FIELDS:
+            if field in filters:
+                allowed = np.zeros(len(mask), dtype=bool)
+                numbers = self.facets.get((field, filters[field]))
+                if numbers:
+                    allowed[np.frombuffer(numbers, dtype=np.int32)] = True
+                mask &= allowed
+        if 'min_score' in filters:
+            mask &= np.frombuffer(self.scores, dtype=np.float32) >= filters['min_score']
+        if 'since' in filters:
+            since = np.datetime64(str(filters['since']), 'D').astype(float)
+            mask &= np.frombuffer(self.dates, dtype=np.float64) >= since
+        return mask
+
+    def search(self, query: str, k: int = 20, filters: Optional[Dict[str, Any]] = None,
+               match_all: bool = True) -> List[Dict[str, Any]]:
+        """
+        Documentos ranqueados por BM25
+
+        Args:
+            query: Palavras-chave (normalizadas como no índice)
+            k: Número de resultados
+            filters: kind, persona, category, min_score e since (data ISO)
+            match_all: Exige todos os termos (interseção das posting lists); False = qualquer termo
+
+        Returns:
+            Metadados dos documentos com 'relevance_score' (BM25), do mais relevante ao menos
+        """
+        postings = [self.postings.get(term) for term in dict.fromkeys(tokenize(query))]
+        if not postings or not self._positions or (match_all and not all(postings)):
+            return []
+
+        active = np.frombuffer(self.active, dtype=np.int8).astype(bool)
+        mask = self._filter_mask(filters)
+        n_docs = len(self._positions)
+        average_length = self.total_length / n_docs
+        lengths = np.frombuffer(self.lengths, dtype=np.float32)
+        scores = np.zeros(len(self.docs), dtype=np.float32)
+        matched = np.zeros(len(self.docs), dtype=bool)
+
+        # Termos mais raros primeiro: na interseção a máscara encolhe a cada passo
+        for numbers, frequencies in sorted((p for p in postings if p), key=lambda p: len(p[0])):
+            numbers = np.frombuffer(numbers, dtype=np.int32)
+            frequencies = np.frombuffer(frequencies, dtype=np.float32)
+            df = int(active[numbers].sum())
+            keep = mask[numbers]
+            numbers, frequencies = numbers[keep], frequencies[keep]
+            if match_all:
+                mask = np.zeros_like(mask)
+                mask[numbers] = True
+
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[numbers] / average_length)
+            scores[numbers] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+            matched[numbers] = True
+
+        candidates = np.flatnonzero(mask if match_all else matched)
+        if len(candidates) == 0:
+            return []
+
+        top = candidates[np.argpartition(-scores[candidates], k)[:k]] if len(candidates) > k else candidates
+        top = top[np.argsort(-scores[top])]
+        return [{**self.docs[i], 'relevance_score': round(float(scores[i]), 4)} for i in top]
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+    def save(self, path: Optional[str] = None) -> str:
+        """Serializa o índice (compacta antes se muitos documentos foram removidos)"""
+        path = path or AppConfig.KEYWORD_INDEX_PATH
+        if len(self.docs) and 1 - len(self._positions) / len(self.docs) > COMPACT_RATIO:
+            self.compact()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'tokenizer': TOKENIZER_VERSION, 'index': self.__dict__}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        logger.info(f"Índice de palavras-chave salvo em: {path} ({len(self)} documentos)")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'KeywordIndex':
+        """Carrega o índice serializado; sem arquivo ou versão incompatível, índice vazio"""
+        path = path or AppConfig.KEYWORD_INDEX_PATH
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') != INDEX_VERSION:
+                raise ValueError(f"versão incompatível: {data.get('version')}")
+            if data.get('tokenizer') != TOKENIZER_VERSION:
+                raise ValueError(f"tokenização incompatível: {data.get('tokenizer')}")
+            index.__dict__.update(data['index'])
+        except Exception as e:
+            logger.warning(f"Índice de palavras-chave ignorado ({e})")
+            return cls()
+        return index
+
+
+def load_keyword_index(path: Optional[str] = None) -> KeywordIndex:
+    """Carrega o índice salvo, sincroniza com a biblioteca e grava se algo mudou"""
+    index = KeywordIndex.load(path)
+    changed = sync_library(index)
+    if changed:
+        logger.info(f"Índice de palavras-chave: {changed} documentos atualizados")
+        index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Busca por palavra-chave (BM25) - F5 Estratégia")
+    parser.add_argument('query', nargs='?', help='Palavras-chave (sem consulta, apenas atualiza o índice)')
+    parser.add_argument('-k', type=int, default=10, help='Número de resultados')
+    parser.add_argument('--any', action='store_true', help='Aceita documentos com qualquer termo')
+    parser.add_argument('--persona', choices=list(F5Config.PERSONAS))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_keyword_index()
+    print(f"📚 {len(index)} documentos, {len(index.postings)} termos ({time.perf_counter() - start:.2f}s)")
+
+    if args.query:
+        start = time.perf_counter()
+        results = index.search(args.query, args.k, {'persona': args.persona} if args.persona else None,
+                               match_all=not args.any)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for result in results:
+            print(f"  {result['relevance_score']:.2f}  {result['title'][:80]}")
+        print(f"🔎 {len(results)} resultados em {elapsed_ms:.1f} ms")
@@ -0,0 +1,238 @@
+"""
+LLM Cache - Cache persistente de respostas de IA
+Desenvolvido para F5 Estratégia - Respostas endereçadas por conteúdo (provedor, modelo, prompt, parâmetros)
+
+As respostas ficam em um SQLite local com expiração (TTL), despejo LRU e limite de tamanho.
+Reexecuções do mesmo catálogo ou reaberturas do mesmo vídeo no dashboard são servidas do cache.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+from config import AIConfig
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+
+def make_cache_key(provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Chave sha256 sobre (provedor, modelo, prompt, parâmetros de geração)
+
+    Args:
+        provider: Provedor de IA ('gemini', 'claude', 'openai')
+        model: Nome do modelo
+        prompt: Prompt completo (incluindo instrução de sistema, se houver)
+        params: Parâmetros de geração (temperature, max_tokens, ...)
+
+    Returns:
+        Hash hexadecimal estável entre execuções
+    """
+    payload = json.dumps(
+        {'provider': provider, 'model': model, 'prompt': prompt, 'params': params or {}},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Cache SQLite de respostas de IA com TTL, despejo LRU e limite de tamanho"""
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Arquivo SQLite (padrão: AIConfig.CACHE_PATH)
+            ttl_seconds: Validade das respostas (0 = sem expiração)
+            max_entries: Número máximo de respostas mantidas
+            max_bytes: Tamanho máximo somado das respostas
+        """
+        self.path = path or AIConfig.CACHE_PATH
+        self.ttl_seconds = AIConfig.CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or AIConfig.CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or AIConfig.CACHE_MAX_MB * 1024 * 1024
+
+        # Contadores da sessão (o total histórico fica na coluna hits)
+        self.hits = 0
+        self.misses = 0
+
+        # Uma conexão compartilhada entre as threads da etapa de IA assíncrona
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna a resposta armazenada ou None (ausente ou expirada)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                'UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?', (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, provider: str, model: str, response: str):
+        """Armazena uma resposta e aplica os limites de tamanho"""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, provider, model, response, size, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, provider, model, response, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Remove as respostas menos usadas recentemente até respeitar os limites (chamado com lock)"""
+        entries, total_bytes = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        excess_entries = max(0, entries - self.max_entries)
+        excess_bytes = max(0, total_bytes - self.max_bytes)
+        victims = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access ASC'):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            victims.append((key,))
+            excess_entries -= 1
+            excess_bytes -= size
+
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', victims)
+        logger.info(f"Cache de IA: {len(victims)} respostas removidas (LRU)")
+
+    def get_or_generate(self, provider: str, model: str, prompt: str, params: Dict[str, Any],
+                        generate: Callable[[], str], reuse_sampled: bool = False) -> str:
+        """
+        Busca a resposta no cache ou chama o provedor e armazena o resultado
+
+        Respostas com temperatura diferente de zero não são determinísticas, por isso
+        só são reaproveitadas quando reuse_sampled=True.
+
+        Args:
+            provider: Provedor de IA
+            model: Nome do modelo
+            prompt: Prompt completo
+            params: Parâmetros de geração
+            generate: Função que executa a chamada real
+            reuse_sampled: Reaproveita respostas geradas com temperatura > 0
+
+        Returns:
+            Texto da resposta
+        """
+        if params.get('temperature', 0) and not reuse_sampled:
+            return generate()
+
+        key = make_cache_key(provider, model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        response = generate()
+        if response:
+            self.set(key, provider, model, response)
+        return response
+
+    @property
+    def hit_rate(self) -> float:
+        """Taxa de acerto da sessão (0-1)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas da sessão e do armazenamento"""
+        with self._lock:
+            entries, total_bytes, lifetime_hits = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM responses'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'entries': entries,
+            'size_bytes': total_bytes,
+            'lifetime_hits': lifetime_hits
+        }
+
+    def prune(self) -> int:
+        """Remove respostas expiradas; retorna quantas foram removidas"""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """Remove todas as respostas"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache de respostas de IA - F5 Estratégia")
+    parser.add_argument('command', choices=['stats', 'prune', 'clear'], help='Ação sobre o cache')
+    parser.add_argument('--path', default=AIConfig.CACHE_PATH, help='Arquivo SQLite do cache')
+    args = parser.parse_args()
+
+    cache = LLMCache(args.path)
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"📦 {stats['entries']} respostas ({stats['size_bytes'] / 1024:.1f} KB)")
+        print(f"🎯 Acertos acumulados: {stats['lifetime_hits']}")
+    elif args.command == 'prune':
+        print(f"🧹 {cache.prune()} respostas expiradas removidas")
+    else:
+        cache.clear()
+        print("🗑️ Cache limpo")
+    cache.close()
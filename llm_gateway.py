@@ -0,0 +1,740 @@
+"""
+LLM Gateway - Cliente assíncrono multi-provedor de IA
+Desenvolvido para F5 Estratégia - Limites de concorrência e tokens/minuto por provedor,
+fallback Gemini → Claude → OpenAI dentro da mesma requisição e streaming para o Streamlit,
+com registro de tokens/custo e orçamento (ver llm_usage.py)
+"""
+
+import asyncio
+import contextvars
+import copy
+import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, AsyncIterator
+
+# SDKs assíncronos de IA (opcionais - apenas os instalados e configurados entram na cadeia)
+try:
+    import google.generativeai as genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+# Cache de contexto do Gemini (opcional - versões antigas do SDK não possuem)
+try:
+    from google.generativeai import caching as genai_caching
+    GEMINI_CACHING_AVAILABLE = True
+except ImportError:
+    GEMINI_CACHING_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from config import AIConfig
+from llm_cache import LLMCache, make_cache_key
+from llm_usage import UsageLedger, BudgetExceeded, BUDGET_ECONOMY, BUDGET_SKIP
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nomes exibidos nos relatórios
+PROVIDER_LABELS = {
+    'gemini': 'Gemini (Google AI)',
+    'claude': 'Claude (Anthropic)',
+    'openai': 'OpenAI'
+}
+
+
+# Uso real informado pelo provedor na chamada em andamento (preenchido por report_usage)
+_call_usage: contextvars.ContextVar = contextvars.ContextVar('llm_call_usage', default=None)
+
+
+class TruncatedResponse(RuntimeError):
+    """Resposta vazia ou cortada pelo limite de tokens (tratada como falha do provedor)"""
+
+
+def thinking_budget(model: str) -> Optional[int]:
+    """Orçamento de raciocínio do modelo Gemini (None para modelos sem raciocínio)"""
+    matches = [prefix for prefix in AIConfig.GEMINI_THINKING_BUDGETS if model.startswith(prefix)]
+    return AIConfig.GEMINI_THINKING_BUDGETS[max(matches, key=len)] if matches else None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa grosseira de tokens (~4 caracteres por token)"""
+    return max(1, len(text) // 4)
+
+
+def report_usage(input_tokens: Optional[int], output_tokens: Optional[int], cached_tokens: Optional[int] = 0):
+    """Informa ao gateway os tokens contados pela API (sem chamada em andamento, não faz nada)"""
+    usage = _call_usage.get()
+    if usage is None:
+        return
+    if input_tokens:
+        usage['input_tokens'] = input_tokens
+    if output_tokens:
+        usage['output_tokens'] = output_tokens
+    if cached_tokens:
+        usage['cached_tokens'] = cached_tokens
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """
+    Prefixo estático compartilhado por várias chamadas (ex.: contexto da marca)
+
+    Texto, hash e estimativa de tokens são calculados uma vez; o hash identifica o
+    prefixo no cache de contexto dos provedores e no cache local de respostas.
+    """
+    text: str
+    digest: str
+    tokens: int
+
+    @classmethod
+    def from_text(cls, text: str) -> 'PromptPrefix':
+        return cls(text, hashlib.sha256(text.encode('utf-8')).hexdigest(), estimate_tokens(text))
+
+
+@dataclass
+class LLMResponse:
+    """Resposta de uma chamada ao gateway"""
+    text: str
+    provider: str
+    model: str
+    latency: float
+    cached: bool = False
+
+
+class TokenBucket:
+    """
+    Balde de tokens por minuto compartilhado entre threads e event loops
+
+    A reserva é calculada sob um lock de thread e a espera é feita com asyncio.sleep,
+    então o mesmo balde vale para o pool assíncrono do catálogo e para chamadas síncronas.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Reserva tokens e retorna quantos segundos esperar até que estejam disponíveis"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Requisições maiores que a capacidade esperam o balde encher por completo
+            self.tokens -= min(amount, self.capacity)
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self, amount: float):
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def refund(self, amount: float):
+        """Devolve tokens reservados e não consumidos"""
+        if amount <= 0:
+            return
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ConcurrencyLimiter:
+    """
+    Limite de chamadas simultâneas compartilhado entre threads e event loops
+
+    Um threading.BoundedSemaphore por provedor no processo: generate_sync (um asyncio.run por
+    chamada) e o pool assíncrono do catálogo disputam as mesmas vagas. A espera é feita com
+    asyncio.sleep, como no TokenBucket, sem bloquear o event loop nem prender uma vaga se a
+    tarefa for cancelada.
+    """
+
+    def __init__(self, max_concurrent: int, poll_interval: float = 0.05):
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    async def __aenter__(self):
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(self.poll_interval)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class BaseProvider:
+    """Adaptador de provedor: geração completa e streaming assíncronos"""
+    name = ''
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def with_model(self, model: str) -> 'BaseProvider':
+        """Cópia do provedor usando outro modelo (mesmo cliente e credenciais)"""
+        clone = copy.copy(self)
+        clone.model = model
+        return clone
+
+    async def generate(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                       response_schema: Optional[Dict[str, Any]] = None,
+                       prefix: Optional[PromptPrefix] = None) -> str:
+        """
+        Resposta completa
+
+        Com response_schema, retorna JSON no formato pedido (modo nativo do provedor).
+        Com prefix, o prefixo estático vai antes de system/prompt usando o cache de contexto do provedor.
+        """
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, system: str, max_tokens: int, temperature: float,
+                     prefix: Optional[PromptPrefix] = None) -> AsyncIterator[str]:
+        # Padrão: uma única parte com a resposta completa
+        yield await self.generate(prompt, system, max_tokens, temperature, prefix=prefix)
+
+
+class GeminiProvider(BaseProvider):
+    name = 'gemini'
+    # Versões antigas do SDK não aceitam thinking_config (o limite de saída ainda reserva o orçamento)
+    _thinking_config_supported = True
+
+    def __init__(self, api_key: str, model: str):
+        super().__init__(model)
+        genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(model)
+        # Modelos ligados a cada prefixo: digest -> (modelo, expiração do CachedContent ou None)
+        self._prefixed: Dict[str, Any] = {}
+        self._prefix_lock = threading.Lock()
+
+    def with_model(self, model: str) -> 'GeminiProvider':
+        clone = super().with_model(model)
+        clone.client = genai.GenerativeModel(model)
+        clone._prefixed = {}
+        clone._prefix_lock = threading.Lock()
+        return clone
+
+    @staticmethod
+    def _report(response):
+        metadata = getattr(response, 'usage_metadata', None)
+        if metadata is not None:
+            report_usage(metadata.prompt_token_count, metadata.candidates_token_count,
+                         getattr(metadata, 'cached_content_token_count', 0))
+
+    def _register_prefix(self, prefix: PromptPrefix):
+        """Registra o prefixo como CachedContent; sem suporte, usa-o como system_instruction"""
+        if GEMINI_CACHING_AVAILABLE:
+            try:
+                ttl = AIConfig.CONTEXT_CACHE_TTL_SECONDS
+                cached_content = genai_caching.CachedContent.create(
+                    model=self.model,
+                    display_name=f"f5-{prefix.digest[:12]}",
+                    system_instruction=prefix.text,
+                    ttl=datetime.timedelta(seconds=ttl)
+                )
+                logger.info(f"Contexto registrado no cache do Gemini ({prefix.tokens} tokens estimados)")
+                # Renovado um pouco antes de expirar
+                return genai.GenerativeModel.from_cached_content(cached_content), time.time() + ttl * 0.9
+            except Exception as e:
+                # Ex.: prefixo abaixo do mínimo de tokens do cache explícito
+                logger.info(f"Cache explícito do Gemini indisponível, usando prefixo implícito: {e}")
+        return genai.GenerativeModel(self.model, system_instruction=prefix.text), None
+
+    def _fresh(self, prefix: PromptPrefix):
+        entry = self._prefixed.get(prefix.digest)
+        if entry is None or (entry[1] is not None and time.time() > entry[1]):
+            return None
+        return entry[0]
+
+    def _prefixed_model(self, prefix: PromptPrefix):
+        """Registra o prefixo uma única vez, mesmo com chamadas concorrentes de vários loops/threads"""
+        with self._prefix_lock:
+            model = self._fresh(prefix)
+            if model is None:
+                entry = self._register_prefix(prefix)
+                self._prefixed[prefix.digest] = entry
+                model = entry[0]
+            return model
+
+    async def _model_for(self, prefix: Optional[PromptPrefix]):
+        if prefix is None:
+            return self.client
+        return self._fresh(prefix) or await asyncio.to_thread(self._prefixed_model, prefix)
+
+    def _config(self, max_tokens: int, temperature: float, response_schema: Optional[Dict[str, Any]] = None):
+        """
+        Configuração de geração; nos modelos com raciocínio, max_tokens é só a resposta
+
+        Os tokens de raciocínio contam em max_output_tokens: sem somar o orçamento, limites curtos
+        (ex.: 60 tokens do título) se esgotam antes de qualquer texto.
+        """
+        options = {'max_output_tokens': max_tokens, 'temperature': temperature}
+        if response_schema:
+            options.update(response_mime_type='application/json', response_schema=response_schema)
+
+        budget = thinking_budget(self.model)
+        if budget is None:
+            return genai.types.GenerationConfig(**options)
+        options['max_output_tokens'] = max_tokens + budget
+        if GeminiProvider._thinking_config_supported:
+            try:
+                return genai.types.GenerationConfig(**options, thinking_config={'thinking_budget': budget})
+            except (TypeError, ValueError) as e:
+                GeminiProvider._thinking_config_supported = False
+                logger.info(f"SDK do Gemini sem thinking_config, reservando o orçamento no limite de saída: {e}")
+        return genai.types.GenerationConfig(**options)
+
+    @staticmethod
+    def _check_finish(response):
+        """TruncatedResponse se a resposta parou no limite de tokens ou veio sem texto"""
+        candidates = getattr(response, 'candidates', None) or []
+        reason = getattr(candidates[0], 'finish_reason', None) if candidates else None
+        if getattr(reason, 'name', reason) in ('MAX_TOKENS', 2):
+            raise TruncatedResponse("resposta cortada pelo limite de tokens (MAX_TOKENS)")
+        if not candidates or not getattr(getattr(candidates[0], 'content', None), 'parts', None):
+            raise TruncatedResponse(f"resposta vazia (finish_reason={getattr(reason, 'name', reason)})")
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        model = await self._model_for(prefix)
+        response = await model.generate_content_async(
+            prompt, generation_config=self._config(max_tokens, temperature, response_schema)
+        )
+        self._report(response)
+        self._check_finish(response)
+        return response.text
+
+    async def stream(self, prompt, system, max_tokens, temperature, prefix=None):
+        model = await self._model_for(prefix)
+        response = await model.generate_content_async(
+            prompt, generation_config=self._config(max_tokens, temperature), stream=True
+        )
+        chunk = None
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        # O último pedaço traz a contagem final
+        self._report(chunk)
+
+
+class ClaudeProvider(BaseProvider):
+    name = 'claude'
+
+    def __init__(self, api_key: str, model: str):
+        super().__init__(model)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+
+    @staticmethod
+    def _report(usage):
+        # input_tokens exclui o que foi lido/gravado no cache de contexto
+        cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        written = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        report_usage(usage.input_tokens + cached + written, usage.output_tokens, cached)
+
+    @staticmethod
+    def _system(system: str, prefix: Optional[PromptPrefix]) -> Dict[str, Any]:
+        """Prefixo como primeiro bloco de system com cache_control; a instrução específica vem depois"""
+        blocks = []
+        if prefix is not None:
+            blocks.append({"type": "text", "text": prefix.text, "cache_control": {"type": "ephemeral"}})
+        if system:
+            blocks.append({"type": "text", "text": system})
+        return {"system": blocks} if blocks else {}
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        if response_schema:
+            # Saída estruturada via tool use obrigatório: o input da ferramenta é o JSON
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                tools=[{
+                    "name": "registrar_resposta",
+                    "description": "Registra a resposta no formato estruturado exigido",
+                    "input_schema": response_schema
+                }],
+                tool_choice={"type": "tool", "name": "registrar_resposta"},
+                messages=[{"role": "user", "content": prompt}],
+                **self._system(system, prefix)
+            )
+            self._report(response.usage)
+            if response.stop_reason == 'max_tokens':
+                raise TruncatedResponse("resposta cortada pelo limite de tokens (max_tokens)")
+            for block in response.content:
+                if block.type == 'tool_use':
+                    return json.dumps(block.input, ensure_ascii=False)
+            return ''
+
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            **self._system(system, prefix)
+        )
+        self._report(response.usage)
+        if response.stop_reason == 'max_tokens':
+            raise TruncatedResponse("resposta cortada pelo limite de tokens (max_tokens)")
+        return response.content[0].text
+
+    async def stream(self, prompt, system, max_tokens, temperature, prefix=None):
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            **self._system(system, prefix)
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            self._report((await stream.get_final_message()).usage)
+
+
+class OpenAIProvider(BaseProvider):
+    name = 'openai'
+
+    def __init__(self, api_key: str, model: str):
+        super().__init__(model)
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+
+    def _messages(self, prompt: str, system: str, prefix: Optional[PromptPrefix] = None) -> List[Dict[str, str]]:
+        # Prefixo sempre na primeira mensagem: o cache automático do OpenAI reaproveita prefixos idênticos
+        messages = []
+        if prefix is not None:
+            messages.append({"role": "system", "content": prefix.text})
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        options = {}
+        if response_schema:
+            # Modo JSON: o schema segue no prompt, o formato é garantido pela API
+            options['response_format'] = {"type": "json_object"}
+            prompt = f"{prompt}\n\nResponda em JSON seguindo este schema:\n{json.dumps(response_schema, ensure_ascii=False)}"
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt, system, prefix),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **options
+        )
+        usage = response.usage
+        if usage is not None:
+            details = getattr(usage, 'prompt_tokens_details', None)
+            report_usage(usage.prompt_tokens, usage.completion_tokens,
+                         getattr(details, 'cached_tokens', 0) if details else 0)
+        if response.choices[0].finish_reason == 'length':
+            raise TruncatedResponse("resposta cortada pelo limite de tokens (length)")
+        return response.choices[0].message.content
+
+    async def stream(self, prompt, system, max_tokens, temperature, prefix=None):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt, system, prefix),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def build_providers() -> List[BaseProvider]:
+    """Instancia os provedores instalados e configurados, na ordem de AIConfig.PROVIDER_ORDER"""
+    factories = {
+        'gemini': (GEMINI_AVAILABLE, AIConfig.GEMINI_API_KEY, AIConfig.GEMINI_MODEL, GeminiProvider),
+        'claude': (ANTHROPIC_AVAILABLE, AIConfig.ANTHROPIC_API_KEY, AIConfig.CLAUDE_MODEL, ClaudeProvider),
+        'openai': (OPENAI_AVAILABLE, AIConfig.OPENAI_API_KEY, AIConfig.OPENAI_MODEL, OpenAIProvider)
+    }
+
+    providers = []
+    for name in AIConfig.PROVIDER_ORDER:
+        available, api_key, model, factory = factories[name]
+        if available and api_key:
+            try:
+                providers.append(factory(api_key, model))
+            except Exception as e:
+                logger.warning(f"Provedor {name} não pôde ser inicializado: {e}")
+    return providers
+
+
+class LLMGateway:
+    """Gateway assíncrono com limites por provedor, fallback em cadeia, cache de respostas e orçamento"""
+
+    def __init__(self, providers: Optional[List[BaseProvider]] = None, cache: Optional[LLMCache] = None,
+                 reuse_sampled: bool = False, ledger: Optional[UsageLedger] = None):
+        """
+        Args:
+            providers: Cadeia de provedores em ordem de preferência (padrão: build_providers())
+            cache: Cache persistente de respostas (opcional)
+            reuse_sampled: Reaproveita respostas em cache geradas com temperatura > 0
+            ledger: Registro de uso e orçamento (opcional; sem ele não há limite de custo)
+        """
+        self.providers = build_providers() if providers is None else providers
+        if not self.providers:
+            raise ValueError("Configure pelo menos uma API de IA (Gemini, Claude ou OpenAI)")
+
+        self.cache = cache
+        self.reuse_sampled = reuse_sampled
+        self.ledger = ledger
+        self._economy_providers: Optional[List[BaseProvider]] = None
+        self.buckets = {
+            provider.name: TokenBucket(AIConfig.PROVIDER_LIMITS[provider.name]['tokens_per_minute'])
+            for provider in self.providers
+        }
+        # Concorrência por provedor válida para o processo inteiro (todas as threads e loops)
+        self.limiters = {
+            provider.name: ConcurrencyLimiter(AIConfig.PROVIDER_LIMITS[provider.name]['max_concurrent'])
+            for provider in self.providers
+        }
+        self.calls: Dict[str, int] = {provider.name: 0 for provider in self.providers}
+        self.failures: Dict[str, int] = {provider.name: 0 for provider in self.providers}
+
+    @property
+    def primary(self) -> BaseProvider:
+        return self.providers[0]
+
+    @property
+    def economy_providers(self) -> List[BaseProvider]:
+        """Mesma cadeia usando AIConfig.ECONOMY_MODELS (criada sob demanda)"""
+        if self._economy_providers is None:
+            self._economy_providers = [
+                provider.with_model(AIConfig.ECONOMY_MODELS[provider.name])
+                if AIConfig.ECONOMY_MODELS.get(provider.name, provider.model) != provider.model else provider
+                for provider in self.providers
+            ]
+        return self._economy_providers
+
+    def budget_mode(self) -> str:
+        """Modo de orçamento atual ('normal' sem ledger)"""
+        return self.ledger.budget_mode() if self.ledger else 'normal'
+
+    def _chain(self) -> List[BaseProvider]:
+        """Cadeia de provedores conforme o orçamento; BudgetExceeded se esgotado"""
+        mode = self.budget_mode()
+        if mode == BUDGET_SKIP:
+            raise BudgetExceeded("Orçamento de IA esgotado")
+        return self.economy_providers if mode == BUDGET_ECONOMY else self.providers
+
+    def _cache_key(self, provider: BaseProvider, prompt: str, params: Dict[str, Any]) -> Optional[str]:
+        if self.cache is None or (params['temperature'] and not self.reuse_sampled):
+            return None
+        return make_cache_key(provider.name, provider.model, prompt, params)
+
+    @staticmethod
+    def _input_tokens(prompt: str, system: str, prefix: Optional[PromptPrefix]) -> int:
+        return estimate_tokens(system + prompt) + (prefix.tokens if prefix else 0)
+
+    def _record(self, provider: BaseProvider, feature: str, usage: Dict[str, int], latency: float,
+                from_cache: bool = False):
+        if self.ledger is None:
+            return
+        try:
+            self.ledger.record(provider.name, provider.model, feature, usage['input_tokens'],
+                               usage['output_tokens'], latency, usage.get('cached_tokens', 0), from_cache)
+        except Exception as e:
+            logger.warning(f"Falha ao registrar uso de IA: {e}")
+
+    async def generate(self, prompt: str, system: str = '', max_tokens: Optional[int] = None,
+                       temperature: Optional[float] = None,
+                       response_schema: Optional[Dict[str, Any]] = None,
+                       prefix: Optional[PromptPrefix] = None, feature: str = 'general') -> LLMResponse:
+        """
+        Gera uma resposta completa, tentando cada provedor da cadeia até um responder
+
+        Args:
+            prompt: Prompt do usuário (apenas a parte específica da chamada)
+            system: Instrução de sistema
+            max_tokens: Limite de tokens de saída (padrão: AIConfig.MAX_TOKENS)
+            temperature: Temperatura (padrão: AIConfig.TEMPERATURE)
+            response_schema: Schema JSON da resposta (modo estruturado de cada provedor)
+            prefix: Contexto estático reaproveitado via cache de contexto do provedor
+            feature: Tarefa que originou a chamada (agrupamento do registro de uso)
+
+        Returns:
+            LLMResponse com o provedor que efetivamente respondeu
+
+        Raises:
+            BudgetExceeded: Orçamento diário ou da execução esgotado
+        """
+        max_tokens = max_tokens or AIConfig.MAX_TOKENS
+        temperature = AIConfig.TEMPERATURE if temperature is None else temperature
+        params = {'system': system, 'max_tokens': max_tokens, 'temperature': temperature}
+        if response_schema:
+            params['response_schema'] = response_schema
+        if prefix is not None:
+            params['prefix'] = prefix.digest
+        errors = []
+
+        for provider in self._chain():
+            key = self._cache_key(provider, prompt, params)
+            if key:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._record(provider, feature, {'input_tokens': 0, 'output_tokens': 0}, 0.0, from_cache=True)
+                    return LLMResponse(cached, provider.name, provider.model, 0.0, cached=True)
+
+            try:
+                text, latency, usage = await self._call(provider, prompt, system, max_tokens, temperature,
+                                                        response_schema, prefix)
+                if not (text or '').strip():
+                    raise TruncatedResponse("resposta vazia")
+            except Exception as e:
+                self.failures[provider.name] += 1
+                errors.append(f"{provider.name}: {e}")
+                logger.warning(f"Falha em {provider.name}, tentando próximo provedor: {e}")
+                continue
+
+            self._record(provider, feature, usage, latency)
+            if key and text:
+                self.cache.set(key, provider.name, provider.model, text)
+            return LLMResponse(text, provider.name, provider.model, latency)
+
+        raise RuntimeError(f"Todos os provedores de IA falharam: {'; '.join(errors)}")
+
+    async def _call(self, provider: BaseProvider, prompt: str, system: str,
+                    max_tokens: int, temperature: float, response_schema: Optional[Dict[str, Any]] = None,
+                    prefix: Optional[PromptPrefix] = None):
+        """Chamada a um provedor respeitando concorrência e tokens/minuto; retorna (texto, latência, uso)"""
+        bucket = self.buckets[provider.name]
+        input_tokens = self._input_tokens(prompt, system, prefix)
+        await bucket.acquire(input_tokens + max_tokens)
+
+        # O provedor informa a contagem real via report_usage; sem ela ficam as estimativas
+        usage = {'input_tokens': input_tokens}
+        token = _call_usage.set(usage)
+        try:
+            async with self.limiters[provider.name]:
+                start = time.perf_counter()
+                try:
+                    text = await asyncio.wait_for(
+                        provider.generate(prompt, system, max_tokens, temperature, response_schema, prefix),
+                        timeout=AIConfig.REQUEST_TIMEOUT
+                    )
+                except Exception:
+                    bucket.refund(max_tokens)
+                    raise
+                self.calls[provider.name] += 1
+        finally:
+            _call_usage.reset(token)
+
+        usage.setdefault('output_tokens', estimate_tokens(text or ''))
+        # Devolve a parte da reserva de saída que não foi usada
+        bucket.refund(max_tokens - usage['output_tokens'])
+        return text, time.perf_counter() - start, usage
+
+    async def stream(self, prompt: str, system: str = '', max_tokens: Optional[int] = None,
+                     temperature: Optional[float] = None,
+                     prefix: Optional[PromptPrefix] = None, feature: str = 'stream') -> AsyncIterator[str]:
+        """
+        Gera a resposta em partes à medida que o provedor as envia
+
+        O fallback só acontece antes da primeira parte; uma falha no meio do texto é propagada.
+        O texto completo vai para o cache de respostas (mesma chave de generate) e, num acerto,
+        é reenviado de uma vez sem chamar o provedor.
+        """
+        max_tokens = max_tokens or AIConfig.MAX_TOKENS
+        temperature = AIConfig.TEMPERATURE if temperature is None else temperature
+        params = {'system': system, 'max_tokens': max_tokens, 'temperature': temperature}
+        if prefix is not None:
+            params['prefix'] = prefix.digest
+        errors = []
+
+        for provider in self._chain():
+            key = self._cache_key(provider, prompt, params)
+            if key:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._record(provider, feature, {'input_tokens': 0, 'output_tokens': 0}, 0.0, from_cache=True)
+                    yield cached
+                    return
+
+            bucket = self.buckets[provider.name]
+            input_tokens = self._input_tokens(prompt, system, prefix)
+            await bucket.acquire(input_tokens + max_tokens)
+            emitted = []
+            usage = {'input_tokens': input_tokens}
+            _call_usage.set(usage)
+            start = time.perf_counter()
+
+            try:
+                async with self.limiters[provider.name]:
+                    async for chunk in provider.stream(prompt, system, max_tokens, temperature, prefix):
+                        emitted.append(chunk)
+                        yield chunk
+                self.calls[provider.name] += 1
+                usage.setdefault('output_tokens', estimate_tokens(''.join(emitted)))
+                bucket.refund(max_tokens - usage['output_tokens'])
+                self._record(provider, feature, usage, time.perf_counter() - start)
+                if key and emitted:
+                    self.cache.set(key, provider.name, provider.model, ''.join(emitted))
+                return
+            except Exception as e:
+                bucket.refund(max_tokens)
+                self.failures[provider.name] += 1
+                if emitted:
+                    raise
+                errors.append(f"{provider.name}: {e}")
+                logger.warning(f"Falha em {provider.name}, tentando próximo provedor: {e}")
+            finally:
+                # O gerador pode ser finalizado em outro contexto: limpa em vez de reset(token)
+                _call_usage.set(None)
+
+        raise RuntimeError(f"Todos os provedores de IA falharam: {'; '.join(errors)}")
+
+    def generate_sync(self, prompt: str, system: str = '', max_tokens: Optional[int] = None,
+                      temperature: Optional[float] = None,
+                      prefix: Optional[PromptPrefix] = None, feature: str = 'general') -> LLMResponse:
+        """Versão bloqueante de generate (para código fora de um event loop)"""
+        return asyncio.run(self.generate(prompt, system, max_tokens, temperature, prefix=prefix, feature=feature))
+
+    def stats(self) -> Dict[str, Any]:
+        """Chamadas e falhas por provedor, e gasto quando há registro de uso"""
+        stats = {'calls': dict(self.calls), 'failures': dict(self.failures)}
+        if self.ledger:
+            stats['cost'] = {'day': self.ledger.daily_cost, 'job': self.ledger.job_cost}
+        return stats
+
+
+def stream_to_streamlit(placeholder, gateway: LLMGateway, prompt: str, system: str = '',
+                        max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                        prefix: Optional[PromptPrefix] = None, feature: str = 'stream') -> str:
+    """
+    Exibe a resposta em um st.empty() conforme os tokens chegam
+
+    Args:
+        placeholder: Contêiner retornado por st.empty()
+        gateway: Gateway configurado
+        prompt: Prompt do usuário
+        prefix: Contexto estático (ver f5_context.get_f5_prefix)
+
+    Returns:
+        Texto completo gerado
+    """
+    async def consume() -> str:
+        text = ''
+        async for chunk in gateway.stream(prompt, system, max_tokens, temperature, prefix, feature):
+            text += chunk
+            placeholder.markdown(text + '▌')
+        placeholder.markdown(text)
+        return text
+
+    return asyncio.run(consume())
@@ -0,0 +1,236 @@
+"""
+LLM Usage - Contabilização de tokens, latência e custo das chamadas de IA
+Desenvolvido para F5 Estratégia - Orçamentos diário e por execução com troca para modelos econômicos
+
+Cada chamada do gateway é registrada em um SQLite local por provedor, modelo e tarefa.
+Ao atingir BUDGET_DOWNGRADE_RATIO do orçamento as chamadas passam para AIConfig.ECONOMY_MODELS;
+ao esgotá-lo a IA é pulada e o processamento segue apenas com as regras.
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional
+
+from config import AIConfig
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    job_id TEXT,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    cost REAL NOT NULL,
+    from_cache INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_usage_day ON usage(day);
+CREATE INDEX IF NOT EXISTS idx_usage_job ON usage(job_id);
+"""
+
+# Modos de operação conforme o orçamento consumido
+BUDGET_NORMAL = 'normal'
+BUDGET_ECONOMY = 'economy'
+BUDGET_SKIP = 'skip'
+
+
+class BudgetExceeded(RuntimeError):
+    """Orçamento de IA esgotado: a chamada não é feita"""
+
+
+def estimate_cost(provider: str, model: str, input_tokens: int, output_tokens: int,
+                  cached_tokens: int = 0) -> float:
+    """
+    Custo em USD de uma chamada
+
+    Args:
+        provider: Provedor de IA (define o desconto dos tokens lidos do cache de contexto)
+        model: Nome do modelo (ver AIConfig.MODEL_PRICING)
+        input_tokens: Tokens de entrada, incluindo os lidos do cache
+        output_tokens: Tokens de saída
+        cached_tokens: Parte da entrada servida pelo cache de contexto do provedor
+    """
+    input_price, output_price = AIConfig.MODEL_PRICING.get(model, AIConfig.DEFAULT_PRICING)
+    cached_ratio = AIConfig.CACHED_INPUT_PRICE_RATIO.get(provider, 1.0)
+    cached_tokens = min(cached_tokens, input_tokens)
+    billed_input = (input_tokens - cached_tokens) + cached_tokens * cached_ratio
+    return (billed_input * input_price + output_tokens * output_price) / 1_000_000
+
+
+class UsageLedger:
+    """Registro de uso das chamadas de IA com orçamento diário e por execução"""
+
+    def __init__(self, path: Optional[str] = None, daily_budget: Optional[float] = None,
+                 job_budget: Optional[float] = None, downgrade_ratio: Optional[float] = None):
+        """
+        Args:
+            path: Arquivo SQLite (padrão: AIConfig.USAGE_PATH)
+            daily_budget: Limite diário em USD (0 = sem limite; padrão: AIConfig.DAILY_BUDGET_USD)
+            job_budget: Limite por execução em USD (0 = sem limite; padrão: AIConfig.JOB_BUDGET_USD)
+            downgrade_ratio: Fração do orçamento a partir da qual usa os modelos econômicos
+        """
+        self.path = path or AIConfig.USAGE_PATH
+        self.daily_budget = AIConfig.DAILY_BUDGET_USD if daily_budget is None else daily_budget
+        self.job_budget = AIConfig.JOB_BUDGET_USD if job_budget is None else job_budget
+        self.downgrade_ratio = AIConfig.BUDGET_DOWNGRADE_RATIO if downgrade_ratio is None else downgrade_ratio
+
+        self.job_id: Optional[str] = None
+        self.job_cost = 0.0
+        self._mode = BUDGET_NORMAL
+
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        # Gasto do dia lido uma vez; as chamadas seguintes só incrementam o total em memória
+        self._today = date.today().isoformat()
+        self.daily_cost = self._spent_on(self._today)
+
+    def _spent_on(self, day: str) -> float:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COALESCE(SUM(cost), 0) FROM usage WHERE day = ?', (day,)
+            ).fetchone()[0]
+
+    def start_job(self, name: str = 'job', budget: Optional[float] = None) -> str:
+        """Inicia uma execução (ex.: catálogo noturno); o orçamento por execução conta a partir daqui"""
+        self.job_id = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.job_cost = 0.0
+        if budget is not None:
+            self.job_budget = budget
+        self._mode = BUDGET_NORMAL
+        return self.job_id
+
+    def record(self, provider: str, model: str, feature: str, input_tokens: int, output_tokens: int,
+               latency: float, cached_tokens: int = 0, from_cache: bool = False) -> float:
+        """
+        Registra uma chamada e retorna seu custo em USD
+
+        Respostas servidas pelo cache local são registradas com custo zero.
+        """
+        cost = 0.0 if from_cache else estimate_cost(provider, model, input_tokens, output_tokens, cached_tokens)
+        now = time.time()
+        day = date.today().isoformat()
+        with self._lock:
+            if day != self._today:
+                self._today, self.daily_cost = day, 0.0
+            self.daily_cost += cost
+            self.job_cost += cost
+            self._conn.execute(
+                'INSERT INTO usage (created_at, day, job_id, provider, model, feature, input_tokens, '
+                'cached_tokens, output_tokens, latency, cost, from_cache) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (now, day, self.job_id, provider, model, feature, input_tokens, cached_tokens,
+                 output_tokens, latency, cost, int(from_cache))
+            )
+            self._conn.commit()
+        return cost
+
+    def budget_mode(self) -> str:
+        """Modo atual: 'normal', 'economy' (modelos econômicos) ou 'skip' (sem IA)"""
+        usage = 0.0
+        if self.daily_budget:
+            usage = max(usage, self.daily_cost / self.daily_budget)
+        if self.job_budget:
+            usage = max(usage, self.job_cost / self.job_budget)
+
+        if usage >= 1.0:
+            mode = BUDGET_SKIP
+        elif usage >= self.downgrade_ratio:
+            mode = BUDGET_ECONOMY
+        else:
+            mode = BUDGET_NORMAL
+
+        if mode != self._mode:
+            self._mode = mode
+            logger.warning(f"Orçamento de IA em {usage:.0%} (dia: ${self.daily_cost:.4f}, "
+                           f"execução: ${self.job_cost:.4f}) - modo {mode}")
+        return mode
+
+    def summary(self, since_day: Optional[str] = None, job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Totais por provedor, modelo e tarefa
+
+        Args:
+            since_day: Data inicial (YYYY-MM-DD) inclusiva
+            job_id: Restringe a uma execução
+
+        Returns:
+            Lista de dicts com chamadas, tokens, latência média e custo, do maior custo para o menor
+        """
+        conditions, args = [], []
+        if since_day:
+            conditions.append('day >= ?')
+            args.append(since_day)
+        if job_id:
+            conditions.append('job_id = ?')
+            args.append(job_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT provider, model, feature, COUNT(*), SUM(from_cache), SUM(input_tokens), '
+                'SUM(cached_tokens), SUM(output_tokens), AVG(CASE WHEN from_cache = 0 THEN latency END), SUM(cost) '
+                f'FROM usage {where} GROUP BY provider, model, feature ORDER BY SUM(cost) DESC',
+                args
+            ).fetchall()
+
+        return [
+            {
+                'provider': provider, 'model': model, 'feature': feature, 'calls': calls,
+                'cache_hits': cache_hits, 'input_tokens': input_tokens, 'cached_tokens': cached_tokens,
+                'output_tokens': output_tokens, 'avg_latency': round(avg_latency or 0.0, 3),
+                'cost': round(cost, 6)
+            }
+            for provider, model, feature, calls, cache_hits, input_tokens, cached_tokens,
+            output_tokens, avg_latency, cost in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def print_summary(rows: List[Dict[str, Any]]):
+    """Exibe o resumo de uso em formato de tabela"""
+    if not rows:
+        print("Nenhuma chamada registrada")
+        return
+    print(f"{'provedor':<8} {'modelo':<28} {'tarefa':<12} {'chamadas':>8} {'cache':>6} "
+          f"{'entrada':>10} {'saída':>8} {'lat.(s)':>7} {'custo US$':>10}")
+    for row in rows:
+        print(f"{row['provider']:<8} {row['model']:<28} {row['feature']:<12} {row['calls']:>8} "
+              f"{row['cache_hits']:>6} {row['input_tokens']:>10} {row['output_tokens']:>8} "
+              f"{row['avg_latency']:>7.2f} {row['cost']:>10.4f}")
+    print(f"💰 Total: US$ {sum(row['cost'] for row in rows):.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uso e custo das chamadas de IA - F5 Estratégia")
+    parser.add_argument('--days', type=int, default=1, help='Dias considerados no resumo (1 = hoje)')
+    parser.add_argument('--job', help='Resumo de uma execução específica')
+    parser.add_argument('--path', default=AIConfig.USAGE_PATH, help='Arquivo SQLite de uso')
+    args = parser.parse_args()
+
+    ledger = UsageLedger(args.path)
+    since = (date.today() - timedelta(days=max(1, args.days) - 1)).isoformat()
+    print_summary(ledger.summary(since_day=None if args.job else since, job_id=args.job))
+    if ledger.daily_budget:
+        print(f"📅 Hoje: US$ {ledger.daily_cost:.4f} de US$ {ledger.daily_budget:.2f}")
+    ledger.close()
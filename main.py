@@ -23,6 +23,8 @@ import json
 # Imports locais
 from youtube_api_manager import initialize_youtube_system
 from content_optimizer import ContentOptimizer
+from catalog_optimizer import CatalogOptimizer
+from batch_scoring import load_videos_csv
 from competitor_analyzer import CompetitorAnalyzer
 from dashboard import create_f5_dashboard
 from config import validate_config, AppConfig, F5Config
@@ -151,6 +153,41 @@ class F5YouTubeOptimizer:
             logger.error(f"Erro na otimização de conteúdo: {e}")
             return {}
     
+    def optimize_catalog(self, csv_file: str, workers: int = None, concurrency: int = None,
+                         budget: float = None) -> List[Dict[str, Any]]:
+        """
+        Otimiza um catálogo de vídeos em paralelo
+        
+        Args:
+            csv_file: CSV com colunas titulo, descricao e tags
+            workers: Processos para pontuação por regras
+            concurrency: Chamadas de IA simultâneas
+            budget: Orçamento de IA da execução em USD (acima dele, só regras)
+        
+        Returns:
+            Resultados na ordem do CSV
+        """
+        print(f"\n📚 Otimizando catálogo: {csv_file}")
+        
+        try:
+            videos = load_videos_csv(csv_file)
+            catalog = CatalogOptimizer(
+                content_optimizer=self.content_optimizer,
+                workers=workers,
+                max_concurrency=concurrency,
+                job_budget=budget
+            )
+            results = catalog.run(videos)
+            
+            self._save_report('catalog_optimization', {'videos': results})
+            print("✅ Otimização do catálogo concluída!")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro na otimização do catálogo: {e}")
+            return []
+    
     def analyze_competitors(self, keywords: List[str] = None) -> Dict[str, Any]:
         """
         Executa análise competitiva completa
@@ -389,7 +426,7 @@ def main():
     
     parser.add_argument(
         '--mode', 
-        choices=['dashboard', 'analysis', 'optimize', 'competitors', 'suggestions'],
+        choices=['dashboard', 'analysis', 'optimize', 'catalog', 'competitors', 'suggestions'],
         default='dashboard',
         help='Modo de operação do sistema'
     )
@@ -400,6 +437,10 @@ def main():
     parser.add_argument('--persona', choices=['estrategico', 'crescimento', 'smart'], 
                        default='crescimento', help='Persona alvo')
     parser.add_argument('--days', type=int, default=30, help='Dias para análise histórica')
+    parser.add_argument('--csv', default='banco_videos_f5.csv', help='CSV do catálogo (modo catalog)')
+    parser.add_argument('--workers', type=int, help='Processos para pontuação por regras (modo catalog)')
+    parser.add_argument('--concurrency', type=int, help='Limite global de vídeos na etapa de IA (modo catalog)')
+    parser.add_argument('--budget', type=float, help='Orçamento de IA em USD para a execução (modo catalog)')
     
     args = parser.parse_args()
     
@@ -424,6 +465,9 @@ def main():
         }
         optimizer.optimize_video_content(video_data)
     
+    elif args.mode == 'catalog':
+        optimizer.optimize_catalog(args.csv, args.workers, args.concurrency, args.budget)
+    
     elif args.mode == 'competitors':
         optimizer.analyze_competitors()
     
@@ -18,7 +18,10 @@ import asyncio
 from pathlib import Path
 
 # Imports locais
-from content_optimizer import ContentOptimizer
+from content_optimizer import ContentOptimizer, GeminiContentOptimizer, RuleBasedAnalyzer
+from llm_gateway import stream_to_streamlit
+from content_index import ContentIndex, KIND_LABELS, load_library_index
+from keyword_index import KeywordIndex, load_keyword_index
 from competitor_analyzer import CompetitorAnalyzer
 from youtube_api_manager import initialize_youtube_system
 from config import F5Config, AppConfig
@@ -207,6 +210,28 @@ def load_custom_css():
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_ai_optimizer() -> Optional[GeminiContentOptimizer]:
+    """
+    Otimizador de IA compartilhado entre sessões (None se nenhuma API estiver configurada)
+
+    Reaproveita respostas amostradas do cache: cada interação refaz a página com o mesmo prompt.
+    """
+    try:
+        return GeminiContentOptimizer(reuse_sampled=True)
+    except ValueError:
+        return None
+
+@st.cache_resource
+def get_content_index() -> ContentIndex:
+    """Índice da biblioteca (vídeos, transcrições, pacotes SEO) sincronizado uma vez por processo"""
+    return load_library_index()
+
+@st.cache_resource
+def get_keyword_index() -> KeywordIndex:
+    """Índice invertido BM25 da biblioteca, carregado do disco e sincronizado uma vez por processo"""
+    return load_keyword_index()
+
 # Classes auxiliares
 class TranscriptionProcessor:
     """Processador avançado de transcrições"""
@@ -292,10 +317,29 @@ class TranscriptionProcessor:
         return found_terms
 
 class ContentSearchEngine:
-    """Motor de busca avançado para conteúdos"""
-    
-    def __init__(self):
+    """Motor de busca sobre o índice vetorial da biblioteca de conteúdos"""
+    
+    def __init__(self, index: Optional[ContentIndex] = None, keyword_index: Optional[KeywordIndex] = None):
+        """
+        Args:
+            index: Índice vetorial da biblioteca (vazio ou ausente: usa os conteúdos de exemplo)
+            keyword_index: Índice BM25 da biblioteca (vazio ou ausente: usa os conteúdos de exemplo)
+        """
         self.content_database = self._load_content_database()
+        self.index = index if index is not None and len(index) else self._build_sample_index(ContentIndex())
+        self.keyword_index = (keyword_index if keyword_index is not None and len(keyword_index)
+                              else self._build_sample_index(KeywordIndex()))
+    
+    def _build_sample_index(self, index):
+        """Índice em memória dos conteúdos de exemplo (biblioteca ainda não indexada)"""
+        for i, content in enumerate(self.content_database):
+            text = ' '.join([content['title'], content['category'], ' '.join(content['keywords'])])
+            index.add(f"sample:{i}", text, {**content, 'kind': 'video'})
+        return index
+    
+    def categories(self) -> List[str]:
+        """Categorias presentes no índice (para o filtro)"""
+        return sorted({doc['category'] for doc in self.index.docs if doc.get('category')})
     
     def _load_content_database(self) -> List[Dict[str, Any]]:
         """Carrega banco de dados de conteúdos"""
@@ -330,43 +374,22 @@ class ContentSearchEngine:
             }
         ]
     
-    def search_content(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Busca conteúdos baseado em query e filtros"""
-        results = []
-        query_lower = query.lower()
+    def search_content(self, query: str, filters: Dict[str, Any] = None, limit: int = 20,
+                       mode: str = 'semantic') -> List[Dict[str, Any]]:
+        """
+        Busca com filtros de persona, categoria, score mínimo e data
         
-        for content in self.content_database:
-            # Calcular score de relevância
-            relevance_score = 0
-            
-            # Busca no título
-            if query_lower in content['title'].lower():
-                relevance_score += 3
-            
-            # Busca nas keywords
-            for keyword in content['keywords']:
-                if query_lower in keyword.lower():
-                    relevance_score += 2
-            
-            # Busca na categoria
-            if query_lower in content['category'].lower():
-                relevance_score += 1
-            
-            # Aplicar filtros se fornecidos
-            if filters:
-                if 'persona' in filters and filters['persona'] != content['persona']:
-                    continue
-                if 'min_score' in filters and content['performance_score'] < filters['min_score']:
-                    continue
-            
-            if relevance_score > 0:
-                content_copy = content.copy()
-                content_copy['relevance_score'] = relevance_score
-                results.append(content_copy)
+        Args:
+            mode: 'semantic' (similaridade TF-IDF) ou 'keyword' (BM25, todos os termos exigidos)
         
-        # Ordenar por relevância
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return results
+        Returns:
+            Conteúdos com 'relevance_score', do mais relevante ao menos
+        """
+        if not query or not query.strip():
+            return []
+        if mode == 'keyword':
+            return self.keyword_index.search(query, k=limit, filters=filters)
+        return self.index.search(query, k=limit, filters=filters)
     
     def get_trending_topics(self) -> List[Dict[str, Any]]:
         """Retorna tópicos em tendência"""
@@ -611,6 +634,24 @@ def render_optimization_results(transcription: str, title: str, persona: str):
     with tab2:
         st.markdown("### 💡 Sugestões de Melhoria")
         
+        # Sugestões da IA exibidas conforme os tokens chegam
+        ai_optimizer = get_ai_optimizer()
+        if ai_optimizer:
+            st.markdown("#### 🤖 Sugestões da IA")
+            analysis = RuleBasedAnalyzer().analyze({'title': title, 'description': transcription, 'tags': []})
+            analysis.persona_target = persona
+            try:
+                stream_to_streamlit(
+                    st.empty(), ai_optimizer.gateway,
+                    ai_optimizer.build_suggestions_prompt(analysis, structured=False),
+                    system=ai_optimizer.SUGGESTIONS_SYSTEM,
+                    max_tokens=ai_optimizer.task_max_tokens('stream'),
+                    temperature=ai_optimizer.ai_config.TEMPERATURE,
+                    prefix=ai_optimizer.f5_prefix
+                )
+            except Exception as e:
+                st.error(f"❌ Erro ao gerar sugestões com IA: {e}")
+        
         suggestions = [
             {
                 'priority': 'Alta',
@@ -698,30 +739,46 @@ def page_content_search():
         with col2:
             search_button = st.button("Buscar", type="primary", use_container_width=True)
     
+    search_engine = ContentSearchEngine(get_content_index(), get_keyword_index())
+    
+    search_mode = st.radio(
+        "Tipo de busca:",
+        ["Semântica", "Palavra-chave exata"],
+        horizontal=True
+    )
+    
     # Filtros avançados
     with st.expander("🎛️ Filtros Avançados"):
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             persona_filter = st.selectbox("Persona:", ["Todas", "estrategico", "crescimento", "smart"])
         
         with col2:
-            min_score = st.slider("Score mínimo:", 0.0, 10.0, 7.0)
+            # Score SEO por regras: poucos documentos passam de 3, então o filtro começa desligado
+            min_score = st.slider("Score mínimo:", 0.0, 10.0, 0.0)
         
         with col3:
-            category_filter = st.selectbox("Categoria:", ["Todas", "Funil de Vendas", "Tráfego Pago", "Lead Generation"])
+            category_filter = st.selectbox("Categoria:", ["Todas"] + search_engine.categories())
+        
+        with col4:
+            since_filter = st.date_input("Desde:", value=None)
     
     # Exibir resultados
     if search_query or search_button:
-        search_engine = ContentSearchEngine()
-        
         filters = {}
         if persona_filter != "Todas":
             filters['persona'] = persona_filter
         if min_score > 0:
             filters['min_score'] = min_score
+        if category_filter != "Todas":
+            filters['category'] = category_filter
+        if since_filter:
+            filters['since'] = since_filter.isoformat()
         
-        results = search_engine.search_content(search_query, filters)
+        results = search_engine.search_content(
+            search_query, filters, mode='keyword' if search_mode == "Palavra-chave exata" else 'semantic'
+        )
         
         if results:
             st.markdown(f"### 📋 Resultados ({len(results)} encontrados)")
@@ -734,15 +791,21 @@ def page_content_search():
                     
                     with col1:
                         st.markdown(f"**{result['title']}**")
-                        st.markdown(f"📂 {result['category']} | 👤 {result['persona']}")
-                        st.markdown(f"🏷️ {', '.join(result['keywords'])}")
+                        st.markdown(f"📄 {KIND_LABELS.get(result.get('kind'), 'Conteúdo')} | "
+                                    f"📂 {result.get('category', '-')} | 👤 {result.get('persona', '-')}")
+                        if result.get('keywords'):
+                            st.markdown(f"🏷️ {', '.join(result['keywords'])}")
+                        st.caption(f"Relevância: {result['relevance_score']:.2f}")
                     
                     with col2:
-                        st.metric("Score", f"{result['performance_score']}/10")
-                        st.metric("Views", f"{result['views']:,}")
-                        st.metric("Engagement", f"{result['engagement_rate']}%")
+                        if result.get('performance_score') is not None:
+                            st.metric("Score", f"{result['performance_score']}/10")
+                        if result.get('views') is not None:
+                            st.metric("Views", f"{result['views']:,}")
+                        if result.get('engagement_rate') is not None:
+                            st.metric("Engagement", f"{result['engagement_rate']}%")
                     
-                    if st.button(f"Ver detalhes", key=f"detail_{result['title'][:20]}"):
+                    if st.button(f"Ver detalhes", key=f"detail_{result['id']}"):
                         st.info("🔜 Detalhes completos em breve...")
                     
                     st.markdown('</div>', unsafe_allow_html=True)
@@ -753,7 +816,6 @@ def page_content_search():
     st.markdown("---")
     st.markdown("### 🔥 Tópicos em Alta")
     
-    search_engine = ContentSearchEngine()
     trending = search_engine.get_trending_topics()
     
     cols = st.columns(len(trending))
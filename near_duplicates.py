@@ -0,0 +1,265 @@
+"""
+Near Duplicates - Detecção de vídeos quase idênticos por MinHash/LSH
+Desenvolvido para F5 Estratégia - Cortes da mesma palestra reaproveitam a otimização já gerada
+
+Cada vídeo vira um conjunto de shingles (trigramas de palavras normalizadas) sobre título,
+descrição e transcrição. As assinaturas MinHash estimam a similaridade de Jaccard e o LSH por
+bandas encontra candidatos sem comparar todos os pares. O índice é persistido em data/ e guarda,
+para cada vídeo, a otimização de IA reaproveitável.
+"""
+
+import json
+import logging
+import os
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+import numpy as np
+
+from config import AppConfig
+from text_analysis import TOKENIZER_VERSION, tokenize
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Primo de Mersenne 2^31 - 1: a * x cabe em uint64 sem estouro
+MERSENNE_PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Conjunto de n-gramas de palavras normalizadas (textos curtos usam as próprias palavras)"""
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return set(tokens)
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Similaridade de Jaccard exata entre dois conjuntos"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def video_text(video: Dict[str, Any]) -> str:
+    """Texto comparado: título, descrição, tags e transcrição (se houver)"""
+    tags = video.get('tags') or []
+    if isinstance(tags, str):
+        tags = [tags]
+    return ' '.join([
+        video.get('title', ''), video.get('description', ''), ' '.join(tags),
+        video.get('transcript', '') or video.get('transcription', '')
+    ])
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Escolhe (bandas, linhas) com bandas * linhas = num_perm
+
+    O limiar efetivo do LSH (1/b)^(1/r) fica logo abaixo do limiar pedido, favorecendo a
+    revocação; os candidatos são confirmados depois pela assinatura completa.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(b, r) for b, r in options if (1 / b) ** (1 / r) <= threshold]
+    return max(below or options, key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class MinHasher:
+    """Assinaturas MinHash vetorizadas com NumPy (permutações universais a * x + b mod p)"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 5):
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: Set[str]) -> np.ndarray:
+        """Assinatura uint32 de tamanho num_perm (conjunto vazio: todos os valores máximos)"""
+        if not items:
+            return np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode('utf-8')) for item in items), dtype=np.uint64, count=len(items)
+        ) % MERSENNE_PRIME
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def is_empty(signature: np.ndarray) -> bool:
+        """Assinatura de conjunto vazio (hashes reais ficam sempre abaixo do primo)"""
+        return bool(np.all(signature >= MERSENNE_PRIME))
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Jaccard estimado: fração de posições iguais"""
+        return float(np.mean(sig_a == sig_b))
+
+
+class NearDuplicateIndex:
+    """Índice LSH de assinaturas MinHash com a otimização reaproveitável de cada vídeo"""
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: int = 128, seed: int = 5):
+        """
+        Args:
+            threshold: Jaccard estimado mínimo para considerar quase duplicado
+                       (padrão: AppConfig.NEAR_DUPLICATE_THRESHOLD)
+            num_perm: Tamanho da assinatura MinHash
+            seed: Semente das permutações (precisa ser a mesma entre execuções)
+        """
+        self.threshold = AppConfig.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.seed = seed
+        self.bands, self.rows = lsh_bands(num_perm, self.threshold)
+
+        self.keys: List[str] = []
+        self.payloads: List[Optional[Dict[str, Any]]] = []
+        self._signatures: List[np.ndarray] = []
+        self._positions: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(shingles(text))
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key: str, signature: np.ndarray, payload: Optional[Dict[str, Any]] = None):
+        """
+        Adiciona ou substitui um vídeo (payload: otimização reaproveitável, serializável em JSON)
+
+        Vídeos sem texto (assinatura vazia) não são indexados: seriam "idênticos" a qualquer
+        outro vídeo vazio sem ter conteúdo em comum.
+        """
+        if self.hasher.is_empty(signature):
+            return
+        position = self._positions.get(key)
+        if position is not None:
+            # Substituição: a posição antiga sai dos buckets e deixa de ser consultada
+            for band_key in self._band_keys(self._signatures[position]):
+                self._buckets[band_key].remove(position)
+
+        position = len(self.keys)
+        self.keys.append(key)
+        self.payloads.append(payload)
+        self._signatures.append(signature)
+        self._positions[key] = position
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(position)
+
+    def query(self, signature: np.ndarray, limit: int = 5) -> List[Tuple[str, float, Optional[Dict[str, Any]]]]:
+        """
+        Vídeos quase duplicados, do mais similar para o menos
+
+        Returns:
+            Lista de (chave, similaridade estimada, payload) acima do limiar
+            (vazia para vídeos sem texto)
+        """
+        if self.hasher.is_empty(signature):
+            return []
+        candidates = {
+            position
+            for band_key in self._band_keys(signature)
+            for position in self._buckets.get(band_key, ())
+        }
+        matches = []
+        for position in candidates:
+            similarity = self.hasher.similarity(signature, self._signatures[position])
+            if similarity >= self.threshold:
+                matches.append((self.keys[position], similarity, self.payloads[position]))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+    def best_match(self, signature: np.ndarray,
+                   with_payload: bool = True) -> Optional[Tuple[str, float, Optional[Dict[str, Any]]]]:
+        """Vídeo mais similar (opcionalmente apenas entre os que têm otimização guardada)"""
+        for match in self.query(signature, limit=len(self.keys) or 1):
+            if match[2] is not None or not with_payload:
+                return match
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _metadata_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '.json'
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Salva assinaturas (.npy uint32) e chaves/payloads (.json) lado a lado"""
+        path = path or AppConfig.NEAR_DUPLICATE_INDEX_PATH
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        live = sorted(self._positions.values())
+        signatures = (np.stack([self._signatures[i] for i in live]) if live
+                      else np.empty((0, self.hasher.num_perm), dtype=np.uint32))
+        np.save(path, signatures)
+
+        metadata = {
+            'version': INDEX_VERSION,
+            'tokenizer': TOKENIZER_VERSION,
+            'threshold': self.threshold,
+            'num_perm': self.hasher.num_perm,
+            'seed': self.seed,
+            'keys': [self.keys[i] for i in live],
+            'payloads': [self.payloads[i] for i in live]
+        }
+        with open(self._metadata_path(path), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False)
+
+        logger.info(f"Índice de quase duplicados salvo em: {path} ({len(live)} vídeos)")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, threshold: Optional[float] = None) -> 'NearDuplicateIndex':
+        """Carrega o índice salvo; sem arquivo (ou versão incompatível), retorna um índice vazio"""
+        path = path or AppConfig.NEAR_DUPLICATE_INDEX_PATH
+        if not os.path.exists(path):
+            return cls(threshold)
+
+        try:
+            with open(cls._metadata_path(path), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('version') != INDEX_VERSION:
+                raise ValueError(f"versão incompatível: {metadata.get('version')}")
+            if metadata.get('tokenizer') != TOKENIZER_VERSION:
+                raise ValueError(f"tokenização incompatível: {metadata.get('tokenizer')}")
+            signatures = np.load(path)
+        except Exception as e:
+            logger.warning(f"Índice de quase duplicados ignorado ({e})")
+            return cls(threshold)
+
+        index = cls(metadata['threshold'] if threshold is None else threshold,
+                    num_perm=metadata['num_perm'], seed=metadata['seed'])
+        for key, signature, payload in zip(metadata['keys'], signatures, metadata['payloads']):
+            index.add(key, signature, payload)
+        return index
+
+
+if __name__ == "__main__":
+    import argparse
+    from batch_scoring import load_videos_csv
+
+    parser = argparse.ArgumentParser(description="Grupos de vídeos quase duplicados - F5 Estratégia")
+    parser.add_argument('--csv', default='banco_videos_f5.csv', help='CSV com titulo, descricao e tags')
+    parser.add_argument('--threshold', type=float, help='Jaccard mínimo (padrão: config)')
+    args = parser.parse_args()
+
+    videos = load_videos_csv(args.csv)
+    index = NearDuplicateIndex(args.threshold)
+    duplicates = 0
+    for video in videos:
+        signature = index.signature(video_text(video))
+        match = index.best_match(signature, with_payload=False)
+        if match:
+            duplicates += 1
+            print(f"🔁 {video['video_id']}: {video['title'][:60]}  ≈  {match[0]} ({match[1]:.0%})")
+        else:
+            index.add(video['video_id'], signature)
+    print(f"\n📊 {duplicates} de {len(videos)} vídeos têm um quase duplicado anterior")
@@ -9,6 +9,7 @@ import json
 import os
 from datetime import datetime, timedelta
 from content_optimizer import create_content_optimizer
+from catalog_optimizer import CatalogOptimizer
 
 def processar_banco_videos(arquivo_csv='banco_videos_f5.csv'):
     """
@@ -49,56 +50,55 @@ def processar_banco_videos(arquivo_csv='banco_videos_f5.csv'):
         print(f"❌ Erro ao ler CSV: {e}")
         return
     
-    # Processar cada vídeo
+    # Preparar dados dos vídeos
+    videos_data = [
+        {
+            'video_id': f'f5_video_{i:03d}',
+            'title': video['titulo'],
+            'description': video['descricao'],
+            'tags': video['tags'].split(',') if video['tags'] else []
+        }
+        for i, video in enumerate(videos, 1)
+    ]
+    
+    # Processar vídeos em paralelo (regras em processos, IA com concorrência limitada)
     resultados = []
     
     print("\n🤖 INICIANDO OTIMIZAÇÃO COM GEMINI 2.5 PRO...")
     print("="*70)
     
-    for i, video in enumerate(videos, 1):
-        print(f"\n📹 PROCESSANDO VÍDEO {i}/{len(videos)}:")
-        print(f"Título: {video['titulo'][:60]}...")
+    def registrar_resultado(indice, resultado):
+        video = videos[indice]
         
-        try:
-            # Preparar dados do vídeo
-            video_data = {
-                'video_id': f'f5_video_{i:03d}',
-                'title': video['titulo'],
-                'description': video['descricao'],
-                'tags': video['tags'].split(',') if video['tags'] else []
-            }
-            
-            # Otimizar com IA
-            resultado = optimizer.optimize_content(video_data)
-            
-            # Adicionar data sugerida de postagem
-            data_postagem = datetime.now() + timedelta(days=i-1)
-            
-            resultado_completo = {
-                'original': {
-                    'titulo': video['titulo'],
-                    'descricao': video['descricao'],
-                    'tags': video['tags']
-                },
-                'otimizado': {
-                    'titulo': resultado['optimized']['title'],
-                    'descricao': resultado['optimized']['description'],
-                    'tags': ', '.join(resultado['optimized']['tags']),
-                    'persona_alvo': resultado['persona_target'],
-                    'score_seo': resultado['analysis'].seo_score,
-                    'melhoria_pontos': resultado['improvement_potential'],
-                    'data_sugerida': data_postagem.strftime('%Y-%m-%d'),
-                    'sugestoes': resultado['analysis'].optimization_suggestions[:5]
-                }
+        if 'error' in resultado:
+            print(f"❌ Erro no vídeo {indice + 1} ({video['titulo'][:40]}...): {resultado['error']}")
+            return
+        
+        # Adicionar data sugerida de postagem
+        data_postagem = datetime.now() + timedelta(days=indice)
+        
+        resultado_completo = {
+            'original': {
+                'titulo': video['titulo'],
+                'descricao': video['descricao'],
+                'tags': video['tags']
+            },
+            'otimizado': {
+                'titulo': resultado['optimized']['title'],
+                'descricao': resultado['optimized']['description'],
+                'tags': ', '.join(resultado['optimized']['tags']),
+                'persona_alvo': resultado['persona_target'],
+                'score_seo': resultado['analysis'].seo_score,
+                'melhoria_pontos': resultado['improvement_potential'],
+                'data_sugerida': data_postagem.strftime('%Y-%m-%d'),
+                'sugestoes': [sugestao.to_dict() for sugestao in resultado['analysis'].optimization_suggestions[:5]]
             }
-            
-            resultados.append(resultado_completo)
-            
-            print(f"✅ Otimizado! Persona: {resultado['persona_target']}, SEO: {resultado['analysis'].seo_score}/10")
-            
-        except Exception as e:
-            print(f"❌ Erro: {e}")
-            continue
+        }
+        
+        resultados.append(resultado_completo)
+    
+    catalog = CatalogOptimizer(content_optimizer=optimizer)
+    catalog.run(videos_data, on_result=registrar_resultado)
     
     # Salvar resultados
     salvar_resultados(resultados)
@@ -221,7 +221,7 @@ def processar_video_individual(titulo, descricao, tags):
             'tags': tags.split(',') if isinstance(tags, str) else tags
         }
         
-        resultado = optimizer.optimize_content(video_data)
+        resultado = optimizer.optimize_existing_content(video_data)
         
         print(f"📹 ORIGINAL:")
         print(f"   Título: {titulo}")
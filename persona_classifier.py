@@ -0,0 +1,309 @@
+"""
+Persona Classifier - Classificador probabilístico de personas
+Desenvolvido para F5 Estratégia - Naive Bayes multinomial sobre n-gramas com hashing
+
+O modelo é treinado offline com títulos, descrições e transcrições rotulados,
+salvo como matriz de pesos .npy (memory-mapped na inicialização) + metadados JSON.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Produto esparso em lote (opcional - fallback por documento)
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from config import AppConfig, F5Config
+from text_analysis import TOKENIZER_VERSION, tokenize
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+DEFAULT_FEATURES = 2 ** 18
+DEFAULT_NGRAM_MAX = 2
+
+# Campos usados como texto de treino/predição
+TEXT_FIELDS = ('title', 'titulo', 'description', 'descricao', 'tags', 'transcript', 'transcricao', 'text')
+
+
+def hash_features(tokens: Sequence[str], n_features: int = DEFAULT_FEATURES,
+                  ngram_max: int = DEFAULT_NGRAM_MAX) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte tokens em features de n-gramas com hashing (crc32, estável entre processos)
+
+    Returns:
+        Tuple (índices únicos, contagens)
+    """
+    mask = n_features - 1
+    buckets = []
+    for n in range(1, ngram_max + 1):
+        for i in range(len(tokens) - n + 1):
+            ngram = ' '.join(tokens[i:i + n])
+            buckets.append(zlib.crc32(ngram.encode('utf-8')) & mask)
+
+    if not buckets:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    indices, counts = np.unique(np.array(buckets, dtype=np.int64), return_counts=True)
+    return indices, counts.astype(np.float32)
+
+
+def check_labels(labels: Sequence[str]):
+    """Garante que todas as personas existem em F5Config.PERSONAS (usadas pelos geradores de prompt)"""
+    unknown = sorted(set(labels) - set(F5Config.PERSONAS))
+    if unknown:
+        raise ValueError(f"Personas desconhecidas: {', '.join(unknown)} "
+                         f"(válidas: {', '.join(F5Config.PERSONAS)})")
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    """Softmax estável por linha"""
+    shifted = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class PersonaClassifier:
+    """Naive Bayes multinomial com features hasheadas e calibração por temperatura"""
+
+    def __init__(self, labels: List[str], feature_log_probs: np.ndarray, log_priors: np.ndarray,
+                 temperature: float = 1.0, ngram_max: int = DEFAULT_NGRAM_MAX):
+        self.labels = list(labels)
+        self.feature_log_probs = feature_log_probs  # (n_classes, n_features), possivelmente memmap
+        self.log_priors = np.asarray(log_priors, dtype=np.float64)
+        self.temperature = float(temperature)
+        self.ngram_max = ngram_max
+        self.n_features = feature_log_probs.shape[1]
+
+    # ------------------------------------------------------------------ #
+    # Treino
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def train(cls, texts: List[str], labels: List[str], n_features: int = DEFAULT_FEATURES,
+              ngram_max: int = DEFAULT_NGRAM_MAX, alpha: float = 1.0,
+              calibration_split: float = 0.2, seed: int = 42) -> 'PersonaClassifier':
+        """
+        Treina o classificador e calibra a temperatura em um conjunto separado
+
+        Args:
+            texts: Textos rotulados (título + descrição + transcrição)
+            labels: Persona de cada texto (chaves de F5Config.PERSONAS)
+            n_features: Tamanho do espaço de hashing (potência de 2)
+            ngram_max: Maior n-grama usado como feature
+            alpha: Suavização de Laplace
+            calibration_split: Fração reservada para calibrar as confianças
+
+        Returns:
+            PersonaClassifier treinado
+        """
+        if n_features & (n_features - 1):
+            raise ValueError("n_features deve ser potência de 2")
+
+        check_labels(labels)
+        classes = sorted(set(labels))
+        if len(classes) < 2:
+            raise ValueError("São necessárias ao menos duas personas rotuladas para treinar")
+
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(texts))
+        n_calibration = int(len(texts) * calibration_split) if len(texts) >= 10 else 0
+        calibration_idx, train_idx = order[:n_calibration], order[n_calibration:]
+
+        features = [hash_features(tokenize(text), n_features, ngram_max) for text in texts]
+        class_index = {label: k for k, label in enumerate(classes)}
+        y = np.array([class_index[label] for label in labels])
+
+        counts = np.zeros((len(classes), n_features), dtype=np.float64)
+        class_docs = np.zeros(len(classes), dtype=np.float64)
+        for i in train_idx:
+            indices, values = features[i]
+            counts[y[i], indices] += values
+            class_docs[y[i]] += 1
+
+        smoothed = counts + alpha
+        feature_log_probs = (np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))).astype(np.float32)
+        log_priors = np.log((class_docs + 1) / (class_docs.sum() + len(classes)))
+
+        model = cls(classes, feature_log_probs, log_priors, ngram_max=ngram_max)
+
+        if n_calibration:
+            raw = model._raw_scores([features[i] for i in calibration_idx])
+            model.temperature = model._fit_temperature(raw, y[calibration_idx])
+            logger.info(f"Temperatura calibrada: {model.temperature:.3f} ({n_calibration} exemplos)")
+
+        return model
+
+    @staticmethod
+    def _fit_temperature(raw_scores: np.ndarray, y: np.ndarray) -> float:
+        """Escolhe a temperatura que minimiza a log-loss no conjunto de calibração"""
+        best_temperature, best_loss = 1.0, np.inf
+        for temperature in np.logspace(-1, 3, 81):
+            probs = _softmax(raw_scores / temperature)
+            loss = -np.mean(np.log(probs[np.arange(len(y)), y] + 1e-12))
+            if loss < best_loss:
+                best_temperature, best_loss = float(temperature), loss
+        return best_temperature
+
+    # ------------------------------------------------------------------ #
+    # Predição
+    # ------------------------------------------------------------------ #
+    def _raw_scores(self, features: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Log-verossimilhança por classe para um lote de documentos já hasheados"""
+        if SCIPY_AVAILABLE and features:
+            indptr = np.cumsum([0] + [len(indices) for indices, _ in features])
+            indices = np.concatenate([indices for indices, _ in features])
+            values = np.concatenate([values for _, values in features])
+            matrix = sparse.csr_matrix((values, indices, indptr), shape=(len(features), self.n_features))
+            scores = np.asarray(matrix @ self.feature_log_probs.T, dtype=np.float64)
+        else:
+            scores = np.array([
+                self.feature_log_probs[:, indices] @ values for indices, values in features
+            ], dtype=np.float64).reshape(len(features), len(self.labels))
+        return scores + self.log_priors
+
+    def predict_proba_tokens(self, token_lists: List[Sequence[str]]) -> np.ndarray:
+        """Probabilidades calibradas para listas de tokens já normalizados (ver text_analysis.tokenize)"""
+        features = [hash_features(tokens, self.n_features, self.ngram_max) for tokens in token_lists]
+        return _softmax(self._raw_scores(features) / self.temperature)
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Probabilidades calibradas (n_textos x n_personas), na ordem de self.labels"""
+        return self.predict_proba_tokens([tokenize(text) for text in texts])
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Persona mais provável e confiança calibrada para cada texto"""
+        probs = self.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [(self.labels[k], float(probs[i, k])) for i, k in enumerate(best)]
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _metadata_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '.json'
+
+    def save(self, path: str) -> str:
+        """Salva pesos (.npy float32) e metadados (.json) lado a lado"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.save(path, np.ascontiguousarray(self.feature_log_probs, dtype=np.float32))
+
+        metadata = {
+            'version': MODEL_VERSION,
+            'tokenizer': TOKENIZER_VERSION,
+            'labels': self.labels,
+            'log_priors': self.log_priors.tolist(),
+            'temperature': self.temperature,
+            'ngram_max': self.ngram_max,
+            'n_features': self.n_features
+        }
+        with open(self._metadata_path(path), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        logger.info(f"Modelo de personas salvo em: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'PersonaClassifier':
+        """Carrega o modelo; os pesos são memory-mapped por padrão"""
+        with open(cls._metadata_path(path), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+
+        if metadata.get('version') != MODEL_VERSION:
+            raise ValueError(f"Versão de modelo incompatível: {metadata.get('version')}")
+        if metadata.get('tokenizer') != TOKENIZER_VERSION:
+            raise ValueError(f"Tokenização incompatível (retreine o modelo): {metadata.get('tokenizer')}")
+        check_labels(metadata['labels'])
+
+        weights = np.load(path, mmap_mode='r' if mmap else None)
+        return cls(
+            metadata['labels'], weights, np.array(metadata['log_priors']),
+            temperature=metadata['temperature'], ngram_max=metadata['ngram_max']
+        )
+
+
+@lru_cache(maxsize=None)
+def get_persona_classifier(path: Optional[str] = None) -> Optional[PersonaClassifier]:
+    """Carrega o modelo uma vez por processo; retorna None se não houver modelo treinado"""
+    path = path or AppConfig.PERSONA_MODEL_PATH
+    if not os.path.exists(path):
+        return None
+
+    try:
+        return PersonaClassifier.load(path)
+    except Exception as e:
+        logger.error(f"Erro ao carregar modelo de personas: {e}")
+        return None
+
+
+def load_labelled_data(path: str) -> Tuple[List[str], List[str]]:
+    """
+    Lê exemplos rotulados de CSV ou JSONL (coluna 'persona' + campos de texto)
+
+    Returns:
+        Tuple (textos, personas)
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+    texts, labels = [], []
+    for row in rows:
+        if not row.get('persona'):
+            continue
+        parts = []
+        for name in TEXT_FIELDS:
+            value = row.get(name)
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if value:
+                parts.append(str(value))
+        if parts:
+            texts.append(' '.join(parts))
+            labels.append(row['persona'].strip())
+
+    return texts, labels
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classificador de personas - F5 Estratégia")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Treina o modelo a partir de exemplos rotulados')
+    train_parser.add_argument('--data', required=True, help='CSV ou JSONL com coluna persona')
+    train_parser.add_argument('--output', default=AppConfig.PERSONA_MODEL_PATH, help='Arquivo .npy de saída')
+    train_parser.add_argument('--features', type=int, default=DEFAULT_FEATURES, help='Tamanho do hashing')
+    train_parser.add_argument('--alpha', type=float, default=1.0, help='Suavização de Laplace')
+
+    predict_parser = subparsers.add_parser('predict', help='Classifica um texto')
+    predict_parser.add_argument('text', help='Texto a classificar')
+    predict_parser.add_argument('--model', default=AppConfig.PERSONA_MODEL_PATH, help='Arquivo .npy do modelo')
+
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        texts, labels = load_labelled_data(args.data)
+        print(f"📁 {len(texts)} exemplos rotulados carregados")
+        classifier = PersonaClassifier.train(texts, labels, n_features=args.features, alpha=args.alpha)
+        classifier.save(args.output)
+        print(f"✅ Modelo salvo em: {args.output}")
+    else:
+        classifier = PersonaClassifier.load(args.model)
+        probs = classifier.predict_proba([args.text])[0]
+        for label, prob in sorted(zip(classifier.labels, probs), key=lambda x: x[1], reverse=True):
+            print(f"   • {label}: {prob:.1%}")
@@ -0,0 +1,224 @@
+"""
+Phrase Ranker - Frases-chave por centralidade (TextRank/LexRank) sobre os segmentos da transcrição
+Desenvolvido para F5 Estratégia - Pontos principais das descrições com o minuto em que aparecem
+
+Cada frase dos segmentos (transcript_parser) vira um vetor TF-IDF esparso (tokens normalizados,
+sem stopwords). A similaridade de cosseno entre frases forma um grafo, e o PageRank do grafo,
+calculado por iteração de potência vetorizada, mede o quanto cada frase resume as demais.
+O teleporte favorece frases com termos da F5 (PageRank personalizado), e frases quase
+iguais às já escolhidas são puladas para que os pontos não se repitam.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Grafo esparso (opcional - fallback denso com NumPy)
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from f5_lexicon import LEXICON
+from text_analysis import normalize_text, stem, tokenize
+from transcript_parser import TranscriptSegment, format_timestamp
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tamanho das frases candidatas (caracteres): curtas demais não servem de ponto na descrição
+MIN_PHRASE_LENGTH = 40
+MAX_PHRASE_LENGTH = 150
+
+# PageRank
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+# Peso extra de teleporte para frases com termos da F5
+F5_TELEPORT_BOOST = 1.0
+
+# Frases com cosseno acima disso em relação a uma já escolhida são consideradas repetidas
+REDUNDANCY_THRESHOLD = 0.5
+
+SENTENCE_SPLIT = re.compile(r'[^.!?]+[.!?]*')
+
+# Stopwords na forma dos tokens de text_analysis.tokenize (sem acento, plural reduzido)
+STOPWORD_KEYS = frozenset(stem(normalize_text(word)) for word in LEXICON.stopwords)
+
+
+@dataclass
+class RankedPhrase:
+    """Frase da transcrição com sua centralidade e o instante em que começa (segundos ou None)"""
+    text: str
+    score: float
+    start: Optional[float]
+    speaker: str = ''
+
+    @property
+    def timestamp(self) -> str:
+        """Início no formato do YouTube (M:SS ou H:MM:SS); vazio se o texto não tem timecode"""
+        return format_timestamp(self.start) if self.start is not None else ''
+
+    def with_timestamp(self) -> str:
+        """Texto seguido do minuto, como ponto de descrição ('... (4:17)'); o YouTube torna o minuto clicável"""
+        return f"{self.text} ({self.timestamp})" if self.timestamp else self.text
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'text': self.text, 'score': round(self.score, 6), 'start': self.start,
+                'timestamp': self.timestamp, 'speaker': self.speaker}
+
+
+def split_sentences(segments: List[TranscriptSegment]) -> List[RankedPhrase]:
+    """
+    Frases candidatas dos segmentos, com o início estimado pela posição dentro do segmento
+
+    Returns:
+        RankedPhrase com score 0, na ordem da transcrição
+    """
+    phrases = []
+    for segment in segments:
+        length = max(len(segment.text), 1)
+        for match in SENTENCE_SPLIT.finditer(segment.text):
+            sentence = match.group().strip().rstrip('.!?').strip()
+            if not MIN_PHRASE_LENGTH <= len(sentence) <= MAX_PHRASE_LENGTH:
+                continue
+            start = None
+            if segment.start is not None:
+                start = segment.start + segment.duration * match.start() / length
+            phrases.append(RankedPhrase(sentence, 0.0, start, segment.speaker))
+    return phrases
+
+
+def tfidf_matrix(texts: List[str]):
+    """
+    Vetores TF-IDF (tf sublinear, idf entre as frases) normalizados, um por linha
+
+    Returns:
+        Tuple (matriz CSR - ou ndarray sem SciPy -, vocabulário termo -> coluna)
+    """
+    vocabulary: Dict[str, int] = {}
+    rows, columns, counts = [], [], []
+    for row, text in enumerate(texts):
+        terms: Dict[int, int] = {}
+        for token in tokenize(text):
+            if token in STOPWORD_KEYS or len(token) < 3:
+                continue
+            column = vocabulary.setdefault(token, len(vocabulary))
+            terms[column] = terms.get(column, 0) + 1
+        rows.extend([row] * len(terms))
+        columns.extend(terms)
+        counts.extend(terms.values())
+
+    rows = np.array(rows, dtype=np.int64)
+    columns = np.array(columns, dtype=np.int64)
+    tf = 1.0 + np.log(np.array(counts, dtype=np.float64))
+    df = np.bincount(columns, minlength=len(vocabulary))
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    values = tf * idf[columns]
+
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(texts)))
+    values = values / np.where(norms > 0, norms, 1.0)[rows]
+
+    shape = (len(texts), len(vocabulary))
+    if SCIPY_AVAILABLE:
+        return sparse.csr_matrix((values, (rows, columns)), shape=shape), vocabulary
+    matrix = np.zeros(shape)
+    matrix[rows, columns] = values
+    return matrix, vocabulary
+
+
+def pagerank(similarity, personalization: np.ndarray, damping: float = DAMPING) -> np.ndarray:
+    """
+    PageRank ponderado por iteração de potência
+
+    Args:
+        similarity: Matriz n x n de pesos não negativos (CSR ou ndarray), diagonal zerada
+        personalization: Distribuição de teleporte (soma 1)
+    """
+    n = similarity.shape[0]
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, out_weight))
+    # Transição por linha: P = D^-1 S; r <- d (P^T r + massa pendente) + (1 - d) p
+    if SCIPY_AVAILABLE and sparse.issparse(similarity):
+        transition_t = (sparse.diags(inverse) @ similarity).T.tocsr()
+    else:
+        transition_t = (similarity * inverse[:, None]).T
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = damping * (transition_t @ scores + scores[dangling].sum() * personalization) \
+            + (1 - damping) * personalization
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def rank_phrases(segments: List[TranscriptSegment], max_phrases: Optional[int] = None) -> List[RankedPhrase]:
+    """
+    Frases mais centrais da transcrição, sem repetições
+
+    Args:
+        segments: Segmentos da transcrição (transcript_parser)
+        max_phrases: Limite de frases (None = todas as não redundantes)
+
+    Returns:
+        RankedPhrase em ordem decrescente de score
+    """
+    phrases = split_sentences(segments)
+    if not phrases:
+        return []
+
+    matrix, _ = tfidf_matrix([phrase.text for phrase in phrases])
+    similarity = matrix @ matrix.T
+    if SCIPY_AVAILABLE:
+        similarity = sparse.csr_matrix(similarity)
+        similarity.setdiag(0)
+        similarity.eliminate_zeros()
+    else:
+        np.fill_diagonal(similarity, 0.0)
+
+    # Teleporte maior para frases com termos da F5 (mesmo critério do bônus de palavras-chave)
+    f5_stems = LEXICON.f5_stems
+    teleport = np.array([
+        1.0 + F5_TELEPORT_BOOST * any(token in f5_stems for token in tokenize(phrase.text))
+        for phrase in phrases
+    ])
+    scores = pagerank(similarity, teleport / teleport.sum())
+
+    selected: List[int] = []
+    for index in np.argsort(-scores, kind='stable'):
+        if max_phrases and len(selected) >= max_phrases:
+            break
+        if selected:
+            overlap = matrix[index] @ matrix[selected].T
+            overlap = overlap.toarray() if SCIPY_AVAILABLE else overlap
+            if np.max(overlap) > REDUNDANCY_THRESHOLD:
+                continue
+        selected.append(int(index))
+
+    return [RankedPhrase(phrases[i].text, float(scores[i]), phrases[i].start, phrases[i].speaker)
+            for i in selected]
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from transcript_parser import parse_file
+
+    parser = argparse.ArgumentParser(description="Frases-chave de uma transcrição (TextRank) - F5 Estratégia")
+    parser.add_argument('file', help='Arquivo de transcrição (.txt)')
+    parser.add_argument('-n', '--top', type=int, default=10, help='Quantidade de frases')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ranked = rank_phrases(list(parse_file(args.file)), args.top)
+    for phrase in ranked:
+        print(f"   [{phrase.timestamp or '-'}] {phrase.score:.4f}  {phrase.text}")
+    print(f"\n⏱️ {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -16,16 +16,13 @@ class SEOPromptGenerator:
         self.template_prompts = self._load_template_prompts()
     
     def _load_template_prompts(self) -> Dict[str, str]:
-        """Carrega templates de prompts para diferentes temas"""
+        """Carrega templates de prompts para diferentes temas (instruções fixas primeiro, transcrição no final)"""
         return {
             'universal': """
 SISTEMA DE OTIMIZAÇÃO SEO YOUTUBE - F5 ESTRATÉGIA
 
-TRANSCRIÇÃO:
-{transcription}
-
 INSTRUÇÕES:
-Analise a transcrição acima e gere conteúdo SEO otimizado seguindo estas especificações:
+Analise a transcrição abaixo e gere conteúdo SEO otimizado seguindo estas especificações:
 
 1. TÍTULO (máx. 100 caracteres):
    - Inclua palavras-chave principais
@@ -70,14 +67,14 @@ FORMATO DE SAÍDA:
   "recomendacoes": ["...", "..."]
 }}
 ```
+
+TRANSCRIÇÃO:
+{transcription}
 """,
             
             'autorresponsabilidade': """
 OTIMIZAÇÃO SEO ESPECÍFICA - AUTORRESPONSABILIDADE
 
-TRANSCRIÇÃO:
-{transcription}
-
 FOCO ESPECÍFICO: AUTORRESPONSABILIDADE
 Gere conteúdo otimizado para autorresponsabilidade, desenvolvimento pessoal e crescimento profissional.
 
@@ -99,14 +96,14 @@ PONTOS DE DESTAQUE:
 - Diferença entre culpa e responsabilidade
 - Técnicas de autorreflexão prática
 - Cases de transformação pessoal
+
+TRANSCRIÇÃO:
+{transcription}
 """,
             
             'comunicacao': """
 OTIMIZAÇÃO SEO ESPECÍFICA - COMUNICAÇÃO
 
-TRANSCRIÇÃO:
-{transcription}
-
 FOCO ESPECÍFICO: COMUNICAÇÃO ESTRATÉGICA
 Gere conteúdo otimizado para comunicação, oratória, persuasão e influência.
 
@@ -121,14 +118,14 @@ https://f5estrategia.com/comunicacao-estrategica
 
 CTA ESPECÍFICO:
 "Comunique-se com impacto e autoridade"
+
+TRANSCRIÇÃO:
+{transcription}
 """,
             
             'lideranca': """
 OTIMIZAÇÃO SEO ESPECÍFICA - LIDERANÇA
 
-TRANSCRIÇÃO:
-{transcription}
-
 FOCO ESPECÍFICO: LIDERANÇA E GESTÃO
 Gere conteúdo otimizado para liderança, gestão de equipes e alta performance.
 
@@ -143,14 +140,14 @@ https://f5estrategia.com/gestao-equipes
 
 CTA ESPECÍFICO:
 "Torne-se um líder extraordinário"
+
+TRANSCRIÇÃO:
+{transcription}
 """,
             
             'vendas': """
 OTIMIZAÇÃO SEO ESPECÍFICA - VENDAS
 
-TRANSCRIÇÃO:
-{transcription}
-
 FOCO ESPECÍFICO: VENDAS E NEGOCIAÇÃO
 Gere conteúdo otimizado para técnicas de vendas, negociação e fechamento.
 
@@ -165,6 +162,9 @@ https://f5estrategia.com/vendas-estrategicas
 
 CTA ESPECÍFICO:
 "Multiplique seus resultados em vendas"
+
+TRANSCRIÇÃO:
+{transcription}
 """
         }
     
@@ -226,43 +226,22 @@ CTA ESPECÍFICO:
         except Exception as e:
             return {'error': str(e)}
     
-    def generate_batch_prompts(self, transcription_directory: str) -> Dict[str, any]:
-        """Gera prompts para múltiplas transcrições em lote"""
-        results = {}
+    def generate_batch_prompts(self, transcription_directory: str, workers: int = None) -> Dict[str, any]:
+        """
+        Gera prompts para múltiplas transcrições em lote (em paralelo, ver batch_processor)
         
-        # Busca arquivos de transcrição
-        transcription_files = []
-        for root, dirs, files in os.walk(transcription_directory):
-            for file in files:
-                if file.endswith('.txt'):
-                    transcription_files.append(os.path.join(root, file))
-        
-        # Processa cada arquivo
-        for file_path in transcription_files:
-            try:
-                file_name = os.path.basename(file_path)
-                print(f"Processando: {file_name}")
-                
-                result = self.generate_structured_prompt(file_path)
-                results[file_name] = result
-                
-            except Exception as e:
-                results[file_name] = {'error': str(e)}
-        
-        # Salva resultados em lote
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        batch_output = f"reports/batch_seo_prompts_{timestamp}.json"
-        
-        os.makedirs('reports', exist_ok=True)
-        with open(batch_output, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        Cada prompt é gravado em reports/batch_prompt_<data>/ assim que fica pronto e o
+        relatório JSONL (output_file) recebe uma linha por transcrição.
+        """
+        from batch_processor import BatchProcessor
         
+        summary = BatchProcessor('prompt', workers=workers).run(transcription_directory, collect=True)
         return {
-            'processed_files': len(transcription_files),
-            'successful': len([r for r in results.values() if 'error' not in r]),
-            'failed': len([r for r in results.values() if 'error' in r]),
-            'output_file': batch_output,
-            'results': results
+            'processed_files': summary['processed'],
+            'successful': summary['successful'],
+            'failed': summary['failed'],
+            'output_file': summary['output_file'],
+            'results': summary['results']
         }
     
     def create_automation_template(self) -> str:
@@ -279,11 +258,8 @@ CTA ESPECÍFICO:
 ```
 SISTEMA DE OTIMIZAÇÃO SEO YOUTUBE - F5 ESTRATÉGIA
 
-TRANSCRIÇÃO:
-{TRANSCRICAO}
-
 INSTRUÇÕES:
-Analise a transcrição e gere:
+Analise a transcrição (no final) e gere:
 
 1. TÍTULO (máx. 100 chars): [Tema]: [Benefício] | F5 Estratégia
 2. DESCRIÇÃO (máx. 5000 chars): Intro + pontos principais + CTA + links + hashtags
@@ -299,6 +275,9 @@ FORMATO JSON:
   "tags": [...],
   "metadados": {...}
 }
+
+TRANSCRIÇÃO:
+{TRANSCRICAO}
 ```
 
 ## TEMAS ESPECÍFICOS
@@ -0,0 +1,116 @@
+"""
+Testes do batch_processor - descoberta de arquivos, relatório JSONL, retomada e regeneração incremental
+"""
+
+import json
+import os
+
+import pytest
+
+import build_manifest
+from batch_processor import BatchProcessor, completed_files, iter_transcription_files
+from config import AppConfig
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Transcricoes de Videos', 'Video 1',
+                      'f5-youtube-video1-Autorresponsabilidade_01mp4.txt')
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    monkeypatch.setattr(AppConfig, 'TRANSCRIPTIONS_DIR', str(tmp_path / 'lib'))
+    monkeypatch.setattr(AppConfig, 'CATALOG_CSV', str(tmp_path / 'sem_catalogo.csv'))
+    monkeypatch.setattr(AppConfig, 'CORPUS_STATS_PATH', str(tmp_path / 'data' / 'corpus_stats.npy'))
+    monkeypatch.setattr(AppConfig, 'BUILD_MANIFEST_PATH', str(tmp_path / 'data' / 'manifest.sqlite3'))
+    monkeypatch.setattr(AppConfig, 'BUILD_MANIFEST_ENABLED', True)
+    monkeypatch.setattr(build_manifest, '_manifest', None)
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        blocks = f.read().split('\n\n')
+    for name, part in [('A', blocks[:12]), ('B', blocks[12:24])]:
+        folder = tmp_path / 'lib' / name
+        folder.mkdir(parents=True)
+        (folder / 'palestra.txt').write_text('\n\n'.join(part), encoding='utf-8')
+    return tmp_path
+
+
+def run_batch(root, report, **kwargs):
+    processor = BatchProcessor('upload', workers=1, report_path=str(root / report), show_progress=False, **kwargs)
+    return processor.run(str(root / 'lib'))
+
+
+def read_outputs(root):
+    return {
+        (folder, name): (root / 'lib' / folder / name).read_text(encoding='utf-8')
+        for folder in ('A', 'B') for name in ('titulo.txt', 'descricao.txt', 'tags.txt', 'metadados.txt')
+    }
+
+
+def test_iter_transcription_files_skips_root_generated_and_hidden(tmp_path):
+    for relative in ['prompt.txt', 'A/palestra.txt', 'A/titulo.txt', 'A/descricao.txt', 'A/notas.md',
+                     'A/Parte 2/palestra.txt', '.cache/palestra.txt', 'B/.rascunho/palestra.txt', 'B/aula.txt']:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('texto', encoding='utf-8')
+
+    found = [os.path.relpath(path, tmp_path) for path in iter_transcription_files(str(tmp_path))]
+    assert found == [os.path.join('A', 'palestra.txt'), os.path.join('A', 'Parte 2', 'palestra.txt'),
+                     os.path.join('B', 'aula.txt')]
+
+
+def test_completed_files_ignores_failures_and_truncated_lines(tmp_path):
+    report = tmp_path / 'relatorio.jsonl'
+    report.write_text(
+        json.dumps({'file': 'A/palestra.txt', 'status': 'ok'}) + '\n'
+        + json.dumps({'file': 'B/palestra.txt', 'status': 'error', 'error': 'falhou'}) + '\n'
+        + '{"file": "C/palestra.txt", "sta', encoding='utf-8')
+    assert completed_files(str(report)) == {os.path.abspath('A/palestra.txt')}
+    assert completed_files(str(tmp_path / 'ausente.jsonl')) == set()
+
+
+def test_report_has_one_record_per_file(library):
+    run_batch(library, 'relatorio.jsonl')
+    with open(library / 'relatorio.jsonl', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+
+    assert [os.path.relpath(record['file'], library / 'lib') for record in records] == \
+        [os.path.join('A', 'palestra.txt'), os.path.join('B', 'palestra.txt')]
+    for record in records:
+        assert record['task'] == 'upload' and record['status'] == 'ok'
+        assert record['up_to_date'] is False
+        assert record['summary'] and record['elapsed'] >= 0 and record['finished_at']
+
+
+def test_resume_skips_files_already_in_the_report(library):
+    run_batch(library, 'relatorio.jsonl')
+    folder = library / 'lib' / 'C'
+    folder.mkdir()
+    (folder / 'palestra.txt').write_text((library / 'lib' / 'A' / 'palestra.txt').read_text(encoding='utf-8'),
+                                         encoding='utf-8')
+
+    resumed = run_batch(library, 'relatorio.jsonl', resume=True)
+    assert resumed['skipped'] == 2 and resumed['processed'] == 1
+    with open(library / 'relatorio.jsonl', encoding='utf-8') as f:
+        assert len(f.readlines()) == 3
+
+
+def test_second_run_on_unchanged_library_is_up_to_date(library):
+    first = run_batch(library, 'primeira.jsonl')
+    assert first['successful'] == 2 and first['up_to_date'] == 0
+    outputs = read_outputs(library)
+
+    second = run_batch(library, 'segunda.jsonl')
+    assert second['successful'] == 2 and second['up_to_date'] == 2
+    assert read_outputs(library) == outputs
+
+
+def test_new_transcript_does_not_regenerate_the_library(library):
+    run_batch(library, 'primeira.jsonl')
+    folder = library / 'lib' / 'C'
+    folder.mkdir()
+    (folder / 'palestra.txt').write_text((library / 'lib' / 'A' / 'palestra.txt').read_text(encoding='utf-8')
+                                         + '\n\nOutro trecho sobre liderança e equipes.', encoding='utf-8')
+
+    # O vídeo novo entra no IDF, mas só ele é gerado
+    third = run_batch(library, 'terceira.jsonl')
+    assert third['successful'] == 3 and third['up_to_date'] == 2
+    assert (folder / 'titulo.txt').exists()
@@ -0,0 +1,101 @@
+"""
+Testes do batch_scoring - matrizes documento-termo e pontuação vetorizada do catálogo
+"""
+
+import numpy as np
+import pytest
+
+from batch_scoring import KeywordWeights, build_document_term_matrices, score_batch
+from content_optimizer import RuleBasedAnalyzer
+from text_analysis import FIELDS, AnalyzedText
+
+VIDEOS = [
+    {'video_id': 'a', 'title': 'Funil de Vendas: como vender mais',
+     'description': 'Estratégias de marketing digital e métricas de conversão. Inscreva-se!',
+     'tags': ['funil de vendas', 'marketing digital']},
+    {'video_id': 'b', 'title': 'Liderança e gestão de equipes',
+     'description': 'Como liderar o time com resultados.', 'tags': ['liderança']},
+    {'video_id': 'c', 'title': '', 'description': '', 'tags': []},
+]
+
+
+def _dense(matrix):
+    return matrix.toarray() if hasattr(matrix, 'toarray') else matrix
+
+
+def test_matrices_match_keyword_counts():
+    weights = KeywordWeights()
+    analyzed_texts = [AnalyzedText.from_video(video) for video in VIDEOS]
+    matrices = build_document_term_matrices(analyzed_texts, weights.vocabulary)
+
+    for field_name in FIELDS:
+        dense = _dense(matrices[field_name])
+        expected = np.array([[analyzed.count(keyword, field_name) for keyword in weights.vocabulary]
+                             for analyzed in analyzed_texts])
+        assert dense.shape == expected.shape
+        assert np.array_equal(dense, expected)
+
+
+def test_keywords_sharing_a_stem_fill_every_column():
+    vocabulary = {'venda': 0, 'vendas': 1, 'funil de vendas': 2}
+    analyzed = AnalyzedText.from_fields('Vendas e mais vendas no funil de vendas', '', [])
+    title = _dense(build_document_term_matrices([analyzed], vocabulary)['title'])
+    assert title.tolist() == [[3, 3, 1]]
+
+
+CATALOG = VIDEOS + [
+    {'video_id': 'd', 'title': 'Tráfego Pago no Meta Ads: o guia para gerar leads e vender mais',
+     'description': ('Neste vídeo mostramos como usar tráfego pago, Meta Ads e Google Ads no funil de vendas '
+                     'com CRM e métricas de conversão. 00:00 Introdução 02:15 Campanhas 07:40 Resultados. '
+                     'Inscreva-se e ative o sininho!'),
+     'tags': ['tráfego pago', 'meta ads', 'google ads', 'crm', 'leads', 'funil de vendas', 'marketing digital']},
+    {'video_id': 'e', 'title': 'Governança e planejamento estratégico para grandes empresas',
+     'description': 'Como o conselho e a diretoria definem a estratégia, o orçamento e os indicadores do ano.',
+     'tags': ['governança', 'planejamento', 'estratégia', 'gestão', 'diretoria']},
+]
+
+
+@pytest.mark.parametrize('index', range(len(CATALOG)))
+def test_score_batch_matches_rule_based_analyzer(index):
+    video = CATALOG[index]
+    row = score_batch(CATALOG).iloc[index]
+    analyzer = RuleBasedAnalyzer()
+    analysis = analyzer.analyze(video)
+    analyzed = AnalyzedText.from_video(video)
+    seo = analyzer.seo_analyzer.analyze_seo(analyzed)
+    persona, confidence = analyzer.persona_targeting.identify_persona(analyzed)
+
+    assert row['video_id'] == video['video_id']
+    for pillar, pillar_score in analysis.chavi_score.items():
+        assert row[f'chavi_{pillar}'] == pytest.approx(pillar_score['score'], abs=0.01)
+        assert row[f'chavi_{pillar}_keywords'] == pillar_score['keywords_found']
+    assert row['persona_target'] == analysis.persona_target == persona
+    assert row['persona_confidence'] == pytest.approx(confidence)
+    assert row['seo_title'] == seo['title_analysis']['score']
+    assert row['seo_description'] == seo['description_analysis']['score']
+    assert row['seo_tags'] == seo['tags_analysis']['score']
+    assert row['seo_score'] == pytest.approx(analysis.seo_score)
+    for keyword, density in analysis.keyword_density.items():
+        assert row[f'density_{keyword}'] == pytest.approx(density)
+
+
+def test_score_batch_one_row_per_video():
+    scores = score_batch(VIDEOS)
+    assert len(scores) == len(VIDEOS)
+    assert scores.loc[scores['video_id'] == 'c', 'chavi_weighted'].iloc[0] == 0
+
+
+def test_classifier_replaces_every_persona_column(monkeypatch):
+    import batch_scoring
+    from persona_classifier import PersonaClassifier
+
+    texts = ['governança e planejamento estratégico', 'vendas e crescimento do pequeno negócio'] * 5
+    labels = ['estrategico', 'crescimento'] * 5
+    model = PersonaClassifier.train(texts, labels, n_features=2 ** 12)
+    monkeypatch.setattr(batch_scoring, 'get_persona_classifier', lambda: model)
+
+    scores = score_batch(VIDEOS)
+    assert (scores['persona_smart'] == 0).all()
+    totals = scores[['persona_estrategico', 'persona_crescimento', 'persona_smart']].sum(axis=1)
+    assert np.allclose(totals, 1.0, atol=1e-3)
+    assert set(scores['persona_target']) <= {'estrategico', 'crescimento'}
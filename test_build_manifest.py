@@ -0,0 +1,88 @@
+"""
+Testes do build_manifest - regras de reaproveitamento e regeneração das saídas
+"""
+
+import pytest
+
+from build_manifest import BuildManifest, build_if_stale
+from config import AppConfig
+from corpus_stats import CorpusStats
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(AppConfig, 'BUILD_MANIFEST_ENABLED', True)
+    monkeypatch.setattr(AppConfig, 'CORPUS_STATS_PATH', str(tmp_path / 'corpus_stats.npy'))
+    source = tmp_path / 'palestra.txt'
+    source.write_text('00:00:00:00 - 00:00:05:00\nDesconhecido\nFunil de vendas.\n', encoding='utf-8')
+    manifest = BuildManifest(str(tmp_path / 'manifest.sqlite3'))
+    yield tmp_path, str(source), manifest
+    manifest.close()
+
+
+def make_build(folder, calls, text='Título gerado'):
+    def build():
+        calls.append(1)
+        title = folder / 'titulo.txt'
+        title.write_text(text, encoding='utf-8')
+        return {'files_created': {'titulo': str(title)}}
+    return build
+
+
+def test_unchanged_inputs_reuse_previous_result(workspace):
+    folder, source, manifest = workspace
+    calls = []
+    build_if_stale('upload', source, make_build(folder, calls), manifest=manifest)
+    result = build_if_stale('upload', source, make_build(folder, calls), manifest=manifest)
+    assert len(calls) == 1
+    assert result['up_to_date'] is True
+    assert manifest.stale_reason('upload', source) is None
+
+
+def test_new_and_changed_transcription(workspace):
+    folder, source, manifest = workspace
+    assert manifest.stale_reason('upload', source) == 'novo'
+    build_if_stale('upload', source, make_build(folder, []), manifest=manifest)
+    with open(source, 'a', encoding='utf-8') as f:
+        f.write('Mais um trecho.\n')
+    assert manifest.stale_reason('upload', source) == 'transcrição alterada'
+
+
+def test_missing_output_is_stale(workspace):
+    folder, source, manifest = workspace
+    build_if_stale('upload', source, make_build(folder, []), manifest=manifest)
+    (folder / 'titulo.txt').unlink()
+    assert manifest.stale_reason('upload', source) == 'saída ausente'
+
+
+def test_output_overwritten_by_other_task_is_stale(workspace):
+    folder, source, manifest = workspace
+    build_if_stale('upload', source, make_build(folder, [], 'Título upload'), manifest=manifest)
+    build_if_stale('f5', source, make_build(folder, [], 'Título f5'), manifest=manifest)
+
+    assert manifest.stale_reason('f5', source) is None
+    assert manifest.stale_reason('upload', source) == 'saída sobrescrita'
+
+    calls = []
+    build_if_stale('upload', source, make_build(folder, calls, 'Título upload'), manifest=manifest)
+    assert len(calls) == 1
+
+
+def test_corpus_growth_keeps_outputs_but_rebuild_does_not(workspace):
+    folder, source, manifest = workspace
+    build_if_stale('upload', source, make_build(folder, []), manifest=manifest)
+
+    stats = CorpusStats(1 << 12)
+    stats.add('novo', 'vídeo novo na biblioteca')
+    stats.save(AppConfig.CORPUS_STATS_PATH)
+    assert manifest.stale_reason('upload', source) is None
+
+    stats.epoch += 1
+    stats.save(AppConfig.CORPUS_STATS_PATH)
+    assert manifest.stale_reason('upload', source) == 'corpus alterado'
+
+
+def test_failed_build_is_not_recorded(workspace):
+    _, source, manifest = workspace
+    build_if_stale('upload', source, lambda: {'error': 'falhou'}, manifest=manifest)
+    assert manifest.stale_reason('upload', source) == 'novo'
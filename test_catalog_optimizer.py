@@ -0,0 +1,120 @@
+"""
+Testes do catalog_optimizer - ordem e falhas no streaming, chave estável dos vídeos no índice de
+quase duplicados e cache de respostas
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+import content_optimizer
+from catalog_optimizer import CatalogOptimizer
+from config import AIConfig
+from llm_gateway import BaseProvider, LLMGateway
+
+VIDEOS = [
+    {'video_id': f'f5_video_{i:03d}', 'title': title, 'description': f'{title} para pequenas empresas.', 'tags': []}
+    for i, title in enumerate(['Funil de Vendas', 'Liderança de Equipes', 'Fluxo de Caixa'])
+]
+
+
+class BatchProvider(BaseProvider):
+    """Provedor falso que responde ao prompt de lote com um item válido por vídeo"""
+    name = 'gemini'
+
+    def __init__(self):
+        super().__init__('fake-model')
+        self.calls = 0
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        self.calls += 1
+        suggestion = {'pillar': 'C', 'priority': 'alta', 'field': 'title', 'proposed_text': 'Use a palavra-chave'}
+        return json.dumps({'videos': [
+            {'video_id': ref, 'suggestions': [suggestion], 'optimized_title': f'Título {ref}'}
+            for ref in re.findall(r'VIDEO_ID: (\S+)', prompt)
+        ]})
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(AIConfig, 'CACHE_ENABLED', True)
+    monkeypatch.setattr(AIConfig, 'CACHE_PATH', str(tmp_path / 'llm_cache.sqlite3'))
+    monkeypatch.setattr(AIConfig, 'USAGE_TRACKING_ENABLED', False)
+    provider = BatchProvider()
+    monkeypatch.setattr(content_optimizer, 'LLMGateway',
+                        lambda **kwargs: LLMGateway(providers=[provider], **kwargs))
+    return provider
+
+
+def run_catalog():
+    return CatalogOptimizer(workers=1, show_progress=False, dedup=False).run(VIDEOS)
+
+
+CATALOG = [
+    {'video_id': f'f5_video_{i:03d}', 'title': f'{topic} - episódio {i}',
+     'description': f'Como aplicar {topic.lower()} no pequeno negócio, com exemplos do episódio {i}.',
+     'tags': [topic.lower(), 'f5 estratégia']}
+    for i, topic in enumerate(['Funil de Vendas', 'Liderança', 'Fluxo de Caixa', 'Tráfego Pago'] * 3)
+]
+
+
+def stream_catalog(videos, **kwargs):
+    optimizer = CatalogOptimizer(use_ai=False, show_progress=False, dedup=False, **kwargs)
+
+    async def collect():
+        return [item async for item in optimizer.stream(videos)]
+    return asyncio.run(collect())
+
+
+def test_stream_yields_results_in_input_order_across_chunks():
+    streamed = stream_catalog(CATALOG, workers=3, chunksize=2, batch_size=5)
+    assert [index for index, _ in streamed] == list(range(len(CATALOG)))
+    assert [result['original']['title'] for _, result in streamed] == [video['title'] for video in CATALOG]
+
+
+def test_failing_video_is_reported_without_stopping_the_stream():
+    videos = list(CATALOG)
+    videos[5] = dict(videos[5], description=1234)
+    results = [result for _, result in stream_catalog(videos, workers=2, chunksize=4, batch_size=3)]
+
+    assert 'error' in results[5]
+    # Os vizinhos de bloco e de lote seguem normalmente
+    assert all('error' not in result for i, result in enumerate(results) if i != 5)
+    assert results[4]['original']['title'] == videos[4]['title']
+    assert results[6]['original']['title'] == videos[6]['title']
+
+
+def test_single_worker_matches_pooled_run():
+    single = CatalogOptimizer(use_ai=False, workers=1, show_progress=False, dedup=False).run(CATALOG)
+    pooled = CatalogOptimizer(use_ai=False, workers=4, chunksize=3, show_progress=False, dedup=False).run(CATALOG)
+    assert [result['analysis'] for result in single] == [result['analysis'] for result in pooled]
+
+
+def test_real_youtube_id_is_the_key():
+    assert CatalogOptimizer._video_key({'video_id': 'dQw4w9WgXcQ', 'title': 'x'}) == 'dQw4w9WgXcQ'
+
+
+def test_positional_ids_use_content_fingerprint():
+    video = {'video_id': 'f5_video_003', 'title': 'Funil de Vendas', 'description': 'Métricas.'}
+    moved = dict(video, video_id='f5_video_117')
+    other = dict(video, title='Liderança')
+
+    key = CatalogOptimizer._video_key(video)
+    assert key.startswith('fp_')
+    assert key == CatalogOptimizer._video_key(moved)
+    assert key == CatalogOptimizer._video_key(dict(moved, title='FUNIL DE VENDAS'))
+    assert key != CatalogOptimizer._video_key(other)
+
+
+def test_second_catalog_run_is_served_from_cache(provider):
+    first = run_catalog()
+    calls = provider.calls
+    assert calls >= 1
+    assert [r['optimized']['title'] for r in first] == [f"Título {v['video_id']}" for v in VIDEOS]
+
+    # Configuração padrão (sem AI_CACHE_REUSE_SAMPLED): o lote é determinístico e vem do cache
+    second = run_catalog()
+    assert provider.calls == calls
+    assert [r['optimized']['title'] for r in second] == [r['optimized']['title'] for r in first]
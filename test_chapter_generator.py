@@ -0,0 +1,78 @@
+"""
+Testes do chapter_generator - segmentação por coesão léxica em transcrições sintéticas
+"""
+
+import random
+
+import numpy as np
+
+from chapter_generator import detect_chapters, depth_scores
+from transcript_parser import TranscriptSegment
+
+SEGMENT_SECONDS = 20
+
+
+def synthetic_segments(topics: int, minutes: int, seed: int = 0):
+    """Segmentos de 20 s; cada bloco de assunto tem vocabulário próprio sobre um vocabulário comum"""
+    rnd = random.Random(seed)
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'la', 'me', 'ni', 'po', 'ru', 'sa', 'te', 'vi', 'xo', 'za']
+
+    def word():
+        return ''.join(rnd.choice(syllables) for _ in range(3))
+
+    common = [word() for _ in range(400)]
+    vocabularies = [[word() for _ in range(40)] for _ in range(topics)]
+    total = minutes * 60 // SEGMENT_SECONDS
+    per_topic = total // topics
+    segments = []
+    for index in range(total):
+        topic = min(index // per_topic, topics - 1)
+        words = [rnd.choice(vocabularies[topic]) if rnd.random() < 0.35 else rnd.choice(common)
+                 for _ in range(45)]
+        start = index * SEGMENT_SECONDS
+        segments.append(TranscriptSegment(start, start + SEGMENT_SECONDS, 'Desconhecido', ' '.join(words) + '.'))
+    truth = [topic * per_topic * SEGMENT_SECONDS for topic in range(topics)]
+    return segments, truth
+
+
+def assert_matches(chapters, truth, tolerance=60):
+    assert len(chapters) == len(truth)
+    for chapter, expected in zip(chapters, truth):
+        assert abs(chapter.start - expected) <= tolerance
+
+
+def test_long_live_is_not_over_segmented():
+    segments, truth = synthetic_segments(topics=6, minutes=180)
+    chapters = detect_chapters(segments)
+    assert_matches(chapters, truth)
+
+
+def test_short_video_chapters():
+    segments, truth = synthetic_segments(topics=4, minutes=10)
+    chapters = detect_chapters(segments)
+    assert_matches(chapters, truth)
+    assert chapters[0].start == 0.0 and chapters[0].timestamp == '0:00'
+    assert all(chapter.end - chapter.start >= 10 for chapter in chapters)
+
+
+def test_single_topic_has_no_chapters():
+    segments, _ = synthetic_segments(topics=1, minutes=60)
+    assert detect_chapters(segments) == []
+
+
+def test_untimed_text_has_no_chapters():
+    segments = [TranscriptSegment(None, None, '', 'texto sem timecode ' * 200)]
+    assert detect_chapters(segments) == []
+
+
+def test_chapter_lines_use_youtube_format():
+    segments, _ = synthetic_segments(topics=4, minutes=10)
+    for chapter in detect_chapters(segments):
+        timestamp, title = chapter.line.split(' ', 1)
+        assert timestamp == chapter.timestamp and title
+
+
+def test_depth_is_deepest_at_the_valley():
+    cohesion = np.array([0.8, 0.8, 0.6, 0.2, 0.6, 0.8, 0.8])
+    depth = depth_scores(cohesion)
+    assert int(np.argmax(depth)) == 3
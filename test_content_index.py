@@ -0,0 +1,90 @@
+"""
+Testes do content_index - busca exata e IVF, filtros e persistência
+"""
+
+import random
+
+import numpy as np
+
+from content_index import ContentIndex
+
+TOPICS = {
+    'vendas': ['funil', 'vendas', 'cliente', 'oferta', 'fechamento', 'proposta', 'comercial'],
+    'lideranca': ['liderança', 'equipe', 'gestão', 'feedback', 'cultura', 'delegar', 'time'],
+    'financas': ['caixa', 'lucro', 'custos', 'margem', 'investimento', 'orçamento', 'faturamento'],
+    'marketing': ['tráfego', 'anúncios', 'conteúdo', 'leads', 'campanha', 'instagram', 'marca'],
+}
+PERSONAS = {'vendas': 'crescimento', 'lideranca': 'estrategico', 'financas': 'estrategico', 'marketing': 'smart'}
+
+
+def build(docs_per_topic: int = 40, dims: int = 256, seed: int = 0) -> ContentIndex:
+    rng = random.Random(seed)
+    index = ContentIndex(dims)
+    for topic, words in TOPICS.items():
+        for i in range(docs_per_topic):
+            text = ' '.join(rng.choice(words) for _ in range(30))
+            index.add(f'{topic}_{i}', text, {'title': f'{topic} {i}', 'kind': 'video', 'persona': PERSONAS[topic],
+                                             'performance_score': i, 'date': f'2024-01-{i % 28 + 1:02d}'})
+    return index
+
+
+def ids(results):
+    return [doc['id'] for doc in results]
+
+
+def test_exact_search_finds_topic():
+    results = build().search('funil de vendas e proposta comercial', k=10)
+    assert len(results) == 10
+    assert all(doc_id.startswith('vendas_') for doc_id in ids(results))
+    scores = [doc['relevance_score'] for doc in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_ivf_probing_every_list_matches_exact():
+    index = build()
+    query = 'caixa, margem e lucro da empresa'
+    exact = index.search(query, k=15)
+    index.build_ivf(n_lists=6)
+    assert ids(index.search(query, k=15, nprobe=6)) == ids(exact)
+
+
+def test_ivf_finds_nearest_lists_and_new_docs():
+    index = build()
+    index.build_ivf(n_lists=4)
+    approximate = index.search('liderança da equipe e feedback', k=10, nprobe=1)
+    assert all(doc_id.startswith('lideranca_') for doc_id in ids(approximate))
+
+    # Adicionado depois do k-means: sempre comparado, mesmo fora das listas visitadas
+    index.add('novo', 'planilha de orçamento trimestral', {'kind': 'transcript'})
+    assert ids(index.search('planilha trimestral', k=1, nprobe=1)) == ['novo']
+
+
+def test_filters():
+    index = build()
+    results = index.search('tráfego e leads', k=50, filters={'persona': 'smart', 'min_score': 30})
+    assert results and all(doc['persona'] == 'smart' and doc['performance_score'] >= 30 for doc in results)
+    assert index.search('tráfego e leads', filters={'kind': 'transcript'}) == []
+
+
+def test_update_and_remove():
+    index = build(docs_per_topic=5)
+    assert index.add('vendas_0', 'x', {}) is True
+    assert index.add('vendas_0', 'x', {}) is False
+    index.remove('vendas_1')
+    assert 'vendas_1' not in ids(index.search('funil vendas cliente', k=50))
+    assert len(index) == 19
+
+
+def test_save_and_load_keeps_results(tmp_path):
+    index = build()
+    index.build_ivf(n_lists=4)
+    index.remove('marketing_3')
+    query = 'campanha de anúncios no instagram'
+    before = index.search(query, k=10, nprobe=2)
+    path = index.save(str(tmp_path / 'content.npy'))
+
+    loaded = ContentIndex.load(path)
+    assert len(loaded) == len(TOPICS) * 40 - 1
+    assert loaded.centroids is not None
+    assert ids(loaded.search(query, k=10, nprobe=2)) == ids(before)
+    assert np.isclose(loaded.search(query, k=1)[0]['relevance_score'], before[0]['relevance_score'])
@@ -0,0 +1,102 @@
+"""
+Testes do corpus_stats - frequência de documentos, persistência e sincronização com a biblioteca
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from config import AppConfig
+from corpus_stats import CorpusStats, corpus_epoch, load_corpus_stats, rebuild_corpus_stats, sync_corpus_stats
+
+BUCKETS = 1 << 12
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / 'transcricoes'
+    for folder, text in [('a', 'funil de vendas para o pequeno negócio'),
+                         ('b', 'liderança e gestão de equipes de vendas')]:
+        (root / folder).mkdir(parents=True)
+        (root / folder / 'palestra.txt').write_text(text, encoding='utf-8')
+    return root, str(tmp_path / 'sem_catalogo.csv')
+
+
+def test_add_counts_distinct_ngrams_once():
+    stats = CorpusStats(BUCKETS)
+    assert stats.add('a', 'funil de vendas e mais vendas')
+    assert not stats.add('a', 'outro texto')
+    stats.add('b', 'vendas no varejo')
+
+    assert stats.document_count == 2
+    assert stats.document_frequency('vendas') == 2
+    assert stats.document_frequency('funil de vendas') == 1
+    assert stats.idf('vendas') == pytest.approx(math.log(3 / 3) + 1)
+    assert stats.idf('funil de vendas') > stats.idf('vendas')
+    assert np.allclose(stats.idf_many(['vendas', 'funil de vendas']),
+                       [stats.idf('vendas'), stats.idf('funil de vendas')])
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    stats = CorpusStats(BUCKETS)
+    stats.add('a', 'funil de vendas')
+    path = stats.save(str(tmp_path / 'corpus.npy'))
+
+    loaded = CorpusStats.load(path)
+    assert isinstance(loaded.df, np.memmap) and not loaded.df.flags.writeable
+    assert loaded.documents == stats.documents
+    assert loaded.idf('funil') == stats.idf('funil')
+
+    # Somar a um vetor memory-mapped trabalha numa cópia, sem alterar o arquivo
+    loaded.add('b', 'funil de marketing')
+    assert loaded.document_frequency('funil') == 2
+    assert CorpusStats.load(path).document_frequency('funil') == 1
+
+
+def test_missing_file_gives_neutral_idf(tmp_path):
+    stats = load_corpus_stats(str(tmp_path / 'ausente.npy'))
+    assert stats.document_count == 0 and stats.idf('funil') == 1.0
+
+
+def test_sync_adds_new_and_rebuilds_changed(library):
+    root, catalog = library
+    stats = sync_corpus_stats(CorpusStats(BUCKETS), str(root), catalog)
+    assert stats.document_count == 2 and stats.document_frequency('vendas') == 2
+
+    (root / 'b' / 'palestra.txt').write_text('planejamento financeiro', encoding='utf-8')
+    rebuilt = sync_corpus_stats(stats, str(root), catalog)
+    assert rebuilt is not stats
+    assert rebuilt.document_count == 2
+    assert rebuilt.document_frequency('vendas') == 1
+    assert rebuilt.document_frequency('planejamento financeiro') == 1
+
+
+def test_sync_ignores_generated_seo_files(library):
+    root, catalog = library
+    before = sync_corpus_stats(CorpusStats(BUCKETS), str(root), catalog)
+
+    for name, text in [('titulo.txt', 'Funil de Vendas'), ('descricao.txt', 'clareza e resposta'),
+                       ('tags.txt', 'funil, vendas'), ('metadados.txt', 'palavras-chave: problema')]:
+        (root / 'a' / name).write_text(text, encoding='utf-8')
+    after = sync_corpus_stats(before, str(root), catalog)
+
+    assert after is before
+    assert sorted(after.documents) == sorted(before.documents)
+    assert after.document_frequency('clareza') == 0
+
+
+def test_only_explicit_rebuild_starts_a_new_epoch(library, tmp_path, monkeypatch):
+    root, catalog = library
+    monkeypatch.setattr(AppConfig, 'TRANSCRIPTIONS_DIR', str(root))
+    monkeypatch.setattr(AppConfig, 'CATALOG_CSV', catalog)
+    path = str(tmp_path / 'corpus.npy')
+    assert corpus_epoch(path) == 0
+
+    load_corpus_stats(path, sync=True)
+    (root / 'b' / 'palestra.txt').write_text('planejamento financeiro', encoding='utf-8')
+    load_corpus_stats(path, sync=True)
+    assert corpus_epoch(path) == 0
+
+    assert rebuild_corpus_stats(path).epoch == 1
+    assert corpus_epoch(path) == 1 and CorpusStats.load(path).epoch == 1
@@ -0,0 +1,54 @@
+"""
+Testes do f5_lexicon - pontuação dos temas específicos pela tabela de n-gramas
+"""
+
+import random
+import re
+
+from f5_lexicon import LEXICON
+from video_seo_optimizer import TranscriptionAnalyzer
+
+FILLER = ['então', 'hoje', 'vamos', 'falar', 'sobre', 'empresa', 'cliente', 'resultado', 'pessoas',
+          'pessoal', 'gestor', 'comunicar', 'líderes', 'times', 'equipes', 'e', 'de', 'o', 'a']
+
+
+def reference_scores(clean_text: str):
+    """Algoritmo original: uma regex por palavra-chave e busca de cada parte no texto inteiro"""
+    scores = {}
+    for theme_name, theme_data in LEXICON.specific_themes.items():
+        score = 0
+        for keyword in theme_data['keywords']:
+            if keyword.lower() in clean_text:
+                score += len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', clean_text)) * 2
+            for word in keyword.split():
+                if len(word) > 3 and word in clean_text:
+                    score += 1
+        scores[theme_name] = score
+    return scores
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    keywords = list(LEXICON.theme_keywords)
+    pieces = [rng.choice(keywords) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(words)]
+    return ' '.join(piece.upper() if rng.random() < 0.1 else piece for piece in pieces) + '.'
+
+
+def test_scores_match_original_algorithm():
+    analyzer = TranscriptionAnalyzer()
+    rng = random.Random(46)
+    for _ in range(100):
+        text = random_text(rng, rng.randint(0, 120))
+        analysis = analyzer.analyze(text)
+        assert LEXICON.score_specific_themes(analysis.tokens) == reference_scores(analysis.clean_text)
+
+
+def test_overlapping_keywords_are_all_counted():
+    tokens = 'desenvolvimento pessoal e autoconhecimento'.split()
+    counts = LEXICON.keyword_counts(tokens)
+    ids = {keyword: i for i, keyword in enumerate(LEXICON.theme_keywords)}
+    assert counts[ids['desenvolvimento pessoal']] == 1
+    assert counts[ids['autoconhecimento']] == 1
+
+
+def test_empty_text_scores_zero():
+    assert set(LEXICON.score_specific_themes([]).values()) == {0}
@@ -0,0 +1,50 @@
+"""
+Testes do keyword_engine - candidatos de várias palavras, filtro por NPMI e bônus F5
+"""
+
+import pytest
+
+from corpus_stats import text_tokens
+from keyword_engine import F5_BOOST, BackgroundCorpus, KeywordEngine
+
+TEXT = ('O funil de vendas organiza o processo. Sem funil de vendas, a empresa perde clientes. '
+        'Café quente e bolo de cenoura. Café quente de novo.')
+
+
+def extract(tokens, **kwargs):
+    # Corpus de fundo vazio: idf 1 para todo termo, o score fica só com tf, colocação e bônus
+    return dict(KeywordEngine(BackgroundCorpus()).extract(tokens, **kwargs))
+
+
+def test_extracts_multi_word_keywords():
+    scores = extract(text_tokens(TEXT))
+    assert max(scores, key=scores.get) == 'funil de vendas'
+    assert 'café quente' in scores
+    # Ocorrência única não vira colocação; conectivos e stopwords não abrem nem fecham candidatos
+    assert 'bolo de cenoura' not in scores
+    assert not any(word in scores for word in ('de', 'o', 'sem'))
+    assert all(not keyword.endswith(' de') for keyword in scores)
+
+
+def test_npmi_bounds():
+    assert KeywordEngine._npmi(2, 2, 2, 25) == pytest.approx(1.0)
+    assert KeywordEngine._npmi(4, 10, 10, 25) == pytest.approx(0.0)
+    assert KeywordEngine._npmi(2, 12, 12, 40) < 0
+
+
+def test_pairs_rarer_than_chance_are_dropped():
+    # "equipe" e "resultado" são frequentes sozinhos e só ficam lado a lado duas vezes
+    tokens = (['equipe', 'resultado'] * 2 + ['equipe', 'planilha', 'resultado', 'reunião'] * 10
+              + ['mentoria', 'individual'] * 2 + ['agenda'] * 4)
+    scores = extract(tokens)
+    assert 'equipe resultado' not in scores
+    assert 'mentoria individual' in scores
+    assert scores['mentoria individual'] == pytest.approx(2 * (1 + KeywordEngine._npmi(2, 2, 2, len(tokens))),
+                                                          abs=1e-3)
+
+
+def test_f5_terms_are_boosted():
+    scores = extract(text_tokens(TEXT))
+    # Uma ocorrência cada: "clientes" (radical F5) vale F5_BOOST vezes "bolo"
+    assert scores['clientes'] == pytest.approx(F5_BOOST * scores['bolo'])
+    assert scores['funil de vendas'] == pytest.approx(2 * 2 * F5_BOOST)
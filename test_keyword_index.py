@@ -0,0 +1,110 @@
+"""
+Testes do keyword_index - ranqueamento BM25, filtros e atualização incremental
+"""
+
+import math
+from collections import Counter
+
+import pytest
+
+import keyword_index
+from keyword_index import KeywordIndex
+from text_analysis import tokenize
+
+DOCS = {
+    'funil': ('funil de vendas e funil de marketing para vender mais',
+              {'title': 'Funil de Vendas', 'persona': 'crescimento', 'performance_score': 80, 'date': '2024-03-01'}),
+    'lider': ('liderança e gestão de equipes de vendas',
+              {'title': 'Liderança', 'persona': 'estrategico', 'performance_score': 40, 'date': '2023-01-10'}),
+    'trafego': ('tráfego pago traz leads para o funil',
+                {'title': 'Tráfego Pago', 'persona': 'crescimento', 'performance_score': 65, 'date': '2024-06-20'}),
+    'ia': ('inteligência artificial e automação no marketing',
+           {'title': 'IA no Marketing', 'persona': 'smart', 'performance_score': 90, 'date': '2024-09-05'}),
+}
+
+
+def build() -> KeywordIndex:
+    index = KeywordIndex()
+    for doc_id, (text, metadata) in DOCS.items():
+        index.add(doc_id, text, metadata)
+    return index
+
+
+def reference_bm25(query: str, k1: float = 1.5, b: float = 0.75):
+    """BM25 calculado documento a documento, com o título valendo TITLE_WEIGHT"""
+    terms = {}
+    for doc_id, (text, metadata) in DOCS.items():
+        counts = Counter(tokenize(text))
+        for term in tokenize(metadata['title']):
+            counts[term] += keyword_index.TITLE_WEIGHT
+        terms[doc_id] = counts
+    average = sum(sum(c.values()) for c in terms.values()) / len(terms)
+    scores = {}
+    for doc_id, counts in terms.items():
+        length = sum(counts.values())
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            df = sum(1 for c in terms.values() if c[term])
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(terms) - df + 0.5) / (df + 0.5))
+            score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * length / average))
+        if score:
+            scores[doc_id] = score
+    return scores
+
+
+@pytest.mark.parametrize('query', ['funil', 'vendas', 'funil vendas', 'marketing'])
+def test_scores_match_reference_bm25(query):
+    expected = reference_bm25(query)
+    results = build().search(query, match_all=False)
+    assert [doc['id'] for doc in results] == sorted(expected, key=expected.get, reverse=True)
+    for doc in results:
+        assert doc['relevance_score'] == pytest.approx(expected[doc['id']], abs=1e-3)
+
+
+def test_match_all_intersects_terms():
+    index = build()
+    assert {doc['id'] for doc in index.search('funil vendas')} == {'funil'}
+    assert {doc['id'] for doc in index.search('funil vendas', match_all=False)} == {'funil', 'lider', 'trafego'}
+    assert index.search('funil inexistente') == []
+
+
+def test_filters():
+    index = build()
+    assert [doc['id'] for doc in index.search('funil', filters={'persona': 'crescimento'})] == ['funil', 'trafego']
+    assert [doc['id'] for doc in index.search('funil', filters={'min_score': 70})] == ['funil']
+    assert [doc['id'] for doc in index.search('funil', filters={'since': '2024-05-01'})] == ['trafego']
+    assert index.search('funil', filters={'persona': 'smart'}) == []
+
+
+def test_update_and_remove():
+    index = build()
+    assert index.add('funil', *DOCS['funil']) is False
+    assert index.add('funil', 'planejamento estratégico', {'title': 'Estratégia'}) is True
+    assert 'funil' not in {doc['id'] for doc in index.search('funil')}
+    assert [doc['id'] for doc in index.search('estratégico')] == ['funil']
+
+    index.remove('trafego')
+    assert index.search('tráfego') == []
+    assert len(index) == 3
+
+
+def test_compact_keeps_results():
+    index = build()
+    index.remove('lider')
+    before = index.search('vendas marketing', match_all=False)
+    index.compact()
+    assert index.search('vendas marketing', match_all=False) == before
+
+
+def test_save_and_load(tmp_path):
+    index = build()
+    path = index.save(str(tmp_path / 'keywords.pkl'))
+    assert KeywordIndex.load(path).search('funil', match_all=False) == index.search('funil', match_all=False)
+
+
+def test_load_discards_other_tokenizer(tmp_path, monkeypatch):
+    path = build().save(str(tmp_path / 'keywords.pkl'))
+    monkeypatch.setattr(keyword_index, 'TOKENIZER_VERSION', -1)
+    assert len(KeywordIndex.load(path)) == 0
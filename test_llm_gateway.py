@@ -0,0 +1,152 @@
+"""
+Testes do llm_gateway - cache de respostas no streaming, concorrência por provedor e respostas truncadas
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import AIConfig
+from llm_cache import LLMCache
+from llm_gateway import BaseProvider, LLMGateway, TruncatedResponse, thinking_budget
+
+
+class FakeProvider(BaseProvider):
+    """Provedor falso que conta as chamadas e devolve o texto em partes"""
+    name = 'gemini'
+
+    def __init__(self, text: str = 'Funil de vendas em três partes'):
+        super().__init__('fake-model')
+        self.text = text
+        self.calls = 0
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        self.calls += 1
+        return self.text
+
+    async def stream(self, prompt, system, max_tokens, temperature, prefix=None):
+        self.calls += 1
+        for word in self.text.split(' '):
+            yield word + ' '
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm_cache.sqlite3'))
+    yield cache
+    cache.close()
+
+
+def collect(gateway: LLMGateway, prompt: str, temperature: float = 0.0):
+    async def consume():
+        return [chunk async for chunk in gateway.stream(prompt, temperature=temperature)]
+    return asyncio.run(consume())
+
+
+def test_reuse_sampled_is_off_by_default():
+    assert AIConfig.CACHE_REUSE_SAMPLED is False
+
+
+def test_stream_is_cached_and_replayed(cache):
+    provider = FakeProvider()
+    gateway = LLMGateway([provider], cache=cache)
+
+    first = collect(gateway, 'título')
+    second = collect(gateway, 'título')
+    assert provider.calls == 1
+    assert len(first) > 1 and second == [''.join(first)]
+
+
+def test_stream_replays_generate_response(cache):
+    provider = FakeProvider()
+    gateway = LLMGateway([provider], cache=cache)
+
+    text = asyncio.run(gateway.generate('título', temperature=0.0)).text
+    assert collect(gateway, 'título') == [text]
+    assert provider.calls == 1
+
+
+def test_sampled_stream_is_not_reused(cache):
+    provider = FakeProvider()
+    gateway = LLMGateway([provider], cache=cache)
+
+    collect(gateway, 'título', temperature=0.7)
+    collect(gateway, 'título', temperature=0.7)
+    assert provider.calls == 2
+
+
+class SlowProvider(FakeProvider):
+    """Registra o pico de chamadas simultâneas"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return self.text
+
+
+def test_max_concurrent_holds_across_sync_callers(monkeypatch):
+    limits = {name: dict(limit) for name, limit in AIConfig.PROVIDER_LIMITS.items()}
+    limits['gemini']['max_concurrent'] = 2
+    monkeypatch.setattr(AIConfig, 'PROVIDER_LIMITS', limits)
+    provider = SlowProvider()
+    gateway = LLMGateway([provider])
+
+    # Cada generate_sync roda no seu próprio event loop
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda i: gateway.generate_sync(f'título {i}', max_tokens=10), range(6)))
+
+    assert provider.peak == 2
+    assert time.perf_counter() - started >= 0.15
+
+
+class TruncatingProvider(FakeProvider):
+    """Simula o Gemini 2.5 Pro gastando o limite inteiro em raciocínio"""
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        self.calls += 1
+        raise TruncatedResponse("resposta cortada pelo limite de tokens (MAX_TOKENS)")
+
+
+class EmptyProvider(FakeProvider):
+    name = 'claude'
+
+    async def generate(self, prompt, system, max_tokens, temperature, response_schema=None, prefix=None):
+        self.calls += 1
+        return '  '
+
+
+def test_thinking_budget_by_model():
+    assert thinking_budget('gemini-2.5-pro') == AIConfig.GEMINI_THINKING_BUDGETS['gemini-2.5-pro']
+    assert thinking_budget('gemini-2.5-flash-lite') == AIConfig.GEMINI_THINKING_BUDGETS['gemini-2.5-flash']
+    assert thinking_budget('gemini-1.5-pro') is None
+
+
+def test_truncated_or_empty_responses_fall_back(cache):
+    truncating, empty, fallback = TruncatingProvider(), EmptyProvider(), FakeProvider()
+    fallback.name = 'openai'
+    gateway = LLMGateway([truncating, empty, fallback], cache=cache)
+
+    response = asyncio.run(gateway.generate('título', max_tokens=60, temperature=0.0))
+    assert response.provider == 'openai' and response.text == fallback.text
+    assert gateway.failures == {'gemini': 1, 'claude': 1, 'openai': 0}
+
+
+def test_truncated_response_is_an_error_not_cached(cache):
+    gateway = LLMGateway([TruncatingProvider()], cache=cache)
+    with pytest.raises(RuntimeError, match='MAX_TOKENS'):
+        asyncio.run(gateway.generate('título', max_tokens=60, temperature=0.0))
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,83 @@
+"""
+Testes do near_duplicates - assinaturas MinHash, LSH e vídeos sem texto
+"""
+
+import random
+
+import pytest
+
+from near_duplicates import MinHasher, NearDuplicateIndex, jaccard, lsh_bands, shingles
+
+TEXT = ('como montar um funil de vendas para o pequeno negócio com tráfego pago, '
+        'métricas de conversão e atendimento comercial no WhatsApp')
+
+
+def test_empty_videos_are_not_indexed():
+    index = NearDuplicateIndex(0.8)
+    empty = index.signature('')
+    assert MinHasher.is_empty(empty)
+
+    index.add('vazio', empty, {'title': ''})
+    assert len(index) == 0
+    assert index.query(empty) == []
+    assert index.best_match(empty) is None
+
+
+def test_empty_video_does_not_match_other_empty_videos():
+    index = NearDuplicateIndex(0.8)
+    index.add('texto', index.signature(TEXT), {'title': 'a'})
+    assert index.query(index.signature('   ')) == []
+    assert not MinHasher.is_empty(index.signature(TEXT))
+
+
+def random_words(rng: random.Random, count: int):
+    return [f'palavra{rng.randrange(5000)}' for _ in range(count)]
+
+
+@pytest.mark.parametrize('overlap', [0.2, 0.5, 0.8, 0.95])
+def test_minhash_estimates_jaccard(overlap):
+    rng = random.Random(int(overlap * 100))
+    common = set(random_words(rng, int(400 * overlap)))
+    a = common | set(random_words(rng, 400 - len(common)))
+    b = common | set(random_words(rng, 400 - len(common)))
+    hasher = MinHasher(num_perm=256)
+    estimate = hasher.similarity(hasher.signature(a), hasher.signature(b))
+    assert estimate == pytest.approx(jaccard(a, b), abs=0.1)
+
+
+def test_identical_sets_have_identical_signatures():
+    hasher = MinHasher()
+    assert hasher.similarity(hasher.signature(shingles(TEXT)), hasher.signature(shingles(TEXT))) == 1.0
+
+
+def test_lsh_threshold_favors_recall():
+    bands, rows = lsh_bands(128, 0.8)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+def test_query_finds_near_duplicates_only():
+    index = NearDuplicateIndex(0.7)
+    index.add('original', index.signature(TEXT), {'title': 'original'})
+    index.add('outro', index.signature('liderança, cultura e gestão de equipes de alta performance'))
+
+    cut = TEXT.replace('WhatsApp', 'Instagram')
+    match = index.best_match(index.signature(cut))
+    assert match[0] == 'original' and match[1] >= 0.7
+    assert index.query(index.signature('planejamento financeiro e fluxo de caixa da empresa')) == []
+
+
+def test_replacing_a_video_drops_its_old_signature():
+    index = NearDuplicateIndex(0.8)
+    index.add('video', index.signature(TEXT))
+    index.add('video', index.signature('liderança, cultura e gestão de equipes de alta performance'))
+    assert len(index) == 1
+    assert index.query(index.signature(TEXT)) == []
+
+
+def test_save_and_load(tmp_path):
+    index = NearDuplicateIndex(0.8)
+    index.add('video', index.signature(TEXT), {'title': 'Funil'})
+    path = index.save(str(tmp_path / 'near.npy'))
+    loaded = NearDuplicateIndex.load(path)
+    assert loaded.best_match(loaded.signature(TEXT)) == ('video', 1.0, {'title': 'Funil'})
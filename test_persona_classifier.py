@@ -0,0 +1,53 @@
+"""
+Testes do persona_classifier - treino, persistência e validação das personas
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from persona_classifier import PersonaClassifier
+
+TEXTS = [
+    'planejamento estratégico e visão de longo prazo para a diretoria',
+    'estratégia corporativa, governança e expansão da empresa',
+    'como crescer as vendas do pequeno negócio com marketing digital',
+    'aumentar faturamento e clientes da pequena empresa em crescimento',
+    'automação inteligente e dados para decisões rápidas',
+    'ferramentas smart e inteligência artificial no dia a dia',
+] * 3
+LABELS = ['estrategico', 'estrategico', 'crescimento', 'crescimento', 'smart', 'smart'] * 3
+
+
+def test_train_and_predict():
+    model = PersonaClassifier.train(TEXTS, LABELS, n_features=2 ** 12)
+    assert model.labels == ['crescimento', 'estrategico', 'smart']
+    probs = model.predict_proba(['governança e planejamento estratégico da diretoria'])
+    assert probs.shape == (1, 3)
+    assert np.isclose(probs.sum(), 1.0)
+    assert model.predict(['governança e planejamento estratégico da diretoria'])[0][0] == 'estrategico'
+
+
+def test_train_rejects_unknown_personas():
+    with pytest.raises(ValueError, match='Personas desconhecidas'):
+        PersonaClassifier.train(TEXTS, ['iniciante'] * len(TEXTS[:6]) + LABELS[6:], n_features=2 ** 12)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = PersonaClassifier.train(TEXTS, LABELS, n_features=2 ** 12)
+    path = model.save(str(tmp_path / 'personas.npy'))
+    loaded = PersonaClassifier.load(path)
+    assert loaded.labels == model.labels
+    assert np.allclose(loaded.predict_proba(TEXTS[:2]), model.predict_proba(TEXTS[:2]))
+
+
+def test_load_rejects_unknown_personas(tmp_path):
+    model = PersonaClassifier.train(TEXTS, LABELS, n_features=2 ** 12)
+    path = model.save(str(tmp_path / 'personas.npy'))
+    metadata_path = tmp_path / 'personas.json'
+    metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+    metadata['labels'] = ['a', 'b', 'c']
+    metadata_path.write_text(json.dumps(metadata), encoding='utf-8')
+    with pytest.raises(ValueError, match='Personas desconhecidas'):
+        PersonaClassifier.load(path)
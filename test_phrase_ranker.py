@@ -0,0 +1,51 @@
+"""
+Testes do phrase_ranker - início estimado das frases e frases repetidas fora do resumo
+"""
+
+import pytest
+
+from phrase_ranker import rank_phrases, split_sentences
+from transcript_parser import TranscriptSegment
+
+FIRST = 'O funil de vendas organiza cada etapa do processo comercial.'
+SECOND = 'A liderança da equipe define as metas e acompanha os resultados.'
+
+
+def test_start_is_estimated_inside_the_segment():
+    text = f'{FIRST} {SECOND}'
+    phrases = split_sentences([TranscriptSegment(60.0, 120.0, 'Maria', text)])
+
+    assert [phrase.text for phrase in phrases] == [FIRST.rstrip('.'), SECOND.rstrip('.')]
+    assert phrases[0].start == 60.0
+    assert phrases[1].start == pytest.approx(60.0 + 60.0 * text.index(' A liderança') / len(text))
+    assert phrases[1].timestamp == '1:28' and phrases[1].speaker == 'Maria'
+    assert phrases[1].with_timestamp().endswith('(1:28)')
+
+
+def test_text_without_timecode_has_no_timestamp():
+    phrase = split_sentences([TranscriptSegment(None, None, '', FIRST)])[0]
+    assert phrase.start is None and phrase.timestamp == ''
+    assert phrase.with_timestamp() == phrase.text
+
+
+def test_short_sentences_are_not_candidates():
+    assert split_sentences([TranscriptSegment(0.0, 5.0, '', 'Muito obrigado. Até a próxima!')]) == []
+
+
+def test_repeated_phrases_are_skipped():
+    sentences = [
+        'O funil de vendas organiza cada etapa do processo comercial da empresa.',
+        'O funil de vendas organiza cada etapa do processo comercial da sua empresa.',
+        'Um funil de vendas bem montado mostra onde o cliente desiste da compra.',
+        'A liderança da equipe comercial acompanha as metas de vendas toda semana.',
+        'O fluxo de caixa mostra se a empresa consegue pagar as contas do mês.',
+    ]
+    segments = [TranscriptSegment(i * 10.0, i * 10.0 + 10.0, '', text) for i, text in enumerate(sentences)]
+    ranked = rank_phrases(segments)
+
+    texts = [phrase.text for phrase in ranked]
+    assert sum(text.startswith('O funil de vendas organiza') for text in texts) == 1
+    assert len(ranked) == len(sentences) - 1
+    assert [phrase.score for phrase in ranked] == sorted((phrase.score for phrase in ranked), reverse=True)
+
+    assert len(rank_phrases(segments, max_phrases=2)) == 2
@@ -0,0 +1,41 @@
+"""
+Testes do text_analysis - normalização, stemming leve e contagem de palavras-chave
+"""
+
+import pytest
+
+from text_analysis import AnalyzedText, keyword_key, normalize_text, stem, tokenize
+
+
+@pytest.mark.parametrize('plural, singular', [
+    ('vendas', 'venda'), ('conversoes', 'conversao'), ('jornais', 'jornal'), ('papeis', 'papel'),
+    ('mulheres', 'mulher'), ('jovens', 'jovem'), ('vezes', 'vez'), ('metricas', 'metrica'),
+])
+def test_stem_reduces_plurals(plural, singular):
+    assert stem(plural) == singular
+
+
+@pytest.mark.parametrize('word', ['mais', 'tres', 'dois', 'depois', 'pois', 'seis', 'pais', 'bonus'])
+def test_stem_keeps_invariant_words(word):
+    assert stem(word) == word
+
+
+def test_stem_never_leaves_stubs():
+    assert all(len(stem(word)) >= 3 for word in ['ares', 'oses', 'uns', 'eis'])
+
+
+def test_tokenize_normalizes_accents_and_case():
+    assert normalize_text('Métricas DE Conversão') == 'metricas de conversao'
+    assert tokenize('Métricas de Conversões') == ['metrica', 'de', 'conversao']
+
+
+def test_unrelated_words_do_not_collide():
+    assert keyword_key('mais') != keyword_key('mal')
+    assert keyword_key('depois') != keyword_key('depol')
+
+
+def test_keyword_count_matches_plural_and_accents():
+    analyzed = AnalyzedText.from_fields('Funil de Vendas', 'Os funis de vendas e a métrica certa', ['funil de venda'])
+    assert analyzed.count('funil de vendas', 'title') == 1
+    assert analyzed.count('métricas', 'description') == 1
+    assert analyzed.contains('funil de vendas', 'tags')
@@ -0,0 +1,57 @@
+"""
+Testes do transcript_parser - timecodes, locutores e textos sem tempo
+"""
+
+from transcript_parser import (
+    format_timestamp, iter_segments, parse_text, segments_text, transcript_duration
+)
+
+
+def test_timecoded_segments():
+    lines = [
+        '00:00:00:00 - 00:00:27:18', 'Desconhecido', 'Primeiro trecho.', '',
+        '00:00:27:18 - 00:01:02:00', 'Desconhecido', 'Segundo trecho', 'em duas linhas.', '',
+    ]
+    segments = list(iter_segments(lines))
+    assert [segment.speaker for segment in segments] == ['Desconhecido', 'Desconhecido']
+    assert segments[0].start == 0.0 and segments[0].end == 27 + 18 / 30
+    assert segments[1].text == 'Segundo trecho em duas linhas.'
+    assert transcript_duration(segments) == 62.0
+
+
+def test_short_first_line_is_kept_as_text():
+    segments = list(iter_segments(['00:00:00:00 - 00:00:05:00', 'Olá pessoal', 'tudo bem com vocês']))
+    assert segments[0].speaker == ''
+    assert segments[0].text == 'Olá pessoal tudo bem com vocês'
+
+
+def test_label_like_speakers():
+    lines = [
+        '00:00:00:00 - 00:00:05:00', 'Maria:', 'Bom dia.', '',
+        '00:00:05:00 - 00:00:09:00', 'Locutor 2', 'Oi.', '',
+        '00:00:09:00 - 00:00:12:00', 'Maria', 'De novo.', '',
+    ]
+    assert [segment.speaker for segment in iter_segments(lines)] == ['Maria', 'Locutor 2', 'Maria']
+
+
+def test_repeated_first_line_becomes_speaker():
+    lines = [
+        '00:00:00:00 - 00:00:05:00', 'João Silva', 'Primeira fala.', '',
+        '00:00:05:00 - 00:00:09:00', 'João Silva', 'Segunda fala.', '',
+    ]
+    first, second = iter_segments(lines)
+    assert first.speaker == '' and first.text == 'João Silva Primeira fala.'
+    assert second.speaker == 'João Silva' and second.text == 'Segunda fala.'
+
+
+def test_untimed_text_splits_paragraphs():
+    segments = parse_text('Primeiro parágrafo.\nContinua.\n\nSegundo parágrafo.')
+    assert [segment.start for segment in segments] == [None, None]
+    assert segments_text(segments) == 'Primeiro parágrafo. Continua.\nSegundo parágrafo.'
+    assert transcript_duration(segments) == 0.0
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == '0:00'
+    assert format_timestamp(257.9) == '4:17'
+    assert format_timestamp(3723) == '1:02:03'
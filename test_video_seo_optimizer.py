@@ -0,0 +1,127 @@
+"""
+Testes do video_seo_optimizer - análise memoizada por conteúdo e relatório de otimização a partir de
+transcrições com timecode
+"""
+
+import json
+from collections import OrderedDict
+
+import pytest
+
+import video_seo_optimizer
+from transcript_parser import TranscriptSegment, parse_text
+from video_seo_optimizer import (
+    ANALYSIS_CACHE_SIZE, SEOContentGenerator, TranscriptionAnalyzer, VideoSEOOptimizer
+)
+
+TOPICS = [
+    'o funil de vendas precisa de uma oferta clara para o cliente certo',
+    'o tráfego pago no Meta Ads traz leads qualificados para a empresa',
+    'a gestão financeira da empresa define quanto investir em marketing digital',
+    'o atendimento comercial no WhatsApp converte os leads em vendas reais',
+]
+
+
+def timecode(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}:00"
+
+
+def timed_transcript(repeats: int = 12, seconds: int = 20) -> str:
+    blocks = []
+    for topic_index, topic in enumerate(TOPICS):
+        for i in range(repeats):
+            start = (topic_index * repeats + i) * seconds
+            blocks.append(f"{timecode(start)} - {timecode(start + seconds)}\nDesconhecido\n"
+                          f"Então, {topic}. Isso muda o resultado do negócio.\n")
+    return '\n'.join(blocks)
+
+
+def test_report_keeps_transcript_summary_only():
+    result = VideoSEOOptimizer().optimize_transcription(timed_transcript(), 'video.txt')
+    transcript = result['transcript']
+    assert set(transcript) == {'segment_count', 'duration_seconds', 'chapters'}
+    assert transcript['segment_count'] == 4 * 12
+    assert transcript['duration_seconds'] == 4 * 12 * 20
+    json.dumps(result, ensure_ascii=False)
+
+
+def test_metadata_keywords_are_hyphenated():
+    result = VideoSEOOptimizer().optimize_transcription(timed_transcript(), 'video.txt')
+    keywords = result['seo_content']['metadata']['keywords']
+    assert keywords and ' ' not in keywords
+
+
+def test_key_points_carry_timestamps():
+    result = VideoSEOOptimizer().optimize_transcription(timed_transcript(), 'video.txt')
+    moments = result['keywords']['key_moments']
+    assert moments and all(moment['timestamp'] for moment in moments)
+    assert f"({moments[0]['timestamp']})" in result['seo_content']['description']['content']
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(TranscriptionAnalyzer, '_analysis_cache', OrderedDict())
+
+
+def counting(monkeypatch, owner, name):
+    calls = []
+    original = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(owner, name, wrapper)
+    return calls
+
+
+def test_artifacts_are_computed_once_per_content(fresh_cache, monkeypatch):
+    keyword_calls = counting(monkeypatch, TranscriptionAnalyzer, '_rank_keywords')
+    phrase_calls = counting(monkeypatch, video_seo_optimizer, 'rank_phrases')
+    chapter_calls = counting(monkeypatch, video_seo_optimizer, 'detect_chapters')
+    text = timed_transcript()
+
+    # Instâncias diferentes compartilham a análise do mesmo texto
+    first, second = TranscriptionAnalyzer(), TranscriptionAnalyzer()
+    assert first.analyze(text) is second.analyze(text)
+    first.extract_keywords(text)
+    second.get_main_theme(text)
+    SEOContentGenerator(second).generate_title(text)
+    first.extract_key_phrases(text)
+    second.extract_ranked_phrases(text, 5)
+    first.extract_chapters(text)
+    second.extract_chapters(text)
+    assert (len(keyword_calls), len(phrase_calls), len(chapter_calls)) == (1, 1, 1)
+
+    # Outro conteúdo tem a própria análise
+    other = text.replace('Meta Ads', 'Google Ads')
+    assert first.analyze(other) is not first.analyze(text)
+    first.extract_keywords(other)
+    assert len(keyword_calls) == 2
+
+
+def test_cache_keeps_the_most_recent_analyses(fresh_cache):
+    analyzer = TranscriptionAnalyzer()
+    kept = analyzer.analyze('texto 0')
+    for i in range(1, ANALYSIS_CACHE_SIZE + 1):
+        analyzer.analyze(f'texto {i}')
+        analyzer.analyze('texto 0')
+    assert analyzer.analyze('texto 0') is kept
+    assert len(TranscriptionAnalyzer._analysis_cache) == ANALYSIS_CACHE_SIZE
+
+
+def test_segments_attached_on_a_later_call_are_kept(fresh_cache):
+    analyzer = TranscriptionAnalyzer()
+    timed = timed_transcript(repeats=2)
+    segments = parse_text(timed)
+    spoken = ' '.join(segment.text for segment in segments)
+
+    # Primeira chamada só com o texto falado; os timecodes chegam depois e prevalecem
+    analysis = analyzer.analyze(spoken)
+    assert analyzer.analyze(spoken, segments) is analysis
+    assert analysis.segments is segments
+    assert analyzer.analyze(spoken).segments is segments
+    assert all(phrase.start is not None for phrase in analysis.ranked_phrases)
+
+    # Segmentos já calculados não são trocados por uma chamada posterior
+    analyzer.analyze(spoken, [TranscriptSegment(None, None, '', spoken)])
+    assert analysis.segments is segments
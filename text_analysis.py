@@ -0,0 +1,190 @@
+"""
+Text Analysis - Contexto compartilhado de análise textual
+Desenvolvido para F5 Estratégia - Tokeniza título, descrição e tags uma única vez por vídeo
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any
+
+# Campos analisados, na ordem em que compõem o texto completo
+FIELDS = ('title', 'description', 'tags')
+
+# Maior n-grama indexado (cobre palavras-chave como "funil de vendas")
+MAX_NGRAM = 3
+
+# Padrões compilados uma única vez por processo
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Stemming leve para português: plurais mais comuns (aplicados após remover acentos)
+PLURAL_RULES = (
+    ('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'),
+    ('ns', 'm'), ('res', 'r'), ('zes', 'z'), ('s', '')
+)
+MIN_STEM_LENGTH = 4
+
+# Radical mínimo depois de tirar o plural ('tres' não vira 'tr')
+MIN_STEM_RESULT = 3
+
+# Palavras terminadas em -s que não são plural ('mais' não vira 'mal', 'dois' não vira 'dol')
+INVARIANT_WORDS = frozenset({
+    'mais', 'demais', 'jamais', 'pais', 'dois', 'pois', 'depois', 'seis', 'tres', 'apos',
+    'atraves', 'antes', 'menos', 'simples', 'lapis', 'onibus', 'virus', 'bonus', 'status', 'campus'
+})
+
+# Versão da tokenização: índices e modelos persistidos com outra versão são descartados
+TOKENIZER_VERSION = 2
+
+
+def strip_accents(text: str) -> str:
+    """Remove acentos via decomposição NFKD ('métricas' -> 'metricas')"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_text(text: str) -> str:
+    """Casefold + remoção de acentos"""
+    return strip_accents(text.casefold())
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Stemming leve: reduz plurais ('vendas' -> 'venda', 'conversoes' -> 'conversao')"""
+    if len(token) < MIN_STEM_LENGTH or token in INVARIANT_WORDS:
+        return token
+    for suffix, replacement in PLURAL_RULES:
+        if token.endswith(suffix):
+            stemmed = token[:-len(suffix)] + replacement
+            return stemmed if len(stemmed) >= MIN_STEM_RESULT else token
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokeniza texto já normalizado e aplica stemming leve"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(normalize_text(text))]
+
+
+@lru_cache(maxsize=8192)
+def keyword_key(keyword: str) -> Tuple[str, ...]:
+    """Chave normalizada de uma palavra-chave (tupla de tokens), calculada uma vez por processo"""
+    return tuple(tokenize(keyword))
+
+
+@dataclass
+class AnalyzedText:
+    """Contexto de análise construído uma vez por vídeo e consumido por todos os analisadores"""
+    title: str
+    description: str
+    tags: List[str]
+    normalized: Dict[str, str] = field(default_factory=dict)
+    text: str = ''
+    tokens: List[str] = field(default_factory=list)
+    field_spans: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    field_ngrams: Dict[str, Counter] = field(default_factory=dict)
+    ngrams: Counter = field(default_factory=Counter)
+    keyword_hits: Dict[Tuple[str, Optional[str]], int] = field(default_factory=dict)
+
+    @classmethod
+    def from_fields(cls, title: str, description: str, tags: List[str]) -> 'AnalyzedText':
+        """
+        Normaliza e tokeniza os campos do vídeo em uma única passada
+
+        Args:
+            title (str): Título do vídeo
+            description (str): Descrição do vídeo
+            tags (List[str]): Tags do vídeo
+
+        Returns:
+            AnalyzedText pronto para consultas de palavras-chave
+        """
+        title = title or ''
+        description = description or ''
+        tags = list(tags or [])
+
+        analyzed = cls(title=title, description=description, tags=tags)
+        analyzed.normalized = {
+            'title': normalize_text(title),
+            'description': normalize_text(description),
+            'tags': normalize_text(' '.join(tags))
+        }
+        # Campos separados por quebra de linha para que nenhuma palavra-chave atravesse campos
+        analyzed.text = '\n'.join(analyzed.normalized[name] for name in FIELDS)
+
+        # Limites de cada campo em posições de tokens
+        for name in FIELDS:
+            start = len(analyzed.tokens)
+            analyzed.tokens.extend(stem(token) for token in TOKEN_PATTERN.findall(analyzed.normalized[name]))
+            analyzed.field_spans[name] = (start, len(analyzed.tokens))
+
+        # Índice de n-gramas por campo (não atravessam fronteiras)
+        for name, (start, end) in analyzed.field_spans.items():
+            field_tokens = analyzed.tokens[start:end]
+            counter = Counter()
+            for n in range(1, MAX_NGRAM + 1):
+                for i in range(len(field_tokens) - n + 1):
+                    counter[tuple(field_tokens[i:i + n])] += 1
+            analyzed.field_ngrams[name] = counter
+            analyzed.ngrams.update(counter)
+
+        return analyzed
+
+    @classmethod
+    def from_video(cls, video_data: Dict[str, Any]) -> 'AnalyzedText':
+        """Constrói o contexto a partir do dicionário de dados do vídeo"""
+        return cls.from_fields(
+            video_data.get('title', ''),
+            video_data.get('description', ''),
+            video_data.get('tags', [])
+        )
+
+    @property
+    def word_count(self) -> int:
+        """Número de palavras do texto completo"""
+        return len(self.text.split())
+
+    def field_tokens(self, name: str) -> List[str]:
+        """Tokens de um campo específico"""
+        start, end = self.field_spans[name]
+        return self.tokens[start:end]
+
+    def count(self, keyword: str, field_name: Optional[str] = None) -> int:
+        """
+        Conta ocorrências de uma palavra-chave respeitando limites de palavra,
+        acentuação e plurais ('bi' não casa com 'combinação', 'métricas' casa com 'metrica')
+
+        Args:
+            keyword (str): Palavra-chave buscada
+            field_name (str): Campo específico ou None para o texto completo
+
+        Returns:
+            Número de ocorrências
+        """
+        cache_key = (keyword, field_name)
+        if cache_key not in self.keyword_hits:
+            key = keyword_key(keyword)
+            index = self.ngrams if field_name is None else self.field_ngrams[field_name]
+
+            if not key:
+                hits = 0
+            elif len(key) <= MAX_NGRAM:
+                hits = index.get(key, 0)
+            else:
+                # Palavras-chave longas: varredura por janela dentro de cada campo
+                names = FIELDS if field_name is None else (field_name,)
+                hits = 0
+                for name in names:
+                    tokens = self.field_tokens(name)
+                    hits += sum(
+                        1 for i in range(len(tokens) - len(key) + 1)
+                        if tuple(tokens[i:i + len(key)]) == key
+                    )
+
+            self.keyword_hits[cache_key] = hits
+        return self.keyword_hits[cache_key]
+
+    def contains(self, keyword: str, field_name: Optional[str] = None) -> bool:
+        """Verifica se a palavra-chave aparece no texto completo ou no campo informado"""
+        return self.count(keyword, field_name) > 0
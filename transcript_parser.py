@@ -0,0 +1,185 @@
+"""
+Transcript Parser - Leitura em streaming das transcrições com timecode
+Desenvolvido para F5 Estratégia - Segmentos tipados (início, fim, locutor, texto) em memória constante
+
+Formato das transcrições exportadas (ex.: "Transcricoes de Videos/Video 1/f5-youtube-video1-...txt"):
+
+    00:00:00:00 - 00:00:27:18
+    Desconhecido
+    Texto falado no trecho...
+    <linha em branco>
+
+O timecode é HH:MM:SS:FF (FF = quadro). O arquivo é lido linha a linha e cada segmento é
+emitido assim que termina, de modo que podcasts de várias horas não precisam caber na memória.
+Textos sem timecode (ex.: transcrição colada no dashboard) viram segmentos sem tempo, um por parágrafo.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Set
+
+# Taxa de quadros usada para converter FF em segundos
+DEFAULT_FPS = 30
+
+TIMECODE_LINE = re.compile(
+    r'^\s*(\d{1,2}):(\d{2}):(\d{2})[:;](\d{2})\s*-\s*(\d{1,2}):(\d{2}):(\d{2})[:;](\d{2})\s*$'
+)
+
+# Linha de locutor: curta, sem pontuação de fim de frase e com cara de rótulo
+MAX_SPEAKER_LENGTH = 40
+SENTENCE_END = ('.', '!', '?', '…', ':')
+
+# Rótulos que as ferramentas de transcrição usam para locutores ("Desconhecido", "Locutor 2")
+SPEAKER_LABEL = re.compile(
+    r'^(desconhecido|unknown|speaker|locutor|falante|orador|entrevistador|entrevistado|'
+    r'apresentador|convidado|participante)(\s+\d+)?$',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class TranscriptSegment:
+    """Trecho da transcrição; start/end em segundos (None quando o texto não tem timecode)"""
+    start: Optional[float]
+    end: Optional[float]
+    speaker: str
+    text: str
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return max(0.0, self.end - self.start)
+
+    @property
+    def timestamp(self) -> str:
+        """Início no formato aceito pelo YouTube em capítulos (M:SS ou H:MM:SS)"""
+        return format_timestamp(self.start or 0.0)
+
+
+def _seconds(hours: str, minutes: str, seconds: str, frames: str, fps: int) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(frames) / fps
+
+
+def format_timestamp(seconds: float) -> str:
+    """Segundos -> 'M:SS' ou 'H:MM:SS'"""
+    total = int(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def _speaker_name(line: str, seen: Set[str]) -> Optional[str]:
+    """
+    Locutor na primeira linha após o timecode, ou None se a linha deve ser tratada como fala
+
+    Só é locutor o que tem cara de rótulo: termina em ':' ("Maria:"), é um rótulo conhecido
+    ("Desconhecido", "Locutor 2") ou já apareceu antes como primeira linha de outro segmento
+    ("João Silva" na segunda fala em diante). Na dúvida a linha fica no texto ("Olá pessoal").
+    """
+    if len(line) > MAX_SPEAKER_LENGTH:
+        return None
+    if line.endswith(':'):
+        name = line[:-1].strip()
+        return name if name and not name.endswith(SENTENCE_END) else None
+    if line.endswith(SENTENCE_END):
+        return None
+    if line in seen or SPEAKER_LABEL.match(line):
+        return line
+    return None
+
+
+def iter_segments(lines: Iterable[str], fps: int = DEFAULT_FPS) -> Iterator[TranscriptSegment]:
+    """
+    Converte as linhas de uma transcrição em segmentos, sem carregar o arquivo inteiro
+
+    Args:
+        lines: Objeto de arquivo (ou qualquer iterável de linhas)
+        fps: Quadros por segundo do timecode
+
+    Yields:
+        TranscriptSegment na ordem do arquivo (segmentos sem texto são descartados)
+    """
+    start = end = None
+    speaker = ''
+    text: List[str] = []
+    expect_speaker = False
+    # Primeiras linhas curtas já vistas: uma repetição ("Ana", "Ana") confirma o locutor
+    first_lines: Set[str] = set()
+
+    def flush() -> Optional[TranscriptSegment]:
+        content = ' '.join(text).strip()
+        return TranscriptSegment(start, end, speaker, content) if content else None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        match = TIMECODE_LINE.match(line)
+
+        if match:
+            segment = flush()
+            if segment:
+                yield segment
+            values = match.groups()
+            start, end = _seconds(*values[:4], fps), _seconds(*values[4:], fps)
+            speaker, text, expect_speaker = '', [], True
+        elif not line:
+            # Sem timecode, a linha em branco separa parágrafos
+            if start is None and text:
+                segment = flush()
+                if segment:
+                    yield segment
+                text = []
+        elif expect_speaker:
+            expect_speaker = False
+            name = _speaker_name(line, first_lines)
+            if len(line) <= MAX_SPEAKER_LENGTH:
+                first_lines.add(line)
+            if name:
+                speaker = name
+                first_lines.add(name)
+            else:
+                text.append(line)
+        else:
+            text.append(line)
+
+    segment = flush()
+    if segment:
+        yield segment
+
+
+def parse_file(path: str, fps: int = DEFAULT_FPS, encoding: str = 'utf-8') -> Iterator[TranscriptSegment]:
+    """Segmentos de um arquivo de transcrição (o arquivo fica aberto apenas durante a iteração)"""
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        yield from iter_segments(f, fps)
+
+
+def parse_text(text: str, fps: int = DEFAULT_FPS) -> List[TranscriptSegment]:
+    """Segmentos de uma transcrição já em memória (ex.: upload no dashboard)"""
+    return list(iter_segments(text.splitlines(), fps))
+
+
+def segments_text(segments: Iterable[TranscriptSegment]) -> str:
+    """Texto falado, sem timecodes nem locutores, um segmento por linha"""
+    return '\n'.join(segment.text for segment in segments)
+
+
+def transcript_duration(segments: List[TranscriptSegment]) -> float:
+    """Duração total em segundos (fim do último segmento com tempo)"""
+    return max((segment.end for segment in segments if segment.end is not None), default=0.0)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Segmentos de uma transcrição com timecode - F5 Estratégia")
+    parser.add_argument('file', help='Arquivo de transcrição (.txt)')
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS, help='Quadros por segundo do timecode')
+    args = parser.parse_args()
+
+    count, last_end, words = 0, 0.0, 0
+    for segment in parse_file(args.file, args.fps):
+        count += 1
+        words += len(segment.text.split())
+        last_end = segment.end if segment.end is not None else last_end
+        print(f"[{segment.timestamp}] {segment.speaker or '-'}: {segment.text[:90]}")
+    print(f"\n📊 {count} segmentos, {words} palavras, duração {format_timestamp(last_end)}")
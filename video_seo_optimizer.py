@@ -6,77 +6,46 @@ Análise inteligente de transcrições e geração automatizada de conteúdo SEO
 import os
 import re
 import json
+import hashlib
 import logging
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple
-from collections import Counter
+from collections import OrderedDict
 from pathlib import Path
 
+from f5_lexicon import LEXICON
+from chapter_generator import Chapter, chapter_lines, detect_chapters
+from keyword_engine import KeywordEngine
+from phrase_ranker import RankedPhrase, rank_phrases
+from transcript_parser import (
+    TranscriptSegment, parse_file, parse_text, segments_text, transcript_duration, format_timestamp
+)
+
 # Configuração do logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Análises memoizadas mantidas em memória (transcrições mais recentes)
+ANALYSIS_CACHE_SIZE = 32
+DEFAULT_MIN_KEYWORD_LENGTH = 4
+MAX_KEY_PHRASES = 15
+
 class TranscriptionAnalyzer:
     """Analisador de transcrições para extração de insights e palavras-chave"""
     
+    _analysis_cache: 'OrderedDict[str, TranscriptAnalysis]' = OrderedDict()
+    
     def __init__(self):
-        self.stopwords = self._get_stopwords()
-        self.f5_keywords = self._get_f5_keywords()
+        # Tabelas imutáveis compartilhadas por todas as instâncias (ver f5_lexicon)
+        self.stopwords = LEXICON.stopwords
+        self.f5_keywords = LEXICON.f5_keywords
+        self.keyword_engine = KeywordEngine()
         
-    def _get_stopwords(self) -> set:
-        """Lista de palavras irrelevantes para SEO"""
-        return {
-            'a', 'o', 'e', 'é', 'de', 'do', 'da', 'em', 'um', 'uma', 'com', 'como', 'para', 
-            'por', 'no', 'na', 'se', 'eu', 'ele', 'ela', 'nós', 'vocês', 'eles', 'elas',
-            'que', 'qual', 'quando', 'onde', 'porque', 'então', 'mas', 'ou', 'nem', 'já',
-            'ainda', 'só', 'também', 'muito', 'mais', 'menos', 'bem', 'mal', 'todo', 'toda',
-            'tudo', 'nada', 'algo', 'alguém', 'ninguém', 'sim', 'não', 'talvez', 'quem',
-            'isso', 'aquilo', 'este', 'esta', 'esse', 'essa', 'aquele', 'aquela', 'meu',
-            'minha', 'seu', 'sua', 'nosso', 'nossa', 'deles', 'delas', 'ter', 'ser', 'estar',
-            'fazer', 'vai', 'vou', 'foi', 'era', 'está', 'estou', 'tem', 'tinha', 'faz',
-            'fazia', 'pode', 'podia', 'quer', 'queria', 'sabe', 'sabia', 'vem', 'vinha',
-            'ali', 'aqui', 'lá', 'aí', 'cá', 'assim', 'agora', 'hoje', 'ontem', 'amanhã',
-            'antes', 'depois', 'sempre', 'nunca', 'às', 'vezes', 'pelo', 'pela', 'pelos',
-            'pelas', 'contra', 'sobre', 'sob', 'entre', 'até', 'desde', 'durante', 'através'
-        }
-    
-    def _get_f5_keywords(self) -> Dict[str, List[str]]:
-        """Palavras-chave relacionadas à F5 Estratégia e temas de interesse"""
-        return {
-            'negocio': [
-                'empreendedorismo', 'empresário', 'negócio', 'empresa', 'gestão', 'liderança',
-                'estratégia', 'planejamento', 'crescimento', 'escalabilidade', 'inovação',
-                'produtividade', 'performance', 'resultados', 'metas', 'objetivos'
-            ],
-            'marketing': [
-                'marketing', 'digital', 'vendas', 'tráfego', 'leads', 'conversão', 'funil',
-                'campanhas', 'anúncios', 'publicidade', 'branding', 'marca', 'posicionamento',
-                'segmentação', 'audiência', 'cliente', 'público', 'mercado'
-            ],
-            'desenvolvimento': [
-                'autoconhecimento', 'autorresponsabilidade', 'desenvolvimento', 'pessoal',
-                'profissional', 'competências', 'habilidades', 'mindset', 'mentalidade',
-                'consciência', 'reflexão', 'aprendizado', 'evolução', 'transformação'
-            ],
-            'comunicacao': [
-                'comunicação', 'oratória', 'apresentação', 'discurso', 'storytelling',
-                'persuasão', 'influência', 'networking', 'relacionamento', 'conexão',
-                'diálogo', 'escuta', 'feedback', 'clareza', 'objetividade'
-            ],
-            'gestao': [
-                'equipe', 'time', 'colaborador', 'funcionário', 'talento', 'recrutamento',
-                'seleção', 'treinamento', 'capacitação', 'motivação', 'engajamento',
-                'cultura', 'organizacional', 'processo', 'sistemática', 'metodologia'
-            ]
-        }
-    
     def clean_text(self, text: str) -> str:
         """Limpa e normaliza o texto da transcrição"""
-        # Remove timestamps
-        text = re.sub(r'\d{2}:\d{2}:\d{2}:\d{2}\s*-\s*\d{2}:\d{2}:\d{2}:\d{2}', '', text)
-        
-        # Remove "Desconhecido" (speaker labels)
-        text = re.sub(r'Desconhecido\s*', '', text)
+        # Remove timecodes e linhas de locutor (ver transcript_parser)
+        text = segments_text(parse_text(text))
         
         # Remove caracteres especiais e normaliza espaços
         text = re.sub(r'[^\w\s]', ' ', text)
@@ -84,74 +53,55 @@ class TranscriptionAnalyzer:
         
         return text.strip().lower()
     
-    def extract_keywords(self, text: str, min_length: int = 4, top_n: int = 30) -> List[Tuple[str, int]]:
-        """Extrai palavras-chave relevantes do texto"""
-        clean_text = self.clean_text(text)
-        words = clean_text.split()
-        
-        # Filtra palavras por critérios
-        filtered_words = [
-            word for word in words
-            if len(word) >= min_length
-            and word not in self.stopwords
-            and not word.isdigit()
-        ]
-        
-        # Conta frequência das palavras
-        word_freq = Counter(filtered_words)
-        
-        # Prioriza palavras relacionadas à F5
-        scored_words = []
-        for word, freq in word_freq.items():
-            score = freq
-            
-            # Aumenta score para palavras da F5
-            for category, keywords in self.f5_keywords.items():
-                if any(keyword in word or word in keyword for keyword in keywords):
-                    score *= 2
-                    break
-            
-            scored_words.append((word, score))
-        
-        # Ordena por score e retorna top N
-        scored_words.sort(key=lambda x: x[1], reverse=True)
-        return scored_words[:top_n]
+    def analyze(self, text: str, segments: Optional[List[TranscriptSegment]] = None) -> 'TranscriptAnalysis':
+        """
+        Análise memoizada da transcrição (uma por conteúdo, compartilhada entre instâncias)
+        
+        segments: segmentos já lidos do texto (preservam os timecodes quando text é só o texto falado)
+        """
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        cache = TranscriptionAnalyzer._analysis_cache
+        analysis = cache.get(key)
+        if analysis is None:
+            analysis = cache[key] = TranscriptAnalysis(text, self)
+            if len(cache) > ANALYSIS_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        if segments is not None and 'segments' not in analysis.__dict__:
+            analysis.segments = segments
+        return analysis
+    
+    def extract_keywords(self, text: str, min_length: int = 4, top_n: int = 30) -> List[Tuple[str, float]]:
+        """Extrai palavras-chave relevantes do texto (1 a 3 palavras, ver keyword_engine)"""
+        if min_length == DEFAULT_MIN_KEYWORD_LENGTH:
+            return self.analyze(text).keywords[:top_n]
+        return self._rank_keywords(self.clean_text(text).split(), min_length)[:top_n]
+    
+    def _rank_keywords(self, tokens: List[str], min_length: int) -> List[Tuple[str, float]]:
+        """Todos os candidatos do texto ordenados por score (TF-IDF × colocação × bônus F5)"""
+        return self.keyword_engine.extract(tokens, min_length)
     
     def extract_key_phrases(self, text: str, max_phrases: int = 15) -> List[str]:
-        """Extrai frases-chave importantes do texto"""
-        sentences = re.split(r'[.!?]+', text)
-        phrases = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 20 or len(sentence) > 150:
-                continue
-                
-            # Remove timestamps e limpeza básica
-            sentence = re.sub(r'\d{2}:\d{2}:\d{2}:\d{2}', '', sentence)
-            sentence = re.sub(r'Desconhecido', '', sentence)
-            sentence = sentence.strip()
-            
-            if not sentence:
-                continue
-                
-            # Verifica se contém palavras-chave da F5
-            words = sentence.lower().split()
-            f5_match = False
-            for category, keywords in self.f5_keywords.items():
-                if any(keyword in ' '.join(words) for keyword in keywords):
-                    f5_match = True
-                    break
-            
-            if f5_match or any(word in ['problema', 'solução', 'resultado', 'estratégia', 'desenvolvimento'] for word in words):
-                phrases.append(sentence)
-        
-        return phrases[:max_phrases]
+        """Extrai frases-chave importantes do texto (as mais centrais, ver phrase_ranker)"""
+        return [phrase.text for phrase in self.extract_ranked_phrases(text, max_phrases)]
+    
+    def extract_ranked_phrases(self, text: str, max_phrases: int = 15) -> List[RankedPhrase]:
+        """Frases-chave com score e instante de início (quando a transcrição tem timecode)"""
+        return self.analyze(text).ranked_phrases[:max_phrases]
+    
+    def extract_chapters(self, text: str) -> List[Chapter]:
+        """Capítulos do vídeo (vazio se a transcrição não tem timecode, ver chapter_generator)"""
+        return self.analyze(text).chapters
     
     def get_main_theme(self, text: str) -> Dict[str, any]:
         """Identifica o tema principal da transcrição"""
-        keywords = self.extract_keywords(text, top_n=50)
+        return dict(self.analyze(text).theme)
+    
+    def _score_themes(self, text: str, keywords: List[Tuple[str, int]]) -> Dict[str, any]:
+        """Pontua cada categoria F5 a partir do texto e das 50 principais palavras-chave"""
         keyword_dict = dict(keywords)
+        lowered = text.lower()
         
         # Analisa distribuição por categoria
         category_scores = {}
@@ -159,7 +109,7 @@ class TranscriptionAnalyzer:
             score = 0
             for keyword in category_keywords:
                 # Verifica se a palavra-chave aparece no texto
-                if keyword in text.lower():
+                if keyword in lowered:
                     # Bonus se estiver nas top keywords extraídas
                     if keyword in keyword_dict:
                         score += keyword_dict[keyword] * 2
@@ -176,26 +126,57 @@ class TranscriptionAnalyzer:
             'confidence': category_scores[main_category] / sum(category_scores.values()) if sum(category_scores.values()) > 0 else 0
         }
 
+class TranscriptAnalysis:
+    """
+    Artefatos derivados de uma transcrição, calculados sob demanda e uma única vez
+    
+    Texto limpo -> palavras ranqueadas -> tema; segmentos -> frases-chave ranqueadas e capítulos.
+    Todos os geradores consultam a mesma instância (ver TranscriptionAnalyzer.analyze).
+    """
+    
+    def __init__(self, text: str, analyzer: TranscriptionAnalyzer):
+        self.text = text
+        self.analyzer = analyzer
+    
+    @cached_property
+    def clean_text(self) -> str:
+        return self.analyzer.clean_text(self.text)
+    
+    @cached_property
+    def tokens(self) -> List[str]:
+        return self.clean_text.split()
+    
+    @cached_property
+    def keywords(self) -> List[Tuple[str, float]]:
+        return self.analyzer._rank_keywords(self.tokens, DEFAULT_MIN_KEYWORD_LENGTH)
+    
+    @cached_property
+    def theme(self) -> Dict[str, any]:
+        return self.analyzer._score_themes(self.text, self.keywords[:50])
+    
+    @cached_property
+    def segments(self) -> List[TranscriptSegment]:
+        return parse_text(self.text)
+    
+    @cached_property
+    def ranked_phrases(self) -> List[RankedPhrase]:
+        return rank_phrases(self.segments, MAX_KEY_PHRASES)
+    
+    @cached_property
+    def key_phrases(self) -> List[str]:
+        return [phrase.text for phrase in self.ranked_phrases]
+    
+    @cached_property
+    def chapters(self) -> List[Chapter]:
+        return detect_chapters(self.segments)
+
 class SEOContentGenerator:
     """Gerador de conteúdo SEO otimizado para YouTube"""
     
-    def __init__(self):
-        self.analyzer = TranscriptionAnalyzer()
-        self.f5_landing_pages = self._get_f5_landing_pages()
+    def __init__(self, analyzer: Optional[TranscriptionAnalyzer] = None):
+        self.analyzer = analyzer or TranscriptionAnalyzer()
+        self.f5_landing_pages = LEXICON.landing_pages
         
-    def _get_f5_landing_pages(self) -> Dict[str, str]:
-        """URLs das landing pages da F5 por categoria"""
-        return {
-            'negocio': 'https://f5estrategia.com/gestao-empresarial',
-            'marketing': 'https://f5estrategia.com/marketing-digital', 
-            'desenvolvimento': 'https://f5estrategia.com/desenvolvimento-pessoal',
-            'comunicacao': 'https://f5estrategia.com/comunicacao-estrategica',
-            'gestao': 'https://f5estrategia.com/gestao-equipes',
-            'consultoria': 'https://f5estrategia.com/consultoria',
-            'treinamento': 'https://f5estrategia.com/treinamentos',
-            'contato': 'https://f5estrategia.com/contato'
-        }
-    
     def generate_title(self, transcription: str, max_chars: int = 100) -> Dict[str, str]:
         """Gera títulos otimizados para SEO do YouTube"""
         theme_analysis = self.analyzer.get_main_theme(transcription)
@@ -205,38 +186,7 @@ class SEOContentGenerator:
         top_keywords = [kw[0] for kw in keywords[:5]]
         
         # Templates de título baseados no tema
-        title_templates = {
-            'desenvolvimento': [
-                "Como Desenvolver {keyword} e Transformar sua {area} | F5 Estratégia",
-                "{keyword}: A Chave para o Sucesso {area} | Dicas Práticas F5",
-                "Desenvolva {keyword} em {tempo} e Mude sua {area} Para Sempre",
-                "{keyword} na Prática: Estratégias que Funcionam | F5 Estratégia"
-            ],
-            'negocio': [
-                "Como {keyword} Pode Revolucionar seu Negócio | F5 Estratégia", 
-                "{keyword} para Empresários: Estratégias Comprovadas | F5",
-                "Aumente seus Resultados com {keyword} | Método F5 Estratégia",
-                "{keyword}: O Segredo dos Empresários de Sucesso | F5"
-            ],
-            'marketing': [
-                "{keyword} no Marketing Digital: Estratégias que Vendem | F5",
-                "Como Usar {keyword} para Gerar Mais Leads | F5 Estratégia",
-                "{keyword}: A Estratégia Secreta para Vender Mais | F5",
-                "Aumente suas Vendas com {keyword} | Método F5 Comprovado"
-            ],
-            'comunicacao': [
-                "Comunicação {keyword}: Como Influenciar e Persuadir | F5",
-                "{keyword} na Comunicação Empresarial | F5 Estratégia",
-                "Domine a Arte da {keyword} e Mude seus Resultados | F5",
-                "{keyword}: Comunicação que Gera Resultados | F5 Estratégia"
-            ],
-            'gestao': [
-                "Gestão {keyword}: Como Liderar Equipes de Alta Performance | F5",
-                "{keyword} para Gestores: Estratégias Eficazes | F5 Estratégia",
-                "Como Aplicar {keyword} na sua Gestão | Método F5",
-                "{keyword}: O Diferencial dos Líderes de Sucesso | F5"
-            ]
-        }
+        title_templates = LEXICON.title_templates
         
         # Escolhe template baseado no tema principal
         main_theme = theme_analysis['main_theme']
@@ -276,13 +226,13 @@ class SEOContentGenerator:
         """Gera descrição otimizada para SEO"""
         theme_analysis = self.analyzer.get_main_theme(transcription)
         keywords = self.analyzer.extract_keywords(transcription, top_n=15)
-        key_phrases = self.analyzer.extract_key_phrases(transcription, max_phrases=3)
+        key_phrases = self.analyzer.extract_ranked_phrases(transcription, max_phrases=3)
         
         main_theme = theme_analysis['main_theme']
         landing_page = self.f5_landing_pages.get(main_theme, self.f5_landing_pages['consultoria'])
         
         # Extrai pontos principais da transcrição
-        key_points = [phrase for phrase in key_phrases if len(phrase) > 30][:3]
+        key_points = [phrase for phrase in key_phrases if len(phrase.text) > 30][:3]
         
         # Template de descrição
         description = f"""🎯 {title}
@@ -294,7 +244,12 @@ Neste vídeo, exploramos conceitos fundamentais sobre {keywords[0][0]} e como ap
         
         # Adiciona pontos principais
         for i, point in enumerate(key_points, 1):
-            description += f"\n{i}. {point.strip()}"
+            description += f"\n{i}. {point.with_timestamp()}"
+        
+        # Capítulos (o YouTube cria a navegação a partir das linhas "0:00 Título")
+        chapters = self.analyzer.extract_chapters(transcription)
+        if chapters:
+            description += f"\n\n⏱️ CAPÍTULOS:\n{chapter_lines(chapters)}"
         
         # Seção de palavras-chave
         top_keywords = [kw[0] for kw in keywords[:8]]
@@ -362,16 +317,10 @@ Site: https://f5estrategia.com
                     content_tags.append(tag)
         
         # Tags por tema
-        theme_tags = {
-            'desenvolvimento': ['autoconhecimento', 'crescimento-pessoal', 'soft-skills', 'mindset'],
-            'negocio': ['crescimento-empresarial', 'inovacao-negocios', 'escalabilidade', 'resultados'],
-            'marketing': ['trafego-pago', 'leads', 'conversao', 'vendas-digitais'],
-            'comunicacao': ['oratoria', 'apresentacao', 'persuasao', 'networking'],
-            'gestao': ['gestao-equipes', 'alta-performance', 'cultura-organizacional', 'processos']
-        }
+        theme_tags = LEXICON.theme_tags
         
         main_theme = theme_analysis['main_theme']
-        specific_tags = theme_tags.get(main_theme, [])
+        specific_tags = list(theme_tags.get(main_theme, ()))
         
         # Combina todas as tags
         all_tags = base_tags + content_tags[:5] + specific_tags
@@ -388,16 +337,16 @@ Site: https://f5estrategia.com
         
         return unique_tags
     
-    def generate_metadata(self, transcription: str) -> Dict[str, str]:
-        """Gera metadados completos para o arquivo de vídeo"""
+    def generate_metadata(self, transcription: str, title: Optional[str] = None) -> Dict[str, str]:
+        """Gera metadados completos para o arquivo de vídeo (title: título já gerado, evita refazê-lo)"""
         theme_analysis = self.analyzer.get_main_theme(transcription)
         keywords = self.analyzer.extract_keywords(transcription, top_n=10)
         
         # Metadados para arquivo
         metadata = {
-            'title': self.generate_title(transcription)['primary'],
+            'title': title or self.generate_title(transcription)['primary'],
             'description': keywords[0][0].title() + ' - Conteúdo F5 Estratégia',
-            'keywords': '-'.join([kw[0] for kw in keywords[:8]]),
+            'keywords': '-'.join([kw[0].replace(' ', '-') for kw in keywords[:8]]),
             'category': theme_analysis['main_theme'],
             'author': 'F5 Estratégia',
             'creation_date': datetime.now().strftime('%Y-%m-%d'),
@@ -411,21 +360,36 @@ class VideoSEOOptimizer:
     """Sistema principal de otimização SEO para vídeos"""
     
     def __init__(self):
-        self.generator = SEOContentGenerator()
         self.analyzer = TranscriptionAnalyzer()
+        self.generator = SEOContentGenerator(self.analyzer)
         
     def optimize_video_from_transcription(self, transcription_file: str) -> Dict[str, any]:
         """Otimiza vídeo completo a partir de arquivo de transcrição"""
         try:
-            # Lê arquivo de transcrição
-            with open(transcription_file, 'r', encoding='utf-8') as f:
-                transcription = f.read()
+            # Lê a transcrição em streaming, mantendo o tempo de cada segmento
+            segments = list(parse_file(transcription_file))
+        except Exception as e:
+            logger.error(f"Erro ao otimizar vídeo: {e}")
+            return {'error': str(e)}
+        return self.optimize_segments(segments, transcription_file)
+    
+    def optimize_transcription(self, transcription: str, source_file: str = '') -> Dict[str, any]:
+        """Otimiza vídeo a partir da transcrição já em memória (sem reler o arquivo)"""
+        return self.optimize_segments(parse_text(transcription), source_file)
+    
+    def optimize_segments(self, segments: List[TranscriptSegment], source_file: str = '') -> Dict[str, any]:
+        """Otimiza vídeo a partir dos segmentos da transcrição"""
+        try:
+            transcription = segments_text(segments)
+            duration = transcript_duration(segments)
+            # Registra os segmentos na análise do texto: frases-chave mantêm os timecodes
+            self.analyzer.analyze(transcription, segments)
             
             # Gera conteúdo SEO
             title_data = self.generator.generate_title(transcription)
             description = self.generator.generate_description(transcription, title_data['primary'])
             tags = self.generator.generate_tags(transcription)
-            metadata = self.generator.generate_metadata(transcription)
+            metadata = self.generator.generate_metadata(transcription, title_data['primary'])
             
             # Análise do tema
             theme_analysis = self.analyzer.get_main_theme(transcription)
@@ -433,9 +397,16 @@ class VideoSEOOptimizer:
             # Resultado completo
             optimization_result = {
                 'video_info': {
-                    'source_file': transcription_file,
+                    'source_file': source_file,
                     'optimization_date': datetime.now().isoformat(),
-                    'theme': theme_analysis
+                    'theme': theme_analysis,
+                    'duration': format_timestamp(duration),
+                    'duration_seconds': round(duration, 2)
+                },
+                'transcript': {
+                    'segment_count': len(segments),
+                    'duration_seconds': round(duration, 2),
+                    'chapters': [chapter.to_dict() for chapter in self.analyzer.extract_chapters(transcription)]
                 },
                 'seo_content': {
                     'title': {
@@ -457,7 +428,8 @@ class VideoSEOOptimizer:
                 },
                 'keywords': {
                     'primary': self.analyzer.extract_keywords(transcription, top_n=15),
-                    'key_phrases': self.analyzer.extract_key_phrases(transcription)
+                    'key_phrases': self.analyzer.extract_key_phrases(transcription),
+                    'key_moments': [phrase.to_dict() for phrase in self.analyzer.extract_ranked_phrases(transcription)]
                 },
                 'recommendations': self._generate_recommendations(theme_analysis, len(transcription))
             }